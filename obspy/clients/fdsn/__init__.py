@@ -142,6 +142,7 @@ from future.utils import PY2, native_str
 
 from .client import Client  # NOQA
 from .header import URL_MAPPINGS  # NOQA
+from .station_cache import StationCache  # NOQA
 
 
 # insert supported URL mapping list dynamically in docstring
@@ -156,7 +157,7 @@ if r"%s" in Client.__init__.__doc__:
             Client.__init__.__doc__ % \
             str(sorted(URL_MAPPINGS.keys())).strip("[]")
 
-__all__ = [native_str("Client")]
+__all__ = [native_str("Client"), native_str("StationCache")]
 
 
 if __name__ == '__main__':
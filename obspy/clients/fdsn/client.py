@@ -20,7 +20,11 @@ import gzip
 import io
 import os
 import re
+import shutil
+import socket
 import sys
+import tempfile
+from multiprocessing.pool import ThreadPool
 from socket import timeout as socket_timeout
 import textwrap
 import threading
@@ -30,20 +34,24 @@ from collections import OrderedDict
 if sys.version_info.major == 2:
     from urllib import urlencode
     import urllib2 as urllib_request
+    import httplib as http_client
     import Queue as queue
 else:
     from urllib.parse import urlencode
     import urllib.request as urllib_request
+    import http.client as http_client
     import queue
 
 from lxml import etree
 
 import obspy
 from obspy import UTCDateTime, read_inventory
+from obspy.io.mseed.core import _iter_mseed, _join_traces
 from .header import (DEFAULT_PARAMETERS, DEFAULT_USER_AGENT, FDSNWS,
                      OPTIONAL_PARAMETERS, PARAMETER_ALIASES, URL_MAPPINGS,
                      WADL_PARAMETERS_NOT_TO_BE_PARSED, FDSNException,
                      FDSNRedirectException, FDSNNoDataException)
+from .station_cache import StationCache
 from .wadl_parser import WADLParser
 
 
@@ -96,6 +104,160 @@ class NoRedirectionHandler(urllib_request.HTTPRedirectHandler):
             "when initializing the Client.")
 
 
+class ConnectionPool(object):
+    """
+    Thread safe pool of idle keep-alive HTTP(S) connections.
+
+    Connections are kept per scheme and host. Connections handed back to a
+    full pool are closed.
+
+    :type maxsize: int
+    :param maxsize: Maximum number of idle connections kept per host.
+    """
+    def __init__(self, maxsize=10):
+        self.maxsize = maxsize
+        self._idle = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return an idle connection for the given key or ``None``.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return None
+
+    def put(self, key, connection):
+        """
+        Hand back a connection that is ready for the next request.
+        """
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.maxsize:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def clear(self):
+        """
+        Close all idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, collections.defaultdict(list)
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class _PooledHTTPResponse(http_client.HTTPResponse):
+    """
+    HTTP response that hands its connection back to the pool as soon as it
+    has been read completely.
+    """
+    _release = None
+
+    def _close_conn(self):
+        super(_PooledHTTPResponse, self)._close_conn()
+        release, self._release = self._release, None
+        if release is not None:
+            release(self)
+
+
+class _PooledConnectionMixin(object):
+    """
+    Opens HTTP(S) connections with keep-alive and reuses them via a
+    :class:`ConnectionPool` instead of opening a new connection for every
+    request like the standard library does.
+    """
+    def _pooled_open(self, connection_class, req, **kwargs):
+        # Requests through a https proxy need a tunnel, don't pool those.
+        if req._tunnel_host:
+            return self.do_open(connection_class, req, **kwargs)
+        host = req.host
+        if not host:
+            raise urllib_request.URLError("no host given")
+        key = (req.type, host)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update(dict((k, v) for k, v in req.headers.items()
+                            if k not in headers))
+        headers["Connection"] = "keep-alive"
+        headers = dict((name.title(), val) for name, val in headers.items())
+
+        while True:
+            connection = self.pool.get(key)
+            reused = connection is not None
+            if reused:
+                connection.timeout = req.timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(req.timeout)
+            else:
+                connection = connection_class(host, timeout=req.timeout,
+                                              **kwargs)
+                connection.response_class = _PooledHTTPResponse
+            try:
+                connection.request(req.get_method(), req.selector, req.data,
+                                   headers)
+                response = connection.getresponse()
+            except (http_client.HTTPException, socket.error) as e:
+                connection.close()
+                if isinstance(e, socket_timeout):
+                    raise
+                # The server might have closed an idle connection in the
+                # meantime, retry with the next one.
+                if reused:
+                    continue
+                raise urllib_request.URLError(e)
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            def release(response):
+                # Only reuse the connection if the response was read
+                # completely, otherwise the remaining bytes would get mixed
+                # up with the next response.
+                if response.length == 0 or (response.chunked and
+                                            response.chunk_left is None):
+                    self.pool.put(key, connection)
+                else:
+                    connection.close()
+            response._release = release
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+
+class PooledHTTPHandler(_PooledConnectionMixin, urllib_request.HTTPHandler):
+    """
+    HTTP handler reusing keep-alive connections from a
+    :class:`ConnectionPool`.
+    """
+    def __init__(self, pool, debuglevel=0):
+        urllib_request.HTTPHandler.__init__(self, debuglevel=debuglevel)
+        self.pool = pool
+
+    def http_open(self, req):
+        return self._pooled_open(http_client.HTTPConnection, req)
+
+
+class PooledHTTPSHandler(_PooledConnectionMixin, urllib_request.HTTPSHandler):
+    """
+    HTTPS handler reusing keep-alive connections from a
+    :class:`ConnectionPool`.
+    """
+    def __init__(self, pool, debuglevel=0, context=None):
+        urllib_request.HTTPSHandler.__init__(self, debuglevel=debuglevel,
+                                             context=context)
+        self.pool = pool
+
+    def https_open(self, req):
+        return self._pooled_open(http_client.HTTPSConnection, req,
+                                 context=self._context)
+
+
 class Client(object):
     """
     FDSN Web service request client.
@@ -138,7 +300,8 @@ class Client(object):
 
     def __init__(self, base_url="IRIS", major_versions=None, user=None,
                  password=None, user_agent=DEFAULT_USER_AGENT, debug=False,
-                 timeout=120, service_mappings=None, force_redirect=False):
+                 timeout=120, service_mappings=None, force_redirect=False,
+                 keep_alive=True, station_cache=None):
         """
         Initializes an FDSN Web Service client.
 
@@ -193,6 +356,18 @@ class Client(object):
             when a redirect is discovered. This is done to improve security.
             Settings this flag to ``True`` will force all redirects to be
             followed even if credentials are given.
+        :type keep_alive: bool
+        :param keep_alive: By default connections to the server are kept
+            open and reused for subsequent requests, which saves the TCP/TLS
+            connection setup when sending many small requests. Set to
+            ``False`` to open a new connection for every request.
+        :type station_cache:
+            :class:`~obspy.clients.fdsn.station_cache.StationCache` or str
+        :param station_cache: Persistent cache (or the directory of one) to
+            answer station queries from, see
+            :meth:`~obspy.clients.fdsn.client.Client.get_stations`. The cache
+            can be shared between clients in different processes. Its
+            directory must only be writable by trusted users.
         """
         self.debug = debug
         self.user = user
@@ -235,9 +410,20 @@ class Client(object):
         else:
             handlers.append(NoRedirectionHandler())
 
+        if keep_alive and not PY2:
+            self._connection_pool = ConnectionPool()
+            handlers.append(PooledHTTPHandler(self._connection_pool))
+            handlers.append(PooledHTTPSHandler(self._connection_pool))
+        else:
+            self._connection_pool = None
+
         # Don't install globally to not mess with other codes.
         self._url_opener = urllib_request.build_opener(*handlers)
 
+        if isinstance(station_cache, (str, native_str)):
+            station_cache = StationCache(station_cache)
+        self.station_cache = station_cache
+
         self.request_headers = {"User-Agent": user_agent}
         # Avoid mutable kwarg.
         if major_versions is None:
@@ -588,6 +774,9 @@ class Client(object):
         locs = locals()
         setup_query_dict('station', locs, kwargs)
 
+        if self.station_cache is not None and not filename:
+            return self._get_stations_cached(kwargs)
+
         url = self._create_url_from_parameters(
             "station", DEFAULT_PARAMETERS['station'], kwargs)
 
@@ -602,6 +791,75 @@ class Client(object):
             data_stream.close()
             return inventory
 
+    def _get_stations_cached(self, kwargs):
+        """
+        Answers a station query from the station cache if possible.
+
+        Queries for a single channel are cached for all epochs of the channel
+        and the requested time span is selected from the cached inventory,
+        so that the queries for different time spans of the same channel
+        (e.g. when attaching responses) share one cache entry. Should the
+        cached entry not contain the requested time span (e.g. a new epoch
+        of the channel), it is fetched again. All other queries are cached
+        as they are.
+        """
+        codes = [kwargs.get(key) for key in
+                 ("network", "station", "location", "channel")]
+        single_channel = (
+            set(kwargs).issubset(("network", "station", "location",
+                                  "channel", "starttime", "endtime",
+                                  "level", "format")) and
+            all(code is not None and
+                not any(char in str(code) for char in "*?,")
+                for code in codes))
+        if not single_channel:
+            url = self._create_url_from_parameters(
+                "station", DEFAULT_PARAMETERS['station'], kwargs)
+            inventory = self.station_cache.get(url)
+            if inventory is None:
+                inventory = self._download_inventory(url)
+                self.station_cache.put(url, inventory)
+            return inventory
+
+        query = dict((key, value) for key, value in kwargs.items()
+                     if key not in ("starttime", "endtime"))
+        url = self._create_url_from_parameters(
+            "station", DEFAULT_PARAMETERS['station'], query)
+        starttime = kwargs.get("starttime")
+        endtime = kwargs.get("endtime")
+        starttime = starttime and UTCDateTime(starttime)
+        endtime = endtime and UTCDateTime(endtime)
+        level = kwargs.get("level", "station")
+
+        inventory = self.station_cache.get(url)
+        for fetch in ((False, True) if inventory is not None else (True,)):
+            if fetch:
+                inventory = self._download_inventory(url)
+                self.station_cache.put(url, inventory)
+            inventory_ = inventory.select(starttime=starttime,
+                                          endtime=endtime)
+            contents = inventory_.get_contents()
+            if level == "network":
+                found = bool(contents["networks"])
+            elif level == "station":
+                found = bool(contents["stations"])
+            else:
+                found = bool(contents["channels"])
+            if found:
+                return inventory_
+        raise FDSNNoDataException("No data available for request.")
+
+    def _download_inventory(self, url):
+        """
+        Downloads and parses the result of a station query.
+        """
+        data_stream = self._download(url)
+        data_stream.seek(0, 0)
+        # This works with XML and StationXML data.
+        inventory = read_inventory(data_stream)
+        data_stream.close()
+        return inventory
+
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime, quality=None, minimumlength=None,
                       longestonly=None, filename=None, attach_response=False,
@@ -710,19 +968,19 @@ class Client(object):
 
         # Gzip not worth it for MiniSEED and most likely disabled for this
         # route in any case.
-        data_stream = self._download(url, use_gzip=False)
-        data_stream.seek(0, 0)
-        if filename:
-            self._write_to_file_object(filename, data_stream)
+        data_stream = self._download(url, use_gzip=False, stream=True)
+        try:
+            if filename:
+                self._write_to_file_object(filename, data_stream)
+                return
+            st = _read_mseed_stream(data_stream)
+        finally:
             data_stream.close()
-        else:
-            st = obspy.read(data_stream, format="MSEED")
-            data_stream.close()
-            if attach_response:
-                self._attach_responses(st)
-            return st
+        if attach_response:
+            self._attach_responses(st)
+        return st
 
-    def _attach_responses(self, st):
+    def _attach_responses(self, st, workers=None):
         """
         Helper method to fetch response via get_stations() and attach it to
         each trace in stream.
@@ -736,21 +994,28 @@ class Client(object):
                 min(tr.stats.starttime, netids[tr.id][0]),
                 max(tr.stats.endtime, netids[tr.id][1]))
 
-        inventories = []
-        for key, value in netids.items():
+        def _get_response(item):
+            key, (starttime, endtime) = item
             net, sta, loc, chan = key.split(".")
-            starttime, endtime = value
             try:
-                inventories.append(self.get_stations(
+                return self.get_stations(
                     network=net, station=sta, location=loc, channel=chan,
-                    starttime=starttime, endtime=endtime, level="response"))
+                    starttime=starttime, endtime=endtime, level="response")
             except Exception as e:
-                warnings.warn(str(e))
+                return e
+
+        inventories = []
+        for inv in self._map(_get_response, list(netids.items()), workers):
+            if isinstance(inv, Exception):
+                warnings.warn(str(inv))
+            else:
+                inventories.append(inv)
         st.attach_response(inventories)
 
     def get_waveforms_bulk(self, bulk, quality=None, minimumlength=None,
                            longestonly=None, filename=None,
-                           attach_response=False, **kwargs):
+                           attach_response=False, chunk_size=None,
+                           workers=None, **kwargs):
         r"""
         Query the dataselect service of the client. Bulk request.
 
@@ -867,6 +1132,15 @@ class Client(object):
             in the result set. A warning will be shown if a response can not be
             found for a channel. Does nothing if output to a file was
             specified.
+        :type chunk_size: int
+        :param chunk_size: If given, the request is split into requests of at
+            most this many lines which are sent one after another or
+            concurrently (see ``workers``). Chunks without data are skipped.
+            Only used if `bulk` is provided as a list of lists.
+        :type workers: int
+        :param workers: Number of threads used to send the chunks of the
+            request and to fetch responses if ``attach_response=True``. The
+            chunks are then decoded one after another.
 
         Any additional keyword arguments will be passed to the webservice as
         additional arguments. If you pass one of the default parameters and the
@@ -878,28 +1152,147 @@ class Client(object):
             msg = "The current client does not have a dataselect service."
             raise ValueError(msg)
 
+        if chunk_size and _is_bulk_list(bulk):
+            bulk = list(bulk)
+            chunks = [bulk[i:i + chunk_size]
+                      for i in range(0, len(bulk), chunk_size)]
+        else:
+            chunks = [bulk]
+
         arguments = OrderedDict(
             quality=quality,
             minimumlength=minimumlength,
             longestonly=longestonly
         )
-        bulk = self._get_bulk_string(bulk, arguments)
+        bulks = [self._get_bulk_string(chunk, arguments) for chunk in chunks]
 
         url = self._build_url("dataselect", "query")
+        # libmseed is not thread-safe, so chunks downloaded by several threads
+        # are only decoded after the download, in this thread
+        threaded = bool(workers and workers > 1 and len(bulks) > 1)
 
-        data_stream = self._download(url,
-                                     data=bulk.encode('ascii', 'strict'))
-        data_stream.seek(0, 0)
+        def _request(bulk):
+            try:
+                data_stream = self._download(
+                    url, data=bulk.encode('ascii', 'strict'), stream=True)
+            except FDSNNoDataException:
+                if len(bulks) == 1:
+                    raise
+                return None
+            try:
+                if not filename and not threaded:
+                    return _read_mseed_stream(data_stream)
+                elif filename and len(bulks) == 1:
+                    self._write_to_file_object(filename, data_stream)
+                    return True
+                # Chunks arrive in any order, keep them in temporary files
+                # to write them out or decode them in order later on.
+                buf = tempfile.SpooledTemporaryFile(max_size=2 ** 24)
+                shutil.copyfileobj(data_stream, buf)
+                buf.seek(0, 0)
+                return buf
+            finally:
+                data_stream.close()
+
+        results = [result for result in self._map(_request, bulks, workers)
+                   if result is not None]
+        if not results:
+            raise FDSNNoDataException("No data available for request.")
         if filename:
-            self._write_to_file_object(filename, data_stream)
-            data_stream.close()
+            if len(bulks) == 1:
+                return
+            if hasattr(filename, "write"):
+                for buf in results:
+                    self._write_to_file_object(filename, buf)
+                    buf.close()
+            else:
+                with open(filename, "wb") as fh:
+                    for buf in results:
+                        self._write_to_file_object(fh, buf)
+                        buf.close()
         else:
-            st = obspy.read(data_stream, format="MSEED")
-            data_stream.close()
+            if threaded:
+                buffers = results
+                results = []
+                for buf in buffers:
+                    with buf:
+                        results.append(_read_mseed_stream(buf))
+            st = results[0]
+            for st_ in results[1:]:
+                st.extend(st_.traces)
             if attach_response:
-                self._attach_responses(st)
+                self._attach_responses(st, workers=workers)
             return st
 
+    def iter_waveforms_bulk(self, bulk, quality=None, minimumlength=None,
+                            longestonly=None, batch_size=2 ** 22, **kwargs):
+        """
+        Query the dataselect service of the client. Bulk request yielding
+        the traces as the data arrives.
+
+        Works like :meth:`get_waveforms_bulk` but the response is decoded
+        batch by batch while it is still being downloaded, so only a few
+        megabytes of raw data are held in memory at any time and processing
+        can start before the download is complete.
+
+        >>> client = Client("IRIS")
+        >>> t1 = UTCDateTime("2010-02-27T06:30:00.000")
+        >>> t2 = t1 + 1
+        >>> bulk = [("IU", "ANMO", "*", "BHZ", t1, t2),
+        ...         ("GR", "GRA1", "*", "BH*", t1, t2)]
+        >>> for tr in client.iter_waveforms_bulk(bulk):
+        ...     print(tr.id)  # doctest: +SKIP
+        IU.ANMO.00.BHZ
+        IU.ANMO.10.BHZ
+        GR.GRA1..BHE
+        GR.GRA1..BHN
+        GR.GRA1..BHZ
+
+        .. note::
+
+            Contiguous data of a channel might be split into several
+            consecutive traces at the boundaries of the decoded batches.
+
+        :type bulk: str, file or list of lists
+        :param bulk: Information about the requested data. See
+            :meth:`get_waveforms_bulk` for details.
+        :type quality: str, optional
+        :param quality: Select a specific SEED quality indicator, handling is
+            data center dependent. Ignored when `bulk` is provided as a
+            request string/file.
+        :type minimumlength: float, optional
+        :param minimumlength: Limit results to continuous data segments of a
+            minimum length specified in seconds. Ignored when `bulk` is
+            provided as a request string/file.
+        :type longestonly: bool, optional
+        :param longestonly: Limit results to the longest continuous segment per
+            channel. Ignored when `bulk` is provided as a request string/file.
+        :type batch_size: int
+        :param batch_size: Approximate number of bytes of MiniSEED data that
+            are decoded at once.
+        :rtype: generator of :class:`~obspy.core.trace.Trace`
+        """
+        if "dataselect" not in self.services:
+            msg = "The current client does not have a dataselect service."
+            raise ValueError(msg)
+
+        arguments = OrderedDict(
+            quality=quality,
+            minimumlength=minimumlength,
+            longestonly=longestonly
+        )
+        bulk = self._get_bulk_string(bulk, arguments)
+
+        url = self._build_url("dataselect", "query")
+
+        data_stream = self._download(url, data=bulk.encode('ascii', 'strict'),
+                                     stream=True)
+        try:
+            for tr in _iter_mseed(data_stream, batch_size=batch_size):
+                yield tr
+        finally:
+            data_stream.close()
+
     def get_stations_bulk(self, bulk, level=None, includerestricted=None,
                           includeavailability=None, filename=None, **kwargs):
         r"""
@@ -1044,12 +1437,93 @@ class Client(object):
             data_stream.close()
             return inv
 
+    def map(self, method, requests, workers=None):
+        """
+        Send many requests of the same kind, optionally concurrently.
+
+        Sending thousands of small requests (e.g. the stations around an
+        event) one after another mostly waits for the network. With
+        ``workers`` the requests are sent from a pool of threads sharing the
+        kept-alive connections of the client.
+
+        >>> client = Client("IRIS")
+        >>> requests = [dict(network="IU", station=station, level="station")
+        ...             for station in ("ANMO", "COLA", "KONO")]
+        >>> inventories = client.map("get_stations", requests, workers=3)
+        >>> print([inv[0][0].code for inv in inventories])
+        ['ANMO', 'COLA', 'KONO']
+
+        :type method: str
+        :param method: Name of the request method, one of
+            ``"get_waveforms"``, ``"get_stations"`` or ``"get_events"``.
+        :type requests: list of dict
+        :param requests: Keyword arguments for the individual requests.
+        :type workers: int
+        :param workers: Number of threads used to send the requests.
+            Waveforms are decoded one after another once they are
+            downloaded.
+        :rtype: list
+        :returns: Results of the individual requests in the order of
+            ``requests``, ``None`` for requests without data.
+        """
+        if method not in ("get_waveforms", "get_stations", "get_events"):
+            msg = "Unsupported request method '%s'." % method
+            raise ValueError(msg)
+        func = getattr(self, method)
+        requests = list(requests)
+        # libmseed is not thread-safe, so waveforms downloaded by several
+        # threads are only decoded after the download, in this thread
+        spool = method == "get_waveforms" and bool(
+            workers and workers > 1 and len(requests) > 1)
+
+        def _request(kwargs):
+            if spool and not kwargs.get("filename"):
+                buf = tempfile.SpooledTemporaryFile(max_size=2 ** 24)
+                kwargs = dict(kwargs, filename=buf, attach_response=False)
+                try:
+                    func(**kwargs)
+                except FDSNNoDataException:
+                    buf.close()
+                    return None
+                buf.seek(0, 0)
+                return buf
+            try:
+                return func(**kwargs)
+            except FDSNNoDataException:
+                return None
+
+        results = self._map(_request, requests, workers)
+        if spool:
+            for i, (kwargs, result) in enumerate(zip(requests, results)):
+                if kwargs.get("filename") or result is None:
+                    continue
+                with result:
+                    try:
+                        st = _read_mseed_stream(result)
+                    except FDSNNoDataException:
+                        results[i] = None
+                        continue
+                if kwargs.get("attach_response"):
+                    self._attach_responses(st)
+                results[i] = st
+        return results
+
+    def _map(self, func, items, workers=None):
+        """
+        Map func over items, using a pool of threads if workers is given.
+        """
+        if workers and workers > 1 and len(items) > 1:
+            pool = ThreadPool(min(workers, len(items)))
+            try:
+                return pool.map(func, items)
+            finally:
+                pool.close()
+                pool.join()
+        return [func(item) for item in items]
+
     def _get_bulk_string(self, bulk, arguments):
         # If its an iterable, we build up the query string from it
-        # StringIO objects also have __iter__ so check for 'read' as well
-        if isinstance(bulk, collections.Iterable) \
-                and not hasattr(bulk, "read") \
-                and not isinstance(bulk, (str, native_str)):
+        if _is_bulk_list(bulk):
             tmp = ["%s=%s" % (key, convert_to_string(value))
                    for key, value in arguments.items() if value is not None]
             # empty location codes have to be represented by two dashes
@@ -1081,11 +1555,12 @@ class Client(object):
         return bulk
 
     def _write_to_file_object(self, filename_or_object, data_stream):
+        # Copy in chunks to not hold large downloads in memory.
         if hasattr(filename_or_object, "write"):
-            filename_or_object.write(data_stream.read())
+            shutil.copyfileobj(data_stream, filename_or_object)
             return
         with open(filename_or_object, "wb") as fh:
-            fh.write(data_stream.read())
+            shutil.copyfileobj(data_stream, fh)
 
     def _create_url_from_parameters(self, service, default_params, parameters):
         """
@@ -1290,11 +1765,12 @@ class Client(object):
 
         print("\n".join(msg))
 
-    def _download(self, url, return_string=False, data=None, use_gzip=True):
+    def _download(self, url, return_string=False, data=None, use_gzip=True,
+                  stream=False):
         code, data = download_url(
             url, opener=self._url_opener, headers=self.request_headers,
             debug=self.debug, return_string=return_string, data=data,
-            timeout=self.timeout, use_gzip=use_gzip)
+            timeout=self.timeout, use_gzip=use_gzip, stream=stream)
         # get detailed server response message
         if code != 200:
             try:
@@ -1622,7 +2098,7 @@ def build_url(base_url, service, major_version, resource_type,
 
 
 def download_url(url, opener, timeout=10, headers={}, debug=False,
-                 return_string=True, data=None, use_gzip=True):
+                 return_string=True, data=None, use_gzip=True, stream=False):
     """
     Returns a pair of tuples.
 
@@ -1634,6 +2110,10 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
     specified.
 
     Performs a http GET if data=None, otherwise a http POST.
+
+    If `stream=True` the second item is the open response to read the
+    (uncompressed) data from as it arrives instead of the data itself. It
+    has to be closed by the caller.
     """
     if debug is True:
         print("Downloading %s %s requesting gzip compression" % (
@@ -1669,14 +2149,22 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
     if url_obj.info().get("Content-Encoding") == "gzip":
         if debug is True:
             print("Uncompressing gzipped response for %s" % url)
-        # Cannot directly stream to gzip from urllib!
-        # http://www.enricozini.org/2011/cazzeggio/python-gzip/
-        buf = io.BytesIO(url_obj.read())
-        buf.seek(0, 0)
-        f = gzip.GzipFile(fileobj=buf)
+        if PY2:
+            # Cannot directly stream to gzip from urllib!
+            # http://www.enricozini.org/2011/cazzeggio/python-gzip/
+            buf = io.BytesIO(url_obj.read())
+            buf.seek(0, 0)
+            f = gzip.GzipFile(fileobj=buf)
+        else:
+            f = gzip.GzipFile(fileobj=url_obj)
     else:
         f = url_obj
 
+    if stream:
+        if debug is True:
+            print("Streaming %s with HTTP code: %i" % (url, code))
+        return code, f
+
     if return_string is False:
         data = io.BytesIO(f.read())
     else:
@@ -1688,6 +2176,30 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
     return code, data
 
 
+def _read_mseed_stream(data_stream):
+    """
+    Decodes MiniSEED data from a HTTP response while it is downloaded.
+
+    Returns the same as :func:`~obspy.core.stream.read` would for the whole
+    response, without holding the raw response in memory.
+    """
+    st = _join_traces(_iter_mseed(data_stream))
+    if not len(st):
+        raise FDSNNoDataException("No data available for request.")
+    return st
+
+
+def _is_bulk_list(bulk):
+    """
+    Checks if a bulk request is given as an iterable of request items (as
+    opposed to a request string/file).
+    """
+    # StringIO objects also have __iter__ so check for 'read' as well
+    return (isinstance(bulk, collections.Iterable) and
+            not hasattr(bulk, "read") and
+            not isinstance(bulk, (str, native_str)))
+
+
 def setup_query_dict(service, locs, kwargs):
     """
     """
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent cache for results of the FDSN station web service.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+from obspy import __version__, read_inventory
+
+
+class StationCache(object):
+    """
+    Persistent on-disk cache for inventories returned by the station
+    service.
+
+    The cache is a directory with one StationXML file per query, so that it
+    can be shared by many processes and is reused across runs. Reading an
+    inventory from the cache saves the round trip to the server, which
+    usually takes much longer than parsing the StationXML.
+
+    Entries older than ``ttl`` seconds are fetched again. If the files in the
+    cache take up more than ``max_size`` bytes, the least recently used
+    entries are removed. Each cache object keeps track of the size of the
+    entries it writes and only checks the directory once its estimate
+    exceeds ``max_size``, so with several processes writing to the same
+    directory the cache can temporarily grow beyond ``max_size``.
+
+    Usually a cache is passed to a
+    :class:`~obspy.clients.fdsn.client.Client` which then answers station
+    queries (including the ones used to attach responses to waveforms) from
+    the cache whenever possible:
+
+    >>> from obspy.clients.fdsn import Client, StationCache
+    >>> cache = StationCache("/path/to/station_cache")  # doctest: +SKIP
+    >>> client = Client("IRIS", station_cache=cache)  # doctest: +SKIP
+
+    .. note::
+
+        Anyone who can write to the cache directory can change the
+        inventories returned by the cache (e.g. the instrument responses used
+        to correct the data). Use a directory that only trusted users can
+        write to, not a world-writable one like ``/tmp``.
+
+    :type path: str
+    :param path: Directory of the cache. Created if it does not exist.
+    :type ttl: float
+    :param ttl: Time in seconds after which cached entries expire. ``None``
+        to never expire entries.
+    :type max_size: int
+    :param max_size: Maximum size of the cache in bytes. ``None`` for no
+        limit.
+    """
+    SUFFIX = ".xml"
+
+    def __init__(self, path, ttl=86400, max_size=2 ** 30):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        # Estimated size of the cache in bytes, see _evict().
+        self._size = None
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+
+    def _filename(self, key):
+        return os.path.join(
+            self.path,
+            hashlib.sha1(key.encode("utf-8")).hexdigest() + self.SUFFIX)
+
+    def get(self, key):
+        """
+        Returns the inventory stored for a key or ``None`` if there is no
+        valid entry.
+
+        :type key: str
+        :param key: Key of the entry, e.g. the URL of the query.
+        """
+        filename = self._filename(key)
+        try:
+            with open(filename, "rb") as fh:
+                # The first line holds the metadata of the entry, the rest is
+                # the StationXML.
+                header = json.loads(fh.readline().decode("utf-8"))
+                if header["version"] != __version__:
+                    return None
+                if self.ttl is not None and \
+                        time.time() - header["created"] > self.ttl:
+                    return None
+                inventory = read_inventory(io.BytesIO(fh.read()),
+                                           format="STATIONXML")
+        except Exception:
+            # Missing or broken entry.
+            return None
+        # The modification time marks the last use for the eviction.
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+        return inventory
+
+    def put(self, key, inventory):
+        """
+        Stores an inventory for a key.
+
+        :type key: str
+        :param key: Key of the entry, e.g. the URL of the query.
+        :type inventory: :class:`~obspy.core.inventory.inventory.Inventory`
+        :param inventory: Inventory to store.
+        """
+        filename = self._filename(key)
+        dirname, basename = os.path.split(filename)
+        # Write to a temporary file first and rename it, so that other
+        # processes never see an incompletely written entry.
+        tmp_filename = os.path.join(dirname, ".tmp_%d_%d_%s" % (
+            os.getpid(), threading.current_thread().ident, basename))
+        header = {"version": __version__, "created": time.time()}
+        with open(tmp_filename, "wb") as fh:
+            fh.write(json.dumps(header).encode("utf-8") + b"\n")
+            inventory.write(fh, format="STATIONXML")
+        added = _replaced_size(tmp_filename, filename)
+        try:
+            os.replace(tmp_filename, filename)
+        except AttributeError:
+            # Python 2
+            os.rename(tmp_filename, filename)
+        self._evict(added)
+
+    def _entries(self):
+        """
+        Returns (last use, size, filename) of all entries.
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith(self.SUFFIX) or name.startswith(".tmp_"):
+                continue
+            filename = os.path.join(self.path, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                # Removed by another process in the meantime.
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+        return entries
+
+    def _evict(self, added=None):
+        """
+        Removes the least recently used entries if the cache is larger than
+        max_size.
+
+        The directory is only scanned if the size of the cache is unknown or
+        if the estimate, updated with the ``added`` bytes of each new entry,
+        exceeds max_size. Entries are then removed until the cache takes up
+        at most 90 % of max_size, so that the next scans are due only after
+        many more entries.
+        """
+        if self.max_size is None:
+            return
+        if self._size is not None and added is not None:
+            self._size += added
+            if self._size <= self.max_size:
+                return
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+        if size > self.max_size:
+            for _, entry_size, filename in sorted(entries):
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+                size -= entry_size
+                if size <= 0.9 * self.max_size:
+                    break
+        self._size = size
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        self._size = None
+        for _, _, filename in self._entries():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def _replaced_size(new_filename, filename):
+    """
+    Returns by how many bytes the cache grows if ``filename`` is replaced by
+    ``new_filename``.
+    """
+    try:
+        old_size = os.path.getsize(filename)
+    except OSError:
+        old_size = 0
+    return os.path.getsize(new_filename) - old_size
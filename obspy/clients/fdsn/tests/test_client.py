@@ -16,18 +16,31 @@ from future.builtins import *  # NOQA
 import io
 import os
 import re
+import shutil
 import sys
+import tempfile
+import threading
 import unittest
 import warnings
 from difflib import Differ
 
+if sys.version_info.major == 2:
+    import BaseHTTPServer as http_server
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl
+else:
+    import http.server as http_server
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl
+
 import lxml
+import numpy as np
 import requests
 
-from obspy import UTCDateTime, read, read_inventory
+from obspy import Stream, Trace, UTCDateTime, read, read_inventory
 from obspy.core.compatibility import mock
 from obspy.core.util.base import NamedTemporaryFile
-from obspy.clients.fdsn import Client
+from obspy.clients.fdsn import Client, StationCache
 from obspy.clients.fdsn.client import build_url, parse_simple_xml
 from obspy.clients.fdsn.header import (DEFAULT_USER_AGENT, URL_MAPPINGS,
                                        FDSNException, FDSNRedirectException,
@@ -1185,8 +1198,325 @@ class ClientTestCase(unittest.TestCase):
                           minmagnitude=8)
 
 
+class _LocalFDSNServer(ThreadingMixIn, http_server.HTTPServer):
+    """
+    Minimal stand-in for a FDSN web service server.
+    """
+    daemon_threads = True
+
+    def __init__(self, datapath):
+        http_server.HTTPServer.__init__(self, ("127.0.0.1", 0),
+                                        _LocalFDSNRequestHandler)
+        self.datapath = datapath
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.connections = 0
+        self.requests = []
+        # close connections after every response without telling the client
+        self.drop_connections = False
+        # number of samples of the returned traces
+        self.npts = 10
+
+
+class _LocalFDSNRequestHandler(http_server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send headers and body in one go like real servers do
+    wbufsize = -1
+
+    def setup(self):
+        http_server.BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args, **kwargs):
+        pass
+
+    def _respond(self, code, body=b"",
+                 content_type="application/octet-stream"):
+        self.send_response(code)
+        if code != 204:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def _waveforms(self, items):
+        traces = []
+        for net, sta, loc, cha, starttime in items:
+            if sta == "NODATA":
+                continue
+            header = dict(network=net, station=sta, channel=cha,
+                          location=loc.replace("--", ""),
+                          starttime=UTCDateTime(starttime))
+            data = np.arange(self.server.npts, dtype=np.int32)
+            traces.append(Trace(data, header))
+        if not traces:
+            return self._respond(204)
+        buf = io.BytesIO()
+        Stream(traces).write(buf, format="MSEED")
+        self._respond(200, buf.getvalue())
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        params = dict(parse_qsl(query))
+        with self.server.lock:
+            self.server.requests.append(("GET", path))
+        if path.endswith("/application.wadl"):
+            filename = os.path.join(self.server.datapath,
+                                    path.split("/")[2] + ".wadl")
+            with open(filename, "rb") as fh:
+                self._respond(200, fh.read(), "application/xml")
+        elif path == "/fdsnws/dataselect/1/query":
+            self._waveforms([(params["network"], params["station"],
+                              params["location"], params["channel"],
+                              params["starttime"])])
+        elif path == "/fdsnws/station/1/query":
+            if params["station"] == "NODATA":
+                return self._respond(204)
+            filename = os.path.join(self.server.datapath, "AU.MEEK.xml")
+            with open(filename, "rb") as fh:
+                self._respond(200, fh.read(), "application/xml")
+        else:
+            self._respond(404)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length).decode()
+        with self.server.lock:
+            self.server.requests.append(("POST", self.path))
+        items = [line.split()[:5] for line in body.splitlines()
+                 if "=" not in line]
+        self._waveforms(items)
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """
+    Test cases for obspy.clients.fdsn.client.Client against a local stand-in
+    server.
+    """
+    @classmethod
+    def setUpClass(cls):
+        datapath = os.path.join(os.path.dirname(__file__), "data")
+        cls.server = _LocalFDSNServer(datapath)
+        cls.base_url = "http://127.0.0.1:%i" % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def setUp(self):
+        self.server.reset()
+        self.t = UTCDateTime(2017, 1, 1)
+
+    def _client(self, **kwargs):
+        return Client(base_url=self.base_url, user_agent=USER_AGENT,
+                      service_mappings={"event": None}, **kwargs)
+
+    def test_keep_alive(self):
+        """
+        Subsequent requests reuse the connection unless keep-alive is
+        switched off.
+        """
+        for keep_alive, expected in ((True, 0), (False, 5)):
+            client = self._client(keep_alive=keep_alive)
+            client.get_waveforms("XX", "TEST", "", "BHZ", self.t, self.t + 9)
+            connections = self.server.connections
+            for _i in range(5):
+                st = client.get_waveforms("XX", "TEST", "", "BHZ", self.t,
+                                          self.t + 9)
+                self.assertEqual(st[0].id, "XX.TEST..BHZ")
+                self.assertEqual(st[0].stats.starttime, self.t)
+            self.assertEqual(self.server.connections - connections, expected)
+            # responses without data don't spoil the connection either
+            self.assertRaises(FDSNNoDataException, client.get_waveforms,
+                              "XX", "NODATA", "", "BHZ", self.t, self.t + 9)
+            self.assertEqual(self.server.connections - connections,
+                             expected + (not keep_alive))
+
+    def test_keep_alive_connection_closed_by_server(self):
+        """
+        Connections closed by the server in the meantime are replaced by new
+        ones.
+        """
+        client = self._client()
+        self.server.drop_connections = True
+        for _i in range(3):
+            st = client.get_waveforms("XX", "TEST", "", "BHZ", self.t,
+                                      self.t + 9)
+            self.assertEqual(st[0].id, "XX.TEST..BHZ")
+
+    def test_get_waveforms_bulk_chunks(self):
+        """
+        Chunked bulk requests are sent concurrently and the results are
+        combined in order, skipping chunks without data.
+        """
+        client = self._client()
+        bulk = [("XX", "STA%i" % i, "", "BHZ", self.t, self.t + 9)
+                for i in range(4)]
+        bulk += [("XX", "NODATA", "", "BHZ", self.t, self.t + 9)] * 2
+        bulk += [("XX", "STA4", "00", "BHZ", self.t, self.t + 9)]
+        expected = client.get_waveforms_bulk(bulk)
+        self.server.reset()
+        st = client.get_waveforms_bulk(bulk, chunk_size=2, workers=3)
+        self.assertEqual(len(self.server.requests), 4)
+        for tr in st + expected:
+            del tr.stats.mseed
+        self.assertEqual(st, expected)
+        self.assertEqual([tr.id for tr in st],
+                         ["XX.STA%i..BHZ" % i for i in range(4)] +
+                         ["XX.STA4.00.BHZ"])
+        with io.BytesIO() as buf:
+            client.get_waveforms_bulk(bulk, chunk_size=2, workers=3,
+                                      filename=buf)
+            buf.seek(0, 0)
+            st = read(buf)
+        for tr in st:
+            del tr.stats.mseed
+        self.assertEqual(st, expected)
+        self.assertRaises(FDSNNoDataException, client.get_waveforms_bulk,
+                          bulk[4:6], chunk_size=1, workers=2)
+
+    def test_streaming_waveforms(self):
+        """
+        Waveforms are decoded while they are downloaded or written to disk
+        directly.
+        """
+        self.server.npts = 50000
+        client = self._client()
+        bulk = [("XX", "STA%i" % i, "", "BHZ", self.t, self.t + 9)
+                for i in range(3)]
+        st = client.get_waveforms_bulk(bulk)
+        self.assertEqual([tr.id for tr in st],
+                         ["XX.STA%i..BHZ" % i for i in range(3)])
+        for tr in st:
+            np.testing.assert_array_equal(tr.data, np.arange(50000))
+        # iterating yields more, shorter traces
+        traces = list(client.iter_waveforms_bulk(bulk, batch_size=4096))
+        self.assertGreater(len(traces), len(st))
+        st2 = Stream(traces)
+        st2.merge(-1)
+        self.assertEqual(len(st2), len(st))
+        for tr, tr_expected in zip(st2, st):
+            self.assertEqual(tr.id, tr_expected.id)
+            np.testing.assert_array_equal(tr.data, tr_expected.data)
+        # writing to disk
+        with NamedTemporaryFile() as tf:
+            client.get_waveforms("XX", "STA0", "", "BHZ", self.t, self.t + 9,
+                                 filename=tf.name)
+            st3 = read(tf.name)
+        self.assertEqual(st3[0].id, "XX.STA0..BHZ")
+        np.testing.assert_array_equal(st3[0].data, np.arange(50000))
+
+    def test_station_cache(self):
+        """
+        Station queries are answered from a persistent cache. Queries for
+        different time spans of a channel share one cache entry.
+        """
+        def station_queries():
+            return len([path for _, path in self.server.requests
+                        if path == "/fdsnws/station/1/query"])
+
+        tempdir = tempfile.mkdtemp(prefix='obspy-')
+        try:
+            kwargs = dict(network="AU", station="MEEK", location="",
+                          channel="SHE", level="response")
+            client = self._client(station_cache=tempdir)
+            self.assertIsInstance(client.station_cache, StationCache)
+            for t in (UTCDateTime(2004, 1, 1), UTCDateTime(2005, 1, 1)):
+                inv = client.get_stations(starttime=t, endtime=t + 3600,
+                                          **kwargs)
+                self.assertEqual(inv.get_contents()["channels"],
+                                 ["AU.MEEK..SHE"])
+            self.assertEqual(station_queries(), 1)
+            # another client, e.g. in another process, uses the same entries
+            client = self._client(station_cache=StationCache(tempdir))
+            t = UTCDateTime(2006, 1, 1)
+            inv = client.get_stations(starttime=t, endtime=t + 3600,
+                                      **kwargs)
+            self.assertEqual(inv.get_contents()["channels"],
+                             ["AU.MEEK..SHE"])
+            # attaching responses also uses the cache
+            st = client.get_waveforms("AU", "MEEK", "", "SHE", t, t + 9,
+                                      attach_response=True)
+            self.assertIsInstance(st[0].stats.response, Response)
+            self.assertEqual(station_queries(), 1)
+            # a time span not covered by the cached epochs is fetched again
+            t = UTCDateTime(2010, 1, 1)
+            self.assertRaises(FDSNNoDataException, client.get_stations,
+                              starttime=t, endtime=t + 3600, **kwargs)
+            self.assertEqual(station_queries(), 2)
+            # other queries are cached as they are
+            for _i in range(2):
+                client.get_stations(network="AU", station="M*")
+            self.assertEqual(station_queries(), 3)
+            # expired entries are fetched again
+            client.station_cache.ttl = -1
+            client.get_stations(network="AU", station="M*")
+            self.assertEqual(station_queries(), 4)
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_map(self):
+        """
+        Test sending many requests concurrently.
+        """
+        client = self._client()
+        requests = [dict(network="AU", station=station)
+                    for station in ("MEEK", "NODATA", "MEEK")]
+        inventories = client.map("get_stations", requests, workers=3)
+        self.assertEqual(len(inventories), 3)
+        self.assertIsNone(inventories[1])
+        for inv in inventories[::2]:
+            self.assertEqual(inv[0][0].code, "MEEK")
+        self.assertRaises(ValueError, client.map, "get_foo", requests)
+
+    def test_waveforms_decoded_in_calling_thread(self):
+        """
+        Waveforms downloaded by several threads are decoded in the calling
+        thread only, libmseed is not thread-safe.
+        """
+        from obspy.clients.fdsn import client as client_module
+        client = self._client()
+        threads = []
+        read_mseed_stream = client_module._read_mseed_stream
+
+        def _read(data_stream):
+            threads.append(threading.current_thread())
+            return read_mseed_stream(data_stream)
+
+        bulk = [("XX", "STA%i" % i, "", "BHZ", self.t, self.t + 9)
+                for i in range(4)]
+        requests = [dict(network="XX", station=station, location="",
+                         channel="BHZ", starttime=self.t,
+                         endtime=self.t + 9)
+                    for station in ("STA0", "NODATA", "STA1")]
+        with mock.patch.object(client_module, "_read_mseed_stream", _read):
+            st = client.get_waveforms_bulk(bulk, chunk_size=1, workers=4)
+            self.assertEqual([tr.id for tr in st],
+                             ["XX.STA%i..BHZ" % i for i in range(4)])
+            results = client.map("get_waveforms", requests, workers=3)
+        self.assertEqual(len(threads), 6)
+        self.assertTrue(all(thread is threading.current_thread()
+                            for thread in threads))
+        self.assertIsNone(results[1])
+        self.assertEqual([st[0].id for st in results[::2]],
+                         ["XX.STA0..BHZ", "XX.STA1..BHZ"])
+
+
 def suite():
-    return unittest.makeSuite(ClientTestCase, 'test')
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ClientTestCase, 'test'))
+    suite.addTest(unittest.makeSuite(LocalServerTestCase, 'test'))
+    return suite
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+The obspy.clients.fdsn.station_cache test suite.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from obspy import read_inventory
+from obspy.clients.fdsn import StationCache
+from obspy.core.compatibility import mock
+
+
+class StationCacheTestCase(unittest.TestCase):
+    """
+    Test cases for obspy.clients.fdsn.station_cache.StationCache.
+    """
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp(prefix='obspy-')
+        self.path = os.path.join(self.tempdir, 'cache')
+        self.inv = read_inventory()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_get_and_put(self):
+        """
+        Entries are shared between instances and expire after the ttl.
+        """
+        cache = StationCache(self.path)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', self.inv)
+        self.assertEqual(cache.get('a'), self.inv)
+        self.assertIsNone(cache.get('b'))
+        # another instance (e.g. in another process) sees the entry
+        self.assertEqual(StationCache(self.path).get('a'), self.inv)
+        # expired
+        self.assertIsNone(StationCache(self.path, ttl=-1).get('a'))
+        # broken entries and entries of other versions are ignored
+        with open(cache._filename('b'), 'wb') as fh:
+            fh.write(b'garbage')
+        self.assertIsNone(cache.get('b'))
+        with open(cache._filename('a'), 'rb') as fh:
+            fh.readline()
+            data = fh.read()
+        with open(cache._filename('b'), 'wb') as fh:
+            fh.write(json.dumps({'version': '0.0.0', 'created': 0.0}).encode(
+                'utf-8') + b'\n' + data)
+        self.assertIsNone(StationCache(self.path, ttl=None).get('b'))
+        cache.clear()
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_eviction(self):
+        """
+        The least recently used entries are removed once the cache is too
+        large.
+        """
+        cache = StationCache(self.path, max_size=None)
+        for i, key in enumerate('abc'):
+            cache.put(key, self.inv)
+            os.utime(cache._filename(key), (i, i))
+        size = os.path.getsize(cache._filename('a'))
+        # using an entry makes it the most recently used one
+        self.assertIsNotNone(cache.get('a'))
+        cache.max_size = 2 * size + size // 2
+        cache.put('d', self.inv)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('c'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('d'))
+        self.assertEqual(len(os.listdir(self.path)), 2)
+
+    def test_eviction_estimates_size(self):
+        """
+        The directory is only scanned again once the estimated size of the
+        cache exceeds max_size.
+        """
+        cache = StationCache(self.path)
+        cache.put('a', self.inv)
+        size = os.path.getsize(cache._filename('a'))
+        cache.max_size = 5 * size + size // 2
+        with mock.patch.object(cache, '_entries',
+                               wraps=cache._entries) as entries:
+            for key in 'bcde':
+                cache.put(key, self.inv)
+            # replacing an entry does not change the size
+            cache.put('a', self.inv)
+            self.assertEqual(entries.call_count, 0)
+            cache.put('f', self.inv)
+            self.assertEqual(entries.call_count, 1)
+        self.assertLessEqual(
+            sum(os.path.getsize(os.path.join(self.path, name))
+                for name in os.listdir(self.path)), 0.9 * cache.max_size)
+
+
+def suite():
+    return unittest.makeSuite(StationCacheTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
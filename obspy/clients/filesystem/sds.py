@@ -40,9 +40,11 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import glob
+import multiprocessing
 import os
 import re
 import warnings
+from collections import OrderedDict
 from datetime import timedelta
 
 import numpy as np
@@ -69,7 +71,8 @@ class Client(object):
     FMTSTR = SDS_FMTSTR
 
     def __init__(self, sds_root, sds_type="D", format="MSEED",
-                 fileborder_seconds=30, fileborder_samples=5000):
+                 fileborder_seconds=30, fileborder_samples=5000,
+                 cache_size=10):
         """
         Initialize a SDS local filesystem client.
 
@@ -106,6 +109,11 @@ class Client(object):
             code of the requested channel to sampling frequency. The maximum of
             both ``fileborder_seconds`` and ``fileborder_samples`` is used when
             determining if previous/next day should be checked for data.
+        :type cache_size: int
+        :param cache_size: Maximum number of decoded daily files kept in
+            memory by :meth:`get_waveforms_bulk()` for reuse by subsequent
+            requests. Cached files are read again if their size or
+            modification time changes. Set to ``0`` to disable caching.
         """
         if not os.path.isdir(sds_root):
             msg = ("SDS root is not a local directory: " + sds_root)
@@ -115,6 +123,8 @@ class Client(object):
         self.format = format and format.upper()
         self.fileborder_seconds = fileborder_seconds
         self.fileborder_samples = fileborder_samples
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
 
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime, merge=-1, sds_type=None, **kwargs):
@@ -198,6 +208,133 @@ class Client(object):
             st.merge(merge)
         return st
 
+    def get_waveforms_bulk(self, bulk, merge=-1, sds_type=None,
+                           workers=None):
+        """
+        Read data for multiple time windows from the SDS archive at once.
+
+        Every daily file needed by any of the requests is decoded only once,
+        no matter how many (possibly overlapping) time windows it contributes
+        to. Decoded daily files are kept in a small least recently used cache
+        (see ``cache_size`` in
+        :meth:`~obspy.clients.filesystem.sds.Client.__init__()`) so that
+        subsequent requests for the same days do not read the files again.
+
+        >>> from obspy import UTCDateTime
+        >>> t = UTCDateTime("2015-10-12T12")
+        >>> bulk = [("IU", "ANMO", "*", "HH?", t, t+30),
+        ...         ("IU", "ANMO", "*", "HH?", t+10, t+60),
+        ...         ("GR", "FUR", "", "HHZ", t, t+600)]
+        >>> st = client.get_waveforms_bulk(bulk, workers=4)
+        ... # doctest: +SKIP
+
+        :type bulk: list of tuples
+        :param bulk: List of requests, each of them a 6-tuple of network,
+            station, location, channel, starttime and endtime, see
+            :meth:`~obspy.clients.filesystem.sds.Client.get_waveforms()`.
+            Wildcards '*' and '?' are supported in the SEED ID fields.
+        :type merge: int or None
+        :param merge: Merge operation performed separately on the data of
+            every single request, see
+            :meth:`~obspy.clients.filesystem.sds.Client.get_waveforms()`.
+        :type sds_type: str
+        :param sds_type: Override SDS data type identifier that was specified
+            during client initialization.
+        :type workers: int
+        :param workers: Number of worker processes used to decode the daily
+            files that are not yet cached. Defaults to ``None``, i.e. all
+            files are decoded one after the other in the current process.
+        :rtype: :class:`~obspy.core.stream.Stream`
+        :returns: Data of all requests, in the order of the requests.
+        """
+        sds_type = sds_type or self.sds_type
+        requests = []
+        all_paths = set()
+        for network, station, location, channel, starttime, endtime in bulk:
+            if starttime >= endtime:
+                msg = ("'endtime' must be after 'starttime'.")
+                raise ValueError(msg)
+            full_paths = self._get_filenames(
+                network=network, station=station, location=location,
+                channel=channel, starttime=starttime, endtime=endtime,
+                sds_type=sds_type)
+            requests.append((network, station, location, channel, starttime,
+                             endtime, sorted(full_paths)))
+            all_paths.update(full_paths)
+
+        day_files = self._read_day_files(sorted(all_paths), workers=workers)
+
+        st = Stream()
+        for (network, station, location, channel, starttime, endtime,
+             full_paths) in requests:
+            st_ = Stream()
+            for full_path in full_paths:
+                # make sure we only have the desired data, just in case the
+                # file contents do not match the expected SEED id
+                st_ += day_files[full_path].select(
+                    network=network, station=station, location=location,
+                    channel=channel).slice(starttime, endtime)
+            # slicing returns views on the cached data, so detach them
+            for tr in st_:
+                tr.data = tr.data.copy()
+            if merge is None or merge is False:
+                pass
+            else:
+                st_.merge(merge)
+            st += st_
+        return st
+
+    def _read_day_files(self, full_paths, workers=None):
+        """
+        Read (or fetch from cache) the full contents of the given files.
+
+        :type full_paths: list of str
+        :param full_paths: Files to read.
+        :type workers: int
+        :param workers: Number of worker processes used to read the files
+            not present in the cache.
+        :rtype: dict
+        :returns: Dictionary mapping the file names to
+            :class:`~obspy.core.stream.Stream` objects. These streams are
+            shared with the cache and must not be modified.
+        """
+        day_files = {}
+        missing = []
+        for full_path in full_paths:
+            stat = os.stat(full_path)
+            key = (stat.st_size, stat.st_mtime)
+            cached = self._cache.get(full_path)
+            if cached is not None and cached[0] == key:
+                # mark as most recently used
+                self._cache.pop(full_path)
+                self._cache[full_path] = cached
+                day_files[full_path] = cached[1]
+            else:
+                missing.append((full_path, key))
+
+        arguments = [(full_path, self.format) for full_path, _ in missing]
+        if workers and workers > 1 and len(arguments) > 1:
+            processes = min(workers, len(arguments))
+            pool = multiprocessing.Pool(processes)
+            try:
+                streams = pool.map(
+                    _read_day_file, arguments,
+                    chunksize=max(1, len(arguments) // (4 * processes)))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            streams = [_read_day_file(args) for args in arguments]
+
+        for (full_path, key), st in zip(missing, streams):
+            day_files[full_path] = st
+            if self.cache_size > 0:
+                self._cache.pop(full_path, None)
+                self._cache[full_path] = (key, st)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return day_files
+
     def _get_filenames(self, network, station, location, channel, starttime,
                        endtime, sds_type=None):
         """
@@ -583,6 +720,19 @@ class Client(object):
         return sorted(result)
 
 
+def _read_day_file(args):
+    """
+    Read a single file of the archive, helper function for
+    :meth:`Client._read_day_files()` that can be used with a process pool.
+    """
+    full_path, format = args
+    try:
+        return read(full_path, format=format)
+    except ObsPyMSEEDFilesizeTooSmallError:
+        # just ignore small MSEED files, see Client.get_waveforms()
+        return Stream()
+
+
 def _wildcarded_except(exclude=[]):
     """
     Function factory for :mod:`re` ``repl`` functions used in :func:`re.sub``,
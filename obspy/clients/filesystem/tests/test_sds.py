@@ -14,6 +14,7 @@ import unittest
 import numpy as np
 
 from obspy import UTCDateTime, Trace, Stream
+from obspy.core.compatibility import mock
 from obspy.core.util.misc import TemporaryWorkingDirectory
 from obspy.clients.filesystem.sds import SDS_FMTSTR, Client
 from obspy.scripts.sds_html_report import main as sds_report
@@ -160,6 +161,58 @@ class SDSTestCase(unittest.TestCase):
                 st = client.get_waveforms(net, sta, loc, cha, t - 200, t + 200)
                 self.assertEqual(len(st), num_matching_ids)
 
+    def test_get_waveforms_bulk(self):
+        """
+        Test reading multiple time windows at once, with and without worker
+        processes and reusing cached daily files.
+        """
+        year, doy = 2015, 1
+        t = UTCDateTime("%d-%03dT00:00:00" % (year, doy))
+        bulk = [("AB", "XYZ", "", "HHZ", t - 20, t + 20),
+                ("AB", "XYZ", "", "HHZ", t - 200, t + 200),
+                ("*", "ZZZ3", "00", "BH?", t + 20, t + 40),
+                ("CD", "XYZ", "", "HHZ", t - 80, t - 30)]
+
+        def _assert_equal(st, expected):
+            # processing history differs, compare actual contents only
+            self.assertEqual(
+                [(tr.id, tr.stats.starttime, tr.data.tolist()) for tr in st],
+                [(tr.id, tr.stats.starttime, tr.data.tolist())
+                 for tr in expected])
+
+        with TemporarySDSDirectory(year=year, doy=doy) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            expected = Stream()
+            for args in bulk:
+                expected += client.get_waveforms(*args).sort()
+            self.assertEqual(len(expected), 9)
+            for workers in (None, 2):
+                client = Client(temp_sds.tempdir, cache_size=20)
+                st = client.get_waveforms_bulk(bulk, workers=workers)
+                _assert_equal(st, expected)
+                # all day files touched by the requests are cached
+                self.assertEqual(len(client._cache), 16)
+            # a second request is served from the cache
+            with mock.patch("obspy.clients.filesystem.sds.read") as p:
+                st = client.get_waveforms_bulk(bulk)
+            self.assertEqual(p.call_count, 0)
+            _assert_equal(st, expected)
+            # modifying the returned data does not affect the cache
+            for tr in st:
+                tr.data[:] = -1
+            _assert_equal(client.get_waveforms_bulk(bulk), expected)
+            # cache size is limited
+            client = Client(temp_sds.tempdir, cache_size=2)
+            st = client.get_waveforms_bulk(bulk)
+            _assert_equal(st, expected)
+            self.assertEqual(len(client._cache), 2)
+            client = Client(temp_sds.tempdir, cache_size=0)
+            st = client.get_waveforms_bulk(bulk, merge=None)
+            self.assertEqual(len(st), sum(
+                len(client.get_waveforms(*args, merge=None))
+                for args in bulk))
+            self.assertEqual(len(client._cache), 0)
+
     def test_sds_report(self):
         """
         Test command line script for generating SDS report html.
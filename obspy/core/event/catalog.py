@@ -31,7 +31,7 @@ import warnings
 import numpy as np
 from pkg_resources import load_entry_point
 
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
 from obspy.core.util import NamedTemporaryFile, _read_from_plugin
 from obspy.core.util.base import ENTRY_POINTS, download_to_file
 from obspy.core.util.decorator import (map_example_filename, rlock,
@@ -349,6 +349,11 @@ class Catalog(object):
                         ">": _is_greater,
                         ">=": _is_greater_or_equal}
 
+        array_operator_map = {"<": UTCDateTimeArray.__lt__,
+                              "<=": UTCDateTimeArray.__le__,
+                              ">": UTCDateTimeArray.__gt__,
+                              ">=": UTCDateTimeArray.__ge__}
+
         try:
             inverse = kwargs["inverse"]
         except KeyError:
@@ -370,16 +375,39 @@ class Catalog(object):
                             float(value))):
                         temp_events.append(event)
                 events = temp_events
-            elif key in ("longitude", "latitude", "depth", "time"):
+            elif key in ("longitude", "latitude", "depth"):
                 temp_events = []
                 for event in events:
                     if (event.origins and key in event.origins[0] and
                         operator_map[operator](
                             event.origins[0].get(key),
-                            UTCDateTime(value) if key == 'time' else
                             float(value))):
                         temp_events.append(event)
                 events = temp_events
+            elif key == "time":
+                # compare all origin times at once
+                value = UTCDateTime(value)
+                events = [event for event in events
+                          if event.origins and key in event.origins[0]]
+                times = [event.origins[0].get(key) for event in events]
+                # missing times pass "<" and "<=" but not ">" and ">="
+                selected = np.full(len(events),
+                                   operator_map[operator](None, value),
+                                   dtype=np.bool_)
+                has_time = np.array([t is not None for t in times],
+                                    dtype=np.bool_)
+                times = [t for t in times if t is not None]
+                try:
+                    # raises for times before 1678 or after 2261
+                    time_array = UTCDateTimeArray(times + [value])
+                except ValueError:
+                    selected[has_time] = [operator_map[operator](t, value)
+                                          for t in times]
+                else:
+                    selected[has_time] = array_operator_map[operator](
+                        time_array[:-1], value)
+                events = [event for event, keep in zip(events, selected)
+                          if keep]
             elif key in ('standard_error', 'azimuthal_gap',
                          'used_station_count', 'used_phase_count'):
                 temp_events = []
@@ -395,7 +423,8 @@ class Catalog(object):
                 msg = "%s is not a valid filter key" % key
                 raise ValueError(msg)
         if inverse:
-            events = [ev for ev in self.events if ev not in events]
+            kept = set(id(ev) for ev in events)
+            events = [ev for ev in self.events if id(ev) not in kept]
         return Catalog(events=events)
 
     def copy(self):
@@ -29,7 +29,7 @@ from obspy.core.util.decorator import map_example_filename
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
 
 from .network import Network
-from .util import _unified_content_strings, _textwrap
+from .util import _ChannelIndexMixin, _unified_content_strings, _textwrap
 
 # Make sure this is consistent with obspy.io.stationxml! Importing it
 # from there results in hard to resolve cyclic imports.
@@ -80,7 +80,7 @@ def read_inventory(path_or_file_object=None, format=None):
 
 
 @python_2_unicode_compatible
-class Inventory(ComparingObject):
+class Inventory(_ChannelIndexMixin, ComparingObject):
     """
     The root object of the Inventory->Network->Station->Channel hierarchy.
 
@@ -290,6 +290,9 @@ class Inventory(ComparingObject):
             raise ValueError(msg)
         self._networks = value
 
+    def _get_indexed_networks(self):
+        return self.networks
+
     def get_response(self, seed_id, datetime):
         """
         Find response for a given channel at given time.
@@ -314,16 +317,7 @@ class Inventory(ComparingObject):
         :rtype: :class:`~obspy.core.inventory.response.Response`
         :returns: Response for time series specified by input arguments.
         """
-        network, _, _, _ = seed_id.split(".")
-
-        responses = []
-        for net in self.networks:
-            if net.code != network:
-                continue
-            try:
-                responses.append(net.get_response(seed_id, datetime))
-            except Exception:
-                pass
+        responses = self._find_responses(seed_id, datetime)
         if len(responses) > 1:
             msg = "Found more than one matching response. Returning first."
             warnings.warn(msg)
@@ -344,16 +338,7 @@ class Inventory(ComparingObject):
         :return: Dictionary containing coordinates (latitude, longitude,
             elevation)
         """
-        network, _, _, _ = seed_id.split(".")
-
-        coordinates = []
-        for net in self.networks:
-            if net.code != network:
-                continue
-            try:
-                coordinates.append(net.get_coordinates(seed_id, datetime))
-            except Exception:
-                pass
+        coordinates = self._find_coordinates(seed_id, datetime)
         if len(coordinates) > 1:
             msg = "Found more than one matching coordinates. Returning first."
             warnings.warn(msg)
@@ -433,6 +418,11 @@ class Inventory(ComparingObject):
             themselves but have no matching child elements (stations/channels)
             will be included in the result.
         """
+        # Without wildcards in the station code only the stations with that
+        # code need to be looked at, which the channel index knows about.
+        index = None
+        if station is not None and not any(char in station for char in "*?["):
+            index = self._get_channel_index()
         networks = []
         for net in self.networks:
             # skip if any given criterion is not matched
@@ -447,6 +437,12 @@ class Inventory(ComparingObject):
 
             has_stations = bool(net.stations)
 
+            if index is not None:
+                stations = [sta for net__, sta in index.get_stations(
+                            net.code, station) if net__ is net]
+                net = copy.copy(net)
+                net.stations = stations
+
             net_ = net.select(
                 station=station, location=location, channel=channel, time=time,
                 starttime=starttime, endtime=endtime,
@@ -21,11 +21,12 @@ import warnings
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
 
 from .station import Station
-from .util import BaseNode, _unified_content_strings, _textwrap
+from .util import (BaseNode, _ChannelIndexMixin, _unified_content_strings,
+                   _textwrap)
 
 
 @python_2_unicode_compatible
-class Network(BaseNode):
+class Network(_ChannelIndexMixin, BaseNode):
     """
     From the StationXML definition:
         This type represents the Network layer, all station metadata is
@@ -187,6 +188,9 @@ class Network(BaseNode):
             raise ValueError(msg)
         self._stations = values
 
+    def _get_indexed_networks(self):
+        return [self]
+
     def __short_str__(self):
         return "%s" % self.code
 
@@ -201,19 +205,7 @@ class Network(BaseNode):
         :rtype: :class:`~obspy.core.inventory.response.Response`
         :returns: Response for time series specified by input arguments.
         """
-        network, station, location, channel = seed_id.split(".")
-        if self.code != network:
-            responses = []
-        else:
-            channels = [cha for sta in self.stations for cha in sta.channels
-                        if sta.code == station and
-                        cha.code == channel and
-                        cha.location_code == location and
-                        (cha.start_date is None or
-                         cha.start_date <= datetime) and
-                        (cha.end_date is None or cha.end_date >= datetime)]
-            responses = [cha.response for cha in channels
-                         if cha.response is not None]
+        responses = self._find_responses(seed_id, datetime)
         if len(responses) > 1:
             msg = "Found more than one matching response. Returning first."
             warnings.warn(msg)
@@ -234,50 +226,7 @@ class Network(BaseNode):
         :return: Dictionary containing coordinates (latitude, longitude,
             elevation)
         """
-        network, station, location, channel = seed_id.split(".")
-        coordinates = []
-        if self.code != network:
-            pass
-        elif self.start_date and self.start_date > datetime:
-            pass
-        elif self.end_date and self.end_date < datetime:
-            pass
-        else:
-            for sta in self.stations:
-                # skip wrong station
-                if sta.code != station:
-                    continue
-                # check datetime only if given
-                if datetime:
-                    # skip if start date before given datetime
-                    if sta.start_date and sta.start_date > datetime:
-                        continue
-                    # skip if end date before given datetime
-                    if sta.end_date and sta.end_date < datetime:
-                        continue
-                for cha in sta.channels:
-                    # skip wrong channel
-                    if cha.code != channel:
-                        continue
-                    # skip wrong location
-                    if cha.location_code != location:
-                        continue
-                    # check datetime only if given
-                    if datetime:
-                        # skip if start date before given datetime
-                        if cha.start_date and cha.start_date > datetime:
-                            continue
-                        # skip if end date before given datetime
-                        if cha.end_date and cha.end_date < datetime:
-                            continue
-                    # prepare coordinates
-                    data = {}
-                    # if channel latitude or longitude is not given use station
-                    data['latitude'] = cha.latitude or sta.latitude
-                    data['longitude'] = cha.longitude or sta.longitude
-                    data['elevation'] = cha.elevation
-                    data['local_depth'] = cha.depth
-                    coordinates.append(data)
+        coordinates = self._find_coordinates(seed_id, datetime)
         if len(coordinates) > 1:
             msg = "Found more than one matching coordinates. Returning first."
             warnings.warn(msg)
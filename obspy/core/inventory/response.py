@@ -12,10 +12,13 @@ Classes related to instrument responses.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
 
 import ctypes as C
+import hashlib
+import threading
 import warnings
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from copy import deepcopy
 from math import pi
 
@@ -32,6 +35,118 @@ from obspy.core.util.obspy_types import (ComplexWithUncertainties, CustomFloat,
 from .util import Angle, Frequency
 
 
+# recently evaluated responses, see Response.get_response_for_frequencies()
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_SIZE = 8
+_RESPONSE_CACHE_LOCK = threading.Lock()
+# Types of the units known to evalresp (see obspy.signal.evrespwrapper).
+_UNIT_TYPES = {
+    "M": "DIS",
+    "NM": "DIS",
+    "CM": "DIS",
+    "MM": "DIS",
+    "M/S": "VEL",
+    "M/SEC": "VEL",
+    "NM/S": "VEL",
+    "NM/SEC": "VEL",
+    "CM/S": "VEL",
+    "CM/SEC": "VEL",
+    "MM/S": "VEL",
+    "MM/SEC": "VEL",
+    "M/S**2": "ACC",
+    "M/(S**2)": "ACC",
+    "M/SEC**2": "ACC",
+    "M/(SEC**2)": "ACC",
+    "NM/S**2": "ACC",
+    "NM/(S**2)": "ACC",
+    "NM/SEC**2": "ACC",
+    "NM/(SEC**2)": "ACC",
+    "CM/S**2": "ACC",
+    "CM/(S**2)": "ACC",
+    "CM/SEC**2": "ACC",
+    "CM/(SEC**2)": "ACC",
+    "MM/S**2": "ACC",
+    "MM/(S**2)": "ACC",
+    "MM/SEC**2": "ACC",
+    "MM/(SEC**2)": "ACC",
+    "V": "VOLTS",
+    "VOLT": "VOLTS",
+    "VOLTS": "VOLTS",
+    # This is weird, but evalresp appears to do the same.
+    "V/M": "VOLTS",
+    "COUNT": "COUNTS",
+    "COUNTS": "COUNTS",
+    "T": "TESLA",
+    "PA": "PRESSURE",
+    "MBAR": "PRESSURE"}
+
+
+def _get_unit_type(key):
+    """
+    Returns the evalresp type (e.g. ``"VEL"``) of an upper case unit string
+    and ``"UNDEF_UNITS"`` (with a warning) for unknown units.
+    """
+    if key not in _UNIT_TYPES:
+        if key is not None:
+            msg = ("The unit '%s' is not known to ObsPy. Raw evalresp "
+                   "would refuse to calculate a response for this "
+                   "channel. Proceed with caution.") % key
+            warnings.warn(msg)
+        return "UNDEF_UNITS"
+    return _UNIT_TYPES[key]
+
+
+def _interpolate_response_list(stage, frequencies):
+    """
+    Interpolates amplitude and phase (in degrees) of a response list stage
+    to the given frequencies.
+    """
+    # Get values as numpy arrays.
+    f = np.array([float(_i.frequency)
+                  for _i in stage.response_list_elements],
+                 dtype=np.float64)
+    amp = np.array([float(_i.amplitude)
+                    for _i in stage.response_list_elements],
+                   dtype=np.float64)
+    phase = np.array([
+        float(_i.phase)
+        for _i in stage.response_list_elements],
+        dtype=np.float64)
+
+    # Sanity check.
+    min_f = frequencies[frequencies > 0].min()
+    max_f = frequencies.max()
+
+    min_f_avail = min(f)
+    max_f_avail = max(f)
+
+    # Allow interpolation for at most two samples.
+    _d = np.abs(np.diff(f))
+    _d = _d[_d > 0].min() * 2
+    min_f_avail -= _d
+    max_f_avail += _d
+
+    if min_f < min_f_avail or max_f > max_f_avail:
+        msg = (
+            "Cannot calculate the response as it contains a "
+            "response list stage with frequencies only from "
+            "%.4f - %.4f Hz. You are requesting a response from "
+            "%.4f - %.4f Hz.")
+        raise ValueError(msg % (min_f_avail, max_f_avail, min_f,
+                                max_f))
+
+    amp = scipy.interpolate.InterpolatedUnivariateSpline(
+        f, amp, k=3)(frequencies)
+    phase = scipy.interpolate.InterpolatedUnivariateSpline(
+        f, phase, k=3)(frequencies)
+
+    # Set static offset to zero.
+    amp[amp == 0] = 0
+    phase[phase == 0] = 0
+
+    return amp, phase
+
+
 class ResponseStage(ComparingObject):
     """
     From the StationXML Definition:
@@ -735,6 +850,31 @@ class Response(ComparingObject):
             msg = "response_stages must be an iterable."
             raise ValueError(msg)
 
+    def _get_stages(self, start_stage=None, end_stage=None):
+        """
+        Returns the response stages between start_stage and end_stage (if
+        given) sorted by stage sequence number.
+        """
+        all_stages = defaultdict(list)
+
+        for stage in self.response_stages:
+            # optionally select only stages as requested by user
+            if start_stage is not None:
+                if stage.stage_sequence_number < start_stage:
+                    continue
+            if end_stage is not None:
+                if stage.stage_sequence_number > end_stage:
+                    continue
+            all_stages[stage.stage_sequence_number].append(stage)
+
+        stage_lengths = set(map(len, all_stages.values()))
+        if len(stage_lengths) != 1 or stage_lengths.pop() != 1:
+            msg = "Each stage can only appear once."
+            raise ValueError(msg)
+
+        return [all_stages[stage_number][0]
+                for stage_number in sorted(all_stages.keys())]
+
     def get_evalresp_response_for_frequencies(
             self, frequencies, output="VEL", start_stage=None, end_stage=None):
         """
@@ -786,54 +926,7 @@ class Response(ComparingObject):
                 key = key.upper()
             except Exception:
                 pass
-            units_mapping = {
-                "M": ew.ENUM_UNITS["DIS"],
-                "NM": ew.ENUM_UNITS["DIS"],
-                "CM": ew.ENUM_UNITS["DIS"],
-                "MM": ew.ENUM_UNITS["DIS"],
-                "M/S": ew.ENUM_UNITS["VEL"],
-                "M/SEC": ew.ENUM_UNITS["VEL"],
-                "NM/S": ew.ENUM_UNITS["VEL"],
-                "NM/SEC": ew.ENUM_UNITS["VEL"],
-                "CM/S": ew.ENUM_UNITS["VEL"],
-                "CM/SEC": ew.ENUM_UNITS["VEL"],
-                "MM/S": ew.ENUM_UNITS["VEL"],
-                "MM/SEC": ew.ENUM_UNITS["VEL"],
-                "M/S**2": ew.ENUM_UNITS["ACC"],
-                "M/(S**2)": ew.ENUM_UNITS["ACC"],
-                "M/SEC**2": ew.ENUM_UNITS["ACC"],
-                "M/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "NM/S**2": ew.ENUM_UNITS["ACC"],
-                "NM/(S**2)": ew.ENUM_UNITS["ACC"],
-                "NM/SEC**2": ew.ENUM_UNITS["ACC"],
-                "NM/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "CM/S**2": ew.ENUM_UNITS["ACC"],
-                "CM/(S**2)": ew.ENUM_UNITS["ACC"],
-                "CM/SEC**2": ew.ENUM_UNITS["ACC"],
-                "CM/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "MM/S**2": ew.ENUM_UNITS["ACC"],
-                "MM/(S**2)": ew.ENUM_UNITS["ACC"],
-                "MM/SEC**2": ew.ENUM_UNITS["ACC"],
-                "MM/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "V": ew.ENUM_UNITS["VOLTS"],
-                "VOLT": ew.ENUM_UNITS["VOLTS"],
-                "VOLTS": ew.ENUM_UNITS["VOLTS"],
-                # This is weird, but evalresp appears to do the same.
-                "V/M": ew.ENUM_UNITS["VOLTS"],
-                "COUNT": ew.ENUM_UNITS["COUNTS"],
-                "COUNTS": ew.ENUM_UNITS["COUNTS"],
-                "T": ew.ENUM_UNITS["TESLA"],
-                "PA": ew.ENUM_UNITS["PRESSURE"],
-                "MBAR": ew.ENUM_UNITS["PRESSURE"]}
-            if key not in units_mapping:
-                if key is not None:
-                    msg = ("The unit '%s' is not known to ObsPy. Raw evalresp "
-                           "would refuse to calculate a response for this "
-                           "channel. Proceed with caution.") % key
-                    warnings.warn(msg)
-                value = ew.ENUM_UNITS["UNDEF_UNITS"]
-            else:
-                value = units_mapping[key]
+            value = ew.ENUM_UNITS[_get_unit_type(key)]
 
             # Scale factor with the same logic as evalresp.
             if key in ["CM/S**2", "CM/S", "CM/SEC", "CM"]:
@@ -845,35 +938,14 @@ class Response(ComparingObject):
 
             return value
 
-        all_stages = defaultdict(list)
-
-        for stage in self.response_stages:
-            # optionally select only stages as requested by user
-            if start_stage is not None:
-                if stage.stage_sequence_number < start_stage:
-                    continue
-            if end_stage is not None:
-                if stage.stage_sequence_number > end_stage:
-                    continue
-            all_stages[stage.stage_sequence_number].append(stage)
-
-        stage_lengths = set(map(len, all_stages.values()))
-        if len(stage_lengths) != 1 or stage_lengths.pop() != 1:
-            msg = "Each stage can only appear once."
-            raise ValueError(msg)
-
-        stage_list = sorted(all_stages.keys())
-
         stage_objects = []
 
-        for stage_number in stage_list:
+        for blockette in self._get_stages(start_stage, end_stage):
             st = ew.Stage()
-            st.sequence_no = stage_number
+            st.sequence_no = blockette.stage_sequence_number
 
             stage_blkts = []
 
-            blockette = all_stages[stage_number][0]
-
             # Write the input and output units.
             st.input_units = get_unit_mapping(blockette.input_units)
             st.output_units = get_unit_mapping(blockette.output_units)
@@ -959,48 +1031,8 @@ class Response(ComparingObject):
                 blkt = ew.Blkt()
                 blkt.type = ew.ENUM_FILT_TYPES["LIST"]
 
-                # Get values as numpy arrays.
-                f = np.array([float(_i.frequency)
-                              for _i in blockette.response_list_elements],
-                             dtype=np.float64)
-                amp = np.array([float(_i.amplitude)
-                                for _i in blockette.response_list_elements],
-                               dtype=np.float64)
-                phase = np.array([
-                    float(_i.phase)
-                    for _i in blockette.response_list_elements],
-                    dtype=np.float64)
-
-                # Sanity check.
-                min_f = frequencies[frequencies > 0].min()
-                max_f = frequencies.max()
-
-                min_f_avail = min(f)
-                max_f_avail = max(f)
-
-                # Allow interpolation for at most two samples.
-                _d = np.abs(np.diff(f))
-                _d = _d[_d > 0].min() * 2
-                min_f_avail -= _d
-                max_f_avail += _d
-
-                if min_f < min_f_avail or max_f > max_f_avail:
-                    msg = (
-                        "Cannot calculate the response as it contains a "
-                        "response list stage with frequencies only from "
-                        "%.4f - %.4f Hz. You are requesting a response from "
-                        "%.4f - %.4f Hz.")
-                    raise ValueError(msg % (min_f_avail, max_f_avail, min_f,
-                                            max_f))
-
-                amp = scipy.interpolate.InterpolatedUnivariateSpline(
-                    f, amp, k=3)(frequencies)
-                phase = scipy.interpolate.InterpolatedUnivariateSpline(
-                    f, phase, k=3)(frequencies)
-
-                # Set static offset to zero.
-                amp[amp == 0] = 0
-                phase[phase == 0] = 0
+                amp, phase = _interpolate_response_list(blockette,
+                                                        frequencies)
 
                 rl = blkt.blkt_info.list
                 rl.nresp = len(frequencies)
@@ -1210,6 +1242,70 @@ class Response(ComparingObject):
             freqs, output=output, start_stage=start_stage, end_stage=end_stage)
         return response, freqs
 
+    def get_response_for_frequencies(
+            self, frequencies, output="VEL", start_stage=None, end_stage=None):
+        """
+        Returns frequency response for given frequencies.
+
+        Calculates the same response as
+        :meth:`get_evalresp_response_for_frequencies` (including evalresp's
+        normalization of stage gains and FIR filters), but with NumPy for all
+        frequencies at once instead of calling evalresp.
+
+        The results of the most recent calls are cached. Responses are
+        compared by their content, so evaluating identical responses of many
+        channels for the same frequencies only computes the response once.
+
+        :type frequencies: list of float
+        :param frequencies: Discrete frequencies to calculate response for.
+        :type output: str
+        :param output: Output units. One of:
+
+            ``"DISP"``
+                displacement, output unit is meters
+            ``"VEL"``
+                velocity, output unit is meters/second
+            ``"ACC"``
+                acceleration, output unit is meters/second**2
+
+        :type start_stage: int, optional
+        :param start_stage: Stage sequence number of first stage that will be
+            used (disregarding all earlier stages).
+        :type end_stage: int, optional
+        :param end_stage: Stage sequence number of last stage that will be
+            used (disregarding all later stages).
+        :rtype: :class:`numpy.ndarray`
+        :returns: frequency response at requested frequencies
+        """
+        if not self.response_stages:
+            msg = ("Can not calculate response for response with no "
+                   "response stages.")
+            raise ObsPyException(msg)
+
+        out_units = output.upper()
+        if out_units not in ("DISP", "VEL", "ACC"):
+            msg = ("requested output is '%s' but must be one of 'DISP', 'VEL' "
+                   "or 'ACC'") % output
+            raise ValueError(msg)
+
+        frequencies = np.ascontiguousarray(frequencies, dtype=np.float64)
+        key = (_get_response_key(self),
+               hashlib.sha1(frequencies.view(np.uint8)).hexdigest(),
+               out_units, start_stage, end_stage)
+        with _RESPONSE_CACHE_LOCK:
+            response = _RESPONSE_CACHE.pop(key, None)
+        if response is None:
+            with np.errstate(all="ignore"):
+                response = _evaluate_response(self, frequencies, out_units,
+                                              start_stage, end_stage)
+            response.flags.writeable = False
+        with _RESPONSE_CACHE_LOCK:
+            if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_SIZE:
+                _RESPONSE_CACHE.popitem(last=False)
+            # (re)insert as most recently used
+            _RESPONSE_CACHE[key] = response
+        return response.copy()
+
     def __str__(self):
         i_s = self.instrument_sensitivity
         if i_s:
@@ -1712,6 +1808,396 @@ class CoefficientWithUncertainties(FloatWithUncertainties):
         self._number = value
 
 
+class _EvalrespStage(object):
+    """
+    A response stage as evalresp sees it: an optional filter followed by an
+    optional decimation and an optional gain.
+    """
+    def __init__(self, sequence_no, input_units, output_units):
+        self.sequence_no = sequence_no
+        self.input_units = input_units
+        self.output_units = output_units
+        self.filter_type = None
+        # sample interval, applied delay correction
+        self.decimation = None
+        # [gain, frequency]
+        self.gain = None
+
+
+def _get_evalresp_stages(response, frequencies, start_stage, end_stage):
+    """
+    Converts the response stages to a list of :class:`_EvalrespStage`
+    (with the instrument sensitivity as last stage with sequence number 0)
+    and checks them the same way evalresp's ``check_channel()`` does.
+    """
+    def unit_type(key):
+        try:
+            key = key.upper()
+        except Exception:
+            pass
+        return _get_unit_type(key)
+
+    stages = []
+    for blockette in response._get_stages(start_stage, end_stage):
+        stage = _EvalrespStage(blockette.stage_sequence_number,
+                               unit_type(blockette.input_units),
+                               unit_type(blockette.output_units))
+        if isinstance(blockette, PolesZerosResponseStage):
+            stage.filter_type = {
+                "LAPLACE (RADIANS/SECOND)": "LAPLACE_PZ",
+                "LAPLACE (HERTZ)": "ANALOG_PZ",
+                "DIGITAL (Z-TRANSFORM)": "IIR_PZ"}[
+                    blockette.pz_transfer_function_type]
+            stage.zeros = np.array(blockette.zeros, dtype=np.complex128)
+            stage.poles = np.array(blockette.poles, dtype=np.complex128)
+            stage.a0 = float(blockette.normalization_factor)
+            stage.a0_freq = float(blockette.normalization_frequency)
+        elif isinstance(blockette, CoefficientsTypeResponseStage):
+            # FIR
+            if len(blockette.denominator) == 0:
+                if blockette.cf_transfer_function_type.lower() \
+                        != "digital":
+                    msg = ("When no denominators are given it must "
+                           "be a digital FIR filter.")
+                    raise ValueError(msg)
+                stage.filter_type = "FIR_ASYM"
+                stage.coefficients = np.array(blockette.numerator,
+                                              dtype=np.float64)
+            # IIR
+            else:
+                stage.filter_type = "IIR_COEFFS"
+                stage.numerator = np.array(blockette.numerator,
+                                           dtype=np.float64)
+                stage.denominator = np.array(blockette.denominator,
+                                             dtype=np.float64)
+            stage.h0 = 1.0
+        elif isinstance(blockette, ResponseListResponseStage):
+            stage.filter_type = "LIST"
+            stage.amplitude, stage.phase = _interpolate_response_list(
+                blockette, frequencies)
+        elif isinstance(blockette, FIRResponseStage):
+            stage.filter_type = {"NONE": "FIR_ASYM", "ODD": "FIR_SYM_1",
+                                 "EVEN": "FIR_SYM_2"}[blockette.symmetry]
+            stage.coefficients = np.array(blockette.coefficients,
+                                          dtype=np.float64)
+            stage.h0 = 1.0
+        elif isinstance(blockette, PolynomialResponseStage):
+            msg = ("PolynomialResponseStage not yet implemented. "
+                   "Please contact the developers.")
+            raise NotImplementedError(msg)
+        # Otherwise it could be a gain only stage.
+        elif blockette.stage_gain is None or \
+                blockette.stage_gain_frequency is None:
+            msg = "Type: %s." % str(type(blockette))
+            raise NotImplementedError(msg)
+
+        # Parse the decimation if is given.
+        decimation_values = set([
+            blockette.decimation_correction,
+            blockette.decimation_delay, blockette.decimation_factor,
+            blockette.decimation_input_sample_rate,
+            blockette.decimation_offset])
+        if None in decimation_values:
+            if len(decimation_values) != 1:
+                msg = ("If a decimation is given, all values must "
+                       "be specified.")
+                raise ValueError(msg)
+        else:
+            if stage.filter_type is None:
+                msg = ("Stage %i: Decimation without a filter." %
+                       stage.sequence_no)
+                raise ValueError(msg)
+            # Evalresp does the same!
+            if blockette.decimation_input_sample_rate == 0:
+                sample_int = 0.0
+            else:
+                sample_int = 1.0 / blockette.decimation_input_sample_rate
+            stage.decimation = (sample_int,
+                                float(blockette.decimation_correction))
+
+        # Add the gain if it is available.
+        if blockette.stage_gain is not None and \
+                blockette.stage_gain_frequency is not None:
+            stage.gain = [float(blockette.stage_gain),
+                          float(blockette.stage_gain_frequency)]
+        stages.append(stage)
+
+    # The instrument sensitivity is stage 0 at the end.
+    stage = _EvalrespStage(0, "UNDEF_UNITS", "UNDEF_UNITS")
+    stage.gain = [float(response.instrument_sensitivity.value),
+                  float(response.instrument_sensitivity.frequency)]
+    stages.append(stage)
+
+    previous = None
+    for stage in stages:
+        if stage.filter_type == "FIR_ASYM":
+            _check_fir_symmetry(stage)
+        if stage.filter_type is None:
+            # Units are not checked for gain only stages.
+            continue
+        if previous is not None and \
+                previous.output_units != stage.input_units:
+            msg = ("Stage %i: Units mismatch with the previous stage." %
+                   stage.sequence_no)
+            raise ValueError(msg)
+        if stage.decimation is None and stage.filter_type in (
+                "IIR_PZ", "FIR_SYM_1", "FIR_SYM_2", "FIR_ASYM",
+                "IIR_COEFFS"):
+            msg = ("Stage %i: Decimation is required for digital "
+                   "filters." % stage.sequence_no)
+            raise ValueError(msg)
+        previous = stage
+    return stages
+
+
+def _check_fir_symmetry(stage):
+    """
+    Normalizes the coefficients of an asymmetric FIR stage to a sum of one if
+    they are off by more than two percent and converts the stage to a
+    symmetric one if possible, like evalresp's ``check_sym()``.
+    """
+    coefficients = stage.coefficients
+    nc = len(coefficients)
+    if not nc:
+        return
+    total = 0.0
+    for value in coefficients:
+        total += value
+    if total < 1.0 - 0.02 or total > 1.0 + 0.02:
+        coefficients = coefficients / total
+        stage.coefficients = coefficients
+    n0 = nc // 2
+    if nc % 2 == 0:
+        if np.array_equal(coefficients[n0:], coefficients[:n0][::-1]):
+            stage.filter_type = "FIR_SYM_2"
+            stage.coefficients = coefficients[:n0]
+    elif np.array_equal(coefficients[n0 + 1:], coefficients[:n0][::-1]):
+        stage.filter_type = "FIR_SYM_1"
+        stage.coefficients = coefficients[:n0 + 1]
+
+
+def _polyval_unit_circle(coefficients, theta):
+    """
+    Evaluates ``sum(coefficients[k] * exp(-1j * k * theta))`` with Horner's
+    method.
+    """
+    x = np.exp(-1j * theta)
+    result = np.empty(theta.shape, dtype=np.complex128)
+    result.fill(coefficients[-1])
+    for value in coefficients[-2::-1]:
+        result *= x
+        result += value
+    return result
+
+
+def _evaluate_filter(stage, frequencies):
+    """
+    Returns the response of the filter of a stage at the given frequencies
+    (without any gain) or ``None`` if the filter does not change the
+    response.
+    """
+    filter_type = stage.filter_type
+    w = 2.0 * pi * frequencies
+    if filter_type in ("LAPLACE_PZ", "ANALOG_PZ"):
+        if filter_type == "LAPLACE_PZ":
+            s = 1j * w
+        else:
+            s = 1j * frequencies
+        numerator = np.ones(s.shape, dtype=np.complex128)
+        for zero in stage.zeros:
+            numerator *= s - zero
+        denominator = np.ones(s.shape, dtype=np.complex128)
+        for pole in stage.poles:
+            denominator *= s - pole
+        return stage.a0 * numerator / denominator
+    elif filter_type == "LIST":
+        phase = stage.phase / 180.0 * pi
+        return stage.amplitude * np.cos(phase) + \
+            1j * stage.amplitude * np.sin(phase)
+    theta = w * stage.decimation[0]
+    if filter_type == "IIR_PZ":
+        if not len(stage.zeros) and not len(stage.poles):
+            return None
+        z = np.exp(1j * theta)
+        result = np.ones(z.shape, dtype=np.complex128)
+        for zero in stage.zeros:
+            result *= z - zero
+        for pole in stage.poles:
+            result /= z - pole
+        return stage.a0 * result
+    elif filter_type == "IIR_COEFFS":
+        return stage.h0 * (
+            _polyval_unit_circle(stage.numerator, theta) /
+            _polyval_unit_circle(stage.denominator, theta))
+    coefficients = stage.coefficients
+    na = len(coefficients)
+    if not na:
+        return None
+    if filter_type == "FIR_SYM_1":
+        coefficients = np.concatenate(
+            [coefficients[-1:], 2.0 * coefficients[-2::-1]])
+        return stage.h0 * _polyval_unit_circle(coefficients, theta).real
+    elif filter_type == "FIR_SYM_2":
+        return stage.h0 * 2.0 * (
+            np.exp(-0.5j * theta) *
+            _polyval_unit_circle(coefficients[::-1], theta)).real
+    # Asymmetric FIR filter. Evalresp uses a closed expression (and no h0)
+    # if all coefficients are equal.
+    if (coefficients == coefficients[0]).all():
+        result = np.sin(theta / 2.0 * na) / np.sin(theta / 2.0) * \
+            coefficients[0]
+        result[theta == 0.0] = 1.0
+        return result
+    return stage.h0 * _polyval_unit_circle(coefficients, theta)
+
+
+def _normalize_evalresp_stages(stages):
+    """
+    Computes the overall sensitivity of the stages at the frequency of the
+    instrument sensitivity, like evalresp's ``norm_resp()``.
+
+    Stage gains given at other frequencies (or poles and zeros normalized at
+    other frequencies) are recalculated for that frequency, which changes the
+    stages in place.
+    """
+    sensitivity, frequency = stages[-1].gain
+    if len(stages) == 2 and stages[0].gain is None:
+        stages[0].gain = [sensitivity, frequency]
+    for stage in stages:
+        if stage.gain is not None and stage.gain[0] == 0.0:
+            msg = "Stage %i: Gain is zero." % stage.sequence_no
+            raise ValueError(msg)
+
+    calc_sensitivity = 1.0
+    frequency_ = np.array([frequency], dtype=np.float64)
+    for stage in stages:
+        # The gain of stage 0 is the instrument sensitivity.
+        if stage.gain is None or not stage.sequence_no:
+            continue
+        gain, gain_frequency = stage.gain
+        filter_type = stage.filter_type
+        is_pz = filter_type in ("LAPLACE_PZ", "ANALOG_PZ", "IIR_PZ")
+        if gain_frequency != frequency or (is_pz and
+                                           stage.a0_freq != frequency):
+            if is_pz:
+                stage.a0 = 1.0
+            elif filter_type in ("FIR_SYM_1", "FIR_SYM_2", "FIR_ASYM") and \
+                    len(stage.coefficients) or filter_type == "IIR_COEFFS":
+                stage.h0 = 1.0
+            else:
+                filter_type = None
+            if filter_type is not None:
+                gain_frequency_ = np.array([gain_frequency], dtype=np.float64)
+                df = _evaluate_filter(stage, gain_frequency_)
+                of = _evaluate_filter(stage, frequency_)
+                df = 1.0 if df is None else abs(df[0])
+                of = 1.0 if of is None else abs(of[0])
+                if filter_type in ("LAPLACE_PZ", "ANALOG_PZ") and \
+                        (df == 0.0 or of == 0.0):
+                    msg = ("Stage %i: Response of bandpass analog filter is "
+                           "zero at gain frequency or sensitivity "
+                           "frequency." % stage.sequence_no)
+                    raise ValueError(msg)
+                gain = gain / df * of
+                stage.gain = [gain, frequency]
+                if is_pz:
+                    stage.a0 = 1.0 / of
+                    stage.a0_freq = frequency
+                else:
+                    stage.h0 = 1.0 / of
+        calc_sensitivity *= gain
+    return calc_sensitivity
+
+
+def _evaluate_response(response, frequencies, output, start_stage=None,
+                       end_stage=None):
+    """
+    Evaluates a response at the given frequencies with NumPy, following
+    what evalresp does.
+
+    See :meth:`Response.get_response_for_frequencies`.
+    """
+    stages = _get_evalresp_stages(response, frequencies, start_stage,
+                                  end_stage)
+    sensitivity = _normalize_evalresp_stages(stages)
+
+    w = 2.0 * pi * frequencies
+    result = np.empty(len(frequencies), dtype=np.complex128)
+    result.fill(sensitivity)
+    for stage in stages:
+        if stage.filter_type is None:
+            continue
+        values = _evaluate_filter(stage, frequencies)
+        if values is not None:
+            result *= values
+        # The delay of asymmetric FIR filters is corrected with the
+        # correction applied during acquisition.
+        if stage.filter_type == "FIR_ASYM" and len(stage.coefficients):
+            result *= np.exp(1j * w * stage.decimation[1])
+
+    # Convert from the input units of the first stage to the requested
+    # output units, everything but displacement and acceleration is treated
+    # like velocity.
+    input_units = stages[0].input_units
+    exponent = {"DISP": 1, "VEL": 0, "ACC": -1}[output] + \
+        {"DIS": -1, "ACC": 1}.get(input_units, 0)
+    if exponent > 0:
+        result *= (1j * w) ** exponent
+    elif exponent < 0:
+        result /= (1j * w) ** -exponent
+        result[w == 0.0] = 0.0
+    return result
+
+
+def _get_response_key(response):
+    """
+    Returns a hashable key describing everything that goes into the
+    evaluation of the response, so that responses with identical content
+    share their cached evaluations.
+    """
+    def hashable(value):
+        if value is None or isinstance(value, (str, native_str)):
+            return value
+        elif isinstance(value, complex):
+            return complex(value)
+        elif isinstance(value, (list, tuple)):
+            return tuple(hashable(_i) for _i in value)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return repr(value)
+
+    key = []
+    for stage in response.response_stages:
+        values = [type(stage).__name__] + [
+            hashable(getattr(stage, attribute)) for attribute in (
+                "stage_sequence_number", "input_units", "output_units",
+                "stage_gain", "stage_gain_frequency",
+                "decimation_input_sample_rate", "decimation_factor",
+                "decimation_offset", "decimation_delay",
+                "decimation_correction")]
+        if isinstance(stage, PolesZerosResponseStage):
+            values += [stage.pz_transfer_function_type,
+                       hashable(stage.normalization_factor),
+                       hashable(stage.normalization_frequency),
+                       hashable(stage.zeros), hashable(stage.poles)]
+        elif isinstance(stage, CoefficientsTypeResponseStage):
+            values += [stage.cf_transfer_function_type,
+                       hashable(stage.numerator),
+                       hashable(stage.denominator)]
+        elif isinstance(stage, ResponseListResponseStage):
+            values += [hashable((_i.frequency, _i.amplitude, _i.phase))
+                       for _i in stage.response_list_elements]
+        elif isinstance(stage, FIRResponseStage):
+            values += [stage.symmetry, hashable(stage.coefficients)]
+        key.append(tuple(values))
+    sensitivity = response.instrument_sensitivity
+    if sensitivity is not None:
+        key.append((hashable(sensitivity.value),
+                    hashable(sensitivity.frequency)))
+    return tuple(key)
+
+
 def _adjust_bode_plot_figure(fig, plot_degrees=False, grid=True, show=True):
     """
     Helper function to do final adjustments to Bode plot figure.
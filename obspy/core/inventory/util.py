@@ -15,6 +15,7 @@ from future.builtins import *  # NOQA
 
 import copy
 import re
+from operator import attrgetter
 from textwrap import TextWrapper
 
 from obspy import UTCDateTime
@@ -23,6 +24,12 @@ from obspy.core.util.obspy_types import (FloatWithUncertaintiesAndUnit,
                                          FloatWithUncertaintiesFixedUnit)
 
 
+# Incremented whenever the code of a network, station or channel is set, so
+# that channel indices know when to check the codes they were built from
+# (see _ChannelIndex).
+_code_changes = [0]
+
+
 class BaseNode(ComparingObject):
     """
     From the StationXML definition:
@@ -78,6 +85,7 @@ class BaseNode(ComparingObject):
             msg = "A Code is required"
             raise ValueError(msg)
         self._code = str(value).strip()
+        _code_changes[0] += 1
 
     @property
     def alternate_code(self):
@@ -859,6 +867,192 @@ def _seed_id_keyfunction(x):
     return x
 
 
+_get_code = attrgetter("_code")
+_get_location_code = attrgetter("_location_code")
+
+
+def _node_codes(nodes, location_codes=False):
+    """
+    Returns the codes of a list of networks, stations or channels (optionally
+    with their location codes).
+    """
+    codes = tuple(map(_get_code, nodes))
+    if location_codes:
+        codes += tuple(map(_get_location_code, nodes))
+    return codes
+
+
+class _ChannelIndex(object):
+    """
+    Index of all channels below a list of networks by their SEED codes.
+
+    Built once for the networks of an inventory (or for a single network) to
+    avoid walking the whole hierarchy for each lookup. The index remembers
+    which networks, stations and channels with which codes it was built
+    from, so that an outdated index is detected and rebuilt (see
+    :meth:`_ChannelIndexMixin._get_channel_index`). The identities of the
+    networks and stations are checked for every lookup, their codes only if
+    any code was set anywhere since the last check. Channels are only
+    checked for the stations looked up. Start and end dates are always
+    checked on the channels themselves, so changing them does not
+    invalidate the index.
+    """
+    def __init__(self, networks):
+        self._code_changes = _code_changes[0]
+        self._networks = (tuple(map(id, networks)), _node_codes(networks))
+        self._station_lists = [
+            (net.stations, tuple(map(id, net.stations)),
+             _node_codes(net.stations))
+            for net in networks]
+        # (NET, STA) in upper case -> list of (network, station, channel
+        # list, identities of the channels, codes of the channels), in the
+        # order of the inventory
+        self._stations = {}
+        for net in networks:
+            for sta in net.stations:
+                channels = sta.channels
+                self._stations.setdefault(
+                    (net.code.upper(), sta.code.upper()), []).append(
+                        (net, sta, channels, tuple(map(id, channels)),
+                         _node_codes(channels, location_codes=True)))
+
+    def is_valid(self, networks):
+        """
+        Checks if the index still describes the given networks.
+
+        Only checks the networks and their stations, the channels are
+        checked in :meth:`get_channels`.
+        """
+        if tuple(map(id, networks)) != self._networks[0]:
+            return False
+        for net, (stations, ids, _) in zip(networks, self._station_lists):
+            if net.stations is not stations or \
+                    tuple(map(id, stations)) != ids:
+                return False
+        if self._code_changes != _code_changes[0]:
+            if _node_codes(networks) != self._networks[1]:
+                return False
+            for stations, _, codes in self._station_lists:
+                if _node_codes(stations) != codes:
+                    return False
+            self._code_changes = _code_changes[0]
+        return True
+
+    def get_stations(self, network, station):
+        """
+        Returns all (network, station) pairs with the given codes (compared
+        case insensitively) in the order of the inventory.
+        """
+        return [(net, sta) for net, sta, _, _, _ in self._stations.get(
+            (network.upper(), station.upper()), [])]
+
+    def get_channels(self, network, station, location, channel):
+        """
+        Returns all (network, station, channel) tuples with the given codes
+        in the order of the inventory or ``None`` if any channel of the
+        stations in question was added, removed, replaced or got a new code
+        since the index was built.
+        """
+        result = []
+        for net, sta, channels, ids, codes in self._stations.get(
+                (network.upper(), station.upper()), []):
+            if sta.channels is not channels or \
+                    tuple(map(id, channels)) != ids or \
+                    _node_codes(channels, location_codes=True) != codes:
+                return None
+            if net.code != network or sta.code != station:
+                continue
+            result.extend((net, sta, cha) for cha in channels
+                          if cha.location_code == location and
+                          cha.code == channel)
+        return result
+
+
+class _ChannelIndexMixin(object):
+    """
+    Provides a lazily built :class:`_ChannelIndex` for
+    :class:`~obspy.core.inventory.inventory.Inventory` and
+    :class:`~obspy.core.inventory.network.Network`.
+
+    The index is neither compared nor pickled or copied.
+    """
+    def _get_indexed_networks(self):
+        raise NotImplementedError
+
+    def _get_channel_index(self):
+        networks = self._get_indexed_networks()
+        index = self.__dict__.get("_channel_index")
+        if index is None or not index.is_valid(networks):
+            index = _ChannelIndex(networks)
+            self._channel_index = index
+        return index
+
+    def _get_channels(self, network, station, location, channel):
+        """
+        Returns all (network, station, channel) tuples with the given SEED
+        codes in the order of the inventory.
+        """
+        channels = self._get_channel_index().get_channels(
+            network, station, location, channel)
+        if channels is None:
+            self._channel_index = None
+            channels = self._get_channel_index().get_channels(
+                network, station, location, channel)
+        return channels
+
+    def _find_responses(self, seed_id, datetime):
+        """
+        Returns the responses of all channels with the given SEED ID that
+        are active at the given time.
+        """
+        responses = []
+        network, station, location, channel = seed_id.split(".")
+        for _, _, cha in self._get_channels(network, station, location,
+                                            channel):
+            if cha.start_date is not None and cha.start_date > datetime:
+                continue
+            if cha.end_date is not None and cha.end_date < datetime:
+                continue
+            if cha.response is not None:
+                responses.append(cha.response)
+        return responses
+
+    def _find_coordinates(self, seed_id, datetime=None):
+        """
+        Returns the coordinates of all channels with the given SEED ID that
+        are active at the given time (if given).
+        """
+        coordinates = []
+        network, station, location, channel = seed_id.split(".")
+        for net, sta, cha in self._get_channels(network, station, location,
+                                                channel):
+            # check datetime only if given
+            if datetime and any(
+                    (node.start_date and node.start_date > datetime) or
+                    (node.end_date and node.end_date < datetime)
+                    for node in (net, sta, cha)):
+                continue
+            # if channel latitude or longitude is not given use station
+            coordinates.append({
+                'latitude': cha.latitude or sta.latitude,
+                'longitude': cha.longitude or sta.longitude,
+                'elevation': cha.elevation,
+                'local_depth': cha.depth})
+        return coordinates
+
+    def __eq__(self, other):
+        return _state_without_index(self) == _state_without_index(other)
+
+    def __getstate__(self):
+        return _state_without_index(self)
+
+
+def _state_without_index(obj):
+    state = obj.__dict__.copy()
+    state.pop("_channel_index", None)
+    return state
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
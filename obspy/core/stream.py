@@ -13,9 +13,10 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 from future.utils import PY3, native_str
 
+import collections
 import copy
 import fnmatch
-import math
+import multiprocessing
 import os
 import pickle
 import re
@@ -26,24 +27,31 @@ from pkg_resources import load_entry_point
 import numpy as np
 
 from obspy.core import compatibility
-from obspy.core.trace import Trace
+from obspy.core.trace import (Trace, _get_argument_names,
+                              _get_processing_info, _read_only_view)
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import NamedTemporaryFile
 from obspy.core.util.base import (ENTRY_POINTS, _get_function_from_entry_point,
-                                  _read_from_plugin, download_to_file)
+                                  _read_from_plugin, create_empty_data_chunk,
+                                  download_to_file)
 from obspy.core.util.decorator import (map_example_filename,
                                        raise_if_masked, uncompress_file)
-from obspy.core.util.misc import get_window_times
+from obspy.core.util.misc import get_window_times, limit_numpy_fft_cache
 
 
 _headonly_warning_msg = (
     "Keyword headonly cannot be combined with starttime, endtime or dtype.")
 
+# maximum number of samples filtered at once by Stream.filter()
+_FILTER_BATCH_SIZE = 2 ** 22
+# maximum number of samples deconvolved at once by Stream.remove_response()
+_REMOVE_RESPONSE_BATCH_SIZE = 2 ** 22
+
 
 @map_example_filename("pathname_or_url")
 def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
          endtime=None, nearest_sample=True, dtype=None, apply_calib=False,
-         **kwargs):
+         workers=None, **kwargs):
     """
     Read waveform files into an ObsPy Stream object.
 
@@ -85,6 +93,12 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     :type apply_calib: bool, optional
     :param apply_calib: Automatically applies the calibration factor
         ``trace.stats.calib`` for each trace, if set. Defaults to ``False``.
+    :type workers: int, optional
+    :param workers: Number of worker processes used to read the files if
+        ``pathname_or_url`` is a file name pattern matching multiple files.
+        The traces are returned in the same order as when reading the files
+        one after the other. Defaults to ``None``, i.e. all files are read
+        in the current process.
     :param kwargs: Additional keyword arguments passed to the underlying
         waveform reader method.
     :return: An ObsPy :class:`~obspy.core.stream.Stream` object.
@@ -192,6 +206,24 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
         >>> print(st)  # doctest: +ELLIPSIS
         1 Trace(s) in Stream:
         .RJOB..Z | 2005-08-31T02:34:00.000000Z - ... | 200.0 Hz, 2001 samples
+
+    (7) Memory mapping large files.
+
+        The MiniSEED, SAC, SEG-Y and SU readers accept ``mmap=True`` to
+        memory map files instead of loading them into memory as a whole.
+        Combined with ``starttime`` and ``endtime`` only the requested part of
+        a large file is actually read from disk.
+
+        >>> st = read("/path/to/huge_dayfile.mseed", mmap=True,
+        ...           starttime=dt, endtime=dt+600)  # doctest: +SKIP
+
+    (8) Reading many files in parallel.
+
+        Files matched by a file name pattern can be read by multiple worker
+        processes. The order of the traces in the resulting stream does not
+        depend on the number of workers.
+
+        >>> st = read("/path/to/archive/*.mseed", workers=4)  # doctest: +SKIP
     """
     # add default parameters to kwargs so sub-modules may handle them
     kwargs['starttime'] = starttime
@@ -227,8 +259,14 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     else:
         # some file name
         pathname = pathname_or_url
-        for file in sorted(glob(pathname)):
-            st.extend(_read(file, format, headonly, **kwargs).traces)
+        files = sorted(glob(pathname))
+        if workers and workers > 1 and len(files) > 1:
+            for stream in _read_parallel(files, workers, format, headonly,
+                                         **kwargs):
+                st.extend(stream.traces)
+        else:
+            for file in files:
+                st.extend(_read(file, format, headonly, **kwargs).traces)
         if len(st) == 0:
             # try to give more specific information why the stream is empty
             if has_magic(pathname) and not glob(pathname):
@@ -277,6 +315,39 @@ def _read(filename, format=None, headonly=False, **kwargs):
     return stream
 
 
+def _star_read(args):
+    """
+    Helper function for _read_parallel() as Pool.starmap() is Python 3 only.
+    """
+    filename, format, headonly, kwargs = args
+    return _read(filename, format, headonly, **kwargs)
+
+
+def _read_parallel(filenames, processes, format=None, headonly=False,
+                   **kwargs):
+    """
+    Read multiple files with a pool of worker processes.
+
+    Unpacking of the data is mostly done within C libraries, some of which
+    (e.g. libmseed) use global state and can thus not be shared between
+    threads. Separate processes are safe and do scale.
+
+    :return: List of streams in the same order as the file names.
+    """
+    arguments = [(filename, format, headonly, kwargs)
+                 for filename in filenames]
+    processes = min(processes, len(filenames))
+    pool = multiprocessing.Pool(processes)
+    try:
+        streams = pool.map(
+            _star_read, arguments,
+            chunksize=max(1, len(arguments) // (4 * processes)))
+    finally:
+        pool.close()
+        pool.join()
+    return streams
+
+
 def _create_example_stream(headonly=False):
     """
     Create an example stream.
@@ -790,37 +861,40 @@ class Stream(object):
         copied_traces = copy.copy(self.traces)
         self.sort()
         gap_list = []
+        # compute gaps and overlaps between all neighbouring traces at once
+        starttimes = np.array([tr.stats.starttime.timestamp
+                               for tr in self.traces])
+        endtimes = np.array([tr.stats.endtime.timestamp for tr in self.traces])
+        deltas = np.array([tr.stats.delta for tr in self.traces])
+        # last sample of earlier trace represents data up to time of last
+        # sample (stats.endtime) plus one delta
+        gaps = starttimes[1:] - (endtimes[:-1] + deltas[:-1])
+        # Check that any overlap is not larger than the trace coverage
+        coverages = endtimes[1:] - starttimes[1:]
+        gaps = np.where((gaps < 0) & (-gaps > coverages), -coverages, gaps)
+        # Number of missing samples, rounding halfway cases away from zero
+        missing = np.abs(gaps) * \
+            np.array([tr.stats.sampling_rate for tr in self.traces[:-1]])
+        missing_floor = np.floor(missing)
+        missing = (missing_floor +
+                   (missing - missing_floor >= 0.5)).astype(np.int64)
+        missing[gaps < 0] *= -1
         for _i in range(len(self.traces) - 1):
             # skip traces with different network, station, location or channel
             if self.traces[_i].id != self.traces[_i + 1].id:
                 continue
             # different sampling rates should always result in a gap or overlap
-            if self.traces[_i].stats.delta == self.traces[_i + 1].stats.delta:
-                same_sampling_rate = True
-            else:
-                same_sampling_rate = False
+            same_sampling_rate = deltas[_i] == deltas[_i + 1]
             stats = self.traces[_i].stats
             stime = stats['endtime']
             etime = self.traces[_i + 1].stats['starttime']
-            # last sample of earlier trace represents data up to time of last
-            # sample (stats.endtime) plus one delta
-            delta = etime.timestamp - (stime.timestamp + stats.delta)
-            # Check that any overlap is not larger than the trace coverage
-            if delta < 0:
-                temp = self.traces[_i + 1].stats['endtime'].timestamp - \
-                    etime.timestamp
-                if (delta * -1) > temp:
-                    delta = -1 * temp
+            delta = float(gaps[_i])
             # Check gap/overlap criteria
             if min_gap and delta < min_gap:
                 continue
             if max_gap and delta > max_gap:
                 continue
-            # Number of missing samples
-            nsamples = int(compatibility.round_away(math.fabs(delta) *
-                                                    stats['sampling_rate']))
-            if delta < 0:
-                nsamples = -nsamples
+            nsamples = int(missing[_i])
             # skip if is equal to delta (1 / sampling rate)
             if same_sampling_rate and nsamples == 0:
                 continue
@@ -1936,7 +2010,15 @@ class Stream(object):
         self.traces = []
         # loop through ids
         for _id in traces_dict.keys():
-            cur_trace = traces_dict[_id].pop(0)
+            cur_trace = None
+            if len(traces_dict[_id]) > 1:
+                # try to merge all traces of same id in one go
+                cur_trace = _merge_traces(traces_dict[_id],
+                                          fill_value=fill_value)
+            if cur_trace is None:
+                cur_trace = traces_dict[_id].pop(0)
+            else:
+                traces_dict[_id] = []
             # loop through traces of same id
             for _i in range(len(traces_dict[_id])):
                 trace = traces_dict[_id].pop(0)
@@ -2055,7 +2137,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return self
 
     @raise_if_masked
-    def filter(self, type, **options):
+    def filter(self, type, inplace=False, **options):
         """
         Filter the data of all traces in the Stream.
 
@@ -2063,6 +2145,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :param type: String that specifies which filter is applied (e.g.
             ``"bandpass"``). See the `Supported Filter`_ section below for
             further details.
+        :type inplace: bool
+        :param inplace: If ``True``, floating point data is filtered in its
+            existing arrays, see :meth:`Trace.filter()
+            <obspy.core.trace.Trace.filter>`. Defaults to ``False``.
         :param options: Necessary keyword arguments for the respective filter
             that will be passed on. (e.g. ``freqmin=1.0``, ``freqmax=20.0`` for
             ``"bandpass"``)
@@ -2076,6 +2162,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             This also makes an entry with information on the applied processing
             in ``stats.processing`` of every trace.
 
+        .. note::
+
+            Traces with the same number of samples, sampling rate and data
+            type are filtered together in one go with the Butterworth
+            filters, which is a lot faster for streams with many short
+            traces (e.g. dense arrays).
+
         .. rubric:: _`Supported Filter`
 
         ``'bandpass'``
@@ -2115,8 +2208,51 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st.filter("highpass", freq=1.0)
             st.plot()
         """
+        func = _get_function_from_entry_point('filter', type.lower())
+        # group traces that can be stacked and filtered in one go
+        groups = {}
+        if 'inplace' in _get_argument_names(func):
+            # traces contained more than once get filtered more than once
+            counts = collections.Counter(id(tr) for tr in self)
+            for tr in self:
+                if counts[id(tr)] > 1:
+                    continue
+                dtype = tr.data.dtype
+                if inplace and dtype in (np.float32, np.float64) and \
+                        tr.data.flags.writeable:
+                    pass
+                elif dtype.kind in 'iuf':
+                    dtype = np.dtype(np.float64)
+                else:
+                    continue
+                key = (tr.stats.npts, tr.stats.sampling_rate, dtype)
+                groups.setdefault(key, []).append(tr)
+        batched = set()
+        for (npts, sampling_rate, dtype), traces in groups.items():
+            if npts == 0 or len(traces) < 2:
+                continue
+            info = _get_processing_info(Trace.filter, traces[0], type,
+                                        inplace=inplace, **options)
+            rows = max(1, _FILTER_BATCH_SIZE // npts)
+            for i in range(0, len(traces), rows):
+                batch = traces[i:i + rows]
+                data = np.empty((len(batch), npts), dtype=dtype)
+                for j, tr in enumerate(batch):
+                    data[j] = tr.data
+                func(data, df=sampling_rate, inplace=True, **options)
+                for j, tr in enumerate(batch):
+                    # only write back into the existing array if asked for,
+                    # it might be shared with other traces
+                    if inplace and tr.data.dtype == dtype and \
+                            tr.data.flags.writeable:
+                        tr.data[:] = data[j]
+                    else:
+                        tr.data = data[j]
+                    tr._internal_add_processing_info(info)
+                    batched.add(id(tr))
         for tr in self:
-            tr.filter(type, **options)
+            if id(tr) not in batched:
+                tr.filter(type, inplace=inplace, **options)
         return self
 
     def trigger(self, type, **options):
@@ -2680,10 +2816,16 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     comp.stats.inclination = inclination
         return self
 
-    def copy(self):
+    def copy(self, data=True):
         """
         Return a deepcopy of the Stream object.
 
+        :type data: bool
+        :param data: If set to ``False`` only the headers are copied and the
+            data is shared between the traces of the original and the copy
+            as read-only arrays. The data is copied only once a trace of
+            either stream is processed, see :meth:`Trace.copy()
+            <obspy.core.trace.Trace.copy>`.
         :rtype: :class:`~obspy.core.stream.Stream`
         :return: Copy of current stream.
 
@@ -2714,8 +2856,34 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             True
             >>> st == st3
             True
+
+        3. Copy only the headers, e.g. to process the same raw data in
+           different ways. The data is not duplicated until it is changed:
+
+            >>> st4 = st.copy(data=False)
+            >>> st4 == st
+            True
+            >>> np.shares_memory(st4[0].data, st[0].data)
+            True
+            >>> st[0].data.flags.writeable
+            False
         """
-        return copy.deepcopy(self)
+        if data:
+            return copy.deepcopy(self)
+        # the original traces get read-only views as well, so that
+        # processing them in place does not change the copy
+        views = {}
+        memo = {}
+        for tr in self:
+            if id(tr.data) not in views:
+                view = _read_only_view(tr.data)
+                # keep the original array alive, its id must not be reused,
+                # and map the view to itself for traces contained twice
+                views[id(tr.data)] = (tr.data, view)
+                views[id(view)] = (view, view)
+                memo[id(view)] = _read_only_view(view)
+            tr.data = views[id(tr.data)][1]
+        return copy.deepcopy(self, memo)
 
     def clear(self):
         """
@@ -2847,12 +3015,33 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             pass
         # clear traces of current stream
         self.traces = []
+
+        def _add_adjacent(cur_trace, adjacent):
+            """
+            Add directly adjacent traces to current trace in one go.
+            """
+            if not adjacent:
+                return cur_trace
+            traces = [cur_trace] + adjacent
+            merged = _merge_traces(traces)
+            if merged is None:
+                merged = traces.pop(0)
+                for trace in traces:
+                    merged += trace
+            return merged
+
         # loop through ids
         for id_ in traces_dict.keys():
             trace_list = traces_dict[id_]
             cur_trace = trace_list.pop(0)
             delta = cur_trace.stats.delta
             allowed_micro_shift = misalignment_threshold * delta
+            # directly adjacent traces are only collected and added to the
+            # current trace later on in one go, adding them one by one would
+            # reallocate the data of the current trace for every single trace
+            adjacent = []
+            cur_npts = cur_trace.stats.npts
+            cur_endtime = cur_trace.stats.endtime
             # work through all traces of same id
             while trace_list:
                 trace = trace_list.pop(0)
@@ -2860,7 +3049,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                 # time of the second trace from the expected start time
                 # (for the ideal case of directly adjacent and perfectly
                 # aligned traces).
-                gap = trace.stats.starttime - (cur_trace.stats.endtime + delta)
+                gap = trace.stats.starttime - (cur_endtime + delta)
                 # if `gap` is larger than the designated allowed shift,
                 # we treat it as a real gap and leave as is.
                 if misalignment_threshold > 0 and gap <= allowed_micro_shift:
@@ -2909,11 +3098,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     cur_trace.stats.starttime.timestamp) % delta / delta
                 subsample_shift_percentage = min(
                     subsample_shift_percentage, 1 - subsample_shift_percentage)
-                if (trace.stats.starttime <= cur_trace.stats.endtime and
+                if (trace.stats.starttime <= cur_endtime and
                         subsample_shift_percentage < misalignment_threshold):
+                    cur_trace = _add_adjacent(cur_trace, adjacent)
+                    adjacent = []
                     # check if common time slice [t1 --> t2] is equal:
                     t1 = trace.stats.starttime
-                    t2 = min(cur_trace.stats.endtime, trace.stats.endtime)
+                    t2 = min(cur_endtime, trace.stats.endtime)
                     # if consistent: add them together
                     if np.array_equal(cur_trace.slice(t1, t2).data,
                                       trace.slice(t1, t2).data):
@@ -2923,15 +3114,22 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                         self.traces.append(cur_trace)
                         cur_trace = trace
                 # traces are perfectly adjacent: add them together
-                elif trace.stats.starttime == cur_trace.stats.endtime + \
-                        cur_trace.stats.delta:
-                    cur_trace += trace
+                elif trace.stats.starttime == cur_endtime + delta:
+                    adjacent.append(trace)
+                    cur_npts += trace.stats.npts
+                    # same as the end time of the merged trace
+                    cur_endtime = cur_trace.stats.starttime + \
+                        float(cur_npts - 1) * delta
+                    continue
                 # no common parts (gap):
                 # leave traces alone and add current to list
                 else:
-                    self.traces.append(cur_trace)
+                    self.traces.append(_add_adjacent(cur_trace, adjacent))
+                    adjacent = []
                     cur_trace = trace
-            self.traces.append(cur_trace)
+                cur_npts = cur_trace.stats.npts
+                cur_endtime = cur_trace.stats.endtime
+            self.traces.append(_add_adjacent(cur_trace, adjacent))
         self.traces = [tr for tr in self.traces if tr.stats.npts]
         return self
 
@@ -2996,7 +3194,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     raise
         return skipped_traces
 
-    def remove_response(self, *args, **kwargs):
+    def remove_response(self, inventory=None, output="VEL", water_level=60,
+                        pre_filt=None, zero_mean=True, taper=True,
+                        taper_fraction=0.05, plot=False, fig=None, **kwargs):
         """
         Deconvolve instrument response for all Traces in Stream.
 
@@ -3004,6 +3204,14 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :meth:`~obspy.core.trace.Trace.remove_response` method of
         :class:`~obspy.core.trace.Trace`.
 
+        .. note::
+
+            Traces with the same number of samples, sampling rate and
+            response are deconvolved together in one go, sharing the
+            frequency vector, the pre-filter taper and the inverted response
+            spectrum, which is a lot faster for streams with many traces of
+            identical instruments.
+
         >>> from obspy import read, read_inventory
         >>> st = read()
         >>> inv = read_inventory()
@@ -3026,8 +3234,49 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             original data, use :meth:`~obspy.core.stream.Stream.copy` to create
             a copy of your stream object.
         """
+        from obspy.core.inventory.response import (PolynomialResponseStage,
+                                                   _get_response_key)
+        options = dict(inventory=inventory, output=output,
+                       water_level=water_level, pre_filt=pre_filt,
+                       zero_mean=zero_mean, taper=taper,
+                       taper_fraction=taper_fraction, **kwargs)
+        # group traces that can be deconvolved in one go
+        groups = collections.OrderedDict()
+        if not plot:
+            # traces contained more than once get corrected more than once
+            counts = collections.Counter(id(tr) for tr in self)
+            response_keys = {}
+            for tr in self:
+                if counts[id(tr)] > 1 or not tr.stats.npts:
+                    continue
+                response = tr._get_response(inventory)
+                # polynomial responses are applied in the time domain
+                if not response.response_stages or any(
+                        isinstance(stage, PolynomialResponseStage)
+                        for stage in response.response_stages):
+                    continue
+                # traces of the same channel share the response object
+                if id(response) not in response_keys:
+                    response_keys[id(response)] = (
+                        response, _get_response_key(response))
+                key = (tr.stats.npts, tr.stats.sampling_rate,
+                       response_keys[id(response)][1])
+                groups.setdefault(key, (response, []))[1].append(tr)
+        batched = set()
+        for (npts, sampling_rate, _), (response, traces) in groups.items():
+            if len(traces) < 2:
+                continue
+            info = _get_processing_info(Trace.remove_response, traces[0],
+                                        **options)
+            _remove_response_batched(
+                traces, response, sampling_rate, info, output=output,
+                water_level=water_level, pre_filt=pre_filt,
+                zero_mean=zero_mean, taper=taper,
+                taper_fraction=taper_fraction, **kwargs)
+            batched.update(id(tr) for tr in traces)
         for tr in self:
-            tr.remove_response(*args, **kwargs)
+            if id(tr) not in batched:
+                tr.remove_response(plot=plot, fig=fig, **options)
         return self
 
     def remove_sensitivity(self, *args, **kwargs):
@@ -3102,6 +3351,147 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return st
 
 
+def _merge_traces(traces, fill_value=None):
+    """
+    Merge a list of traces with the same id in one go.
+
+    The result is the same as adding up the traces one after the other with
+    :meth:`Trace.__add__() <obspy.core.trace.Trace.__add__>`, but the merged
+    data array is allocated only once and the data of every trace is copied
+    only once. Adding up many traces pairwise instead reallocates the merged
+    array for every single trace, which gets very slow for thousands of
+    traces.
+
+    Only gaps, directly adjacent traces and overlaps with matching data are
+    handled here, i.e. the cases for which the merge method does not matter.
+    For anything else (e.g. overlaps with differing data or traces not
+    sampled on a common time grid) ``None`` is returned and the traces have
+    to be added up pairwise.
+
+    :type traces: list of :class:`~obspy.core.trace.Trace`
+    :param traces: Non-empty traces with same id, sampling rate, data type
+        and calibration factor, sorted by start time and end time.
+    :type fill_value: int, float, str or ``None``
+    :param fill_value: Fill value for gaps, see
+        :meth:`Stream.merge() <obspy.core.stream.Stream.merge>`.
+    :rtype: :class:`~obspy.core.trace.Trace` or ``None``
+    """
+    first = traces[0]
+    sampling_rate = first.stats.sampling_rate
+    starttime = first.stats.starttime
+    # sample offset of every trace relative to the first trace
+    offsets = np.array([(tr.stats.starttime - starttime) * sampling_rate
+                        for tr in traces])
+    positions = np.round(offsets).astype(np.int64)
+    if np.any(np.abs(offsets - positions) > 0.25):
+        return None
+    ends = positions + np.array([len(tr) for tr in traces], dtype=np.int64)
+    merged_ends = np.maximum.accumulate(ends)
+    # end of the merged data at the time the respective trace is added
+    previous_ends = np.empty_like(ends)
+    previous_ends[0] = 0
+    previous_ends[1:] = merged_ends[:-1]
+    gaps = positions > previous_ends
+    overlaps = positions < previous_ends
+    # overlapping data must not reach back into a gap
+    gap_ends = np.maximum.accumulate(np.where(gaps, positions, 0))
+    if np.any(positions[overlaps] < gap_ends[overlaps]):
+        return None
+    latest = isinstance(fill_value, (str, native_str)) and \
+        fill_value == "latest"
+    interpolate = isinstance(fill_value, (str, native_str)) and \
+        fill_value == "interpolate"
+    masked = [isinstance(tr.data, np.ma.masked_array) for tr in traces]
+    if any(masked) and (overlaps.any() or latest or interpolate):
+        return None
+
+    data = np.empty(merged_ends[-1], dtype=first.data.dtype)
+    mask = None
+    if any(masked) or (fill_value is None and gaps.any()):
+        mask = np.zeros(len(data), dtype=np.bool_)
+    for tr, start, end, previous_end, overlap, is_masked in zip(
+            traces, positions, ends, previous_ends, overlaps, masked):
+        if overlap:
+            common = min(end, previous_end) - start
+            if not np.array_equal(data[start:start + common],
+                                  tr.data[:common]):
+                return None
+        data[start:end] = np.ma.getdata(tr.data)
+        if is_masked:
+            mask[start:end] = np.ma.getmaskarray(tr.data)
+    for start, previous_end in zip(positions[gaps], previous_ends[gaps]):
+        if latest:
+            value = data[previous_end - 1]
+        elif interpolate:
+            value = (data[previous_end - 1], data[start])
+        else:
+            value = fill_value
+        gap = create_empty_data_chunk(start - previous_end, data.dtype, value)
+        data[previous_end:start] = np.ma.getdata(gap)
+        if value is None:
+            mask[previous_end:start] = True
+    if mask is not None and mask.any():
+        data = np.ma.masked_array(data, mask=mask)
+
+    out = first.__class__(header=copy.deepcopy(first.stats))
+    out.data = data
+    return out
+
+
+def _remove_response_batched(traces, response, sampling_rate, info,
+                             output, water_level, pre_filt, zero_mean, taper,
+                             taper_fraction, **kwargs):
+    """
+    Deconvolve the response from traces of equal length and sampling rate
+    sharing the same response as rows of 2-D arrays.
+
+    Performs the same steps as :meth:`~obspy.core.trace.Trace.remove_response`
+    but evaluates the frequency vector, the pre-filter taper and the inverted
+    response spectrum only once.
+    """
+    from obspy.signal.invsim import (cosine_taper, cosine_sac_taper,
+                                     invert_spectrum)
+    from obspy.signal.util import _npts2nfft
+    limit_numpy_fft_cache()
+
+    npts = traces[0].stats.npts
+    nfft = _npts2nfft(npts)
+    fy = sampling_rate / 2.0
+    freqs = np.linspace(0, fy, nfft // 2 + 1).astype(np.float64)
+    freq_response = response.get_response_for_frequencies(
+        freqs, output=output, **kwargs)
+    if water_level is None:
+        freq_response[0] = 0.0
+        freq_response[1:] = 1.0 / freq_response[1:]
+    else:
+        invert_spectrum(freq_response, water_level)
+    if pre_filt:
+        freq_domain_taper = cosine_sac_taper(freqs, flimit=pre_filt)
+    if taper:
+        time_domain_taper = cosine_taper(npts, taper_fraction,
+                                         sactaper=True, halfcosine=False)
+
+    rows = max(1, _REMOVE_RESPONSE_BATCH_SIZE // nfft)
+    for i in range(0, len(traces), rows):
+        batch = traces[i:i + rows]
+        data = np.empty((len(batch), npts), dtype=np.float64)
+        for j, tr in enumerate(batch):
+            data[j] = tr.data
+        if zero_mean:
+            data -= data.mean(axis=1)[:, np.newaxis]
+        if taper:
+            data *= time_domain_taper
+        data = np.fft.rfft(data, n=nfft, axis=1)
+        if pre_filt:
+            data *= freq_domain_taper
+        data *= freq_response
+        data[:, -1] = np.abs(data[:, -1]) + 0.0j
+        data = np.fft.irfft(data, axis=1)[:, :npts]
+        for j, tr in enumerate(batch):
+            tr.data = data[j]
+            tr._internal_add_processing_info(info)
+
+
 def _is_pickle(filename):  # @UnusedVariable
     """
     Check whether a file is a pickled ObsPy Stream file.
@@ -480,6 +480,20 @@ class CatalogTestCase(unittest.TestCase):
             self.assertTrue(all(event in cat_smaller
                                 for event in cat_bigger_inverse))
 
+    def test_filter_time_outside_of_array_range(self):
+        """
+        Origin times and rule values outside of the years supported by
+        UTCDateTimeArray are compared one by one.
+        """
+        cat = read_events()
+        cat[0].origins[0].time = UTCDateTime(1600, 1, 1)
+        old = cat.filter("time < 1650-01-01")
+        self.assertEqual(old.events, [cat[0]])
+        self.assertEqual(cat.filter("time > 1500-01-01").events, cat.events)
+        self.assertEqual(cat.filter("time > 1650-01-01").events,
+                         cat.events[1:])
+        self.assertEqual(cat.filter("time >= 2500-01-01").events, [])
+
     def test_catalog_resource_id(self):
         """
         See #662
@@ -13,7 +13,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import copy
 import os
+import pickle
 import unittest
 import warnings
 
@@ -332,6 +334,75 @@ class InventoryTestCase(unittest.TestCase):
         # exist.
         self.assertEqual(len(inv.select(network="RR")), 0)
 
+    def test_channel_index(self):
+        """
+        Tests that lookups via the channel index notice changes to the
+        inventory.
+        """
+        inv = read_inventory()
+        t = UTCDateTime(2007, 7, 1)
+        net = inv[0]
+        sta = net[0]
+        cha = sta[0]
+        seed_id = "GR.FUR..HHZ"
+        self.assertIs(inv.get_response(seed_id, t), cha.response)
+        self.assertIs(net.get_response(seed_id, t), cha.response)
+        # The index is neither compared nor pickled.
+        self.assertIn("_channel_index", inv.__dict__)
+        self.assertEqual(inv, read_inventory())
+        self.assertNotIn("_channel_index",
+                         pickle.loads(pickle.dumps(inv)).__dict__)
+        # Changed codes.
+        cha.location_code = "00"
+        self.assertRaises(Exception, inv.get_response, seed_id, t)
+        self.assertIs(inv.get_response("GR.FUR.00.HHZ", t), cha.response)
+        # Changed dates.
+        cha.start_date = UTCDateTime(2008, 1, 1)
+        self.assertRaises(Exception, inv.get_response, "GR.FUR.00.HHZ", t)
+        cha.start_date = None
+        # Channels and stations replaced in place.
+        other = copy.deepcopy(sta[1])
+        sta.channels[0] = other
+        self.assertRaises(Exception, inv.get_response, "GR.FUR.00.HHZ", t)
+        self.assertIs(inv.get_response("GR.FUR.%s.%s" % (
+            other.location_code, other.code), t), other.response)
+        sta.channels[0] = cha
+        self.assertIs(inv.get_response("GR.FUR.00.HHZ", t), cha.response)
+        other = copy.deepcopy(sta)
+        other.code = "OTH"
+        net.stations[0] = other
+        self.assertEqual(len(inv.select(station="FUR")), 0)
+        self.assertRaises(Exception, inv.get_response, "GR.FUR.00.HHZ", t)
+        net.stations[0] = sta
+        # Codes changed elsewhere do not invalidate the index.
+        index = inv._get_channel_index()
+        read_inventory()[0][0][0].code = "XYZ"
+        self.assertIs(inv.get_response("GR.FUR.00.HHZ", t), cha.response)
+        self.assertIs(inv._get_channel_index(), index)
+        # Added channels, stations and networks.
+        new_cha = copy.deepcopy(cha)
+        new_cha.code = "HHX"
+        sta.channels.append(new_cha)
+        self.assertEqual(inv.get_coordinates("GR.FUR.00.HHX")["latitude"],
+                         cha.latitude)
+        new_sta = copy.deepcopy(sta)
+        new_sta.code = "NEW"
+        net.stations.append(new_sta)
+        self.assertEqual(len(inv.select(station="NEW")), 1)
+        self.assertEqual(inv.get_coordinates("GR.NEW.00.HHX")["latitude"],
+                         cha.latitude)
+        self.assertEqual(len(net.select(station="NEW")), 1)
+        new_net = copy.deepcopy(net)
+        new_net.code = "XX"
+        inv += new_net
+        self.assertEqual(len(inv.select(station="new")), 2)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("ignore")
+            inv.get_coordinates("XX.NEW.00.HHX")
+        # Removed channels.
+        sta.channels.pop()
+        self.assertRaises(Exception, inv.get_coordinates, "GR.FUR.00.HHX")
+
     def test_util_unified_content_string(self):
         """
         Tests helper routine that compresses inventory content lists.
@@ -13,6 +13,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import copy
 import inspect
 import os
 import unittest
@@ -24,6 +25,7 @@ import scipy.interpolate
 from matplotlib import rcParams
 
 from obspy import UTCDateTime, read_inventory
+from obspy.core.compatibility import mock
 from obspy.core.inventory.response import (
     _pitick2latex, PolesZerosResponseStage)
 from obspy.core.util import MATPLOTLIB_VERSION
@@ -267,6 +269,53 @@ class ResponseTestCase(unittest.TestCase):
             "stage with frequencies only from -0.0096 - 20.0096 Hz. You are "
             "requesting a response from 0.4500 - 22.5000 Hz.")
 
+    def test_get_response_for_frequencies(self):
+        """
+        Tests the NumPy response evaluation against evalresp.
+        """
+        filenames = ["IRIS_single_channel_with_response.xml", "XM.05.xml",
+                     "AU.MEEK.xml", "IM_IL31__BHZ.xml"]
+        for filename in filenames:
+            inv = read_inventory(os.path.join(self.data_dir, filename))
+            for cha in inv[0][0]:
+                freqs = np.linspace(0.0, cha.sample_rate / 2.0, 1001)
+                for output in ["DISP", "VEL", "ACC"]:
+                    start_stages = [None]
+                    if len(cha.response.response_stages) > 1:
+                        start_stages.append(2)
+                    for start_stage in start_stages:
+                        expected = cha.response.\
+                            get_evalresp_response_for_frequencies(
+                                freqs, output=output,
+                                start_stage=start_stage)
+                        got = cha.response.get_response_for_frequencies(
+                            freqs, output=output, start_stage=start_stage)
+                        np.testing.assert_allclose(got, expected, rtol=1e-9)
+
+    def test_get_response_for_frequencies_cache(self):
+        """
+        Tests that responses with identical content share cached results.
+        """
+        inv = read_inventory(os.path.join(self.data_dir, "AU.MEEK.xml"))
+        response = inv[0][0][0].response
+        freqs = np.linspace(0.0, 20.0, 101)
+        first = response.get_response_for_frequencies(freqs)
+        # A changed copy gets a new result.
+        other = copy.deepcopy(response)
+        other.response_stages[0].stage_gain *= 2
+        np.testing.assert_allclose(
+            other.get_response_for_frequencies(freqs), 2 * first)
+        # An identical copy gets the cached result.
+        other.response_stages[0].stage_gain /= 2
+        with mock.patch("obspy.core.inventory.response._evaluate_response",
+                        side_effect=AssertionError):
+            second = other.get_response_for_frequencies(freqs)
+        np.testing.assert_array_equal(first, second)
+        # Returned arrays can be changed without affecting the cache.
+        second[:] = 0
+        np.testing.assert_array_equal(
+            response.get_response_for_frequencies(freqs), first)
+
 
 def suite():
     return unittest.makeSuite(ResponseTestCase, 'test')
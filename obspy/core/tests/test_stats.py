@@ -228,6 +228,64 @@ class StatsTestCase(unittest.TestCase):
         self.assertEqual(ad, adict)
         self.assertEqual(adict, ad)
 
+    def test_default_attributes_in_slots(self):
+        """
+        Default attributes are kept in slots, only additional attributes
+        are stored in the instance dictionary.
+        """
+        stats = Stats({'network': 'BW', 'npts': 11, 'sampling_rate': 10,
+                       'starttime': UTCDateTime(2009, 1, 1), 'mseed': {}})
+        self.assertEqual(list(stats.__dict__), ['mseed'])
+        self.assertEqual(len(stats), 11)
+        self.assertEqual(list(stats)[:10], list(Stats.defaults))
+        self.assertEqual(stats.endtime, UTCDateTime(2009, 1, 1, 0, 0, 1))
+        self.assertEqual(stats['endtime'], stats.endtime)
+        self.assertEqual(stats['delta'], 0.1)
+        # derived values get updated
+        stats.npts = 21
+        self.assertEqual(stats.endtime, UTCDateTime(2009, 1, 1, 0, 0, 2))
+        stats.delta = 1.0
+        self.assertEqual(stats.sampling_rate, 1.0)
+        self.assertEqual(stats.endtime, UTCDateTime(2009, 1, 1, 0, 0, 20))
+        stats.starttime += 10
+        self.assertEqual(stats.endtime, UTCDateTime(2009, 1, 1, 0, 0, 30))
+        # deleting default attributes resets them to their default values
+        del stats.network
+        self.assertEqual(stats.network, '')
+        del stats['mseed']
+        self.assertNotIn('mseed', stats)
+        # copies do not share the start time
+        stats2 = copy.deepcopy(stats)
+        stats2.starttime.year = 2010
+        self.assertEqual(stats.starttime.year, 2009)
+        self.assertEqual(stats2.endtime, UTCDateTime(2010, 1, 1, 0, 0, 30))
+        # state of Stats objects pickled by older versions
+        state = dict(stats)
+        state['npts'] = 1
+        stats3 = Stats.__new__(Stats)
+        stats3.__setstate__(state)
+        self.assertEqual(stats3.npts, 1)
+        self.assertEqual(stats3.endtime, stats3.starttime)
+
+    def test_clear_and_popitem(self):
+        """
+        Clearing resets the default attributes and removes all others,
+        popitem() only removes additional attributes.
+        """
+        stats = Stats({'network': 'BW', 'npts': 11, 'sampling_rate': 10,
+                       'mseed': {}, 'processing': []})
+        key, value = stats.popitem()
+        self.assertIn(key, ('mseed', 'processing'))
+        self.assertNotIn(key, stats)
+        stats.popitem()
+        self.assertRaises(KeyError, stats.popitem)
+        self.assertEqual(stats.network, 'BW')
+        stats.mseed = {}
+        stats.clear()
+        self.assertEqual(stats, Stats())
+        self.assertEqual(stats.__dict__, {})
+        self.assertEqual(stats.endtime, UTCDateTime(0))
+
 
 def suite():
     return unittest.makeSuite(StatsTestCase, 'test')
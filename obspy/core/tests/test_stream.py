@@ -3,6 +3,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import itertools
 import os
 import pickle
 import unittest
@@ -11,7 +12,7 @@ from copy import deepcopy
 
 import numpy as np
 
-from obspy import Stream, Trace, UTCDateTime, read
+from obspy import Stream, Trace, UTCDateTime, read, read_inventory
 from obspy.core.compatibility import mock
 from obspy.core.stream import _is_pickle, _read_pickle, _write_pickle
 from obspy.core.util.attribdict import AttribDict
@@ -1097,6 +1098,54 @@ class StreamTestCase(unittest.TestCase):
             (4 * 1440 - 1) * trace1.stats.delta
         self.assertEqual(st[0].stats.endtime, endtime)
 
+    def test_merge_many_traces(self):
+        """
+        Merging many short traces with gaps, adjacent and overlapping parts
+        in one go has to give the same result as adding them up pairwise.
+        """
+        t = UTCDateTime(2017, 1, 1)
+        data = np.arange(5000, dtype=np.int32)
+        traces = []
+        for i in range(500):
+            # every 7th packet is missing, every 5th packet is sent twice
+            # and every 11th packet overlaps with the previous one
+            if i % 7 == 3:
+                continue
+            start = i * 10 - 3 * (i % 11 == 0 and i > 0)
+            tr = Trace(data=data[start:start + 10].copy())
+            tr.stats.starttime = t + start / 100.0
+            tr.stats.sampling_rate = 100.0
+            traces.append(tr)
+            if i % 5 == 0:
+                traces.append(tr.copy())
+        for fill_value in (None, 0, 'latest', 'interpolate'):
+            expected = traces[0]
+            for tr in traces[1:]:
+                expected = expected.__add__(tr, fill_value=fill_value)
+            st = Stream([tr.copy() for tr in traces[::-1]])
+            st.merge(fill_value=fill_value)
+            self.assertEqual(len(st), 1)
+            self.assertEqual(st[0].stats, expected.stats)
+            self.assertEqual(type(st[0].data), type(expected.data))
+            np.testing.assert_array_equal(st[0].data, expected.data)
+            if fill_value is None:
+                np.testing.assert_array_equal(st[0].data.mask,
+                                              expected.data.mask)
+        # overlaps with differing data are still handled pairwise
+        for tr in traces:
+            if tr.stats.starttime == t + 48.37:
+                tr.data += 1
+        for method in (0, 1):
+            expected = traces[0]
+            for tr in traces[1:]:
+                expected = expected.__add__(tr, method=method)
+            st = Stream([tr.copy() for tr in traces])
+            st.merge(method=method)
+            self.assertEqual(len(st), 1)
+            np.testing.assert_array_equal(st[0].data, expected.data)
+            np.testing.assert_array_equal(st[0].data.mask,
+                                          expected.data.mask)
+
     def test_merge_overlaps_method_1(self):
         """
         Test merging with method = 1.
@@ -1803,6 +1852,27 @@ class StreamTestCase(unittest.TestCase):
             self.assertRaises(UserWarning, read, '/path/to/slist_float.ascii',
                               headonly=True, starttime=0, endtime=1)
 
+    def test_read_with_workers(self):
+        """
+        Reading multiple files with worker processes keeps the order of the
+        files and passes all options on to the readers.
+        """
+        path = os.path.dirname(__file__)
+        mseed_path = os.path.join(path, "..", "..", "io", "mseed", "tests",
+                                  "data")
+        filename = os.path.join(mseed_path, "BW.*")
+        starttime = UTCDateTime(2008, 1, 1, 0, 0, 5)
+        for kwargs in [{}, {'headonly': True}, {'starttime': starttime}]:
+            st = read(filename, format="MSEED", **kwargs)
+            self.assertGreater(len(st), 2)
+            for workers in (2, 3):
+                st2 = read(filename, format="MSEED", workers=workers,
+                           **kwargs)
+                self.assertEqual(st, st2)
+        # single files are always read directly
+        filename = os.path.join(mseed_path, "test.mseed")
+        self.assertEqual(read(filename, workers=2), read(filename))
+
     def test_read_url_via_network(self):
         """
         Testing read function with an URL fetching data via network connection
@@ -1834,6 +1904,36 @@ class StreamTestCase(unittest.TestCase):
         self.assertEqual(st.traces[0], st2.traces[0])
         self.assertFalse(st.traces[0] is st2.traces[0])
 
+    def test_copy_without_data(self):
+        """
+        Test copying only the headers of a Stream.
+        """
+        st = read()
+        st.append(st[0])
+        expected = st.copy()
+        expected.filter('lowpass', freq=1.0).detrend().taper(0.05)
+        st2 = st.copy(data=False)
+        self.assertEqual(st2, st)
+        # traces contained twice stay the same object in the copy
+        self.assertIs(st2[3], st2[0])
+        for tr, tr2 in zip(st, st2):
+            self.assertIsNot(tr2, tr)
+            self.assertIsNot(tr2.stats, tr.stats)
+            self.assertTrue(np.shares_memory(tr2.data, tr.data))
+            self.assertFalse(tr2.data.flags.writeable)
+        st2.filter('lowpass', freq=1.0).detrend().taper(0.05)
+        for tr, tr2, tr_expected in zip(st, st2, expected):
+            self.assertFalse(np.shares_memory(tr2.data, tr.data))
+            np.testing.assert_allclose(tr2.data, tr_expected.data)
+        self.assertEqual(st[:3], read())
+        # processing the original stream leaves the copy untouched
+        for tr in st:
+            self.assertFalse(tr.data.flags.writeable)
+        raw = st.copy(data=False)
+        st[:3].filter('lowpass', freq=1.0, inplace=True).taper(0.05)
+        self.assertEqual(raw[:3], read())
+        self.assertIs(raw[3], raw[0])
+
     def test_merge_with_empty_trace(self):
         """
         Merging a stream containing a empty trace with a differing sampling
@@ -2123,6 +2223,59 @@ class StreamTestCase(unittest.TestCase):
         # Clearing also works for method chaining.
         self.assertEqual(len(st.clear()), 0)
 
+    def test_filter_batched(self):
+        """
+        Filtering many traces with same number of samples and sampling rate
+        in one go gives the same results as filtering them one by one.
+        """
+        np.random.seed(815)
+        st = Stream()
+        for i, dtype in enumerate((np.int32, np.float32, np.float64) * 4):
+            tr = Trace(data=(np.random.randn(1000 + 100 * (i % 2)) *
+                             1e3).astype(dtype))
+            tr.stats.station = "A%02d" % i
+            tr.stats.sampling_rate = 100.0
+            st.append(tr)
+        st.append(st[-1].copy())
+        st[-1].data.flags.writeable = False
+        for (type_, options), inplace in itertools.product(
+                (("bandpass", dict(freqmin=1.0, freqmax=5.0)),
+                 ("highpass", dict(freq=2.0, zerophase=True)),
+                 ("lowpass_cheby_2", dict(freq=5.0))), (False, True)):
+            expected = st.copy()
+            expected[-1].data.flags.writeable = False
+            for tr in expected:
+                tr.filter(type_, inplace=inplace, **options)
+            got = st.copy()
+            got[-1].data.flags.writeable = False
+            data = [tr.data for tr in got]
+            with mock.patch("obspy.core.stream._FILTER_BATCH_SIZE", 2000):
+                got.filter(type_, inplace=inplace, **options)
+            for tr_got, tr_expected, data_ in zip(got, expected, data):
+                self.assertEqual(tr_got.stats, tr_expected.stats)
+                self.assertEqual(tr_got.data.dtype, tr_expected.data.dtype)
+                np.testing.assert_array_equal(tr_got.data, tr_expected.data)
+                if not inplace:
+                    self.assertIsNot(tr_got.data, data_)
+
+    def test_filter_does_not_change_shared_data(self):
+        """
+        Filtering a sliced stream without ``inplace`` leaves the data of the
+        original stream untouched, also if traces are filtered in one go.
+        """
+        st = read()
+        for tr in st:
+            tr.data = tr.data.astype(np.float64)
+        expected = st.copy()
+        data = [tr.data for tr in st]
+        t = st[0].stats.starttime
+        st.slice(t + 5, t + 10).filter("lowpass", freq=5.0)
+        self.assertEqual(st, expected)
+        st.filter("lowpass", freq=5.0)
+        for tr, data_, tr_expected in zip(st, data, expected):
+            self.assertIsNot(tr.data, data_)
+            np.testing.assert_array_equal(data_, tr_expected.data)
+
     def test_simulate_seedresp_parser(self):
         """
         Test simulate() with giving a Parser object to use for RESP information
@@ -2196,6 +2349,36 @@ class StreamTestCase(unittest.TestCase):
         st2.remove_response(pre_filt=(0.1, 0.5, 30, 50))
         self.assertEqual(st1, st2)
 
+    def test_remove_response_batched(self):
+        """
+        Deconvolving many traces with same number of samples, sampling rate
+        and response in one go gives the same results as deconvolving them
+        one by one.
+        """
+        inv = read_inventory()
+        st = Stream()
+        for i, tr in enumerate(read() * 3):
+            tr.data = tr.data[:1000 + 100 * (i % 2)]
+            st.append(tr)
+        st.append(st[0])
+        for options in (dict(),
+                        dict(pre_filt=(0.1, 0.5, 30, 50), output="DISP"),
+                        dict(water_level=None, zero_mean=False, taper=False)):
+            expected = Stream([tr.copy() for tr in st])
+            expected[-1] = expected[0]
+            for tr in expected:
+                tr.remove_response(inventory=inv, **options)
+            got = Stream([tr.copy() for tr in st])
+            got[-1] = got[0]
+            with mock.patch(
+                    "obspy.core.stream._REMOVE_RESPONSE_BATCH_SIZE", 2000):
+                got.remove_response(inventory=inv, **options)
+            for tr_got, tr_expected in zip(got, expected):
+                self.assertEqual(tr_got.stats, tr_expected.stats)
+                np.testing.assert_allclose(
+                    tr_got.data, tr_expected.data, rtol=0,
+                    atol=1e-12 * np.abs(tr_expected.data).max())
+
     def test_remove_sensitivity(self):
         """
         Tests that the remove_sensitivity method is called for all traces of a
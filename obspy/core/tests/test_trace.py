@@ -1327,6 +1327,52 @@ class TraceTestCase(unittest.TestCase):
             self.assertLessEqual(tr.data[i], 1.)
             self.assertGreaterEqual(tr.data[i], 0.)
 
+    def test_processing_in_place(self):
+        """
+        Floating point data is processed in place, without allocating a new
+        data array, and keeps its dtype if requested.
+        """
+        for dtype in (np.float32, np.float64):
+            tr = read()[0]
+            tr.data = tr.data.astype(dtype)
+            data = tr.data
+            expected = tr.copy()
+            for tr_ in (tr, expected):
+                tr_.detrend("simple")
+                tr_.taper(max_percentage=0.05)
+            expected.filter("bandpass", freqmin=1.0, freqmax=10.0,
+                            zerophase=True)
+            expected.filter("lowpass_cheby_2", freq=5.0)
+            # by default a new double precision array is returned
+            self.assertEqual(expected.data.dtype, np.float64)
+            tr.filter("bandpass", freqmin=1.0, freqmax=10.0, zerophase=True,
+                      inplace=True)
+            tr.filter("lowpass_cheby_2", freq=5.0, inplace=True)
+            self.assertIs(tr.data, data)
+            self.assertEqual(tr.data.dtype, dtype)
+            np.testing.assert_allclose(tr.data, expected.data, rtol=1e-4,
+                                       atol=1e-4 * abs(expected.data).max())
+        # read only data can not be filtered in place
+        tr = read()[0]
+        tr.data = tr.data.astype(np.float64)
+        tr.data.flags.writeable = False
+        expected = tr.copy().filter("lowpass", freq=5.0).data
+        tr.filter("lowpass", freq=5.0, inplace=True)
+        np.testing.assert_array_equal(tr.data, expected)
+
+    def test_filter_does_not_change_shared_data(self):
+        """
+        Filtering a slice or a header-only copy without ``inplace`` leaves the
+        data of the original trace untouched.
+        """
+        tr = read()[0]
+        tr.data = tr.data.astype(np.float64)
+        data = tr.data.copy()
+        tr.slice(tr.stats.starttime + 5, tr.stats.starttime + 10).filter(
+            "lowpass", freq=5.0)
+        tr.copy(data=False).filter("lowpass", freq=5.0)
+        np.testing.assert_array_equal(tr.data, data)
+
     def test_taper_onesided(self):
         """
         Test onesided taper method of trace
@@ -1427,6 +1473,9 @@ class TraceTestCase(unittest.TestCase):
         np.testing.assert_allclose(
             [t_.timestamp for t_ in got[:5]],
             [t_.timestamp for t_ in expected], rtol=1e-17)
+        got = tr.times("utcdatetimearray")
+        self.assertEqual(got[:5].tolist(), expected.tolist())
+        self.assertEqual(len(got), tr.stats.npts)
         got = tr.times("timestamp")
         expected = np.arange(0, 4.5 * delta, delta) + 946684800.0
         np.testing.assert_allclose(got[:5], expected, rtol=1e-17)
@@ -1437,6 +1486,25 @@ class TraceTestCase(unittest.TestCase):
             730120.00000231480225920677])
         np.testing.assert_allclose(got[:5], expected, rtol=1e-17)
 
+    def test_times_outside_of_array_range(self):
+        """
+        Traces before 1678 still return UTCDateTime objects, only the
+        UTCDateTimeArray raises.
+        """
+        tr = Trace(data=np.ones(10))
+        tr.stats.starttime = UTCDateTime(1600, 1, 1)
+        got = tr.times("utcdatetime")
+        self.assertEqual(got[0], UTCDateTime(1600, 1, 1))
+        self.assertEqual(got[-1], tr.stats.endtime)
+        self.assertRaises(ValueError, tr.times, "utcdatetimearray")
+        # gaps between traces before 1678
+        tr2 = tr.copy()
+        tr2.stats.starttime += 20
+        gaps = Stream([tr, tr2]).get_gaps()
+        self.assertEqual(len(gaps), 1)
+        self.assertEqual(gaps[0][4:], [tr.stats.endtime, tr2.stats.starttime,
+                                       10.0, 10])
+
     def test_modulo_operation(self):
         """
         Method for testing the modulo operation. Mainly tests part not covered
@@ -2694,6 +2762,48 @@ class TraceTestCase(unittest.TestCase):
         self.assertFalse(tr_opt_out.data.flags['C_CONTIGUOUS'])
         self.assertFalse(tr_opt_out.data.flags['F_CONTIGUOUS'])
 
+    def test_copy_without_data(self):
+        """
+        Test that copy(data=False) copies the header, shares the data as a
+        read-only view and that processing the copy leaves the original
+        untouched.
+        """
+        tr = read()[0]
+        original = tr.data.copy()
+        for method, args, kwargs in (
+                ('detrend', (), {}), ('taper', (0.05,), {}),
+                ('normalize', (), {}),
+                ('filter', ('lowpass',), {'freq': 1.0})):
+            tr2 = tr.copy(data=False)
+            self.assertEqual(tr2, tr)
+            self.assertIsNot(tr2.stats, tr.stats)
+            self.assertTrue(np.shares_memory(tr2.data, tr.data))
+            self.assertFalse(tr2.data.flags.writeable)
+            self.assertFalse(tr.data.flags.writeable)
+            with self.assertRaises(ValueError):
+                tr2.data[0] = 0
+            with self.assertRaises(ValueError):
+                tr.data[0] = 0
+            tr2.stats.station = "XYZ"
+            getattr(tr2, method)(*args, **kwargs)
+            self.assertFalse(np.shares_memory(tr2.data, tr.data))
+            self.assertEqual(tr.stats.station, "RJOB")
+            np.testing.assert_array_equal(tr.data, original)
+            # processing the original in place leaves the copy untouched
+            tr3 = tr.copy(data=False)
+            if method == 'filter':
+                kwargs = dict(kwargs, inplace=True)
+            getattr(tr, method)(*args, **kwargs)
+            self.assertFalse(np.shares_memory(tr3.data, tr.data))
+            np.testing.assert_array_equal(tr3.data, original)
+            tr.data = original.copy()
+        # masked arrays get their own mask
+        tr = Trace(np.ma.masked_array(np.arange(5.0),
+                                      mask=[0, 1, 0, 0, 0]))
+        tr2 = tr.copy(data=False)
+        tr2.data.mask[0] = True
+        np.testing.assert_array_equal(tr.data.mask, [0, 1, 0, 0, 0])
+
 
 def suite():
     return unittest.makeSuite(TraceTestCase, 'test')
@@ -5,11 +5,13 @@ from future.builtins import *  # NOQA @UnusedWildImport
 
 import copy
 import datetime
+import pickle
 import unittest
 
 import numpy as np
 
 from obspy import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTimeArray
 
 
 class UTCDateTimeTestCase(unittest.TestCase):
@@ -1121,6 +1123,128 @@ class UTCDateTimeTestCase(unittest.TestCase):
         self.assertFalse(a == e)
         self.assertFalse(e == a)
 
+    def test_iso8601_fast_path(self):
+        """
+        Tests that the fast path for common ISO8601 strings gives the same
+        results as the full parser, also for cached strings.
+        """
+        strings = ["2009-08-24T00:20:03Z", "2009-08-24T00:20",
+                   "2009-08-24T00:20:03.1", "2009-08-24T00:20:03.000001Z",
+                   " 2008-02-29T23:59:59.999999Z ", "1000-01-01T00:00:00",
+                   "9999-12-31T23:59:59.5Z", "1969-12-31T23:59:59.999999"]
+        for _ in range(2):
+            for string in strings:
+                dt = UTCDateTime(string)
+                expected = UTCDateTime(string, iso8601=True)
+                self.assertEqual(dt._ns, expected._ns)
+                self.assertEqual(dt.precision, expected.precision)
+        # more than six digits and time zones are handled by the full parser
+        self.assertEqual(UTCDateTime("2009-08-24T00:20:03.1234567Z")._ns,
+                         1251073203123457000)
+        self.assertEqual(UTCDateTime("2009-08-24T02:20:03+02:00"),
+                         UTCDateTime(2009, 8, 24, 0, 20, 3))
+        # invalid dates still raise
+        for string in ("2009-02-29T00:00:00", "2009-08-24T24:00:00",
+                       "2009-13-01T00:00:00", "2009-08-24T00:20:60"):
+            self.assertRaises(ValueError, UTCDateTime, string)
+
+    def test_slots_and_pickling(self):
+        """
+        UTCDateTime objects have no instance dictionary and can still be
+        pickled with all protocols, including objects pickled on older
+        versions.
+        """
+        dt = UTCDateTime(2009, 8, 24, 0, 20, 3, 40000, precision=4)
+        self.assertFalse(hasattr(dt, "__dict__"))
+        self.assertRaises(AttributeError, setattr, dt, "foo", 1)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            dt2 = pickle.loads(pickle.dumps(dt, protocol=protocol))
+            self.assertEqual(dt2._ns, dt._ns)
+            self.assertEqual(dt2.precision, 4)
+        # state of objects pickled on ObsPy < 1.1
+        dt2 = UTCDateTime.__new__(UTCDateTime)
+        dt2.__setstate__({"timestamp": 1251073203.0399999618,
+                          "_UTCDateTime__precision": 6})
+        self.assertEqual(dt2._ns, 1251073203040000000)
+        self.assertEqual(dt2.precision, 6)
+
+    def test_utcdatetime_array(self):
+        """
+        Tests construction, arithmetic, comparisons and conversions of
+        UTCDateTimeArray.
+        """
+        objs = [UTCDateTime(2009, 8, 24, 0, 20, 3),
+                UTCDateTime(2009, 8, 24, 0, 20, 3, 500000),
+                UTCDateTime(2010, 1, 1)]
+        times = UTCDateTimeArray(objs)
+        self.assertEqual(len(times), 3)
+        self.assertEqual(times.ns.tolist(), [t._ns for t in objs])
+        self.assertEqual(times.tolist(), objs)
+        self.assertEqual(times[1], objs[1])
+        self.assertEqual(times[-2:].tolist(), objs[-2:])
+        # other ways of construction give the same times
+        for values in ([str(t) for t in objs],
+                       np.array([t.timestamp for t in objs]),
+                       times.to_datetime64(), times):
+            np.testing.assert_array_equal(UTCDateTimeArray(values).ns,
+                                          times.ns)
+        np.testing.assert_array_equal(
+            UTCDateTimeArray(np.array([0, 1])).ns, [0, 10**9])
+        self.assertEqual(times.to_datetime64()[0],
+                         np.datetime64("2009-08-24T00:20:03", "ns"))
+        # arithmetic
+        self.assertEqual((times + 1.5).tolist(), [t + 1.5 for t in objs])
+        self.assertEqual((times - np.arange(3)).tolist(),
+                         [t - i for i, t in enumerate(objs)])
+        np.testing.assert_array_equal(times - objs[0],
+                                      [t - objs[0] for t in objs])
+        np.testing.assert_array_equal(times - times, [0, 0, 0])
+        self.assertRaises(TypeError, times.__add__, objs[0])
+        # comparisons
+        np.testing.assert_array_equal(times > objs[1], [False, False, True])
+        np.testing.assert_array_equal(times <= objs[1], [True, True, False])
+        np.testing.assert_array_equal(times == objs[1] + 1e-7,
+                                      [False, True, False])
+        np.testing.assert_array_equal(times != times, [False] * 3)
+        np.testing.assert_array_equal(times < objs[0].timestamp + 1,
+                                      [True, True, False])
+        # searching
+        self.assertEqual(times.searchsorted(objs[1]), 1)
+        self.assertEqual(times.searchsorted(objs[1], side="right"), 2)
+        np.testing.assert_array_equal(times.searchsorted(times), [0, 1, 2])
+        self.assertEqual(times.min(), objs[0])
+        self.assertEqual(times.max(), objs[2])
+        # item assignment
+        times[0] = objs[2]
+        self.assertEqual(times[0], objs[2])
+        # out of range of 64 bit nanoseconds
+        self.assertRaises(ValueError, UTCDateTimeArray,
+                          [UTCDateTime(3000, 1, 1)])
+        self.assertRaises(ValueError, UTCDateTimeArray, np.array([1e10]))
+
+    def test_utcdatetime_array_calendar(self):
+        """
+        Tests that the calendar properties of UTCDateTimeArray match the
+        ones of UTCDateTime.
+        """
+        np.random.seed(815)
+        timestamps = np.concatenate((
+            np.random.uniform(-9e9, 9e9, 1000),
+            np.random.uniform(-1e6, 1e6, 100), [0.0, -1e-9]))
+        times = UTCDateTimeArray(timestamps)
+        objs = [UTCDateTime(t) for t in timestamps]
+        for key in ("year", "month", "day", "julday", "hour", "minute",
+                    "second", "microsecond", "weekday"):
+            np.testing.assert_array_equal(getattr(times, key),
+                                          [getattr(t, key) for t in objs])
+        np.testing.assert_array_equal(times.isoweekday(),
+                                      [t.isoweekday() for t in objs])
+        np.testing.assert_array_equal(np.array(times.isocalendar()).T,
+                                      [t.isocalendar() for t in objs])
+        np.testing.assert_allclose(
+            times._get_hours_after_midnight(),
+            [t._get_hours_after_midnight() for t in objs], rtol=0, atol=1e-9)
+
 
 def suite():
     return unittest.makeSuite(UTCDateTimeTestCase, 'test')
@@ -22,7 +22,7 @@ import numpy as np
 from decorator import decorator
 
 from obspy.core import compatibility
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
 from obspy.core.util import AttribDict, create_empty_data_chunk
 from obspy.core.util.base import _get_function_from_entry_point
 from obspy.core.util.decorator import raise_if_masked, skip_if_no_data
@@ -144,17 +144,50 @@ class Stats(AttribDict):
         'location': '',
         'channel': '',
     }
+    # The default attributes live in slots, only additional (e.g. format
+    # specific) attributes are stored in the instance dictionary. The
+    # endtime is derived on first access after a change.
+    __slots__ = ('sampling_rate', 'delta', 'starttime', '_endtime', 'npts',
+                 'calib', 'network', 'station', 'location', 'channel')
+    _keys = tuple(defaults)
+    _slot_keys = frozenset(defaults)
 
     def __init__(self, header={}):
         """
         """
-        super(Stats, self).__init__(header)
+        self._set_defaults()
+        self.update(dict(header))
+
+    def _set_defaults(self):
+        set_ = object.__setattr__
+        for key in ('sampling_rate', 'delta', 'starttime', 'npts', 'calib',
+                    'network', 'station', 'location', 'channel'):
+            set_(self, key, self.defaults[key])
+        set_(self, '_endtime', self.defaults['endtime'])
+
+    @property
+    def endtime(self):
+        endtime = self._endtime
+        if endtime is None:
+            # set derived value: endtime
+            if self.npts == 0:
+                timediff = 0
+            else:
+                timediff = float(self.npts - 1) * self.delta
+            endtime = self.starttime + timediff
+            object.__setattr__(self, '_endtime', endtime)
+        return endtime
+
+    def __getitem__(self, name, default=None):
+        if name in self._slot_keys:
+            return getattr(self, name)
+        return super(Stats, self).__getitem__(name, default)
 
     def __setitem__(self, key, value):
         """
         """
         # keys which need to refresh derived values
-        if key in ['delta', 'sampling_rate', 'starttime', 'npts']:
+        if key in ('delta', 'sampling_rate', 'starttime', 'npts'):
             # ensure correct data type
             if key == 'delta':
                 key = 'sampling_rate'
@@ -166,32 +199,92 @@ class Stats(AttribDict):
             elif key == 'npts':
                 value = int(value)
             # set current key
-            super(Stats, self).__setitem__(key, value)
+            object.__setattr__(self, key, value)
             # set derived value: delta
             try:
-                delta = 1.0 / float(self.sampling_rate)
+                delta = 1.0 / self.sampling_rate
             except ZeroDivisionError:
                 delta = 0
-            self.__dict__['delta'] = delta
-            # set derived value: endtime
-            if self.npts == 0:
-                timediff = 0
-            else:
-                timediff = float(self.npts - 1) * delta
-            self.__dict__['endtime'] = self.starttime + timediff
+            object.__setattr__(self, 'delta', delta)
+            object.__setattr__(self, '_endtime', None)
             return
+        if key in self.readonly:
+            msg = 'Attribute "%s" in %s object is read only!'
+            raise AttributeError(msg % (key, self.__class__.__name__))
         # prevent a calibration factor of 0
         if key == 'calib' and value == 0:
             msg = 'Calibration factor set to 0.0!'
             warnings.warn(msg, UserWarning)
+        if key in self._slot_keys:
+            object.__setattr__(self, key, value)
         # all other keys
-        if isinstance(value, dict):
+        elif isinstance(value, dict):
             super(Stats, self).__setitem__(key, AttribDict(value))
         else:
             super(Stats, self).__setitem__(key, value)
 
     __setattr__ = __setitem__
 
+    def __delitem__(self, name):
+        # default attributes fall back to their default values
+        if name in self._slot_keys:
+            if name not in self.readonly:
+                self.__setitem__(name, self.defaults[name])
+            return
+        super(Stats, self).__delitem__(name)
+
+    __delattr__ = __delitem__
+
+    def clear(self):
+        """
+        Resets the default attributes and removes all others.
+        """
+        self._set_defaults()
+        self.__dict__.clear()
+
+    def popitem(self):
+        """
+        Removes and returns an additional attribute (the default attributes
+        can not be removed).
+        """
+        try:
+            return self.__dict__.popitem()
+        except KeyError:
+            raise KeyError("popitem(): no additional attributes")
+
+    def __iter__(self):
+        for key in self._keys:
+            yield key
+        for key in self.__dict__:
+            yield key
+
+    def __len__(self):
+        return len(self._keys) + len(self.__dict__)
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, dict(self))
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, adict):
+        self._set_defaults()
+        self.update(adict)
+
+    def __deepcopy__(self, *args, **kwargs):  # @UnusedVariable
+        stats = self.__class__.__new__(self.__class__)
+        set_ = object.__setattr__
+        for key in ('sampling_rate', 'delta', 'npts', 'calib', 'network',
+                    'station', 'location', 'channel'):
+            set_(stats, key, getattr(self, key))
+        starttime = self.starttime
+        set_(stats, 'starttime',
+             UTCDateTime(ns=starttime._ns, precision=starttime.precision))
+        set_(stats, '_endtime', None)
+        if self.__dict__:
+            stats.__dict__.update(deepcopy(self.__dict__))
+        return stats
+
     def __str__(self):
         """
         Return better readable string representation of Stats object.
@@ -205,10 +298,19 @@ class Stats(AttribDict):
         p.text(str(self))
 
 
-@decorator
-def _add_processing_info(func, *args, **kwargs):
+def _get_argument_names(func):
     """
-    This is a decorator that attaches information about a processing call as a
+    Return the names of the arguments of a function.
+    """
+    try:
+        return [p.name for p in inspect.signature(func).parameters.values()]
+    except AttributeError:
+        return inspect.getargspec(func).args
+
+
+def _get_processing_info(func, *args, **kwargs):
+    """
+    Return the information about a processing call that gets attached as a
     string to the Trace.stats.processing list.
     """
     callargs = inspect.getcallargs(func, *args, **kwargs)
@@ -226,7 +328,16 @@ def _add_processing_info(func, *args, **kwargs):
         ["%s=%s" % (k, repr(v)) if not isinstance(v, native_str) else
          "%s='%s'" % (k, v) for k, v in kwargs_.items()]
     arguments.sort()
-    info = info % "::".join(arguments)
+    return info % "::".join(arguments)
+
+
+@decorator
+def _add_processing_info(func, *args, **kwargs):
+    """
+    This is a decorator that attaches information about a processing call as a
+    string to the Trace.stats.processing list.
+    """
+    info = _get_processing_info(func, *args, **kwargs)
     self = args[0]
     result = func(*args, **kwargs)
     # Attach after executing the function to avoid having it attached
@@ -1432,7 +1543,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
 
     @_add_processing_info
     @raise_if_masked
-    def filter(self, type, **options):
+    def filter(self, type, inplace=False, **options):
         """
         Filter the data of the current trace.
 
@@ -1440,6 +1551,11 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :param type: String that specifies which filter is applied (e.g.
             ``"bandpass"``). See the `Supported Filter`_ section below for
             further details.
+        :type inplace: bool
+        :param inplace: If ``True``, floating point data is filtered in its
+            existing array instead of being replaced by a new double
+            precision array. See the note below. Integer and read-only data
+            are filtered as usual. Defaults to ``False``.
         :param options: Necessary keyword arguments for the respective filter
             that will be passed on. (e.g. ``freqmin=1.0``, ``freqmax=20.0`` for
             ``"bandpass"``)
@@ -1453,6 +1569,21 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             This also makes an entry with information on the applied processing
             in ``stats.processing`` of this trace.
 
+        .. note::
+
+            With ``inplace=True`` the Butterworth filters write the filtered
+            samples directly back into floating point data arrays, so no
+            second array as large as the data is needed and the data keeps its
+            dtype. Converting the data to single precision once (e.g.
+            ``tr.data = tr.data.astype(np.float32)``) hence halves the memory
+            used during all subsequent processing.
+
+            Any other object sharing the data array is changed as well then,
+            e.g. the parent trace of a trace returned by
+            :meth:`~obspy.core.trace.Trace.slice` or a header-only copy made
+            with ``copy(data=False)``. Only filter in place if the data array
+            is not shared.
+
         .. rubric:: _`Supported Filter`
 
         ``'bandpass'``
@@ -1497,6 +1628,15 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         type = type.lower()
         # retrieve function call from entry points
         func = _get_function_from_entry_point('filter', type)
+        if inplace and self.data.dtype in (np.float32, np.float64) and \
+                self.data.flags.writeable:
+            if 'inplace' in _get_argument_names(func):
+                func(self.data, df=self.stats.sampling_rate, inplace=True,
+                     **options)
+            else:
+                self.data[:] = func(self.data, df=self.stats.sampling_rate,
+                                    **options)
+            return self
         # filtering
         # the options dictionary is passed as kwargs to the function that is
         # mapped according to the filter_functions dictionary
@@ -1961,6 +2101,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                 type = 'constant'
             options['type'] = type
             original_dtype = self.data.dtype
+        elif not self.data.flags.writeable:
+            # ObsPy's detrend functions work in place, data shared with
+            # another trace by copy(data=False) has to be copied first
+            self.data = self.data.copy()
 
         # detrending
         self.data = func(self.data, **options)
@@ -2098,20 +2242,18 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             taper_sides = func(2 * wlen, **kwargs)
         else:
             taper_sides = func(2 * wlen + 1, **kwargs)
-        if side == 'left':
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
-        elif side == 'right':
-            taper = np.hstack((np.ones(npts - wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
-        else:
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
-
         # Convert data if it's not a floating point type.
         if not np.issubdtype(self.data.dtype, float):
             self.data = np.require(self.data, dtype=np.float64)
-
-        self.data *= taper
+        elif not self.data.flags.writeable:
+            self.data = self.data.copy()
+
+        # only touch the tapered ends of the data, the rest would just be
+        # multiplied by one
+        if side in ('both', 'left'):
+            self.data[:wlen] *= taper_sides[:wlen]
+        if side in ('both', 'right') and wlen:
+            self.data[-wlen:] *= taper_sides[len(taper_sides) - wlen:]
         return self
 
     @_add_processing_info
@@ -2175,15 +2317,26 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         # Convert data if it's not a floating point type.
         if not np.issubdtype(self.data.dtype, float):
             self.data = np.require(self.data, dtype=np.float64)
+        elif not self.data.flags.writeable:
+            self.data = self.data.copy()
 
         self.data /= abs(norm)
 
         return self
 
-    def copy(self):
+    def copy(self, data=True):
         """
         Returns a deepcopy of the trace.
 
+        :type data: bool
+        :param data: If set to ``False`` only the header is copied and the
+            data is shared between the original trace and the copy instead.
+            The data of both traces is made read-only for that. Processing
+            methods that would change the data in place copy it first, so the
+            data is only copied when one of the traces is actually processed
+            (copy-on-write) and neither trace is changed by working on the
+            other one. To change samples directly, assign a copy of the data
+            first, e.g. ``tr.data = tr.data.copy()``.
         :return: Copy of trace.
 
         This actually copies all data in the trace and does not only provide
@@ -2216,8 +2369,26 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         True
         >>> tr3 == tr
         True
+
+        Copy only the header of the trace, e.g. before trying different
+        processing on the same data:
+
+        >>> tr4 = tr.copy(data=False)
+        >>> np.shares_memory(tr4.data, tr.data)
+        True
+        >>> tr4.data.flags.writeable, tr.data.flags.writeable
+        (False, False)
+        >>> tr4.normalize()  # doctest: +ELLIPSIS
+        <...Trace object at 0x...>
+        >>> np.shares_memory(tr4.data, tr.data)
+        False
         """
-        return deepcopy(self)
+        if data:
+            return deepcopy(self)
+        # the original gets a read-only view as well, so that processing it
+        # in place does not change the copy
+        self.data = _read_only_view(self.data)
+        return deepcopy(self, {id(self.data): _read_only_view(self.data)})
 
     def _internal_add_processing_info(self, info):
         """
@@ -2433,6 +2604,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
           * absolute time as
             :class:`~obspy.core.utcdatetime.UTCDateTime` objects
             (``type="utcdatetime"``)
+          * absolute time as a compact
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray`, which is much
+            faster and uses far less memory for long traces
+            (``type="utcdatetimearray"``, gaps in the data are not masked)
           * absolute time as POSIX timestamps (
             :class:`UTCDateTime.timestamp <obspy.core.utcdatetime.UTCDateTime>`
             ``type="timestamp"``)
@@ -2478,7 +2653,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :returns: An array of time samples in an :class:`~numpy.ndarray` if
             the trace doesn't have any gaps or a :class:`~numpy.ma.MaskedArray`
             otherwise (``dtype`` of array is either ``float`` or
-            :class:`~obspy.core.utcdatetime.UTCDateTime`).
+            :class:`~obspy.core.utcdatetime.UTCDateTime`) or a
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray`.
         """
         type = type.lower()
         time_array = np.arange(self.stats.npts)
@@ -2488,9 +2664,23 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                 time_array += (self.stats.starttime - reftime)
         elif type == "timestamp":
             time_array = time_array + self.stats.starttime.timestamp
-        elif type == "utcdatetime":
-            time_array = np.array(
-                [self.stats.starttime + t_ for t_ in time_array])
+        elif type in ("utcdatetime", "utcdatetimearray"):
+            starttime = self.stats.starttime
+            try:
+                # raises for times before 1678 or after 2261
+                UTCDateTimeArray([starttime, self.stats.endtime])
+            except ValueError:
+                if type == "utcdatetimearray":
+                    raise
+                time_array = np.array([starttime + t_ for t_ in time_array])
+            else:
+                time_array = UTCDateTimeArray(
+                    ns=starttime._ns +
+                    np.round(time_array * 1e9).astype(np.int64),
+                    precision=starttime.precision)
+                if type == "utcdatetimearray":
+                    return time_array
+                time_array = np.array(time_array.tolist())
         elif type == "matplotlib":
             from matplotlib.dates import date2num
             time_array = date2num([(self.stats.starttime + t_).datetime
@@ -2607,7 +2797,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         .. note::
 
             Any additional kwargs will be passed on to
-            :meth:`obspy.core.inventory.response.Response.get_evalresp_response`,
+            :meth:`obspy.core.inventory.response.Response.get_response_for_frequencies`,
             see documentation of that method for further customization (e.g.
             start/stop stage).
 
@@ -2738,7 +2928,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             self.data = np.poly1d(coefficients[::-1])(self.data)
             return self
 
-        # use evalresp
+        # evaluate the response in the frequency domain
         data = self.data.astype(np.float64)
         npts = len(data)
         # time domain pre-processing
@@ -2816,9 +3006,10 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         data = np.fft.rfft(data, n=nfft)
         # calculate and apply frequency response,
         # optionally prefilter in frequency domain and/or apply water level
-        freq_response, freqs = \
-            response.get_evalresp_response(self.stats.delta, nfft,
-                                           output=output, **kwargs)
+        fy = 1 / (self.stats.delta * 2.0)
+        freqs = np.linspace(0, fy, nfft // 2 + 1).astype(np.float64)
+        freq_response = response.get_response_for_frequencies(
+            freqs, output=output, **kwargs)
 
         if plot:
             ax1.loglog(freqs, np.abs(data), color=color1, zorder=9)
@@ -2915,6 +3106,25 @@ def _data_sanity_checks(value):
         raise ValueError(msg)
 
 
+def _read_only_view(data):
+    """
+    Returns a read-only view of the given data array without copying it.
+
+    Masked arrays get a copy of their mask, so that masking samples in the
+    view does not change the original array.
+    """
+    if isinstance(data, np.ma.MaskedArray):
+        mask = data.mask
+        if mask is not np.ma.nomask:
+            mask = mask.copy()
+        view = np.ma.masked_array(data.data.view(), mask=mask,
+                                  fill_value=data.fill_value)
+    else:
+        view = data.view()
+    view.flags.writeable = False
+    return view
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -15,10 +15,62 @@ from future.utils import native_str
 
 import datetime
 import math
+import operator
+import re
 import time
+from collections import OrderedDict
+
+import numpy as np
 
 
 TIMESTAMP0 = datetime.datetime(1970, 1, 1, 0, 0)
+# ordinal of 1970-01-01, see datetime.date.toordinal
+_ORDINAL0 = TIMESTAMP0.toordinal()
+# the most common ISO8601 format, e.g. "2009-08-24T00:20:03.123456Z"
+_ISO8601_FAST_PATTERN = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?"
+    r"Z?$")
+# recently parsed time strings with their nanoseconds
+_ISO8601_CACHE = OrderedDict()
+_ISO8601_CACHE_SIZE = 1024
+
+
+def _parse_iso8601_fast(value):
+    """
+    Parses the most common ISO8601 format into nanoseconds.
+
+    Time strings repeat a lot (e.g. creation times in event catalogs), so
+    the most recently parsed strings are cached.
+
+    :type value: str
+    :rtype: int
+    :returns: Nanoseconds since 1970-01-01 or ``None`` if the string is not
+        in the basic ``YYYY-MM-DDThh:mm[:ss[.ffffff]][Z]`` format or is
+        invalid.
+    """
+    try:
+        ns = _ISO8601_CACHE.pop(value)
+    except KeyError:
+        match = _ISO8601_FAST_PATTERN.match(value)
+        if match is None:
+            return None
+        year, month, day, hour, minute, second, fraction = match.groups()
+        hour, minute = int(hour), int(minute)
+        second = int(second) if second else 0
+        microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+        try:
+            # validates all fields
+            dt = datetime.datetime(int(year), int(month), int(day), hour,
+                                   minute, second, microsecond)
+        except ValueError:
+            return None
+        ns = ((dt.toordinal() - _ORDINAL0) * 86400 + hour * 3600 +
+              minute * 60 + second) * 10**9 + microsecond * 1000
+        if len(_ISO8601_CACHE) >= _ISO8601_CACHE_SIZE:
+            _ISO8601_CACHE.popitem(last=False)
+    # (re)insert as most recently used
+    _ISO8601_CACHE[value] = ns
+    return ns
 
 
 class UTCDateTime(object):
@@ -206,11 +258,20 @@ class UTCDateTime(object):
     .. _ISO8601:2004: https://en.wikipedia.org/wiki/ISO_8601
     """
     DEFAULT_PRECISION = 6
+    __slots__ = ("__ns", "__precision", "__weakref__")
 
     def __init__(self, *args, **kwargs):
         """
         Creates a new UTCDateTime object.
         """
+        # fast path for the most common ISO8601 strings
+        if len(args) == 1 and not kwargs and \
+                isinstance(args[0], (str, native_str)):
+            ns = _parse_iso8601_fast(args[0].strip())
+            if ns is not None:
+                self.__precision = int(self.DEFAULT_PRECISION)
+                self.__ns = ns
+                return
         # set default precision
         self.precision = kwargs.pop('precision', self.DEFAULT_PRECISION)
         # set directly to nanoseconds if given
@@ -228,26 +289,7 @@ class UTCDateTime(object):
         elif len(args) == 1 and len(kwargs) == 0:
             value = args[0]
             if isinstance(value, UTCDateTime):
-                # ugly workaround to be able to unpickle UTCDateTime objects
-                # that were pickled on ObsPy <1.1
-                try:
-                    self._ns = value._ns
-                except AttributeError:
-                    # work around floating point accuracy/rounding issue on
-                    # Py3.3, see
-                    # https://travis-ci.org/obspy/obspy/jobs/208941376#L751
-                    # timestamp is 1251073203.0399999618 so when converting to
-                    # integer nanosecond based UTCDateTime this should be
-                    # rounded to 1251073203040000 nanoseconds.. but on Py3.3 it
-                    # ends up as 1251073203039999, so we manually set
-                    # microseconds with correct rounding without artifacts from
-                    # floating point precision. see #1664
-                    timestamp_seconds = int(value.__dict__['timestamp'])
-                    timestamp_microseconds = round(
-                        (value.__dict__['timestamp'] % 1.0) * 1e6)
-                    dt_ = datetime.datetime.utcfromtimestamp(timestamp_seconds)
-                    dt_ = dt_.replace(microsecond=timestamp_microseconds)
-                    self._from_datetime(dt_)
+                self._ns = value._ns
                 return
             # check types
             try:
@@ -355,6 +397,34 @@ class UTCDateTime(object):
         dt = datetime.datetime(*args, **kwargs)
         self._from_datetime(dt)
 
+    def __getstate__(self):
+        return {"_UTCDateTime__ns": self.__ns,
+                "_UTCDateTime__precision": self.__precision}
+
+    def __setstate__(self, state):
+        self.__precision = state.get("_UTCDateTime__precision",
+                                     self.DEFAULT_PRECISION)
+        try:
+            self.__ns = state["_UTCDateTime__ns"]
+        except KeyError:
+            # ugly workaround to be able to unpickle UTCDateTime objects that
+            # were pickled on ObsPy <1.1
+            # work around floating point accuracy/rounding issue on
+            # Py3.3, see
+            # https://travis-ci.org/obspy/obspy/jobs/208941376#L751
+            # timestamp is 1251073203.0399999618 so when converting to
+            # integer nanosecond based UTCDateTime this should be
+            # rounded to 1251073203040000 nanoseconds.. but on Py3.3 it
+            # ends up as 1251073203039999, so we manually set
+            # microseconds with correct rounding without artifacts from
+            # floating point precision. see #1664
+            timestamp_seconds = int(state['timestamp'])
+            timestamp_microseconds = round(
+                (state['timestamp'] % 1.0) * 1e6)
+            dt_ = datetime.datetime.utcfromtimestamp(timestamp_seconds)
+            dt_ = dt_.replace(microsecond=timestamp_microseconds)
+            self._from_datetime(dt_)
+
     def _set(self, **kwargs):
         """
         Sets current timestamp using kwargs.
@@ -1548,6 +1618,400 @@ class UTCDateTime(object):
         return date2num(self.datetime)
 
 
+class UTCDateTimeArray(object):
+    """
+    A compact array of UTC-based points in time.
+
+    The times are stored as a single NumPy array of 64 bit integer
+    nanoseconds since 1970-01-01T00:00:00 (see
+    :class:`~obspy.core.utcdatetime.UTCDateTime`), which needs a tiny fraction
+    of the memory and CPU time of a list of
+    :class:`~obspy.core.utcdatetime.UTCDateTime` objects. Arithmetic,
+    comparisons and calendar properties work on all times at once.
+
+    :type values: list, :class:`numpy.ndarray` or
+        :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+    :param values: Points in time. Either an array of type
+        :class:`numpy.datetime64`, a numerical array of POSIX timestamps or a
+        sequence of objects accepted by
+        :class:`~obspy.core.utcdatetime.UTCDateTime`.
+    :type ns: array_like of int
+    :param ns: Nanoseconds since 1970-01-01T00:00:00 as an alternative to
+        ``values``.
+    :type precision: int
+    :param precision: Precision in digits used by the rich comparison
+        operators and by subtracting times. Defaults to
+        :attr:`UTCDateTime.DEFAULT_PRECISION
+        <obspy.core.utcdatetime.UTCDateTime.DEFAULT_PRECISION>`.
+
+    .. note::
+
+        Unlike :class:`~obspy.core.utcdatetime.UTCDateTime`, which supports
+        the years 1 to 9999, the 64 bit integer nanoseconds restrict the
+        array to times between the years 1678 and 2261, the same range as
+        :class:`numpy.datetime64` with nanosecond resolution.
+
+    .. rubric:: Example
+
+    >>> times = UTCDateTimeArray(["2009-08-24T00:20:03",
+    ...                           "2009-08-24T00:20:13"])
+    >>> times
+    UTCDateTimeArray([2009-08-24T00:20:03.000000Z,
+                      2009-08-24T00:20:13.000000Z])
+    >>> times[1]
+    UTCDateTime(2009, 8, 24, 0, 20, 13)
+    >>> times + 0.5
+    UTCDateTimeArray([2009-08-24T00:20:03.500000Z,
+                      2009-08-24T00:20:13.500000Z])
+    >>> times - UTCDateTime(2009, 8, 24)
+    array([ 1203.,  1213.])
+    >>> times > UTCDateTime("2009-08-24T00:20:10")
+    array([False,  True], dtype=bool)
+    >>> times.searchsorted(UTCDateTime("2009-08-24T00:20:10"))
+    1
+    >>> times.to_datetime64()[0]
+    numpy.datetime64('2009-08-24T00:20:03.000000000')
+    """
+    def __init__(self, values=None, ns=None, precision=None):
+        if precision is None:
+            precision = UTCDateTime.DEFAULT_PRECISION
+        self.precision = precision
+        if ns is not None:
+            self.ns = np.array(ns, dtype=np.int64, ndmin=1)
+        elif values is None:
+            self.ns = np.empty(0, dtype=np.int64)
+        elif isinstance(values, UTCDateTimeArray):
+            self.ns = values.ns.copy()
+        else:
+            if not isinstance(values, np.ndarray):
+                values = list(values)
+                if not all(isinstance(_i, UTCDateTime) for _i in values):
+                    values = [UTCDateTime(_i) for _i in values]
+                values = [_i._ns for _i in values]
+                try:
+                    values = np.array(values, dtype=np.int64)
+                except OverflowError:
+                    self._check_range(np.array(values, dtype=np.float64) /
+                                      1e9)
+                    raise
+            elif values.dtype.kind == "M":
+                self._check_range(
+                    values.astype(native_str("M8[s]")).astype(np.int64))
+                values = values.astype(native_str("M8[ns]")).view(np.int64)
+            elif values.dtype.kind in "iu":
+                self._check_range(values)
+                values = values.astype(np.int64) * 10**9
+            elif values.dtype.kind == "f":
+                self._check_range(values)
+                values = np.round(values * 1e9).astype(np.int64)
+            else:
+                values = UTCDateTimeArray(values.tolist()).ns
+            self.ns = np.array(values, dtype=np.int64, ndmin=1)
+        if self.ns.ndim != 1:
+            msg = "UTCDateTimeArray needs to be one-dimensional"
+            raise ValueError(msg)
+
+    @staticmethod
+    def _check_range(timestamps):
+        # 64 bit integer nanoseconds cover the years 1678 to 2261
+        if len(timestamps) and np.abs(timestamps).max() >= 9.2e9:
+            msg = ("UTCDateTimeArray only supports times between the years "
+                   "1678 and 2261")
+            raise ValueError(msg)
+
+    def _new(self, ns):
+        return UTCDateTimeArray(ns=ns, precision=self.precision)
+
+    def __len__(self):
+        return len(self.ns)
+
+    def __iter__(self):
+        precision = self.precision
+        for ns in self.ns.tolist():
+            yield UTCDateTime(ns=ns, precision=precision)
+
+    def __getitem__(self, index):
+        ns = self.ns[index]
+        if isinstance(ns, np.ndarray):
+            return self._new(ns)
+        return UTCDateTime(ns=int(ns), precision=self.precision)
+
+    def __setitem__(self, index, value):
+        if isinstance(value, UTCDateTime):
+            self.ns[index] = value._ns
+        else:
+            self.ns[index] = UTCDateTimeArray(value).ns
+
+    def __repr__(self):
+        if len(self) > 6:
+            times = [str(_i) for _i in self[:3]] + ["..."] + \
+                [str(_i) for _i in self[-3:]]
+        else:
+            times = [str(_i) for _i in self]
+        return "UTCDateTimeArray([%s])" % (",\n" + " " * 18).join(times)
+
+    @staticmethod
+    def _seconds_to_ns(value):
+        if isinstance(value, datetime.timedelta):
+            # see datetime.timedelta.total_seconds
+            value = (value.microseconds + (value.seconds + value.days *
+                     86400) * 10**6) / 1e6
+        elif isinstance(value, (UTCDateTime, UTCDateTimeArray)):
+            msg = ("unsupported operand type(s) for +: 'UTCDateTimeArray' "
+                   "and '%s'" % type(value).__name__)
+            raise TypeError(msg)
+        return np.round(np.asarray(value, dtype=np.float64) * 1e9).astype(
+            np.int64)
+
+    def _other_ns(self, other):
+        """
+        Returns nanoseconds of another UTCDateTime(Array) or None.
+        """
+        if isinstance(other, UTCDateTimeArray):
+            return other.ns
+        elif isinstance(other, UTCDateTime):
+            return other._ns
+        elif isinstance(other, datetime.datetime):
+            return UTCDateTime(other)._ns
+        return None
+
+    def __add__(self, value):
+        """
+        Adds seconds to all times.
+
+        :type value: float, :class:`numpy.ndarray` or
+            :class:`datetime.timedelta`
+        :param value: Seconds to add, either one value for all times or one
+            per time.
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+        """
+        return self._new(self.ns + self._seconds_to_ns(value))
+
+    __radd__ = __add__
+
+    def __sub__(self, value):
+        """
+        Subtracts seconds from all times or computes relative time spans to
+        other times.
+
+        :type value: float, :class:`numpy.ndarray`,
+            :class:`~obspy.core.utcdatetime.UTCDateTime` or
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+        :param value: Seconds or points in time to subtract.
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray` or
+            :class:`numpy.ndarray`
+        :return: New times or relative time spans in seconds.
+        """
+        other = self._other_ns(value)
+        if other is not None:
+            return np.round((self.ns - other) / 1e9, self.precision)
+        return self._new(self.ns - self._seconds_to_ns(value))
+
+    def _compare(self, other, op):
+        other_ns = self._other_ns(other)
+        if other_ns is not None:
+            diff = (self.ns - other_ns) / 1e9
+        else:
+            try:
+                other = np.asarray(other, dtype=np.float64)
+            except (TypeError, ValueError):
+                return NotImplemented
+            diff = self.timestamp - other
+        return op(np.round(diff, self.precision), 0)
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    def searchsorted(self, value, side="left"):
+        """
+        Finds the indices where times would have to be inserted to keep the
+        (sorted) array sorted.
+
+        See :meth:`numpy.ndarray.searchsorted`.
+
+        :type value: :class:`~obspy.core.utcdatetime.UTCDateTime` or
+            :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+        :param value: Time(s) to insert.
+        :type side: str
+        :param side: ``"left"`` or ``"right"``.
+        """
+        other = self._other_ns(value)
+        if other is None:
+            other = UTCDateTime(value)._ns
+        index = self.ns.searchsorted(other, side=native_str(side))
+        if isinstance(index, np.ndarray):
+            return index
+        return int(index)
+
+    def copy(self):
+        """
+        Returns a copy of the array.
+        """
+        return self._new(self.ns.copy())
+
+    def tolist(self):
+        """
+        Returns the times as a list of
+        :class:`~obspy.core.utcdatetime.UTCDateTime` objects.
+        """
+        return list(self)
+
+    def min(self):
+        """
+        Returns the earliest time.
+        """
+        return UTCDateTime(ns=int(self.ns.min()), precision=self.precision)
+
+    def max(self):
+        """
+        Returns the latest time.
+        """
+        return UTCDateTime(ns=int(self.ns.max()), precision=self.precision)
+
+    def argsort(self):
+        """
+        Returns the indices that sort the times.
+        """
+        return self.ns.argsort(kind="mergesort")
+
+    def to_datetime64(self):
+        """
+        Returns the times as an array of type :class:`numpy.datetime64` with
+        nanosecond resolution.
+        """
+        return self.ns.astype(native_str("M8[ns]"))
+
+    @property
+    def timestamp(self):
+        """
+        Array of POSIX timestamps in seconds.
+        """
+        return self.ns / 1e9
+
+    def _get_days(self):
+        """
+        Returns days since 1970-01-01 and nanoseconds after midnight.
+        """
+        days, ns = np.divmod(self.ns, 86400 * 10**9)
+        return days, ns
+
+    def _get_dates(self, unit):
+        # day resolution covers years 1 to 9999
+        return self._get_days()[0].astype(native_str("M8[D]")).astype(
+            native_str("M8[%s]" % unit))
+
+    @property
+    def year(self):
+        """
+        Array of years.
+        """
+        return self._get_dates("Y").astype(np.int64) + 1970
+
+    @property
+    def month(self):
+        """
+        Array of months.
+        """
+        return self._get_dates("M").astype(np.int64) % 12 + 1
+
+    @property
+    def day(self):
+        """
+        Array of days of month.
+        """
+        return (self._get_dates("D") - self._get_dates("M")).astype(
+            np.int64) + 1
+
+    @property
+    def julday(self):
+        """
+        Array of Julian days.
+        """
+        return (self._get_dates("D") - self._get_dates("Y")).astype(
+            np.int64) + 1
+
+    @property
+    def hour(self):
+        """
+        Array of hours.
+        """
+        return self._get_days()[1] // (3600 * 10**9)
+
+    @property
+    def minute(self):
+        """
+        Array of minutes.
+        """
+        return self._get_days()[1] // (60 * 10**9) % 60
+
+    @property
+    def second(self):
+        """
+        Array of seconds.
+        """
+        return self._get_days()[1] // 10**9 % 60
+
+    @property
+    def microsecond(self):
+        """
+        Array of microseconds.
+        """
+        return self.ns % 10**9 // 1000
+
+    @property
+    def weekday(self):
+        """
+        Array of days of the week (Monday is 0, Sunday is 6).
+        """
+        # 1970-01-01 was a Thursday
+        return (self._get_days()[0] + 3) % 7
+
+    def isoweekday(self):
+        """
+        Returns an array of days of the week (Monday is 1, Sunday is 7).
+        """
+        return self.weekday + 1
+
+    def isocalendar(self):
+        """
+        Returns arrays of ISO year, ISO week number and ISO weekday.
+
+        See :meth:`datetime.date.isocalendar`.
+        """
+        days = self._get_days()[0]
+        weekday = (days + 3) % 7
+        # the ISO year is the year of the Thursday of the same week
+        thursday = (days - weekday + 3).astype(native_str("M8[D]"))
+        year_start = thursday.astype(native_str("M8[Y]")).astype(
+            native_str("M8[D]"))
+        week = (thursday - year_start).astype(np.int64) // 7 + 1
+        year = thursday.astype(native_str("M8[Y]")).astype(np.int64) + 1970
+        return year, week, weekday + 1
+
+    def _get_hours_after_midnight(self):
+        """
+        Returns an array of floating point hours after midnight.
+        """
+        return self._get_days()[1] / 3.6e12
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
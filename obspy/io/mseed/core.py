@@ -10,9 +10,17 @@ from future.utils import native_str
 import ctypes as C
 import io
 import os
+import sys
+import threading
 import warnings
+from collections import OrderedDict
 from struct import pack
 
+if sys.version_info.major == 2:
+    import Queue as queue
+else:
+    import queue
+
 import numpy as np
 
 from obspy import Stream, Trace, UTCDateTime
@@ -144,7 +152,8 @@ def __is_mseed(fp, file_size):  # NOQA
 
 def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                 sourcename=None, reclen=None, details=False,
-                header_byteorder=None, verbose=None, **kwargs):
+                header_byteorder=None, verbose=None, mmap=False,
+                record_index=False, **kwargs):
     """
     Reads a Mini-SEED file and returns a Stream object.
 
@@ -190,6 +199,23 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         little-endian, ``1`` or ``'>'`` for MBF or big-endian. ``'='`` is the
         native byte order. Used to enforce the header byte order. Useful in
         some rare cases where the automatic byte order detection fails.
+    :type mmap: bool, optional
+    :param mmap: If ``True`` and a file name is given, the file is memory
+        mapped instead of being read into memory as a whole. Together with
+        ``starttime``, ``endtime`` or ``sourcename`` only the selected records
+        are touched and decoded which greatly reduces memory usage and I/O
+        when cutting short windows out of large files. Defaults to ``False``.
+    :type record_index: bool, optional
+    :param record_index: If ``True``, a file name is given, and ``starttime``
+        and/or ``endtime`` are set, the file is memory mapped and the fixed
+        headers of all records are parsed into an index (see
+        :func:`~obspy.io.mseed.util.get_record_index`). Only the records
+        overlapping the requested time window are then passed on to libmseed.
+        The index is cached for as long as the file does not change, so
+        repeatedly cutting windows out of the same file only touches the
+        records actually needed. This also allows reading short windows from
+        files larger than 2048 MiB. Files with varying record lengths are
+        read as usual. Defaults to ``False``.
 
     .. rubric:: Example
 
@@ -258,6 +284,15 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     else:
         bo = None
 
+    for name, value in (('starttime', starttime), ('endtime', endtime)):
+        if value is not None and not isinstance(value, UTCDateTime):
+            msg = '%s needs to be a UTCDateTime object' % name
+            raise ValueError(msg)
+
+    use_index = bool(record_index) and \
+        isinstance(mseed_object, (str, native_str)) and \
+        (starttime is not None or endtime is not None)
+
     # Determine total size. Either its a file-like object.
     if hasattr(mseed_object, "tell") and hasattr(mseed_object, "seek"):
         cur_pos = mseed_object.tell()
@@ -272,13 +307,8 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         msg = "The smallest possible mini-SEED record is made up of 128 " \
               "bytes. The passed buffer or file contains only %i." % length
         raise ObsPyMSEEDFilesizeTooSmallError(msg)
-    elif length > 2 ** 31:
-        msg = ("ObsPy can currently not directly read mini-SEED files that "
-               "are larger than 2^31 bytes (2048 MiB). To still read it, "
-               "please read the file in chunks as documented here: "
-               "https://github.com/obspy/obspy/pull/1419"
-               "#issuecomment-221582369")
-        raise ObsPyMSEEDFilesizeTooLargeError(msg)
+    elif length > 2 ** 31 and not use_index:
+        _raise_filesize_too_large()
 
     info = util.get_record_information(mseed_object, endian=bo)
 
@@ -308,14 +338,38 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
 
     # If it's a file name just read it.
     if isinstance(mseed_object, (str, native_str)):
-        # Read to NumPy array which is used as a buffer.
-        bfr_np = np.fromfile(mseed_object, dtype=np.int8)
+        # Read to NumPy array which is used as a buffer. A copy-on-write
+        # memory map leaves it to the OS to only page in the records libmseed
+        # actually looks at.
+        if mmap or use_index:
+            bfr_np = np.memmap(mseed_object, dtype=np.int8, mode='c')
+        else:
+            bfr_np = np.fromfile(mseed_object, dtype=np.int8)
     elif hasattr(mseed_object, 'read'):
         bfr_np = np.fromstring(mseed_object.read(), dtype=np.int8)
 
     # Get the record length
     record_length = info["record_length"]
 
+    # Only keep the records that are relevant for the requested time window.
+    if use_index:
+        try:
+            index = util._get_cached_record_index(
+                mseed_object, bfr_np, record_length, info['byteorder'])
+        except ValueError:
+            index = None
+        if index is not None:
+            offsets = util._select_records(index, starttime, endtime)
+            if not len(offsets):
+                return Stream()
+            if offsets[-1] - offsets[0] == (len(offsets) - 1) * record_length:
+                bfr_np = bfr_np[offsets[0]:offsets[-1] + record_length]
+            else:
+                bfr_np = bfr_np.reshape(-1, record_length)[
+                    offsets // record_length].ravel()
+        if len(bfr_np) > 2 ** 31:
+            _raise_filesize_too_large()
+
     # Search for data records and pass only the data part to the underlying C
     # routine.
     offset = 0
@@ -348,18 +402,12 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         selections = Selections()
         selections.timewindows.contents = select_time
         if starttime is not None:
-            if not isinstance(starttime, UTCDateTime):
-                msg = 'starttime needs to be a UTCDateTime object'
-                raise ValueError(msg)
             selections.timewindows.contents.starttime = \
                 util._convert_datetime_to_mstime(starttime)
         else:
             # HPTERROR results in no starttime.
             selections.timewindows.contents.starttime = HPTERROR
         if endtime is not None:
-            if not isinstance(endtime, UTCDateTime):
-                msg = 'endtime needs to be a UTCDateTime object'
-                raise ValueError(msg)
             selections.timewindows.contents.endtime = \
                 util._convert_datetime_to_mstime(endtime)
         else:
@@ -493,6 +541,139 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     return Stream(traces=traces)
 
 
+def _iter_mseed(file_object, batch_size=2 ** 22, **kwargs):
+    """
+    Reads MiniSEED data from a file-like object as it arrives and yields the
+    decoded traces batch by batch.
+
+    The file-like object does not have to be seekable, e.g. a HTTP response.
+    Records are read in a background thread while the previous batch of
+    records is decoded, so waiting for data and decoding overlap and only a
+    few batches of raw data are held in memory at a time.
+
+    Contiguous data of a channel can be split into several consecutive
+    traces at batch boundaries, see :func:`_join_traces`.
+
+    :type batch_size: int
+    :param batch_size: Approximate number of bytes decoded at once.
+    :param kwargs: Passed on to :func:`_read_mseed`.
+    """
+    batches = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read():
+        try:
+            batch = []
+            size = 0
+            # The last batch is held back until the next one is complete so
+            # that trailing garbage or a broken last record always end up
+            # behind valid records, where libmseed skips them.
+            pending = b""
+            for record in util._iter_records(file_object):
+                # Only start a new batch with a proper record.
+                if size >= batch_size and \
+                        util._get_record_length(record) == len(record):
+                    if pending and not _put(pending):
+                        return
+                    pending = b"".join(batch)
+                    batch = []
+                    size = 0
+                batch.append(record)
+                size += len(record)
+            last = pending + b"".join(batch)
+            if last:
+                _put(last)
+        except Exception as e:
+            _put(e)
+        finally:
+            _put(None)
+
+    thread = threading.Thread(target=_read)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            elif isinstance(batch, Exception):
+                raise batch
+            for tr in _read_mseed(io.BytesIO(batch), **kwargs):
+                tr.stats._format = "MSEED"
+                yield tr
+    finally:
+        stop.set()
+
+
+def _join_traces(traces):
+    """
+    Joins consecutive pieces of contiguous data read from several buffers
+    (e.g. by :func:`_iter_mseed`) into one trace each, the same way libmseed
+    joins records read from one buffer.
+
+    Pieces are joined if they have the same SEED id, data quality, data type
+    and sampling rate and the next one starts where the last piece of that id
+    ends (within half a sample). The returned stream lists the traces
+    grouped by id in the order the ids first appeared.
+    """
+    segments = OrderedDict()
+    for tr in traces:
+        key = (tr.id, tr.stats.mseed.get("dataquality"))
+        pieces = segments.setdefault(key, [])
+        if pieces:
+            last = pieces[-1][-1]
+            delta = last.stats.delta
+            gap = tr.stats.starttime - last.stats.endtime - delta
+            if (last.stats.npts and tr.stats.npts and
+                    last.data.dtype == tr.data.dtype and
+                    abs(1.0 - last.stats.sampling_rate /
+                        tr.stats.sampling_rate) < 0.0001 and
+                    abs(gap) <= 0.5 * delta):
+                pieces[-1].append(tr)
+                continue
+        pieces.append([tr])
+
+    joined = []
+    for pieces in segments.values():
+        for segment in pieces:
+            tr = segment[0]
+            if len(segment) > 1:
+                data = np.empty(sum(tr_.stats.npts for tr_ in segment),
+                                dtype=tr.data.dtype)
+                number_of_records = 0
+                start = 0
+                # Release the pieces while copying to not need twice the
+                # memory of the data.
+                for i in range(len(segment)):
+                    piece, segment[i] = segment[i], None
+                    data[start:start + piece.stats.npts] = piece.data
+                    start += piece.stats.npts
+                    number_of_records += piece.stats.mseed.number_of_records
+                    piece.data = np.empty(0, dtype=data.dtype)
+                tr.data = data
+                tr.stats.mseed.number_of_records = number_of_records
+            joined.append(tr)
+    return Stream(traces=joined)
+
+
+def _raise_filesize_too_large():
+    msg = ("ObsPy can currently not directly read mini-SEED files that "
+           "are larger than 2^31 bytes (2048 MiB). To still read it, "
+           "please read the file in chunks as documented here: "
+           "https://github.com/obspy/obspy/pull/1419"
+           "#issuecomment-221582369")
+    raise ObsPyMSEEDFilesizeTooLargeError(msg)
+
+
 def _write_mseed(stream, filename, encoding=None, reclen=None, byteorder=None,
                  sequence_number=None, flush=True, verbose=0, **_kwargs):
     """
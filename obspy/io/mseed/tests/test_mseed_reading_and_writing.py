@@ -12,7 +12,7 @@ import os
 import unittest
 import warnings
 from datetime import datetime
-from struct import unpack
+from struct import pack, unpack
 
 import numpy as np
 
@@ -21,7 +21,8 @@ from obspy.core import AttribDict
 from obspy.core.util import CatchOutput, NamedTemporaryFile
 from obspy.io.mseed import (util, InternalMSEEDWarning,
                             InternalMSEEDError)
-from obspy.io.mseed.core import _is_mseed, _read_mseed, _write_mseed
+from obspy.io.mseed.core import (_is_mseed, _iter_mseed, _join_traces,
+                                 _read_mseed, _write_mseed)
 from obspy.io.mseed.headers import ENCODINGS, clibmseed
 from obspy.io.mseed.msstruct import _MSStruct
 
@@ -425,6 +426,129 @@ class MSEEDReadingAndWritingTestCase(unittest.TestCase):
         st6 = _read_mseed(testfile, sourcename='*.BLA')
         self.assertEqual(len(st6), 0)
 
+    def test_read_memory_mapped(self):
+        """
+        Reading with mmap=True must give the same results as reading the
+        whole file into memory, also for partial reads.
+        """
+        starttime = UTCDateTime('2007-12-31T23:59:59.915000Z')
+        testfile = os.path.join(self.path, 'data',
+                                'BW.BGLD.__.EHE.D.2008.001.first_10_records')
+        for kwargs in [{}, {'starttime': starttime + 6},
+                       {'starttime': starttime + 6, 'endtime': starttime + 9},
+                       {'headonly': True}]:
+            st1 = _read_mseed(testfile, **kwargs)
+            st2 = _read_mseed(testfile, mmap=True, **kwargs)
+            self.assertEqual(st1, st2)
+        # file-like objects are silently read as usual
+        with io.open(testfile, 'rb') as fh:
+            st3 = _read_mseed(fh, mmap=True)
+        self.assertEqual(_read_mseed(testfile), st3)
+
+    def test_read_with_record_index(self):
+        """
+        Reading time windows via the record index must give the same results
+        as reading the whole file with the same selection.
+        """
+        starttime = UTCDateTime('2007-12-31T23:59:59.915000Z')
+        testfile = os.path.join(self.path, 'data',
+                                'BW.BGLD.__.EHE.D.2008.001.first_10_records')
+        for kwargs in [{'starttime': starttime + 6},
+                       {'endtime': starttime + 3.3},
+                       {'starttime': starttime + 6, 'endtime': starttime + 9},
+                       {'starttime': starttime + 2.055,
+                        'endtime': starttime + 2.06},
+                       {'starttime': starttime - 10, 'endtime': starttime},
+                       {'starttime': starttime + 100}]:
+            st1 = _read_mseed(testfile, **kwargs)
+            # second read uses the cached index
+            for _i in range(2):
+                st2 = _read_mseed(testfile, record_index=True, **kwargs)
+                self.assertEqual(st1, st2)
+        self.assertIn(os.path.abspath(testfile),
+                      [key[0] for key in util._RECORD_INDEX_CACHE])
+        # multiplexed file
+        testfile = os.path.join(self.path, 'data', 'two_channels.mseed')
+        starttime = UTCDateTime('2010-06-20T00:00:01')
+        st1 = _read_mseed(testfile, starttime=starttime, sourcename='*.?HZ')
+        st2 = _read_mseed(testfile, starttime=starttime, sourcename='*.?HZ',
+                          record_index=True)
+        self.assertEqual(st1, st2)
+        # invalid times are rejected before the index is used
+        with self.assertRaises(ValueError):
+            _read_mseed(testfile, starttime="2010-06-20T00:00:01",
+                        record_index=True)
+
+    def test_read_with_record_index_blockette_100(self):
+        """
+        The record index uses the actual sampling rate of blockette 100, so
+        no records are dropped if it is lower than the nominal one.
+        """
+        tr = Trace(np.arange(5000, dtype=np.int32))
+        tr.stats.sampling_rate = 40000.5
+        tr.stats.starttime = UTCDateTime(2010, 1, 1)
+        with NamedTemporaryFile() as tf:
+            tr.write(tf.name, format='MSEED', reclen=512, encoding='INT32',
+                     byteorder='>')
+            with open(tf.name, 'rb') as fh:
+                data = bytearray(fh.read())
+            # much higher nominal sampling rate in the fixed headers
+            for offset in range(0, len(data), 512):
+                data[offset + 32:offset + 36] = pack(native_str('>hh'),
+                                                     32767, 32767)
+            with open(tf.name, 'wb') as fh:
+                fh.write(data)
+            index = util.get_record_index(tf.name)
+            np.testing.assert_allclose(index['sampling_rate'], 40000.5)
+            kwargs = {'starttime': tr.stats.starttime + 0.01,
+                      'endtime': tr.stats.starttime + 0.0101}
+            st = _read_mseed(tf.name, record_index=True, **kwargs)
+            self.assertEqual(st, _read_mseed(tf.name, **kwargs))
+            self.assertEqual(len(st), 1)
+
+    def test_iter_mseed(self):
+        """
+        Decoding a non-seekable stream batch by batch and joining the pieces
+        must give the same result as reading everything at once.
+        """
+        class ShortReads(io.RawIOBase):
+            def __init__(self, data):
+                self.bfr = io.BytesIO(data)
+
+            def readable(self):
+                return True
+
+            def read(self, size=-1):
+                if size is None or size < 0:
+                    return self.bfr.read()
+                return self.bfr.read(min(size, 100))
+
+        data = b""
+        for name in ('two_channels.mseed', 'test.mseed',
+                     'BW.BGLD.__.EHE.D.2008.001.first_10_records',
+                     'single_record_plus_noise_record.mseed'):
+            with open(os.path.join(self.path, 'data', name), 'rb') as fh:
+                data += fh.read()
+        # one extra byte of garbage at the end
+        data += b"0"
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("always")
+            expected = _read_mseed(io.BytesIO(data))
+            for batch_size in (1, 5000, 2 ** 22):
+                traces = list(_iter_mseed(ShortReads(data),
+                                          batch_size=batch_size))
+                if batch_size == 1:
+                    self.assertGreater(len(traces), len(expected))
+                st = _join_traces(traces)
+                self.assertEqual(len(st), len(expected))
+                for tr, tr_expected in zip(st, expected):
+                    self.assertEqual(tr.id, tr_expected.id)
+                    self.assertEqual(tr.stats.starttime,
+                                     tr_expected.stats.starttime)
+                    self.assertEqual(tr.stats.sampling_rate,
+                                     tr_expected.stats.sampling_rate)
+                    np.testing.assert_array_equal(tr.data, tr_expected.data)
+
     def test_write_integers(self):
         """
         Write integer array via L{obspy.io.mseed.mseed._write_mseed}.
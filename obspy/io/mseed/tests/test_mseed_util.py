@@ -201,6 +201,60 @@ class MSEEDUtilTestCase(unittest.TestCase):
         self.assertEqual(info['number_of_records'], 2)
         self.assertEqual(info['excess_bytes'], 0)
 
+    def test_iter_records(self):
+        """
+        Tests splitting MiniSEED data into records without seeking.
+        """
+        for name in ('BW.BGLD.__.EHE.D.2008.001.first_10_records',
+                     'test.mseed', 'two_channels.mseed'):
+            filename = os.path.join(self.path, 'data', name)
+            info = util.get_record_information(filename)
+            with open(filename, 'rb') as fh:
+                data = fh.read()
+            records = list(util._iter_records(io.BytesIO(data)))
+            self.assertEqual(len(records), info['number_of_records'])
+            self.assertEqual(b"".join(records), data)
+            for record in records:
+                self.assertEqual(len(record), info['record_length'])
+                self.assertEqual(util._get_record_length(record),
+                                 info['record_length'])
+        # an incomplete last record is passed on as is
+        records = list(util._iter_records(io.BytesIO(data[:1000])))
+        self.assertEqual([len(record) for record in records], [512, 488])
+        # data that is no record with blockette 1000 is passed on as a whole
+        records = list(util._iter_records(
+            io.BytesIO(b" " * 128 + data[:1024])))
+        self.assertEqual([len(record) for record in records], [1152])
+        self.assertIsNone(util._get_record_length(b" " * 128))
+
+    def test_get_record_index(self):
+        """
+        Tests the record index against the headers unpacked by libmseed.
+        """
+        for name in ('BW.BGLD.__.EHE.D.2008.001.first_10_records',
+                     'test.mseed', 'two_channels.mseed'):
+            filename = os.path.join(self.path, 'data', name)
+            index = util.get_record_index(filename)
+            with open(filename, 'rb') as fh:
+                np.testing.assert_array_equal(
+                    index, util.get_record_index(io.BytesIO(fh.read())))
+            info = util.get_record_information(filename)
+            self.assertEqual(len(index), info['number_of_records'])
+            np.testing.assert_array_equal(
+                index['offset'],
+                np.arange(len(index)) * info['record_length'])
+            for record, offset in zip(index, index['offset']):
+                info = util.get_record_information(filename, offset=offset)
+                for key in ('network', 'station', 'location', 'channel',
+                            'npts'):
+                    self.assertEqual(record[key], info[key])
+                self.assertEqual(record['sampling_rate'], info['samp_rate'])
+                # blockette 1001 microseconds are not part of the index
+                self.assertLess(
+                    abs(record['starttime'] - info['starttime']._ns), 10 ** 5)
+                self.assertLess(
+                    abs(record['endtime'] - info['endtime']._ns), 10 ** 5)
+
     def test_get_data_quality(self):
         """
         This test reads a self-made Mini-SEED file with set Data Quality Bits.
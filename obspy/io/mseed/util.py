@@ -26,6 +26,23 @@ from .headers import (ENCODINGS, ENDIAN, FIXED_HEADER_ACTIVITY_FLAGS,
                       MS_NOERROR, clibmseed)
 
 
+# Fields of the record index returned by get_record_index().
+RECORD_INDEX_DTYPE = np.dtype([
+    (native_str('offset'), np.int64),
+    (native_str('network'), native_str('U2')),
+    (native_str('station'), native_str('U5')),
+    (native_str('location'), native_str('U2')),
+    (native_str('channel'), native_str('U3')),
+    (native_str('starttime'), np.int64),
+    (native_str('endtime'), np.int64),
+    (native_str('npts'), np.int64),
+    (native_str('sampling_rate'), np.float64)])
+
+# Maximum number of record indices cached by _get_cached_record_index().
+_RECORD_INDEX_CACHE_SIZE = 64
+_RECORD_INDEX_CACHE = collections.OrderedDict()
+
+
 def get_start_and_end_time(file_or_file_object):
     """
     Returns the start and end time of a MiniSEED file or file-like object.
@@ -776,6 +793,279 @@ def _get_record_information(file_object, offset=0, endian=None):
     return info
 
 
+def get_record_index(file_or_file_object):
+    """
+    Returns an index of all data records in a MiniSEED file.
+
+    The index is a structured NumPy array with one entry per data record and
+    the fields ``offset`` (byte offset of the record in the file),
+    ``network``, ``station``, ``location``, ``channel``, ``starttime`` and
+    ``endtime`` (time of first and last sample in nanoseconds since
+    1970-01-01, see :attr:`~obspy.core.utcdatetime.UTCDateTime.ns`), ``npts``
+    and ``sampling_rate``. It can be used to quickly find the records
+    covering a certain time span without unpacking any data and can be
+    stored with :func:`numpy.save` for later use.
+
+    Only the fixed section of the data header and blockette 100 are parsed,
+    so start times do not include the microsecond offsets of blockettes 500
+    and 1001. The sampling rate is the actual one of blockette 100 if present
+    and the nominal one of the fixed header otherwise. All records
+    are required to have the same record length which is the case for
+    virtually all MiniSEED files found in data archives. Control records of
+    full SEED files are skipped.
+
+    :type file_or_file_object: str or file
+    :param file_or_file_object: MiniSEED file name or open file-like object.
+    :rtype: :class:`numpy.ndarray`
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import get_example_file
+    >>> filename = get_example_file(
+    ...     "BW.BGLD.__.EHE.D.2008.001.first_10_records")
+    >>> index = get_record_index(filename)
+    >>> len(index)
+    10
+    >>> print(index[0]['channel'], index[0]['offset'], index[1]['offset'])
+    EHE 0 512
+    >>> print(UTCDateTime(ns=int(index[-1]['endtime'])))
+    2008-01-01T00:00:20.510000Z
+    """
+    info = get_record_information(file_or_file_object)
+    if isinstance(file_or_file_object, (str, native_str)):
+        bfr = np.memmap(file_or_file_object, dtype=np.uint8, mode='r')
+    else:
+        position = file_or_file_object.tell()
+        bfr = np.fromstring(file_or_file_object.read(), dtype=np.uint8)
+        file_or_file_object.seek(position, 0)
+    return _get_record_index(bfr, info['record_length'], info['byteorder'])
+
+
+def _get_record_index(bfr, record_length, endian):
+    """
+    Parses the fixed headers of all records of a buffer with a constant
+    record length in one go.
+
+    Raises a ValueError if the buffer can not be split into records of the
+    given length.
+    """
+    if len(bfr) == 0 or len(bfr) % record_length:
+        msg = "Buffer is no sequence of %i byte records." % record_length
+        raise ValueError(msg)
+    e = endian
+    header = np.dtype({
+        'names': [native_str(_i) for _i in (
+            'quality', 'station', 'location', 'channel', 'network', 'year',
+            'julday', 'hour', 'minute', 'second', 'fract', 'npts', 'factor',
+            'multiplier', 'activity_flags', 'time_correction',
+            'first_blockette')],
+        'formats': [native_str(_i) for _i in (
+            'S1', 'S5', 'S2', 'S3', 'S2', e + 'u2', e + 'u2', 'u1', 'u1',
+            'u1', e + 'u2', e + 'u2', e + 'i2', e + 'i2', 'u1', e + 'i4',
+            e + 'u2')],
+        'offsets': [6, 8, 13, 15, 18, 20, 22, 24, 25, 26, 28, 30, 32, 34, 36,
+                    40, 46],
+        'itemsize': record_length})
+    headers = np.frombuffer(bfr, dtype=header)
+    is_data = np.in1d(headers['quality'], [b'D', b'R', b'Q', b'M'])
+    offsets = np.nonzero(is_data)[0].astype(np.int64) * record_length
+    headers = headers[is_data]
+    if not len(headers):
+        raise ValueError("No data records found.")
+
+    # Nanoseconds since 1970-01-01 of the record start times.
+    days = (headers['year'].astype(np.int64) - 1970).astype(
+        native_str('datetime64[Y]')).astype(
+        native_str('datetime64[D]')).astype(np.int64)
+    days += headers['julday'].astype(np.int64) - 1
+    seconds = days * 86400 + headers['hour'].astype(np.int64) * 3600 + \
+        headers['minute'].astype(np.int64) * 60 + headers['second']
+    fract = headers['fract'].astype(np.int64)
+    # Bit 1 of the activity flags signals an already applied time correction.
+    not_applied = (headers['activity_flags'] & 2) == 0
+    fract[not_applied] += headers['time_correction'][not_applied]
+    starttime = seconds * 10 ** 9 + fract * 10 ** 5
+
+    # Nominal sampling rate according to the SEED manual.
+    factor = headers['factor'].astype(np.float64)
+    multiplier = headers['multiplier'].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sampling_rate = np.select(
+            [(factor > 0) & (multiplier > 0), (factor > 0) & (multiplier < 0),
+             (factor < 0) & (multiplier > 0), (factor < 0) & (multiplier < 0)],
+            [factor * multiplier, -factor / multiplier,
+             -multiplier / factor, 1.0 / (factor * multiplier)],
+            default=1.0)
+        # The actual sampling rate of blockette 100 takes precedence, same as
+        # in libmseed.
+        _apply_blockette_100(np.frombuffer(bfr, dtype=np.uint8), offsets,
+                             headers['first_blockette'], record_length, e,
+                             sampling_rate)
+        npts = headers['npts'].astype(np.int64)
+        duration = np.where(npts > 0, (npts - 1) / sampling_rate, 0.0)
+
+    index = np.empty(len(headers), dtype=RECORD_INDEX_DTYPE)
+    index['offset'] = offsets
+    for key in ('network', 'station', 'location', 'channel'):
+        index[key] = np.char.strip(np.char.decode(headers[key], 'ascii',
+                                                  'replace'))
+    index['starttime'] = starttime
+    index['endtime'] = starttime + np.round(duration * 1e9).astype(np.int64)
+    index['npts'] = npts
+    index['sampling_rate'] = sampling_rate
+    return index
+
+
+def _apply_blockette_100(bfr, offsets, first_blockette, record_length,
+                         endian, sampling_rate):
+    """
+    Walks the blockette chains of all records at once and sets the sampling
+    rate of records with a blockette 100 to its actual sampling rate.
+    """
+    def gather(pos, size):
+        return bfr[pos[:, None] + np.arange(size)]
+
+    blkt_offset = first_blockette.astype(np.int64)
+    active = np.arange(len(offsets))
+    # Records rarely have more than a handful of blockettes, the limit only
+    # guards against broken chains.
+    for _ in range(16):
+        keep = (blkt_offset[active] >= 48) & \
+            (blkt_offset[active] + 4 <= record_length)
+        active = active[keep]
+        if not len(active):
+            break
+        pos = offsets[active] + blkt_offset[active]
+        blkt_type, next_blkt = gather(pos, 4).view(
+            native_str(endian + 'u2')).T.astype(np.int64)
+        is_100 = (blkt_type == 100) & \
+            (blkt_offset[active] + 8 <= record_length)
+        if is_100.any():
+            rate = gather(pos[is_100] + 4, 4).view(
+                native_str(endian + 'f4')).ravel()
+            valid = rate > 0
+            sampling_rate[active[is_100][valid]] = rate[valid]
+        # Follow the chain as long as it moves forward.
+        forward = next_blkt > blkt_offset[active]
+        blkt_offset[active] = next_blkt
+        active = active[forward]
+
+
+def _get_cached_record_index(filename, bfr, record_length, endian):
+    """
+    Returns the record index of a file buffer and keeps it around for as long
+    as the file on disk does not change.
+    """
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_size, stat.st_mtime)
+    try:
+        index = _RECORD_INDEX_CACHE.pop(key)
+    except KeyError:
+        index = _get_record_index(bfr, record_length, endian)
+    _RECORD_INDEX_CACHE[key] = index
+    while len(_RECORD_INDEX_CACHE) > _RECORD_INDEX_CACHE_SIZE:
+        _RECORD_INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def _select_records(index, starttime=None, endtime=None):
+    """
+    Returns the offsets of all records in a record index that might contain
+    samples between starttime and endtime.
+
+    The record times in the index ignore blockettes 500 and 1001, thus every
+    record is widened by one sample and one millisecond on each side. To not
+    drop records whose sampling rate is off, e.g. due to clock drift, the end
+    of every record is additionally widened by its duration. This reads at
+    most a few more records per channel, libmseed still cuts the data to the
+    exact time window.
+    """
+    with np.errstate(divide='ignore'):
+        slack = np.where(index['sampling_rate'] > 0,
+                         1e9 / index['sampling_rate'], 0.0)
+    slack = slack.astype(np.int64) + 10 ** 6
+    selected = np.ones(len(index), dtype=bool)
+    if starttime is not None:
+        duration = index['endtime'] - index['starttime']
+        selected &= index['endtime'] + duration + slack >= starttime._ns
+    if endtime is not None:
+        selected &= index['starttime'] - slack <= endtime._ns
+    return index['offset'][selected]
+
+
+def _read_exactly(file_object, size):
+    """
+    Reads size bytes from a file-like object, less only at the end of the
+    data. Reads from sockets and pipes can return less than requested.
+    """
+    data = file_object.read(size)
+    if len(data) in (0, size):
+        return data
+    chunks = [data]
+    size -= len(data)
+    while size:
+        data = file_object.read(size)
+        if not data:
+            break
+        chunks.append(data)
+        size -= len(data)
+    return b"".join(chunks)
+
+
+def _get_record_length(header):
+    """
+    Returns the record length given in blockette 1000 of the (at least 128
+    bytes of the) fixed header of a MiniSEED data record or None if it can
+    not be determined from the header alone.
+    """
+    if header[6:7] not in (b'D', b'R', b'Q', b'M'):
+        return None
+    # Same byte order check as libmseed, the year has to be sensible.
+    endian = ">"
+    year, julday = unpack(native_str(">HH"), header[20:24])
+    if not (1900 <= year <= 2100 and 1 <= julday <= 366):
+        endian = "<"
+    blkt_offset = unpack(native_str(endian + "H"), header[46:48])[0]
+    while blkt_offset:
+        if blkt_offset < 48 or blkt_offset + 7 > len(header):
+            return None
+        blkt_type, next_blkt = unpack(native_str(endian + "HH"),
+                                      header[blkt_offset:blkt_offset + 4])
+        if blkt_type == 1000:
+            exponent = unpack(native_str("B"),
+                              header[blkt_offset + 6:blkt_offset + 7])[0]
+            if not 7 <= exponent <= 20:
+                return None
+            return 2 ** exponent
+        if next_blkt and next_blkt <= blkt_offset:
+            return None
+        blkt_offset = next_blkt
+    return None
+
+
+def _iter_records(file_object):
+    """
+    Splits MiniSEED data read from a file-like object into records, reading
+    only as much data as needed for the next record. The file-like object
+    does not have to be seekable, e.g. a HTTP response or a pipe.
+
+    Yields the raw bytes of one data record at a time. Should the record
+    length of a record not be given in its blockette 1000, the remaining
+    data is yielded in one go.
+    """
+    while True:
+        header = _read_exactly(file_object, 128)
+        if not header:
+            return
+        record_length = _get_record_length(header)
+        if record_length is None or len(header) < 128:
+            yield header + file_object.read()
+            return
+        # An incomplete last record is passed on as is, libmseed deals with
+        # it like it does for complete buffers.
+        yield header + _read_exactly(file_object, record_length - 128)
+
+
 def _ctypes_array_2_numpy_array(buffer_, buffer_elements, sampletype):
     """
     Takes a Ctypes array and its length and type and returns it as a
@@ -78,7 +78,8 @@ def init_header_arrays(arrays=('float', 'int', 'str'), byteorder='='):
     return out
 
 
-def read_sac(source, headonly=False, byteorder=None, checksize=False):
+def read_sac(source, headonly=False, byteorder=None, checksize=False,
+             mmap=False):
     """
     Read a SAC binary file.
 
@@ -95,6 +96,11 @@ def read_sac(source, headonly=False, byteorder=None, checksize=False):
     :param checksize: If True, check that the theoretical file size from the
         header matches the size on disk.
     :type checksize: bool
+    :param mmap: If True, the data array is a copy-on-write
+        :class:`numpy.memmap` of the file on disk instead of an in-memory
+        copy. Samples are only read from disk when they are accessed. Ignored
+        for file-like objects that are not backed by a real file.
+    :type mmap: bool
 
     :return: The float, integer, and string header arrays, and data array,
         in that order. Data array will be None if headonly is True.
@@ -177,6 +183,16 @@ def read_sac(source, headonly=False, byteorder=None, checksize=False):
     # --------------------------------------------------------------
     if headonly:
         data = None
+    elif mmap and _has_fileno(f):
+        offset = f.tell()
+        try:
+            data = np.memmap(f, dtype=native_str(endian_str + 'f4'),
+                             mode='c', offset=offset, shape=(int(npts),))
+        except ValueError:
+            if is_file_name:
+                f.close()
+            raise SacIOError("Cannot read all data points")
+        f.seek(offset + int(npts) * 4, os.SEEK_SET)
     else:
         data = from_buffer(f.read(int(npts) * 4),
                            dtype=native_str(endian_str + 'f4'))
@@ -191,6 +207,17 @@ def read_sac(source, headonly=False, byteorder=None, checksize=False):
     return hf, hi, hs, data
 
 
+def _has_fileno(f):
+    """
+    Check if a file-like object is backed by an actual file on disk.
+    """
+    try:
+        f.fileno()
+    except Exception:
+        return False
+    return True
+
+
 def read_sac_ascii(source, headonly=False):
     """
     Read a SAC ASCII/Alphanumeric file.
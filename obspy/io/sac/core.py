@@ -308,7 +308,7 @@ def _internal_write_sac_xy(trace, buf, **kwargs):  # @UnusedVariable
 
 
 def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
-              **kwargs):  # @UnusedVariable
+              mmap=False, **kwargs):  # @UnusedVariable
     """
     Reads an SAC file and returns an ObsPy Stream object.
 
@@ -331,6 +331,11 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
     :param fsize: Check if file size is consistent with theoretical size
         from header. Defaults to ``True``.
     :type fsize: bool
+    :param mmap: If set to ``True``, the data of a file on disk is memory
+        mapped (copy-on-write) instead of being read into memory. Samples are
+        then only loaded when accessed, e.g. after trimming to a short time
+        window. Defaults to ``False``.
+    :type mmap: bool
     :rtype: :class:`~obspy.core.stream.Stream`
     :return: A ObsPy Stream object.
 
@@ -343,18 +348,18 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
     if is_bytes_buffer(filename):
         return _internal_read_sac(buf=filename, headonly=headonly,
                                   debug_headers=debug_headers, fsize=fsize,
-                                  **kwargs)
+                                  mmap=mmap, **kwargs)
     elif isinstance(filename, (str, bytes)):
         with open(filename, "rb") as fh:
             return _internal_read_sac(buf=fh, headonly=headonly,
                                       debug_headers=debug_headers, fsize=fsize,
-                                      **kwargs)
+                                      mmap=mmap, **kwargs)
     else:
         raise ValueError("Cannot open '%s'." % filename)
 
 
 def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
-                       **kwargs):  # @UnusedVariable
+                       mmap=False, **kwargs):  # @UnusedVariable
     """
     Reads an SAC file and returns an ObsPy Stream object.
 
@@ -377,11 +382,17 @@ def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
     :param fsize: Check if file size is consistent with theoretical size
         from header. Defaults to ``True``.
     :type fsize: bool
+    :param mmap: If set to ``True``, the data of a file on disk is memory
+        mapped (copy-on-write) instead of being read into memory. Samples are
+        then only loaded when accessed, e.g. after trimming to a short time
+        window. Defaults to ``False``.
+    :type mmap: bool
     :rtype: :class:`~obspy.core.stream.Stream`
     :return: A ObsPy Stream object.
     """
     # read SAC file
-    sac = SACTrace.read(buf, headonly=headonly, ascii=False, checksize=fsize)
+    sac = SACTrace.read(buf, headonly=headonly, ascii=False, checksize=fsize,
+                        mmap=mmap)
     # assign all header entries to a new dictionary compatible with an ObsPy
     tr = sac.to_obspy_trace(debug_headers=debug_headers)
 
@@ -1100,7 +1100,7 @@ class SACTrace(object):
     # --------------------------- I/O METHODS ---------------------------------
     @classmethod
     def read(cls, source, headonly=False, ascii=False, byteorder=None,
-             checksize=False, debug_strings=False):
+             checksize=False, debug_strings=False, mmap=False):
         """
         Construct an instance from a binary or ASCII file on disk.
 
@@ -1125,6 +1125,9 @@ class SACTrace(object):
             beginning with '-12345' are considered unset. If True, they
             are instead passed without modification.  Good for debugging.
         :type debug_strings: bool
+        :param mmap: If True, memory map the data array instead of reading it
+            into memory. Only valid for binary files.
+        :type mmap: bool
 
         :raises: :class:`SacIOError` if checksize failed, byteorder was wrong,
             or header arrays are wrong size.
@@ -1155,7 +1158,7 @@ class SACTrace(object):
         else:
             hf, hi, hs, data = _io.read_sac(source, headonly=headonly,
                                             byteorder=byteorder,
-                                            checksize=checksize)
+                                            checksize=checksize, mmap=mmap)
         if not debug_strings:
             for i, val in enumerate(hs):
                 val = _ut._clean_str(val, strip_whitespace=False)
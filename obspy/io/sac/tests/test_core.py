@@ -124,6 +124,22 @@ class CoreTestCase(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.testdata[0:10],
                                              tr.data[0:10])
 
+    def test_read_memory_mapped_via_obspy(self):
+        """
+        Read little and big endian files with memory mapped data.
+        """
+        for filename in (self.file, self.filebe):
+            tr = read(filename, format='SAC')[0]
+            tr_mm = read(filename, format='SAC', mmap=True)[0]
+            self.assertIsInstance(tr_mm.data, np.memmap)
+            self.assertEqual(tr.stats, tr_mm.stats)
+            np.testing.assert_array_equal(tr.data, tr_mm.data)
+            # data is copy-on-write and can be changed in place without
+            # touching the file on disk
+            tr_mm.data *= 2
+            np.testing.assert_array_equal(
+                read(filename, format='SAC')[0].data, tr.data)
+
     def test_swap_bytes_via_obspy(self):
         with NamedTemporaryFile() as tf:
             tempfile = tf.name
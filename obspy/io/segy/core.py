@@ -120,7 +120,7 @@ def _is_segy(filename):
 
 def _read_segy(filename, headonly=False, byteorder=None,
                textual_header_encoding=None, unpack_trace_headers=False,
-               **kwargs):  # @UnusedVariable
+               mmap=False, **kwargs):  # @UnusedVariable
     """
     Reads a SEG Y file and returns an ObsPy Stream object.
 
@@ -149,6 +149,12 @@ def _read_segy(filename, headonly=False, byteorder=None,
         header values can still be accessed and will be calculated on the fly
         but tab completion will no longer work. Look in the headers.py for a
         list of all possible trace header values. Defaults to ``False``.
+    :type mmap: bool, optional
+    :param mmap: If set to ``True``, the trace data is memory mapped
+        (copy-on-write) instead of being read into memory. Only applies to
+        files with 2 byte or 4 byte integer or 4 byte IEEE floating point
+        samples stored in native byte order, all other files are read as
+        usual. Defaults to ``False``.
     :returns: A ObsPy :class:`~obspy.core.stream.Stream` object.
 
     .. rubric:: Example
@@ -165,7 +171,7 @@ def _read_segy(filename, headonly=False, byteorder=None,
     segy_object = _read_segyrev1(
         filename, endian=byteorder,
         textual_header_encoding=textual_header_encoding,
-        unpack_headers=unpack_trace_headers)
+        unpack_headers=unpack_trace_headers, mmap=mmap)
     # Create the stream object.
     stream = Stream()
     # SEGY has several file headers that apply to all traces. They will be
@@ -408,7 +414,8 @@ def _is_su(filename):
 
 
 def _read_su(filename, headonly=False, byteorder=None,
-             unpack_trace_headers=False, **kwargs):  # @UnusedVariable
+             unpack_trace_headers=False, mmap=False,
+             **kwargs):  # @UnusedVariable
     """
     Reads a Seismic Unix (SU) file and returns an ObsPy Stream object.
 
@@ -433,6 +440,11 @@ def _read_su(filename, headonly=False, byteorder=None,
         header values can still be accessed and will be calculated on the fly
         but tab completion will no longer work. Look in the headers.py for a
         list of all possible trace header values. Defaults to ``False``.
+    :type mmap: bool, optional
+    :param mmap: If set to ``True``, the trace data is memory mapped
+        (copy-on-write) instead of being read into memory. Only applies to
+        files stored in native byte order, all other files are read as usual.
+        Defaults to ``False``.
     :returns: A ObsPy :class:`~obspy.core.stream.Stream` object.
 
     .. rubric:: Example
@@ -447,7 +459,7 @@ def _read_su(filename, headonly=False, byteorder=None,
     """
     # Read file to the internal segy representation.
     su_object = _read_su_file(filename, endian=byteorder,
-                              unpack_headers=unpack_trace_headers)
+                              unpack_headers=unpack_trace_headers, mmap=mmap)
 
     # Create the stream object.
     stream = Stream()
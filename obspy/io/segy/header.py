@@ -199,6 +199,14 @@ DATA_SAMPLE_FORMAT_SAMPLE_SIZE = {
     8: 1,
 }
 
+# Data sample formats that are stored on disk exactly like their in-memory
+# representation and can therefore be memory mapped.
+DATA_SAMPLE_FORMAT_MMAP_DTYPE = {
+    2: 'i4',
+    3: 'i2',
+    5: 'f4',
+}
+
 # Map the data format sample code and the corresponding dtype.
 DATA_SAMPLE_FORMAT_CODE_DTYPE = {
     1: np.float32,
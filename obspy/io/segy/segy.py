@@ -13,6 +13,7 @@ Routines to read and write SEG Y rev 1 encoded seismic data files.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
 
 import io
 import os
@@ -24,11 +25,12 @@ from obspy import Trace, UTCDateTime
 from obspy.core import AttribDict
 
 from .header import (BINARY_FILE_HEADER_FORMAT,
+                     DATA_SAMPLE_FORMAT_MMAP_DTYPE,
                      DATA_SAMPLE_FORMAT_PACK_FUNCTIONS,
                      DATA_SAMPLE_FORMAT_SAMPLE_SIZE,
                      DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS, ENDIAN,
                      TRACE_HEADER_FORMAT, TRACE_HEADER_KEYS)
-from .unpack import OnTheFlyDataUnpacker
+from .unpack import BYTEORDER, OnTheFlyDataUnpacker
 from .util import unpack_header_value
 
 
@@ -74,7 +76,8 @@ class SEGYFile(object):
     Class that internally handles SEG Y files.
     """
     def __init__(self, file=None, endian=None, textual_header_encoding=None,
-                 unpack_headers=False, headonly=False, read_traces=True):
+                 unpack_headers=False, headonly=False, read_traces=True,
+                 mmap=False):
         """
         Class that internally handles SEG Y files.
 
@@ -101,6 +104,10 @@ class SEGYFile(object):
         :param read_traces: Data traces will only be read if this is set to
             ``True``. The data will be completely ignored if this is set to
             ``False``.
+        :type mmap: bool
+        :param mmap: If ``True``, trace data is memory mapped instead of read
+            into memory whenever the data sample format and the byte order
+            allow it. See :class:`SEGYTrace`. Defaults to ``False``.
         """
         if file is None:
             self._create_empty_segy_file_object()
@@ -127,7 +134,7 @@ class SEGYFile(object):
         # Read the actual traces.
         if read_traces:
             [i for i in self._read_traces(
-                unpack_headers=unpack_headers, headonly=headonly)]
+                unpack_headers=unpack_headers, headonly=headonly, mmap=mmap)]
 
     def __str__(self):
         """
@@ -310,7 +317,7 @@ class SEGYFile(object):
         file.write(textual_header)
 
     def _read_traces(self, unpack_headers=False, headonly=False,
-                     yield_each_trace=False):
+                     yield_each_trace=False, mmap=False):
         """
         Reads the actual traces starting at the current file pointer position
         to the end of the file.
@@ -333,6 +340,10 @@ class SEGYFile(object):
             streaming interface to read SEG-Y files. Read traces will no
             longer be collected in ``self.traces`` list if this is set to
             ``True``.
+
+        :type mmap: bool
+        :param mmap: Memory map the trace data if possible. See
+            :class:`SEGYTrace`.
         """
         self.traces = []
         # Determine the filesize once.
@@ -343,13 +354,17 @@ class SEGYFile(object):
             self.file.seek(pos, 0)
         else:
             filesize = os.fstat(self.file.fileno())[6]
+        # Map the file once for all traces.
+        if mmap and _can_mmap(self.file, self.data_encoding, self.endian):
+            mmap = _map_file(self.file)
         # Big loop to read all data traces.
         while True:
             # Read and as soon as the trace header is too small abort.
             try:
                 trace = SEGYTrace(self.file, self.data_encoding, self.endian,
                                   unpack_headers=unpack_headers,
-                                  filesize=filesize, headonly=headonly)
+                                  filesize=filesize, headonly=headonly,
+                                  mmap=mmap)
                 if yield_each_trace:
                     yield trace
                 else:
@@ -462,7 +477,8 @@ class SEGYTrace(object):
     Convenience class that internally handles a single SEG Y trace.
     """
     def __init__(self, file=None, data_encoding=4, endian='>',
-                 unpack_headers=False, filesize=None, headonly=False):
+                 unpack_headers=False, filesize=None, headonly=False,
+                 mmap=False):
         """
         Convenience class that internally handles a single SEG Y trace.
 
@@ -502,6 +518,14 @@ class SEGYTrace(object):
             will be read and unpacked. Has a huge impact on memory usage. Data
             can be read and unpacked on-the-fly after reading the file.
             Defaults to False.
+        :type mmap: bool or :class:`numpy.memmap`
+        :param mmap: If True, the data is a copy-on-write
+            :class:`numpy.memmap` of the file instead of an in-memory copy.
+            Only possible for files on disk with 2 byte or 4 byte integer or 4
+            byte IEEE floating point samples in native byte order, otherwise
+            the data is read as usual. A map of the whole file as returned by
+            :func:`_map_file` is used instead of mapping the file again.
+            Defaults to False.
         """
         self.endian = endian
         self.data_encoding = data_encoding
@@ -522,9 +546,10 @@ class SEGYTrace(object):
             else:
                 self.filesize = os.fstat(self.file.fileno())[6]
         # Otherwise read the file.
-        self._read_trace(unpack_headers=unpack_headers, headonly=headonly)
+        self._read_trace(unpack_headers=unpack_headers, headonly=headonly,
+                         mmap=mmap)
 
-    def _read_trace(self, unpack_headers=False, headonly=False):
+    def _read_trace(self, unpack_headers=False, headonly=False, mmap=False):
         """
         Reads the complete next header starting at the file pointer at
         self.file.
@@ -539,6 +564,9 @@ class SEGYTrace(object):
             will be read and unpacked. Has a huge impact on memory usage. Data
             can be read and unpacked on-the-fly after reading the file.
             Defaults to False.
+        :type mmap: bool or :class:`numpy.memmap`
+        :param mmap: Memory map the data if possible, see
+            :class:`SEGYTrace`. Defaults to False.
         """
         trace_header = self.file.read(240)
         # Check if it is smaller than 240 byte.
@@ -570,6 +598,15 @@ class SEGYTrace(object):
             self.unpack_data = OnTheFlyDataUnpacker(
                 DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS[self.data_encoding],
                 self.file.name, self.file.mode, pos, npts, endian=self.endian)
+        elif isinstance(mmap, np.memmap) or (
+                mmap and _can_mmap(self.file, self.data_encoding,
+                                   self.endian)):
+            if not isinstance(mmap, np.memmap):
+                mmap = _map_file(self.file)
+            self.data = mmap[pos:pos + data_needed].view(
+                native_str(self.endian + DATA_SAMPLE_FORMAT_MMAP_DTYPE[
+                    self.data_encoding]))
+            self.file.seek(pos + data_needed, 0)
         else:
             # Unpack the data.
             self.data = DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS[
@@ -704,6 +741,37 @@ class SEGYTrace(object):
         return trace
 
 
+def _can_mmap(file, data_encoding, endian):
+    """
+    Check if trace data with the given encoding and byte order can be memory
+    mapped as is from the given file.
+    """
+    if data_encoding not in DATA_SAMPLE_FORMAT_MMAP_DTYPE:
+        return False
+    # Unpacking swaps the samples to native byte order, so only keep the
+    # results consistent if no swapping is needed.
+    if endian != BYTEORDER:
+        return False
+    try:
+        file.fileno()
+    except Exception:
+        return False
+    return True
+
+
+def _map_file(file):
+    """
+    Returns a copy-on-write :class:`numpy.memmap` of the bytes of a whole
+    file, slices of which are the data of the traces. The file position is
+    kept.
+    """
+    pos = file.tell()
+    try:
+        return np.memmap(file, mode='c', dtype=np.uint8)
+    finally:
+        file.seek(pos, 0)
+
+
 class SEGYTraceHeader(object):
     """
     Convenience class that handles reading and writing of the trace headers.
@@ -840,7 +908,7 @@ class SEGYTraceHeader(object):
 
 
 def _read_segy(file, endian=None, textual_header_encoding=None,
-               unpack_headers=False, headonly=False):
+               unpack_headers=False, headonly=False, mmap=False):
     """
     Reads a SEG Y file and returns a SEGYFile object.
 
@@ -863,6 +931,9 @@ def _read_segy(file, endian=None, textual_header_encoding=None,
     :param headonly: Determines whether or not the actual data records will be
         read and unpacked. Has a huge impact on memory usage. Data can be read
         and unpacked on-the-fly after reading the file. Defaults to False.
+    :type mmap: bool
+    :param mmap: Memory map the trace data instead of reading it into memory
+        if the data sample format and byte order allow it. Defaults to False.
     """
     # Open the file if it is not a file like object.
     if not hasattr(file, 'read') or not hasattr(file, 'tell') or not \
@@ -871,16 +942,16 @@ def _read_segy(file, endian=None, textual_header_encoding=None,
             return _internal_read_segy(
                 open_file, endian=endian,
                 textual_header_encoding=textual_header_encoding,
-                unpack_headers=unpack_headers, headonly=headonly)
+                unpack_headers=unpack_headers, headonly=headonly, mmap=mmap)
     # Otherwise just read it.
     return _internal_read_segy(file, endian=endian,
                                textual_header_encoding=textual_header_encoding,
                                unpack_headers=unpack_headers,
-                               headonly=headonly)
+                               headonly=headonly, mmap=mmap)
 
 
 def _internal_read_segy(file, endian=None, textual_header_encoding=None,
-                        unpack_headers=False, headonly=False):
+                        unpack_headers=False, headonly=False, mmap=False):
     """
     Reads on open file object and returns a SEGYFile object.
 
@@ -902,14 +973,18 @@ def _internal_read_segy(file, endian=None, textual_header_encoding=None,
     :param headonly: Determines whether or not the actual data records will be
         read and unpacked. Has a huge impact on memory usage. Data can be read
         and unpacked on-the-fly after reading the file. Defaults to False.
+    :type mmap: bool
+    :param mmap: Memory map the trace data instead of reading it into memory
+        if the data sample format and byte order allow it. Defaults to False.
     """
     return SEGYFile(file, endian=endian,
                     textual_header_encoding=textual_header_encoding,
-                    unpack_headers=unpack_headers, headonly=headonly)
+                    unpack_headers=unpack_headers, headonly=headonly,
+                    mmap=mmap)
 
 
 def iread_segy(file, endian=None, textual_header_encoding=None,
-               unpack_headers=False, headonly=False):
+               unpack_headers=False, headonly=False, mmap=False):
     """
     Iteratively read a SEG-Y field and yield single ObsPy Traces.
 
@@ -952,6 +1027,9 @@ def iread_segy(file, endian=None, textual_header_encoding=None,
     :param headonly: Determines whether or not the actual data records will be
         read and unpacked. Has a huge impact on memory usage. Data can be read
         and unpacked on-the-fly after reading the file. Defaults to False.
+    :type mmap: bool
+    :param mmap: Memory map the trace data instead of reading it into memory
+        if the data sample format and byte order allow it. Defaults to False.
     """
     # Open the file if it is not a file like object.
     if not hasattr(file, 'read') or not hasattr(file, 'tell') or not \
@@ -960,19 +1038,20 @@ def iread_segy(file, endian=None, textual_header_encoding=None,
             for tr in _internal_iread_segy(
                     open_file, endian=endian,
                     textual_header_encoding=textual_header_encoding,
-                    unpack_headers=unpack_headers, headonly=headonly):
+                    unpack_headers=unpack_headers, headonly=headonly,
+                    mmap=mmap):
                 yield tr
             return
     # Otherwise just read it.
     for tr in _internal_iread_segy(
             file, endian=endian,
             textual_header_encoding=textual_header_encoding,
-            unpack_headers=unpack_headers, headonly=headonly):
+            unpack_headers=unpack_headers, headonly=headonly, mmap=mmap):
         yield tr
 
 
 def _internal_iread_segy(file, endian=None, textual_header_encoding=None,
-                         unpack_headers=False, headonly=False):
+                         unpack_headers=False, headonly=False, mmap=False):
     """
     Iteratively read a SEG-Y field and yield single ObsPy Traces.
     """
@@ -981,7 +1060,7 @@ def _internal_iread_segy(file, endian=None, textual_header_encoding=None,
         unpack_headers=unpack_headers, headonly=headonly, read_traces=False)
     for trace in segy_file._read_traces(unpack_headers=unpack_headers,
                                         headonly=headonly,
-                                        yield_each_trace=True):
+                                        yield_each_trace=True, mmap=mmap):
         tr = trace.to_obspy_trace(unpack_trace_headers=unpack_headers,
                                   headonly=headonly)
         # Fill stats that are normally attached to the stream stats.
@@ -995,7 +1074,8 @@ def _internal_iread_segy(file, endian=None, textual_header_encoding=None,
         yield tr
 
 
-def iread_su(file, endian=None, unpack_headers=False, headonly=False):
+def iread_su(file, endian=None, unpack_headers=False, headonly=False,
+             mmap=False):
     """
     Iteratively read a SU field and yield single ObsPy Traces.
 
@@ -1032,6 +1112,9 @@ def iread_su(file, endian=None, unpack_headers=False, headonly=False):
     :param headonly: Determines whether or not the actual data records will be
         read and unpacked. Has a huge impact on memory usage. Data can be read
         and unpacked on-the-fly after reading the file. Defaults to False.
+    :type mmap: bool
+    :param mmap: Memory map the trace data instead of reading it into memory
+        if the data sample format and byte order allow it. Defaults to False.
     """
     # Open the file if it is not a file like object.
     if not hasattr(file, 'read') or not hasattr(file, 'tell') or not \
@@ -1039,18 +1122,19 @@ def iread_su(file, endian=None, unpack_headers=False, headonly=False):
         with open(file, 'rb') as open_file:
             for tr in _internal_iread_su(
                     open_file, endian=endian,
-                    unpack_headers=unpack_headers, headonly=headonly):
+                    unpack_headers=unpack_headers, headonly=headonly,
+                    mmap=mmap):
                 yield tr
             return
     # Otherwise just read it.
     for tr in _internal_iread_su(
             file, endian=endian,
-            unpack_headers=unpack_headers, headonly=headonly):
+            unpack_headers=unpack_headers, headonly=headonly, mmap=mmap):
         yield tr
 
 
 def _internal_iread_su(file, endian=None, unpack_headers=False,
-                       headonly=False):
+                       headonly=False, mmap=False):
     """
     Iteratively read a SU field and yield single ObsPy Traces.
     """
@@ -1059,7 +1143,7 @@ def _internal_iread_su(file, endian=None, unpack_headers=False,
         read_traces=False)
     for trace in su_file._read_traces(unpack_headers=unpack_headers,
                                       headonly=headonly,
-                                      yield_each_trace=True):
+                                      yield_each_trace=True, mmap=mmap):
         tr = trace.to_obspy_trace(unpack_trace_headers=unpack_headers,
                                   headonly=headonly)
         tr.stats.su = tr.stats.segy
@@ -1077,7 +1161,7 @@ class SUFile(object):
     currently can only read IEEE 4 byte float encoded SU data files.
     """
     def __init__(self, file=None, endian=None, unpack_headers=False,
-                 headonly=False, read_traces=True):
+                 headonly=False, read_traces=True, mmap=False):
         """
         :param file: A file like object with the file pointer set at the
             beginning of the SEG Y file. If file is None, an empty SEGYFile
@@ -1099,6 +1183,10 @@ class SUFile(object):
         :param read_traces: Data traces will only be read if this is set to
             ``True``. The data will be completely ignored if this is set to
             ``False``.
+        :type mmap: bool
+        :param mmap: If ``True``, trace data is memory mapped instead of read
+            into memory whenever the data sample format and the byte order
+            allow it. See :class:`SEGYTrace`. Defaults to ``False``.
         """
         if file is None:
             self._create_empty_su_file_object()
@@ -1118,7 +1206,7 @@ class SUFile(object):
         if read_traces:
             # Read the actual traces.
             [i for i in self._read_traces(unpack_headers=unpack_headers,
-                                          headonly=headonly)]
+                                          headonly=headonly, mmap=mmap)]
 
     def _autodetect_endianness(self):
         """
@@ -1146,7 +1234,7 @@ class SUFile(object):
         p.text(str(self))
 
     def _read_traces(self, unpack_headers=False, headonly=False,
-                     yield_each_trace=False):
+                     yield_each_trace=False, mmap=False):
         """
         Reads the actual traces starting at the current file pointer position
         to the end of the file.
@@ -1166,8 +1254,15 @@ class SUFile(object):
             streaming interface to read SEG-Y files. Read traces will no
             longer be collected in ``self.traces`` list if this is set to
             ``True``.
+
+        :type mmap: bool
+        :param mmap: Memory map the trace data if possible. See
+            :class:`SEGYTrace`.
         """
         self.traces = []
+        # Map the file once for all traces.
+        if mmap and _can_mmap(self.file, 5, self.endian):
+            mmap = _map_file(self.file)
         # Big loop to read all data traces.
         while True:
             # Read and as soon as the trace header is too small abort.
@@ -1175,7 +1270,7 @@ class SUFile(object):
                 # Always unpack with IEEE
                 trace = SEGYTrace(self.file, 5, self.endian,
                                   unpack_headers=unpack_headers,
-                                  headonly=headonly)
+                                  headonly=headonly, mmap=mmap)
                 if yield_each_trace:
                     yield trace
                 else:
@@ -1208,7 +1303,8 @@ class SUFile(object):
             trace.write(file, data_encoding=5, endian=endian)
 
 
-def _read_su(file, endian=None, unpack_headers=False, headonly=False):
+def _read_su(file, endian=None, unpack_headers=False, headonly=False,
+             mmap=False):
     """
     Reads a Seismic Unix (SU) file and returns a SUFile object.
 
@@ -1228,6 +1324,9 @@ def _read_su(file, endian=None, unpack_headers=False, headonly=False):
     :param headonly: Determines whether or not the actual data records will be
         unpacked. Useful if one is just interested in the headers. Defaults to
         False.
+    :type mmap: bool
+    :param mmap: Memory map the trace data instead of reading it into memory
+        if the byte order allows it. Defaults to False.
     """
     # Open the file if it is not a file like object.
     if not hasattr(file, 'read') or not hasattr(file, 'tell') or not \
@@ -1235,13 +1334,15 @@ def _read_su(file, endian=None, unpack_headers=False, headonly=False):
         with open(file, 'rb') as open_file:
             return _internal_read_su(open_file, endian=endian,
                                      unpack_headers=unpack_headers,
-                                     headonly=headonly)
+                                     headonly=headonly, mmap=mmap)
     # Otherwise just read it.
     return _internal_read_su(file, endian=endian,
-                             unpack_headers=unpack_headers, headonly=headonly)
+                             unpack_headers=unpack_headers, headonly=headonly,
+                             mmap=mmap)
 
 
-def _internal_read_su(file, endian=None, unpack_headers=False, headonly=False):
+def _internal_read_su(file, endian=None, unpack_headers=False, headonly=False,
+                      mmap=False):
     """
     Reads on open file object and returns a SUFile object.
 
@@ -1260,9 +1361,12 @@ def _internal_read_su(file, endian=None, unpack_headers=False, headonly=False):
     :param headonly: Determines whether or not the actual data records will be
         unpacked. Useful if one is just interested in the headers. Defaults to
         False.
+    :type mmap: bool
+    :param mmap: Memory map the trace data instead of reading it into memory
+        if the byte order allows it. Defaults to False.
     """
     return SUFile(file, endian=endian, unpack_headers=unpack_headers,
-                  headonly=headonly)
+                  headonly=headonly, mmap=mmap)
 
 
 def autodetect_endian_and_sanity_check_su(file):
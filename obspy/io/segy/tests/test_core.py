@@ -19,7 +19,9 @@ from obspy.io.segy.core import (SEGYCoreWritingError, SEGYSampleIntervalError,
                                 _write_segy, _write_su)
 from obspy.io.segy.segy import _read_segy as _read_segy_internal
 from obspy.io.segy.segy import SEGYError
+from obspy.io.segy.segy import iread_segy, iread_su
 from obspy.io.segy.tests.header import DTYPES, FILES
+from obspy.io.segy.unpack import BYTEORDER
 
 
 class SEGYCoreTestCase(unittest.TestCase):
@@ -189,6 +191,78 @@ class SEGYCoreTestCase(unittest.TestCase):
                 # different computers.
                 np.testing.assert_array_equal(this_data, this_stream[0].data)
 
+    def test_reading_memory_mapped(self):
+        """
+        Data encodings that are stored as is on disk are memory mapped if
+        requested, all others are read as usual.
+        """
+        file = os.path.join(self.path, 'ld0042_file_00018.sgy_first_trace')
+        st = _read_segy(file)
+        data = st[0].data
+        encodings = {1: np.float32,
+                     2: np.int32,
+                     3: np.int16,
+                     5: np.float32}
+        with NamedTemporaryFile() as tf:
+            out_file = tf.name
+            for byteorder in ('<', '>'):
+                for data_encoding, dtype in encodings.items():
+                    this_data = np.require(data.copy(), dtype)
+                    st[0].data = this_data
+                    _write_segy(st, out_file, data_encoding=data_encoding,
+                                byteorder=byteorder)
+                    this_stream = _read_segy(out_file, mmap=True)
+                    np.testing.assert_array_equal(this_data,
+                                                  this_stream[0].data)
+                    is_mmap = isinstance(this_stream[0].data, np.memmap)
+                    self.assertEqual(
+                        is_mmap, data_encoding != 1 and byteorder == BYTEORDER)
+                    if data_encoding == 5:
+                        is_mmap = [isinstance(tr.data, np.memmap)
+                                   for tr in iread_segy(out_file, mmap=True)]
+                        self.assertEqual(is_mmap, [byteorder == BYTEORDER])
+            # SU files always hold 4 byte IEEE floating point samples.
+            st[0].data = np.require(data.copy(), np.float32)
+            for byteorder in ('<', '>'):
+                _write_su(st, out_file, byteorder=byteorder)
+                for this_stream in (_read_su(out_file, mmap=True),
+                                    list(iread_su(out_file, mmap=True))):
+                    np.testing.assert_array_equal(st[0].data,
+                                                  this_stream[0].data)
+                    is_mmap = isinstance(this_stream[0].data, np.memmap)
+                    self.assertEqual(is_mmap, byteorder == BYTEORDER)
+
+    def test_reading_memory_mapped_multiple_traces(self):
+        """
+        All traces of a SEG-Y or SU file are memory mapped.
+        """
+        file = os.path.join(self.path, 'ld0042_file_00018.sgy_first_trace')
+        st = _read_segy(file)
+        data = np.require(st[0].data, np.float32)
+        for i in range(1, 5):
+            tr = st[0].copy()
+            tr.data = data * i
+            st.append(tr)
+        st[0].data = data
+        with NamedTemporaryFile() as tf:
+            out_file = tf.name
+            _write_segy(st, out_file, data_encoding=5, byteorder=BYTEORDER)
+            expected = _read_segy(out_file)
+            for this_stream in (_read_segy(out_file, mmap=True),
+                                list(iread_segy(out_file, mmap=True))):
+                self.assertEqual(len(this_stream), 5)
+                for tr, tr_expected in zip(this_stream, expected):
+                    self.assertIsInstance(tr.data, np.memmap)
+                    np.testing.assert_array_equal(tr.data, tr_expected.data)
+            _write_su(st, out_file, byteorder=BYTEORDER)
+            expected = _read_su(out_file)
+            for this_stream in (_read_su(out_file, mmap=True),
+                                list(iread_su(out_file, mmap=True))):
+                self.assertEqual(len(this_stream), 5)
+                for tr, tr_expected in zip(this_stream, expected):
+                    self.assertIsInstance(tr.data, np.memmap)
+                    np.testing.assert_array_equal(tr.data, tr_expected.data)
+
     def test_not_matching_data_encoding_and_dtype_raises(self):
         """
         obspy.io.segy does not automatically convert to the corresponding
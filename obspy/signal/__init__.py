@@ -198,7 +198,7 @@ from future.builtins import *  # NOQA
 if "filter" in locals():
     del filter
 
-from .spectral_estimation import PPSD
+from .spectral_estimation import PPSD, PPSDStore
 
 
 if __name__ == '__main__':
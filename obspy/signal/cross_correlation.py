@@ -21,8 +21,11 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 from future.utils import native_str
 
+import bisect
+import collections
 import ctypes as C
 import warnings
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 import scipy
@@ -31,6 +34,7 @@ from obspy import Stream, Trace
 from obspy.core.util.misc import MatplotlibBackend
 from obspy.signal.headers import clibsignal
 from obspy.signal.invsim import cosine_taper
+from obspy.signal.util import next_pow_2
 
 
 def _pad_zeros(a, num):
@@ -673,6 +677,337 @@ def templates_max_similarity(st, time, streams_templates):
         return 0
 
 
+def _window_norms(data, length):
+    """
+    Norm of the demeaned data in all windows of given length.
+
+    Computed with running sums, windows with vanishing variance get a norm of
+    zero.
+    """
+    # demeaning the whole array does not change the result but keeps the
+    # running sums small
+    data = data - data.mean()
+    cumsum = np.concatenate(([0.], np.cumsum(data)))
+    cumsum2 = np.concatenate(([0.], np.cumsum(data ** 2)))
+    sums = cumsum[length:] - cumsum[:-length]
+    var = cumsum2[length:] - cumsum2[:-length]
+    var -= sums ** 2 / length
+    # rounding errors of the running sums are of the order of the total sum
+    var[var <= 1e-10 * cumsum2[-1]] = 0.0
+    return np.sqrt(var)
+
+
+def _normalized_xcorr(data, spectra, nfft, length):
+    """
+    Normalized cross-correlation of data with several templates.
+
+    :param data: data array, at most ``nfft`` samples
+    :param spectra: complex conjugated spectra of the demeaned templates of
+        unit norm, one template per row, computed with ``nfft`` points
+    :param length: number of samples of the templates
+    :return: 2-D array with the correlation coefficients for all windows of
+        ``data`` of the template length, one template per row
+    """
+    num = len(data) - length + 1
+    cc = np.fft.irfft(np.fft.rfft(data, nfft) * spectra, nfft)[:, :num]
+    norms = _window_norms(data, length)
+    scale = np.zeros_like(norms)
+    np.divide(1.0, norms, out=scale, where=norms > 0)
+    cc *= scale
+    return cc
+
+
+def _template_spectra(templates, nfft):
+    """
+    Complex conjugated spectra of demeaned templates scaled to unit norm.
+    """
+    templates = templates - templates.mean(axis=1)[:, np.newaxis]
+    norms = np.sqrt((templates ** 2).sum(axis=1))
+    # flat templates have a correlation of zero everywhere
+    norms[norms == 0] = np.inf
+    templates /= norms[:, np.newaxis]
+    return np.conj(np.fft.rfft(templates, nfft))
+
+
+def correlate_templates(data, templates):
+    """
+    Normalized cross-correlation of several templates with continuous data.
+
+    All templates are correlated with the data in one batch of FFTs, the
+    normalization of the data windows is computed with running sums. The
+    result for each template and sample is the correlation coefficient of
+    the template and the data window of the same length starting at that
+    sample.
+
+    :type data: :class:`~numpy.ndarray`
+    :param data: Continuous data.
+    :type templates: :class:`~numpy.ndarray`
+    :param templates: Templates of equal length, one template per row of a
+        2-D array. A single template can be given as 1-D array.
+    :rtype: :class:`~numpy.ndarray`
+    :return: Correlation coefficients, one row per template with
+        ``len(data) - template_length + 1`` samples.
+
+    .. rubric:: Example
+
+    >>> data = np.random.randn(1000)
+    >>> templates = np.array([data[100:200], data[500:600]])
+    >>> cc = correlate_templates(data, templates)
+    >>> cc.shape
+    (2, 901)
+    >>> print(cc.argmax(axis=1), np.round(cc.max(axis=1), 6))
+    [100 500] [ 1.  1.]
+    """
+    data = np.asarray(data, dtype=np.float64)
+    templates = np.array(templates, dtype=np.float64, ndmin=2)
+    length = templates.shape[1]
+    if length > len(data):
+        msg = "Templates must not be longer than the data."
+        raise ValueError(msg)
+    nfft = next_pow_2(len(data))
+    spectra = _template_spectra(templates, nfft)
+    return _normalized_xcorr(data, spectra, nfft, length)
+
+
+def _find_peaks(indices, values, distance):
+    """
+    Positions (in ``indices`` and ``values``) of the highest values whose
+    indices have at least the given distance to each other, in the order of
+    the indices.
+    """
+    peaks = []
+    positions = []
+    for i in np.argsort(-values, kind='mergesort'):
+        index = indices[i]
+        pos = bisect.bisect_left(peaks, index)
+        if pos > 0 and index - peaks[pos - 1] < distance:
+            continue
+        if pos < len(peaks) and peaks[pos] - index < distance:
+            continue
+        peaks.insert(pos, index)
+        positions.insert(pos, i)
+    return positions
+
+
+def _detect_template_batch(batch, channels, threshold, block_length):
+    """
+    Correlate a batch of templates with the continuous data and return all
+    maxima of the stacked correlation above the threshold.
+
+    Each entry of ``batch`` is a tuple of the template index, a list of
+    ``(trace id, template data, moveout)`` and the range of valid stack
+    indices. Returns a list of ``(template index, stack index, value)``.
+    """
+    # templates of one channel and length are correlated in one go
+    groups = collections.OrderedDict()
+    for row, (_, chans, _, _) in enumerate(batch):
+        for id_, data, moveout in chans:
+            groups.setdefault((id_, len(data)), []).append(
+                (row, data, moveout))
+    overlap = 0
+    for (id_, length), group in groups.items():
+        moveouts = [moveout for _, _, moveout in group]
+        overlap = max(overlap, max(moveouts) - min(moveouts) + length - 1)
+    # make the best use of the FFT length
+    nfft = next_pow_2(block_length + overlap)
+    block_length = nfft - overlap
+    prepared = []
+    for (id_, length), group in groups.items():
+        rows = np.array([row for row, _, _ in group])
+        moveouts = np.array([moveout for _, _, moveout in group])
+        spectra = _template_spectra(
+            np.array([data for _, data, _ in group]), nfft)
+        prepared.append((id_, length, rows, moveouts, spectra))
+    num_channels = np.array([len(chans) for _, chans, _, _ in batch],
+                            dtype=np.float64)
+    kmin = min(b[2] for b in batch)
+    kmax = max(b[3] for b in batch)
+    candidates = []
+    for k0 in range(kmin, kmax + 1, block_length):
+        k1 = min(k0 + block_length, kmax + 1)
+        stack = np.zeros((len(batch), k1 - k0))
+        for id_, length, rows, moveouts, spectra in prepared:
+            data, offset = channels[id_]
+            # sample j of the correlation of a channel belongs to sample
+            # k = j + offset - moveout of the stack
+            j0 = max(k0 - offset + moveouts.min(), 0)
+            j1 = min(k1 - 1 - offset + moveouts.max(), len(data) - length)
+            if j1 < j0:
+                continue
+            cc = _normalized_xcorr(data[j0:j1 + length], spectra, nfft,
+                                   length)
+            for row, moveout, cc_ in zip(rows, moveouts, cc):
+                start = max(k0, j0 + offset - moveout)
+                end = min(k1, j1 + offset - moveout + 1)
+                if end > start:
+                    j = start - offset + moveout - j0
+                    stack[row, start - k0:end - k0] += \
+                        cc_[j:j + end - start]
+        stack /= num_channels[:, np.newaxis]
+        for row, (index, _, kmin_, kmax_) in enumerate(batch):
+            start = max(k0, kmin_)
+            end = min(k1, kmax_ + 1)
+            if end <= start:
+                continue
+            values = stack[row, start - k0:end - k0]
+            above = np.concatenate(([False], values > threshold, [False]))
+            # one candidate for every run of samples above the threshold
+            edges = np.flatnonzero(above[1:] != above[:-1])
+            for run_start, run_end in zip(edges[::2], edges[1::2]):
+                i = run_start + values[run_start:run_end].argmax()
+                candidates.append((index, start + i, values[i]))
+    return candidates
+
+
+def correlation_detector(stream, templates, threshold, distance=None,
+                         batch_size=64, block_length=2 ** 14, workers=None):
+    """
+    Detect events similar to template events in continuous data.
+
+    Each template event is correlated with the continuous data on all of its
+    channels (matched filter). The normalized cross-correlations of the
+    channels are shifted by the moveouts of the template and averaged, a
+    detection is declared where this stacked correlation exceeds the
+    threshold.
+
+    Templates are processed in batches: all templates of a batch are
+    correlated with a block of continuous data in one go using FFTs, the
+    normalization of the data windows is computed with running sums over
+    the data. Batches are distributed to a pool of threads. Memory usage
+    is bounded by the batch size and the block length, independent of the
+    length of the continuous data.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: Continuous data. One trace per trace ID (merge the stream
+        beforehand and fill any gaps), all traces need to have the same
+        sampling rate.
+    :type templates: list of :class:`~obspy.core.stream.Stream`
+    :param templates: Template events. Each template is a stream with the
+        waveforms of the event on some or all channels of ``stream``. The
+        moveouts between the channels are given by the start times of the
+        template traces. Channels not present in ``stream`` are disregarded.
+    :type threshold: float
+    :param threshold: Detection threshold for the mean correlation
+        coefficient of all channels of a template (between -1 and 1).
+    :type distance: float
+    :param distance: Minimum time between two detections of the same
+        template in seconds. If two maxima above the threshold are closer,
+        only the higher one is kept. Defaults to the length of the
+        respective template.
+    :type batch_size: int
+    :param batch_size: Number of templates correlated in one go.
+    :type block_length: int
+    :param block_length: Minimum number of samples of the stacked
+        correlation computed in one go. It is increased to make full use of
+        the FFT length.
+    :type workers: int
+    :param workers: Number of threads. Defaults to the number of CPUs.
+    :rtype: list of dict
+    :return: Detections sorted chronologically. Each detection is a
+        dictionary with the keys ``'time'`` (start time of the earliest
+        template trace, including traces disregarded because they are not
+        present in ``stream``, shifted to match the data), ``'similarity'``
+        (stacked correlation coefficient) and ``'template_id'`` (index of
+        the template in ``templates``).
+
+    .. rubric:: Example
+
+    >>> from obspy import read, UTCDateTime
+    >>> st = read()
+    >>> st.filter('highpass', freq=1.0)  # doctest: +ELLIPSIS
+    <...Stream object at 0x...>
+    >>> t = UTCDateTime(2009, 8, 24, 0, 20, 7, 700000)
+    >>> template = st.slice(t, t + 5)
+    >>> detections = correlation_detector(st, [template], 0.5)
+    >>> for detection in detections:  # doctest: +NORMALIZE_WHITESPACE
+    ...     print(detection['time'], round(detection['similarity'], 6))
+    2009-08-24T00:20:07.700000Z 1.0
+    """
+    sampling_rates = set(tr.stats.sampling_rate for tr in stream)
+    sampling_rates.update(tr.stats.sampling_rate
+                          for template in templates for tr in template)
+    if len(sampling_rates) > 1:
+        msg = "All traces need to have the same sampling rate."
+        raise ValueError(msg)
+    if len(set(tr.id for tr in stream)) != len(stream):
+        msg = ("The stream has to contain only one trace per trace ID, "
+               "merge it beforehand.")
+        raise ValueError(msg)
+    if any(isinstance(tr.data, np.ma.masked_array) for tr in stream):
+        msg = "Gaps in the data have to be filled beforehand."
+        raise ValueError(msg)
+    if not len(stream) or not templates:
+        return []
+    sampling_rate = sampling_rates.pop()
+    t0 = min(tr.stats.starttime for tr in stream)
+    channels = {}
+    for tr in stream:
+        offset = int(round((tr.stats.starttime - t0) * sampling_rate))
+        channels[tr.id] = (np.asarray(tr.data, dtype=np.float64), offset)
+    prepared = []
+    distances = {}
+    for index, template in enumerate(templates):
+        if not len(template):
+            continue
+        reftime = min(tr.stats.starttime for tr in template)
+        chans = []
+        for tr in template:
+            if tr.id not in channels:
+                msg = ("Skipping trace %s of template %d (not present in "
+                       "the continuous data).")
+                warnings.warn(msg % (tr.id, index))
+                continue
+            moveout = int(round((tr.stats.starttime - reftime) *
+                                sampling_rate))
+            chans.append((tr.id, np.asarray(tr.data, dtype=np.float64),
+                          moveout))
+        if not chans:
+            continue
+        # stack samples for which all channels of the template have data
+        kmin = max(channels[id_][1] - moveout for id_, _, moveout in chans)
+        kmax = min(channels[id_][1] - moveout + len(channels[id_][0]) -
+                   len(data) for id_, data, moveout in chans)
+        if kmax < kmin:
+            continue
+        prepared.append((index, chans, kmin, kmax))
+        if distance is None:
+            distances[index] = max(len(data) + moveout
+                                   for _, data, moveout in chans)
+        else:
+            distances[index] = distance * sampling_rate
+    batches = [prepared[i:i + batch_size]
+               for i in range(0, len(prepared), batch_size)]
+
+    def _detect(batch):
+        return _detect_template_batch(batch, channels, threshold,
+                                      block_length)
+
+    if len(batches) > 1 and workers != 1:
+        pool = ThreadPool(workers)
+        try:
+            results = pool.map(_detect, batches)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_detect(batch) for batch in batches]
+    candidates = collections.defaultdict(list)
+    for result in results:
+        for index, k, value in result:
+            candidates[index].append((k, value))
+    detections = []
+    for index, candidates_ in candidates.items():
+        indices, values = zip(*candidates_)
+        values = np.array(values)
+        for i in _find_peaks(indices, values, distances[index]):
+            detections.append({
+                'time': t0 + indices[i] / sampling_rate,
+                'similarity': values[i],
+                'template_id': index})
+    detections.sort(key=lambda d: (d['time'], d['template_id']))
+    return detections
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -32,7 +32,12 @@ def simple(data):
         data = np.require(data, dtype=np.float64)
     ndat = len(data)
     x1, x2 = data[0], data[-1]
-    data -= x1 + np.arange(ndat) * (x2 - x1) / float(ndat - 1)
+    # build the trend in a single temporary array
+    trend = np.arange(ndat, dtype=np.float64)
+    trend *= x2 - x1
+    trend /= float(ndat - 1)
+    trend += x1
+    data -= trend
     return data
 
 
@@ -22,6 +22,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 from scipy.fftpack import hilbert
@@ -36,7 +37,79 @@ except ImportError:
     from ._sosfilt import _zpk2sos as zpk2sos
 
 
-def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
+# number of samples filtered at once when filtering in place
+_INPLACE_BLOCK_SIZE = 2 ** 16
+# recently designed Butterworth filters in second-order sections format
+_BUTTERWORTH_SOS_CACHE = OrderedDict()
+_BUTTERWORTH_SOS_CACHE_SIZE = 128
+
+
+def _butterworth_sos(corners, wn, btype):
+    """
+    Design a Butterworth filter in second-order sections format.
+
+    Designing the filter is expensive compared to filtering short traces, so
+    the most recently used filters are cached. The returned array is shared
+    and must not be modified.
+
+    :param corners: Filter corners / order.
+    :param wn: Corner frequency or list of two corner frequencies, normalized
+        to Nyquist.
+    :type btype: str
+    :param btype: Type of filter, see :func:`scipy.signal.iirfilter`.
+    :rtype: numpy.ndarray
+    """
+    key = (corners, tuple(np.atleast_1d(wn)), btype)
+    try:
+        sos = _BUTTERWORTH_SOS_CACHE.pop(key)
+    except KeyError:
+        z, p, k = iirfilter(corners, wn, btype=btype, ftype='butter',
+                            output='zpk')
+        sos = zpk2sos(z, p, k)
+        sos.flags.writeable = False
+        if len(_BUTTERWORTH_SOS_CACHE) >= _BUTTERWORTH_SOS_CACHE_SIZE:
+            _BUTTERWORTH_SOS_CACHE.popitem(last=False)
+    # (re)insert as most recently used
+    _BUTTERWORTH_SOS_CACHE[key] = sos
+    return sos
+
+
+def _apply_sos(sos, data, zerophase=False, inplace=False):
+    """
+    Apply a filter in second-order sections format to the data.
+
+    :type sos: numpy.ndarray
+    :param sos: Second-order sections of the filter, see
+        :func:`scipy.signal.sosfilt`.
+    :type data: numpy.ndarray
+    :param data: Data to filter, multi-dimensional arrays are filtered along
+        the last axis.
+    :param zerophase: If True, apply filter once forwards and once backwards.
+    :type inplace: bool
+    :param inplace: If True, the data is filtered block by block (carrying
+        over the filter state from block to block) and the filtered samples
+        are written back to ``data``. No temporary array as large as the data
+        is needed then and the data keeps its dtype, e.g. single precision
+        data stays single precision (the filter itself is still computed in
+        double precision). ``data`` must be a writeable floating point array.
+    :return: Filtered data.
+    """
+    if not inplace:
+        if zerophase:
+            firstpass = sosfilt(sos, data)
+            return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
+        else:
+            return sosfilt(sos, data)
+    for pass_ in ((data, data[..., ::-1]) if zerophase else (data,)):
+        zi = np.zeros((sos.shape[0],) + data.shape[:-1] + (2,))
+        for i in range(0, data.shape[-1], _INPLACE_BLOCK_SIZE):
+            block = pass_[..., i:i + _INPLACE_BLOCK_SIZE]
+            block[...], zi = sosfilt(sos, block, zi=zi)
+    return data
+
+
+def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False,
+             inplace=False):
     """
     Butterworth-Bandpass Filter.
 
@@ -46,7 +119,8 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freqmin: Pass band low corner frequency.
     :param freqmax: Pass band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -54,6 +128,11 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
     :param zerophase: If True, apply filter once forwards and once backwards.
         This results in twice the filter order but zero phase shift in
         the resulting filtered trace.
+    :type inplace: bool
+    :param inplace: If True, the filtered data is written back to ``data``
+        block by block, so that no temporary array as large as the data is
+        needed. ``data`` must be a writeable floating point array and keeps
+        its dtype.
     :return: Filtered data.
     """
     fe = 0.5 * df
@@ -66,21 +145,16 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
             freqmax, fe)
         warnings.warn(msg)
         return highpass(data, freq=freqmin, df=df, corners=corners,
-                        zerophase=zerophase)
+                        zerophase=zerophase, inplace=inplace)
     if low > 1:
         msg = "Selected low corner frequency is above Nyquist."
         raise ValueError(msg)
-    z, p, k = iirfilter(corners, [low, high], btype='band',
-                        ftype='butter', output='zpk')
-    sos = zpk2sos(z, p, k)
-    if zerophase:
-        firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
-    else:
-        return sosfilt(sos, data)
+    sos = _butterworth_sos(corners, [low, high], 'band')
+    return _apply_sos(sos, data, zerophase=zerophase, inplace=inplace)
 
 
-def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
+def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False,
+             inplace=False):
     """
     Butterworth-Bandstop Filter.
 
@@ -90,7 +164,8 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freqmin: Stop band low corner frequency.
     :param freqmax: Stop band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -98,6 +173,11 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     :param zerophase: If True, apply filter once forwards and once backwards.
         This results in twice the number of corners but zero phase shift in
         the resulting filtered trace.
+    :type inplace: bool
+    :param inplace: If True, the filtered data is written back to ``data``
+        block by block, so that no temporary array as large as the data is
+        needed. ``data`` must be a writeable floating point array and keeps
+        its dtype.
     :return: Filtered data.
     """
     fe = 0.5 * df
@@ -112,17 +192,11 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     if low > 1:
         msg = "Selected low corner frequency is above Nyquist."
         raise ValueError(msg)
-    z, p, k = iirfilter(corners, [low, high],
-                        btype='bandstop', ftype='butter', output='zpk')
-    sos = zpk2sos(z, p, k)
-    if zerophase:
-        firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
-    else:
-        return sosfilt(sos, data)
+    sos = _butterworth_sos(corners, [low, high], 'bandstop')
+    return _apply_sos(sos, data, zerophase=zerophase, inplace=inplace)
 
 
-def lowpass(data, freq, df, corners=4, zerophase=False):
+def lowpass(data, freq, df, corners=4, zerophase=False, inplace=False):
     """
     Butterworth-Lowpass Filter.
 
@@ -132,13 +206,19 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
     :param zerophase: If True, apply filter once forwards and once backwards.
         This results in twice the number of corners but zero phase shift in
         the resulting filtered trace.
+    :type inplace: bool
+    :param inplace: If True, the filtered data is written back to ``data``
+        block by block, so that no temporary array as large as the data is
+        needed. ``data`` must be a writeable floating point array and keeps
+        its dtype.
     :return: Filtered data.
     """
     fe = 0.5 * df
@@ -149,17 +229,11 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
         msg = "Selected corner frequency is above Nyquist. " + \
               "Setting Nyquist as high corner."
         warnings.warn(msg)
-    z, p, k = iirfilter(corners, f, btype='lowpass', ftype='butter',
-                        output='zpk')
-    sos = zpk2sos(z, p, k)
-    if zerophase:
-        firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
-    else:
-        return sosfilt(sos, data)
+    sos = _butterworth_sos(corners, f, 'lowpass')
+    return _apply_sos(sos, data, zerophase=zerophase, inplace=inplace)
 
 
-def highpass(data, freq, df, corners=4, zerophase=False):
+def highpass(data, freq, df, corners=4, zerophase=False, inplace=False):
     """
     Butterworth-Highpass Filter.
 
@@ -169,13 +243,19 @@ def highpass(data, freq, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
     :param zerophase: If True, apply filter once forwards and once backwards.
         This results in twice the number of corners but zero phase shift in
         the resulting filtered trace.
+    :type inplace: bool
+    :param inplace: If True, the filtered data is written back to ``data``
+        block by block, so that no temporary array as large as the data is
+        needed. ``data`` must be a writeable floating point array and keeps
+        its dtype.
     :return: Filtered data.
     """
     fe = 0.5 * df
@@ -184,14 +264,8 @@ def highpass(data, freq, df, corners=4, zerophase=False):
     if f > 1:
         msg = "Selected corner frequency is above Nyquist."
         raise ValueError(msg)
-    z, p, k = iirfilter(corners, f, btype='highpass', ftype='butter',
-                        output='zpk')
-    sos = zpk2sos(z, p, k)
-    if zerophase:
-        firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
-    else:
-        return sosfilt(sos, data)
+    sos = _butterworth_sos(corners, f, 'highpass')
+    return _apply_sos(sos, data, zerophase=zerophase, inplace=inplace)
 
 
 def envelope(data):
@@ -23,8 +23,10 @@ from future.builtins import *  # NOQA
 from future.utils import native_str
 
 import bisect
+import copy
 import glob
 import math
+import multiprocessing
 import os
 import warnings
 
@@ -35,7 +37,7 @@ from matplotlib.dates import date2num
 from matplotlib.ticker import FormatStrFormatter
 
 from obspy import Stream, Trace, UTCDateTime, __version__
-from obspy.core import Stats
+from obspy.core import Stats, UTCDateTimeArray
 from obspy.imaging.scripts.scan import compress_start_end
 from obspy.core.inventory import Inventory
 from obspy.core.util import AttribDict
@@ -118,6 +120,73 @@ def welch_window(n):
     return taper
 
 
+def _psd_histogram(binned_psds, db_bin_edges):
+    """
+    2D histogram of binned psds.
+
+    :type binned_psds: :class:`numpy.ndarray`
+    :param binned_psds: 2-D array with one binned psd per row.
+    :type db_bin_edges: :class:`numpy.ndarray`
+    :param db_bin_edges: Edges of the db bins.
+    :rtype: :class:`numpy.ndarray`
+    :returns: Histogram with one row per period bin and one column per db
+        bin.
+    """
+    num_psds, num_period_bins = binned_psds.shape
+    num_db_bins = len(db_bin_edges) - 1
+    hist_stack = np.zeros((num_period_bins, num_db_bins), dtype=np.uint64)
+    if not num_psds:
+        return hist_stack
+    # evaluate index of amplitude bin each value belongs to
+    inds = binned_psds.ravel()
+    # for "inds" now a number of ..
+    #   - 0 means below lowest bin (bin index 0)
+    #   - 1 means, hit lowest bin (bin index 0)
+    #   - ..
+    #   - len(db_bin_edges) means above top bin
+    # we need minus one because searchsorted returns the insertion index in
+    # the array of bin edges which is the index of the corresponding bin
+    # plus one
+    inds = db_bin_edges.searchsorted(inds, side="left") - 1
+    # for "inds" now a number of ..
+    #   - -1 means below lowest bin (bin index 0)
+    #   - 0 means, hit lowest bin (bin index 0)
+    #   - ..
+    #   - (len(db_bin_edges)-1) means above top bin
+    # values that are left of first bin edge have to be moved back into the
+    # binning
+    inds[inds == -1] = 0
+    # same goes for values right of last bin edge
+    inds[inds == num_db_bins] -= 1
+    # reshape such that we can iterate over the array, extracting for
+    # each period bin an array of all amplitude bins we have hit
+    inds = inds.reshape((num_psds, num_period_bins)).T
+    for i, inds_ in enumerate(inds):
+        # count how often each bin has been hit for this period bin,
+        # set the 2D histogram column accordingly
+        hist_stack[i, :] = np.bincount(inds_, minlength=num_db_bins)
+    return hist_stack
+
+
+# PPSD used in worker processes of PPSD.add()
+_worker_ppsd = None
+
+
+def _init_ppsd_worker(ppsd):
+    """
+    Set up a worker process for parallel processing in :meth:`PPSD.add`.
+    """
+    global _worker_ppsd
+    _worker_ppsd = ppsd
+
+
+def _process_ppsd_segment(tr):
+    """
+    Process one segment in a worker process, see :meth:`PPSD.add`.
+    """
+    return _worker_ppsd._process_segment(tr)
+
+
 class PPSD(object):
     """
     Class to compile probabilistic power spectral densities for one combination
@@ -591,6 +660,26 @@ class PPSD(object):
         self._times_processed.insert(ind, utcdatetime.timestamp)
         self._binned_psds.insert(ind, spectrum)
 
+    def __insert_processed_data_many(self, times, spectra):
+        """
+        Inserts many processed/octave-binned spectra at once, see
+        :meth:`PPSD.__insert_processed_data()`.
+
+        :type times: :class:`numpy.ndarray`
+        :param times: POSIX timestamps of the segments.
+        :type spectra: :class:`numpy.ndarray`
+        :param spectra: 2-D array with one binned spectrum per row.
+        """
+        if not len(times):
+            return
+        times_all = np.concatenate((self._times_processed, times))
+        # stable sort keeps existing segments in front of new ones with equal
+        # start time, like bisect.bisect() does
+        order = np.argsort(times_all, kind='mergesort')
+        spectra_all = self._binned_psds + [s for s in spectra]
+        self._times_processed = times_all[order].tolist()
+        self._binned_psds = [spectra_all[i] for i in order]
+
     def __insert_gap_times(self, stream):
         """
         Gets gap information of stream and adds the encountered gaps to the gap
@@ -630,6 +719,29 @@ class PPSD(object):
         else:
             return False
 
+    def __check_times_present(self, timestamps):
+        """
+        Vectorized version of :meth:`PPSD.__check_time_present()` for many
+        sorted POSIX timestamps that are inserted one after another.
+
+        :type timestamps: :class:`numpy.ndarray`
+        :rtype: :class:`numpy.ndarray` of bool
+        :returns: Boolean array of which segments are already covered.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        times = np.array(self._times_processed, dtype=np.float64)
+        index1 = times.searchsorted(timestamps, side='left')
+        index2 = times.searchsorted(timestamps + self.ppsd_length,
+                                    side='right')
+        present = index1 != index2
+        # inserting sorted timestamps one after another, a segment can only
+        # be covered by an earlier one of the same time
+        if len(timestamps) > 1:
+            same = np.concatenate(([False],
+                                   timestamps[1:] == timestamps[:-1]))
+            present |= same
+        return present
+
     def __check_histogram(self):
         # check if any data has been added yet
         if self._current_hist_stack is None:
@@ -645,7 +757,7 @@ class PPSD(object):
         self._current_times_used = []
         self._current_times_all_details = []
 
-    def add(self, stream, verbose=False):
+    def add(self, stream, verbose=False, workers=None):
         """
         Process all traces with compatible information and add their spectral
         estimates to the histogram containing the probabilistic psd.
@@ -655,6 +767,12 @@ class PPSD(object):
                 :class:`~obspy.core.trace.Trace`
         :param stream: Stream or trace with data that should be added to the
                 probabilistic psd histogram.
+        :type workers: int, optional
+        :param workers: Number of worker processes used to compute the
+                spectra of the individual psd segments. By default all
+                segments are processed in the current process. Warnings
+                issued while processing a segment are not shown when using
+                worker processes.
         :returns: True if appropriate data were found and the ppsd statistics
                 were changed, False otherwise.
         """
@@ -677,6 +795,8 @@ class PPSD(object):
         # merge depending on skip_on_gaps set during __init__
         stream.merge(self.merge_method, fill_value=0)
 
+        # collect all segments not covered yet
+        slices = []
         for tr in stream:
             # the following check should not be necessary due to the select()..
             if not self.__sanity_check(tr):
@@ -694,32 +814,59 @@ class PPSD(object):
                 else:
                     # throw warnings if trace length is different
                     # than ppsd_length..!?!
-                    slice = tr.slice(t1, t1 + self.ppsd_length)
-                    # XXX not good, should be working in place somehow
-                    # XXX how to do it with the padding, though?
-                    success = self.__process(slice)
-                    if success:
-                        if verbose:
-                            print(t1)
-                        changed = True
+                    slices.append(tr.slice(t1, t1 + self.ppsd_length))
                 t1 += (1 - self.overlap) * self.ppsd_length  # advance
 
             # enforce time limits, pad zeros if gaps
             # tr.trim(t, t+PPSD_LENGTH, pad=True)
+
+        if workers and workers > 1 and len(slices) > 1:
+            # the worker processes do not need any processed data
+            ppsd = copy.copy(self)
+            for key in self.NPZ_STORE_KEYS_LIST_TYPES:
+                setattr(ppsd, key, [])
+            ppsd.__invalidate_histogram()
+            pool = multiprocessing.Pool(min(workers, len(slices)),
+                                        initializer=_init_ppsd_worker,
+                                        initargs=(ppsd,))
+            try:
+                spectra = pool.map(_process_ppsd_segment, slices)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            spectra = (self._process_segment(slice) for slice in slices)
+
+        for slice, spectrum in zip(slices, spectra):
+            if spectrum is None:
+                continue
+            t1 = slice.stats.starttime
+            # segments of the same call might overlap, e.g. across gaps
+            if self.__check_time_present(t1):
+                msg = "Already covered time spans detected (e.g. %s), " + \
+                      "skipping these slices."
+                msg = msg % t1
+                warnings.warn(msg)
+                continue
+            self.__insert_processed_data(t1, spectrum)
+            if verbose:
+                print(t1)
+            changed = True
+
         if changed:
             self.__invalidate_histogram()
         return changed
 
-    def __process(self, tr):
+    def _process_segment(self, tr):
         """
-        Processes a segment of data and save the psd information.
+        Processes a segment of data and returns the binned psd.
         Whether `Trace` is compatible (station, channel, ...) has to
         checked beforehand.
 
         :type tr: :class:`~obspy.core.trace.Trace`
         :param tr: Compatible Trace with data of one PPSD segment
-        :returns: `True` if segment was successfully processed,
-            `False` otherwise.
+        :returns: Binned psd as :class:`numpy.ndarray` if segment was
+            successfully processed, `None` otherwise.
         """
         # XXX DIRTY HACK!!
         if len(tr) == self.len + 1:
@@ -729,7 +876,7 @@ class PPSD(object):
             msg = "Got a piece of data with wrong length. Skipping"
             warnings.warn(msg)
             print(len(tr), self.len)
-            return False
+            return None
         # being paranoid, only necessary if in-place operations would follow
         tr.data = tr.data.astype(np.float64)
         # if trace has a masked array we fill in zeros
@@ -776,7 +923,7 @@ class PPSD(object):
                        "Skipping time segment(s).")
                 msg = msg % (e.__class__.__name__, str(e))
                 warnings.warn(msg)
-                return False
+                return None
 
             resp = resp[1:]
             resp = resp[::-1]
@@ -806,9 +953,7 @@ class PPSD(object):
             specs = spec[(per_left <= self.psd_periods) &
                          (self.psd_periods <= per_right)]
             smoothed_psd.append(specs.mean())
-        smoothed_psd = np.array(smoothed_psd, dtype=np.float32)
-        self.__insert_processed_data(tr.stats.starttime, smoothed_psd)
-        return True
+        return np.array(smoothed_psd, dtype=np.float32)
 
     def _get_times_all_details(self):
         # check if we can reuse a previously cached array of all times as
@@ -825,16 +970,15 @@ class PPSD(object):
                               (native_str('month'), np.int8)])
             times_all_details = np.empty(shape=len(self._times_processed),
                                          dtype=dtype)
-            utc_times_all = [UTCDateTime(t) for t in self._times_processed]
+            utc_times_all = UTCDateTimeArray(
+                np.array(self._times_processed, dtype=np.float64))
             times_all_details['time_of_day'][:] = \
-                [t._get_hours_after_midnight() for t in utc_times_all]
-            times_all_details['iso_weekday'][:] = \
-                [t.isoweekday() for t in utc_times_all]
-            times_all_details['iso_week'][:] = \
-                [t.isocalendar()[1] for t in utc_times_all]
-            times_all_details['year'][:] = \
-                [t.year for t in utc_times_all]
-            times_all_details['month'][:] = [t.month for t in utc_times_all]
+                utc_times_all._get_hours_after_midnight()
+            _, iso_week, iso_weekday = utc_times_all.isocalendar()
+            times_all_details['iso_weekday'][:] = iso_weekday
+            times_all_details['iso_week'][:] = iso_week
+            times_all_details['year'][:] = utc_times_all.year
+            times_all_details['month'][:] = utc_times_all.month
             self._current_times_all_details = times_all_details
             return times_all_details
 
@@ -1008,35 +1152,10 @@ class PPSD(object):
             self._current_times_used = used_times
             return
 
-        # concatenate all used spectra, evaluate index of amplitude bin each
-        # value belongs to
-        inds = np.hstack([self._binned_psds[i] for i in used_indices])
-        # for "inds" now a number of ..
-        #   - 0 means below lowest bin (bin index 0)
-        #   - 1 means, hit lowest bin (bin index 0)
-        #   - ..
-        #   - len(self.db_bin_edges) means above top bin
-        # we need minus one because searchsorted returns the insertion index in
-        # the array of bin edges which is the index of the corresponding bin
-        # plus one
-        inds = self.db_bin_edges.searchsorted(inds, side="left") - 1
-        # for "inds" now a number of ..
-        #   - -1 means below lowest bin (bin index 0)
-        #   - 0 means, hit lowest bin (bin index 0)
-        #   - ..
-        #   - (len(self.db_bin_edges)-1) means above top bin
-        # values that are left of first bin edge have to be moved back into the
-        # binning
-        inds[inds == -1] = 0
-        # same goes for values right of last bin edge
-        inds[inds == num_db_bins] -= 1
-        # reshape such that we can iterate over the array, extracting for
-        # each period bin an array of all amplitude bins we have hit
-        inds = inds.reshape((used_count, num_period_bins)).T
-        for i, inds_ in enumerate(inds):
-            # count how often each bin has been hit for this period bin,
-            # set the current 2D histogram column accordingly
-            hist_stack[i, :] = np.bincount(inds_, minlength=num_db_bins)
+        # evaluate the amplitude bins hit by all used spectra
+        hist_stack = _psd_histogram(
+            np.array([self._binned_psds[i] for i in used_indices]),
+            self.db_bin_edges)
 
         # calculate and set the cumulative version (i.e. going from 0 to 1 from
         # low to high psd values for every period column) of the current
@@ -1261,18 +1380,20 @@ class PPSD(object):
                 warnings.warn(msg)
         _times_data = data["_times_data"].tolist()
         _times_gaps = data["_times_gaps"].tolist()
-        _times_processed = [d_ for d_ in data["_times_processed"]]
-        _binned_psds = [d_ for d_ in data["_binned_psds"]]
+        _times_processed = data["_times_processed"]
+        _binned_psds = data["_binned_psds"]
+        # files written by PPSD are sorted already
+        order = np.argsort(_times_processed, kind='mergesort')
+        _times_processed = _times_processed[order]
+        _binned_psds = _binned_psds[order]
         # add new data
         self._times_data.extend(_times_data)
         self._times_gaps.extend(_times_gaps)
-        duplicates = 0
-        for t, psd in zip(_times_processed, _binned_psds):
-            t = UTCDateTime(t)
-            if self.__check_time_present(t):
-                duplicates += 1
-                continue
-            self.__insert_processed_data(t, psd)
+        keep = self.__check_times_present(_times_processed)
+        np.logical_not(keep, out=keep)
+        duplicates = len(keep) - keep.sum()
+        self.__insert_processed_data_many(_times_processed[keep],
+                                          _binned_psds[keep])
         # warn if some segments were omitted
         if duplicates:
             msg = ("%d/%d segments omitted in file '%s' "
@@ -1564,17 +1685,17 @@ class PPSD(object):
         ax.set_yticks([])
 
         # plot data used in histogram stack
-        used_times = [UTCDateTime(t) for t in self._times_processed
-                      if t in self._current_times_used]
-        unused_times = [UTCDateTime(t) for t in self._times_processed
-                        if t not in self._current_times_used]
-        for times, color in zip((used_times, unused_times), ("b", "0.6")):
+        timestamps = np.array(self._times_processed, dtype=np.float64)
+        used = np.in1d(timestamps,
+                       np.array(self._current_times_used, dtype=np.float64))
+        times_all = UTCDateTimeArray(timestamps)
+        for selected, color in zip((used, ~used), ("b", "0.6")):
             # skip on empty lists (i.e. all data used, or none used in stack)
-            if not times:
+            if not selected.any():
                 continue
-            starts = [date2num(t.datetime) for t in times]
-            ends = [date2num((t + self.ppsd_length).datetime)
-                    for t in times]
+            times = times_all[selected]
+            starts = date2num([t.datetime for t in times])
+            ends = date2num([t.datetime for t in times + self.ppsd_length])
             startends = np.array([starts, ends])
             startends = compress_start_end(startends.T, 20,
                                            merge_overlaps=True)
@@ -1595,6 +1716,347 @@ class PPSD(object):
         ax.autoscale_view()
 
 
+class PPSDStore(object):
+    """
+    Append-only on-disk store for the processed data of a PPSD.
+
+    The store is a directory holding the settings of the PPSD (binning,
+    segment length, ...) in ``settings.npz`` and any number of chunk files.
+    Every call of :meth:`append` writes the psd segments that are not in the
+    store yet to a new chunk file, together with their histogram. The time
+    span of each chunk is encoded in its file name, so only chunks
+    overlapping a requested time span are read, and histograms of chunks
+    that are completely inside a requested time span are added up without
+    reading their psd segments. Existing files are never modified, so
+    readers can work on a store while new data is appended.
+
+    .. rubric:: Example
+
+    Process the data of a new day, skipping segments that are present in
+    the store already, and append the new segments to the store:
+
+    >>> store = PPSDStore("/path/to/ppsd/BW.KW1..EHZ")  # doctest: +SKIP
+    >>> store.add(st, metadata=inv, workers=4)  # doctest: +SKIP
+
+    Histogram of one month without reading all data:
+
+    >>> hist = store.calculate_histogram(
+    ...     UTCDateTime(2016, 2, 1), UTCDateTime(2016, 3, 1))  # doctest: +SKIP
+
+    PPSD with all segments of one month, e.g. for plotting:
+
+    >>> ppsd = store.ppsd(starttime=UTCDateTime(2016, 2, 1),
+    ...                   endtime=UTCDateTime(2016, 3, 1))  # doctest: +SKIP
+    >>> ppsd.plot()  # doctest: +SKIP
+
+    :type path: str
+    :param path: Directory of the store. It is created on the first call of
+        :meth:`append` or :meth:`add` if necessary.
+    """
+    SETTINGS_FILENAME = "settings.npz"
+    SETTINGS_KEYS = (PPSD.NPZ_STORE_KEYS_ARRAY_TYPES +
+                     PPSD.NPZ_STORE_KEYS_SIMPLE_TYPES +
+                     PPSD.NPZ_STORE_KEYS_VERSION_NUMBERS)
+    CHUNK_FILENAME = "psd_%.6f_%.6f.npz"
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    def _settings_file(self):
+        return os.path.join(self.path, self.SETTINGS_FILENAME)
+
+    def _chunks(self, starttime=None, endtime=None):
+        """
+        Sorted list of ``(starttime, endtime, filename)`` of all chunks that
+        overlap the given time span (POSIX timestamps).
+        """
+        chunks = []
+        try:
+            filenames = os.listdir(self.path)
+        except OSError:
+            return chunks
+        for filename in filenames:
+            if not filename.startswith("psd_") or \
+                    not filename.endswith(".npz"):
+                continue
+            try:
+                start, end = map(float, filename[4:-4].split("_")[:2])
+            except ValueError:
+                continue
+            if starttime is not None and end < starttime:
+                continue
+            if endtime is not None and start > endtime:
+                continue
+            chunks.append((start, end, os.path.join(self.path, filename)))
+        chunks.sort()
+        return chunks
+
+    def _load_chunks(self, chunks, keys):
+        """
+        Load the given keys of all given chunks, concatenated over chunks.
+        """
+        values = dict((key, []) for key in keys)
+        for _, _, filename in chunks:
+            with np.load(filename) as data:
+                for key in keys:
+                    values[key].append(data[key])
+        return values
+
+    def _write_settings(self, ppsd):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        out = dict([(key, getattr(ppsd, key)) for key in self.SETTINGS_KEYS])
+        self._write_npz(self._settings_file, out)
+
+    def _check_settings(self, ppsd):
+        """
+        Check if the settings of the PPSD agree with the settings of the store.
+        """
+        with np.load(self._settings_file) as data:
+            for key in PPSD.NPZ_STORE_KEYS_SIMPLE_TYPES:
+                if getattr(ppsd, key) != data[key].item():
+                    msg = ("Mismatch in '%s' attribute.\n\tCurrent:\n\t%s\n\t"
+                           "Store:\n\t%s")
+                    msg = msg % (key, getattr(ppsd, key), data[key].item())
+                    raise AssertionError(msg)
+            for key in PPSD.NPZ_STORE_KEYS_ARRAY_TYPES:
+                try:
+                    np.testing.assert_array_equal(getattr(ppsd, key),
+                                                  data[key])
+                except AssertionError as e:
+                    msg = ("Mismatch in '%s' attribute.\n") % key
+                    raise AssertionError(msg + str(e))
+
+    @staticmethod
+    def _write_npz(filename, data):
+        """
+        Write a npz file so that it never shows up incompletely written.
+        """
+        dirname, basename = os.path.split(filename)
+        tmp_filename = os.path.join(
+            dirname, ".tmp_%d_%s" % (os.getpid(), basename))
+        with open(tmp_filename, "wb") as fh:
+            np.savez_compressed(fh, **data)
+        os.rename(tmp_filename, filename)
+
+    def _empty_ppsd(self, metadata=None):
+        """
+        PPSD with the settings of the store but without any data.
+        """
+        if not os.path.exists(self._settings_file):
+            msg = "No PPSD data stored in '%s' yet." % self.path
+            raise ValueError(msg)
+        # the information regarding stats is set from the settings
+        ppsd = PPSD(Stats(), metadata=metadata)
+        with np.load(self._settings_file) as data:
+            for key in self.SETTINGS_KEYS:
+                data_ = data[key]
+                if key not in PPSD.NPZ_STORE_KEYS_ARRAY_TYPES:
+                    data_ = data_.item()
+                setattr(ppsd, key, data_)
+        return ppsd
+
+    @property
+    def times_processed(self):
+        """
+        Start times (POSIX timestamps) of all psd segments in the store.
+        """
+        chunks = self._chunks()
+        if not chunks:
+            return np.empty(0, dtype=np.float64)
+        times = self._load_chunks(chunks, ["times"])["times"]
+        return np.sort(np.concatenate(times), kind='mergesort')
+
+    def ppsd(self, metadata=None, starttime=None, endtime=None):
+        """
+        PPSD with the psd segments of the store, optionally only those
+        starting in the given time span.
+
+        Like :meth:`PPSD.calculate_histogram`, only psd segments starting
+        after ``starttime`` and before ``endtime`` are used.
+
+        :type metadata: :class:`~obspy.core.inventory.inventory.Inventory` or
+            :class:`~obspy.io.xseed Parser` or str or dict
+        :param metadata: Response information of instrument, only needed if
+            more data is to be processed. See notes in
+            :meth:`PPSD.__init__` for details.
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: Only use psd segments starting after this time.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: Only use psd segments starting before this time.
+        :rtype: :class:`PPSD`
+        """
+        ppsd = self._empty_ppsd(metadata)
+        t1 = starttime and starttime.timestamp
+        t2 = endtime and endtime.timestamp
+        chunks = self._chunks(t1, t2)
+        values = self._load_chunks(
+            chunks, ["times", "psds", "times_data", "times_gaps"])
+        if chunks:
+            times = np.concatenate(values["times"])
+            psds = np.concatenate(values["psds"])
+            selected = np.ones(len(times), dtype=np.bool_)
+            if t1 is not None:
+                selected &= times > t1
+            if t2 is not None:
+                selected &= times < t2
+            order = np.argsort(times[selected], kind='mergesort')
+            ppsd._times_processed = times[selected][order].tolist()
+            ppsd._binned_psds = [psd for psd in psds[selected][order]]
+            for key in ("times_data", "times_gaps"):
+                ranges = np.concatenate(values[key]).reshape(-1, 2)
+                if t1 is not None:
+                    ranges = ranges[ranges[:, 1] >= t1]
+                if t2 is not None:
+                    ranges = ranges[ranges[:, 0] <= t2]
+                setattr(ppsd, "_" + key, ranges.tolist())
+        return ppsd
+
+    def append(self, ppsd):
+        """
+        Append all psd segments of a PPSD that are not in the store yet.
+
+        Segments are skipped under the same rules as in
+        :meth:`PPSD.add_npz`. The information on data and gap time spans
+        of the PPSD is appended as well, except for spans already present in
+        the store.
+
+        :type ppsd: :class:`PPSD`
+        :rtype: int
+        :returns: Number of psd segments appended.
+        """
+        if os.path.exists(self._settings_file):
+            self._check_settings(ppsd)
+        else:
+            self._write_settings(ppsd)
+        times = np.array(ppsd._times_processed, dtype=np.float64)
+        psds = np.array(ppsd._binned_psds, dtype=np.float32).reshape(
+            len(times), len(ppsd.period_bin_centers))
+        times_data = np.array(ppsd._times_data,
+                              dtype=np.float64).reshape(-1, 2)
+        times_gaps = np.array(ppsd._times_gaps,
+                              dtype=np.float64).reshape(-1, 2)
+        ranges = [times, times_data.ravel(), times_gaps.ravel()]
+        ranges = np.concatenate(ranges)
+        if not len(ranges):
+            return 0
+        t1, t2 = ranges.min(), ranges.max()
+        # only the chunks that could hold any of these segments are read
+        chunks = self._chunks(t1, t2 + ppsd.ppsd_length)
+        stored = self._load_chunks(
+            chunks, ["times", "times_data", "times_gaps"])
+        stored_times = np.sort(np.concatenate(
+            stored["times"] or [np.empty(0)]))
+        # same rules as in PPSD.add_npz()
+        index1 = stored_times.searchsorted(times, side='left')
+        index2 = stored_times.searchsorted(times + ppsd.ppsd_length,
+                                           side='right')
+        keep = index1 == index2
+        times = times[keep]
+        psds = psds[keep]
+        new_ranges = {}
+        for key, ranges in (("times_data", times_data),
+                            ("times_gaps", times_gaps)):
+            present = set(map(tuple, np.concatenate(
+                stored[key] or [np.empty((0, 2))]).reshape(-1, 2).tolist()))
+            new_ranges[key] = np.array(
+                [r for r in ranges.tolist() if tuple(r) not in present],
+                dtype=np.float64).reshape(-1, 2)
+        if not len(times) and not any(map(len, new_ranges.values())):
+            return 0
+        # encode the time span of the chunk in the file name
+        ranges = np.concatenate([times] + [r.ravel()
+                                           for r in new_ranges.values()])
+        filename = os.path.join(self.path, self.CHUNK_FILENAME % (
+            ranges.min(), ranges.max()))
+        base = filename[:-4]
+        i = 0
+        while os.path.exists(filename):
+            i += 1
+            filename = "%s_%d.npz" % (base, i)
+        self._write_npz(filename, {
+            "times": times, "psds": psds,
+            "histogram": _psd_histogram(psds, ppsd.db_bin_edges),
+            "times_data": new_ranges["times_data"],
+            "times_gaps": new_ranges["times_gaps"]})
+        return len(times)
+
+    def add(self, stream, metadata, verbose=False, workers=None, **kwargs):
+        """
+        Process new data and append the resulting psd segments to the store.
+
+        Only segments of the data that are not in the store yet are
+        processed.
+
+        :type stream: :class:`~obspy.core.stream.Stream` or
+                :class:`~obspy.core.trace.Trace`
+        :param stream: Stream or trace with data that should be added.
+        :type metadata: :class:`~obspy.core.inventory.inventory.Inventory` or
+            :class:`~obspy.io.xseed Parser` or str or dict
+        :param metadata: Response information of instrument. See notes in
+            :meth:`PPSD.__init__` for details.
+        :type workers: int, optional
+        :param workers: Number of worker processes, see :meth:`PPSD.add`.
+        :param kwargs: Keyword arguments passed on to :class:`PPSD` when
+            creating a new store (ignored for existing stores).
+        :rtype: int
+        :returns: Number of psd segments appended.
+        """
+        if isinstance(stream, Trace):
+            stream = Stream([stream])
+        if not len(stream):
+            return 0
+        starttime = min(tr.stats.starttime for tr in stream)
+        endtime = max(tr.stats.endtime for tr in stream)
+        if os.path.exists(self._settings_file):
+            # segments in this time span would be skipped by PPSD.add()
+            ppsd = self.ppsd(metadata=metadata, starttime=starttime,
+                             endtime=endtime)
+        else:
+            ppsd = PPSD(stream[0].stats, metadata, **kwargs)
+        ppsd.add(stream, verbose=verbose, workers=workers)
+        return self.append(ppsd)
+
+    def calculate_histogram(self, starttime=None, endtime=None):
+        """
+        2D histogram of all psd segments starting in the given time span.
+
+        Like :meth:`PPSD.calculate_histogram`, only psd segments starting
+        after ``starttime`` and before ``endtime`` are used. The psd segments
+        are only read for chunks that are not completely inside the time
+        span.
+
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: If set, data before the specified time is excluded.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: If set, data after the specified time is excluded.
+        :rtype: :class:`numpy.ndarray`
+        :returns: Histogram with one row per period bin and one column per db
+            bin, see :attr:`PPSD.current_histogram`.
+        """
+        ppsd = self._empty_ppsd()
+        t1 = starttime and starttime.timestamp
+        t2 = endtime and endtime.timestamp
+        hist = _psd_histogram(
+            np.empty((0, len(ppsd.period_bin_centers)), dtype=np.float32),
+            ppsd.db_bin_edges)
+        for start, end, filename in self._chunks(t1, t2):
+            with np.load(filename) as data:
+                if (t1 is None or start > t1) and (t2 is None or end < t2):
+                    hist += data["histogram"]
+                    continue
+                times = data["times"]
+                selected = np.ones(len(times), dtype=np.bool_)
+                if t1 is not None:
+                    selected &= times > t1
+                if t2 is not None:
+                    selected &= times < t2
+                hist += _psd_histogram(data["psds"][selected],
+                                       ppsd.db_bin_edges)
+        return hist
+
+
 def get_nlnm():
     """
     Returns periods and psd values for the New Low Noise Model.
@@ -25,3 +25,26 @@ void recstalta(double *a, double *charfct, int ndat, int nsta, int nlta) {
 
     return;
 }
+
+
+/* Recursive STA/LTA of one block of a longer time series. The averages at
+ * the end of the previous block are passed in state[0] (sta) and state[1]
+ * (lta) and are replaced by the averages at the end of this block. */
+void recstalta_state(double *a, double *charfct, int ndat, int nsta, int nlta,
+                     double *state) {
+    int i;
+    double csta = 1./((double)nsta);
+    double clta = 1./((double)nlta);
+    double sta = state[0];
+    double lta = state[1];
+
+    for (i=0;i<ndat;i++) {
+        sta = csta * pow(a[i],2) + (1-csta)*sta;
+        lta = clta * pow(a[i],2) + (1-clta)*lta;
+        charfct[i] = sta/lta;
+    }
+    state[0] = sta;
+    state[1] = lta;
+
+    return;
+}
@@ -12,11 +12,13 @@ import os
 import unittest
 import warnings
 
-from obspy import UTCDateTime, read
+from obspy import Stream, Trace, UTCDateTime, read
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 from obspy.core.util.libnames import _load_cdll
 from obspy.core.util.testing import ImageComparison
-from obspy.signal.cross_correlation import (correlate, xcorr_pick_correction,
+from obspy.signal.cross_correlation import (correlate, correlate_templates,
+                                            correlation_detector,
+                                            xcorr_pick_correction,
                                             xcorr_3c, xcorr_max, xcorr,
                                             _xcorr_padzeros, _xcorr_slice)
 
@@ -271,6 +273,81 @@ class CrossCorrelationTestCase(unittest.TestCase):
             dt, coeff = xcorr_pick_correction(
                 t1, tr1, t2, tr2, 0.05, 0.2, 0.1, plot=True, filename=ic.name)
 
+    def test_correlate_templates(self):
+        """
+        Test normalized cross-correlation of several templates against
+        correlation coefficients computed window by window.
+        """
+        np.random.seed(42)
+        data = np.random.randn(1000)
+        data[600:700] = 3.0
+        templates = np.random.randn(3, 50)
+        templates[2] = 1.0
+        cc = correlate_templates(data, templates)
+        self.assertEqual(cc.shape, (3, 951))
+        for i in range(2):
+            for j in (0, 1, 333, 570, 950):
+                expected = np.corrcoef(templates[i], data[j:j + 50])[0, 1]
+                self.assertAlmostEqual(cc[i, j], expected)
+        # flat template or flat data windows correlate with zero
+        np.testing.assert_array_equal(cc[2], 0.0)
+        np.testing.assert_array_equal(cc[:, 600:651], 0.0)
+        # single template as 1-D array
+        np.testing.assert_allclose(correlate_templates(data, templates[0]),
+                                   cc[:1])
+        self.assertRaises(ValueError, correlate_templates, data[:20],
+                          templates)
+
+    def test_correlation_detector(self):
+        """
+        Test matched filter detection on three stations with moveouts.
+        """
+        np.random.seed(42)
+        t0 = UTCDateTime(2017, 1, 1)
+        event = np.random.randn(3, 100)
+        stream = Stream()
+        for i, moveout in enumerate((0, 30, 70)):
+            data = np.random.randn(6000)
+            # repeat the event with different amplitudes at 10 s and 40 s
+            for start, amp in ((1000, 5.0), (4000, 0.5)):
+                start += moveout
+                data[start:start + 100] += amp * event[i]
+            stream += Trace(data=data, header={
+                'station': 'S%d' % i, 'sampling_rate': 100.0,
+                'starttime': t0})
+        template = stream.slice(t0 + 10, t0 + 11.7).copy()
+        for i, tr in enumerate(template):
+            tr.trim(t0 + 10 + (0, 0.3, 0.7)[i], nearest_sample=False)
+            tr.data = tr.data[:100]
+        noise = Stream([Trace(data=np.random.randn(100), header={
+            'station': 'S0', 'sampling_rate': 100.0})])
+        expected = [(t0 + 10, 0), (t0 + 40, 0)]
+        for kwargs in ({}, {'batch_size': 1, 'block_length': 100},
+                       {'workers': 2, 'batch_size': 1}):
+            detections = correlation_detector(
+                stream, [template, noise], 0.4, **kwargs)
+            self.assertEqual([(d['time'], d['template_id'])
+                              for d in detections], expected)
+            self.assertAlmostEqual(detections[0]['similarity'], 1.0)
+            self.assertTrue(0.4 < detections[1]['similarity'] < 0.6)
+        # channels only present in the template are disregarded, detection
+        # times still refer to the earliest template trace
+        template[0].stats.station = 'S9'
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            detections = correlation_detector(stream, [template], 0.4)
+        self.assertEqual(len(w), 1)
+        self.assertEqual([d['time'] for d in detections],
+                         [t0 + 10, t0 + 40])
+        # distance suppresses the weaker detection
+        template[0].stats.station = 'S0'
+        detections = correlation_detector(stream, [template], 0.4,
+                                          distance=40)
+        self.assertEqual([d['time'] for d in detections], [t0 + 10])
+        stream[0].stats.sampling_rate = 50.0
+        self.assertRaises(ValueError, correlation_detector, stream,
+                          [template], 0.4)
+
 
 def suite():
     return unittest.makeSuite(CrossCorrelationTestCase, 'test')
@@ -16,8 +16,9 @@ import numpy as np
 import scipy.signal as sg
 
 from obspy import read
-from obspy.signal.filter import (bandpass, highpass, lowpass, envelope,
-                                 lowpass_cheby_2)
+from obspy.core.compatibility import mock
+from obspy.signal.filter import (bandpass, bandstop, highpass, lowpass,
+                                 envelope, lowpass_cheby_2)
 
 
 class FilterTestCase(unittest.TestCase):
@@ -281,6 +282,44 @@ class FilterTestCase(unittest.TestCase):
                     np.testing.assert_allclose(got, expected, rtol=1e-3,
                                                atol=0.9)
 
+    def test_filter_inplace(self):
+        """
+        Filtering in place block by block has to give the same results as
+        filtering all data at once, without allocating a new array.
+        """
+        data = read()[0].data.astype(np.float64)
+        for func, kwargs in ((bandpass, dict(freqmin=1.0, freqmax=10.0)),
+                             (bandstop, dict(freqmin=1.0, freqmax=10.0)),
+                             (lowpass, dict(freq=5.0)),
+                             (highpass, dict(freq=5.0))):
+            for zerophase in (False, True):
+                expected = func(data, df=100.0, zerophase=zerophase, **kwargs)
+                with mock.patch("obspy.signal.filter._INPLACE_BLOCK_SIZE",
+                                1000):
+                    data_ = data.copy()
+                    got = func(data_, df=100.0, zerophase=zerophase,
+                               inplace=True, **kwargs)
+                    self.assertIs(got, data_)
+                    np.testing.assert_array_equal(got, expected)
+                    # single precision data stays single precision
+                    data_ = data.astype(np.float32)
+                    got = func(data_, df=100.0, zerophase=zerophase,
+                               inplace=True, **kwargs)
+                    self.assertIs(got, data_)
+                    self.assertEqual(got.dtype, np.float32)
+                    np.testing.assert_allclose(got, expected, rtol=1e-5,
+                                               atol=1e-3)
+                # multi-dimensional data is filtered along the last axis
+                data_ = np.vstack([data, data[::-1]])
+                got = func(data_, df=100.0, zerophase=zerophase, **kwargs)
+                np.testing.assert_array_equal(got[0], expected)
+                got = func(data_, df=100.0, zerophase=zerophase,
+                           inplace=True, **kwargs)
+                np.testing.assert_array_equal(got[0], expected)
+                np.testing.assert_array_equal(
+                    got[1], func(data[::-1], df=100.0, zerophase=zerophase,
+                                 **kwargs))
+
 
 def suite():
     return unittest.makeSuite(FilterTestCase, 'test')
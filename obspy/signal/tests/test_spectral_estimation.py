@@ -10,6 +10,8 @@ from future.utils import native_str
 
 import gzip
 import os
+import shutil
+import tempfile
 import unittest
 import warnings
 from copy import deepcopy
@@ -22,7 +24,8 @@ from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.testing import (
     ImageComparison, ImageComparisonException, MATPLOTLIB_VERSION)
 from obspy.io.xseed import Parser
-from obspy.signal.spectral_estimation import (PPSD, welch_taper, welch_window)
+from obspy.signal.spectral_estimation import (PPSD, PPSDStore, welch_taper,
+                                              welch_window)
 
 
 PATH = os.path.join(os.path.dirname(__file__), 'data')
@@ -597,6 +600,67 @@ class PsdTestCase(unittest.TestCase):
         # should not add the data to the ppsd
         self.assertFalse(ret)
 
+    def test_ppsd_add_workers(self):
+        """
+        Test that processing segments in a pool of worker processes gives
+        the same result as serial processing.
+        """
+        tr, paz = _get_sample_data()
+        ppsd = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        ppsd.add(Stream([tr]), workers=2)
+        expected = _get_ppsd()
+        self.assertEqual(ppsd._times_processed, expected._times_processed)
+        np.testing.assert_array_equal(ppsd._binned_psds,
+                                      expected._binned_psds)
+
+    def test_ppsd_store(self):
+        """
+        Test incremental processing into a PPSDStore and histograms
+        computed from the stored chunks.
+        """
+        tr, paz = _get_sample_data()
+        st = Stream([tr])
+        expected = _get_ppsd()
+        tempdir = tempfile.mkdtemp(prefix='obspy-')
+        try:
+            store = PPSDStore(os.path.join(tempdir, 'store'))
+            start = tr.stats.starttime
+            self.assertEqual(
+                store.add(st.slice(start, start + 5000), paz,
+                          db_bins=(-200, -50, 0.5)), 1)
+            # only segments not yet in the store get processed
+            self.assertEqual(store.add(st, paz), 3)
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                self.assertEqual(store.add(st, paz), 0)
+            # reopening the store picks up settings and processed data
+            store = PPSDStore(os.path.join(tempdir, 'store'))
+            ppsd = store.ppsd()
+            self.assertEqual(ppsd._times_processed,
+                             expected._times_processed)
+            np.testing.assert_array_equal(ppsd._binned_psds,
+                                          expected._binned_psds)
+            for starttime, endtime in (
+                    (None, None), (start + 1800, None),
+                    (None, start + 5400), (start, start + 5400)):
+                expected.calculate_histogram(starttime=starttime,
+                                             endtime=endtime)
+                np.testing.assert_array_equal(
+                    store.calculate_histogram(starttime, endtime),
+                    expected.current_histogram)
+            # segments starting exactly at the given times are excluded, as
+            # in PPSD.calculate_histogram()
+            times = expected.times_processed
+            ppsd = store.ppsd(starttime=times[0], endtime=times[2])
+            self.assertEqual(ppsd.times_processed, [times[1]])
+            expected.calculate_histogram(starttime=times[0],
+                                         endtime=times[2])
+            ppsd.calculate_histogram()
+            np.testing.assert_array_equal(ppsd.current_histogram,
+                                          expected.current_histogram)
+        finally:
+            shutil.rmtree(tempdir)
+
 
 def suite():
     return unittest.makeSuite(PsdTestCase, 'test')
@@ -14,8 +14,9 @@ from ctypes import ArgumentError
 
 import numpy as np
 
-from obspy import Stream, UTCDateTime, read
+from obspy import Stream, Trace, UTCDateTime, read
 from obspy.signal.trigger import (
+    StreamingCoincidenceTrigger, StreamingStaLta, StreamingTriggerOnset,
     ar_pick, classic_sta_lta, classic_sta_lta_py, coincidence_trigger, pk_baer,
     recursive_sta_lta, recursive_sta_lta_py, trigger_onset)
 from obspy.signal.util import clibsignal
@@ -462,6 +463,85 @@ class TriggerTestCase(unittest.TestCase):
         ref = np.array([0.38012302, 0.37704431, 0.47674533, 0.67992292])
         self.assertTrue(np.allclose(ref, c2[99:103]))
 
+    def test_streaming_sta_lta(self):
+        """
+        Test STA/LTA computed block by block against the whole data.
+        """
+        nsta, nlta = 50, 1000
+        blocks = np.split(self.data, [1, 500, 2000, 2001, 50000])
+        sta_lta = StreamingStaLta(nsta, nlta)
+        cft = np.concatenate([sta_lta.process(block) for block in blocks])
+        np.testing.assert_array_equal(
+            cft, recursive_sta_lta(self.data, nsta, nlta))
+        sta_lta = StreamingStaLta(nsta, nlta, method='classic')
+        cft = np.concatenate([sta_lta.process(block) for block in blocks])
+        np.testing.assert_allclose(
+            cft, classic_sta_lta(self.data, nsta, nlta), rtol=1e-10)
+        self.assertRaises(ValueError, StreamingStaLta, nsta, nlta, 'delayed')
+
+    def test_streaming_trigger_onset(self):
+        """
+        Test trigger onset evaluated block by block against the whole data.
+        """
+        cft = np.concatenate((np.sin(np.arange(0, 5 * np.pi, 0.1)) + 1,
+                              np.sin(np.arange(0, 5 * np.pi, 0.1)) + 2.1,
+                              np.sin(np.arange(0, 5 * np.pi, 0.1)) + 0.4,
+                              np.sin(np.arange(0, 5 * np.pi, 0.1)) + 1))
+        for kwargs in [{}, {'max_len': 50},
+                       {'max_len': 50, 'max_len_delete': True}]:
+            expected = trigger_onset(cft, 1.5, 1.0, **kwargs)
+            for size in (1, 7, 31, 100, len(cft)):
+                onset = StreamingTriggerOnset(1.5, 1.0, **kwargs)
+                picks = [onset.process(cft[i:i + size])
+                         for i in range(0, len(cft), size)]
+                picks.append(onset.flush())
+                np.testing.assert_array_equal(np.concatenate(picks),
+                                              expected)
+
+    def test_streaming_coincidence_trigger(self):
+        """
+        Test network coincidence trigger on data handed in chunk by chunk.
+        """
+        st = Stream()
+        files = ["BW.UH1._.SHZ.D.2010.147.cut.slist.gz",
+                 "BW.UH2._.SHZ.D.2010.147.cut.slist.gz",
+                 "BW.UH3._.SHZ.D.2010.147.cut.slist.gz",
+                 "BW.UH4._.EHZ.D.2010.147.cut.slist.gz"]
+        for filename in files:
+            filename = os.path.join(self.path, filename)
+            st += read(filename)
+        st.filter('bandpass', freqmin=10, freqmax=20)
+        kwargs = dict(details=True, sta=0.5, lta=10)
+        expected = coincidence_trigger("recstalta", 3.5, 1, st.copy(), 3,
+                                       **kwargs)
+        self.assertEqual(len(expected), 3)
+        for trace_ids in (None, [tr.id for tr in st]):
+            trigger = StreamingCoincidenceTrigger(
+                "recstalta", 3.5, 1, 3, trace_ids=trace_ids, **kwargs)
+            # chunks of 20 seconds that do not start at common samples
+            results = []
+            for i in range(12):
+                chunk = Stream()
+                for tr in st:
+                    spr = tr.stats.sampling_rate
+                    start = int(i * 19.9 * spr)
+                    chunk += Trace(
+                        data=tr.data[start:int((i + 1) * 19.9 * spr)],
+                        header={'network': tr.stats.network,
+                                'station': tr.stats.station,
+                                'channel': tr.stats.channel,
+                                'sampling_rate': spr,
+                                'starttime': tr.stats.starttime +
+                                start / spr})
+                results.append(trigger.process(chunk))
+            results.append(trigger.flush())
+            # triggers are emitted as soon as they are complete
+            self.assertEqual([len(res) for res in results],
+                             [0, 1] + [0] * 7 + [1, 1, 0, 0])
+            self.assertEqual(sum(results, []), expected)
+        self.assertRaises(ValueError, StreamingCoincidenceTrigger,
+                          "zdetect", 3.5, 1, 3, sta=0.5)
+
 
 def suite():
     return unittest.makeSuite(TriggerTestCase, 'test')
@@ -30,6 +30,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 from collections import deque
+from itertools import islice
 import ctypes as C
 import warnings
 
@@ -680,50 +681,16 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
     coincidence_triggers = []
     last_off_time = 0.0
     while triggers != []:
-        # remove first trigger from list and look for overlaps
-        on, off, tr_id, cft_peak, cft_std = triggers.pop(0)
-        sta = tr_id.split(".")[1]
-        event = {}
-        event['time'] = UTCDateTime(on)
-        event['stations'] = [tr_id.split(".")[1]]
-        event['trace_ids'] = [tr_id]
-        event['coincidence_sum'] = float(trace_ids[tr_id])
-        event['similarity'] = {}
-        if details:
-            event['cft_peaks'] = [cft_peak]
-            event['cft_stds'] = [cft_std]
-        # evaluate maximum similarity for station if event templates were
+        # look for overlaps of the first trigger and remove it from list
+        event, off = _coincidence_sum(triggers, trace_ids,
+                                      trigger_off_extension, details)
+        on = triggers.pop(0)[0]
+        # evaluate maximum similarity for stations if event templates were
         # provided
-        templates = event_templates.get(sta)
-        if templates:
-            event['similarity'][sta] = \
-                templates_max_similarity(stream, event['time'], templates)
-        # compile the list of stations that overlap with the current trigger
-        for trigger in triggers:
-            tmp_on, tmp_off, tmp_tr_id, tmp_cft_peak, tmp_cft_std = trigger
-            tmp_sta = tmp_tr_id.split(".")[1]
-            # skip retriggering of already present station in current
-            # coincidence trigger
-            if tmp_tr_id in event['trace_ids']:
-                continue
-            # check for overlapping trigger,
-            # break if there is a gap in between the two triggers
-            if tmp_on > off + trigger_off_extension:
-                break
-            event['stations'].append(tmp_sta)
-            event['trace_ids'].append(tmp_tr_id)
-            event['coincidence_sum'] += trace_ids[tmp_tr_id]
-            if details:
-                event['cft_peaks'].append(tmp_cft_peak)
-                event['cft_stds'].append(tmp_cft_std)
-            # allow sets of triggers that overlap only on subsets of all
-            # stations (e.g. A overlaps with B and B overlaps w/ C => ABC)
-            off = max(off, tmp_off)
-            # evaluate maximum similarity for station if event templates were
-            # provided
-            templates = event_templates.get(tmp_sta)
+        for sta in event['stations']:
+            templates = event_templates.get(sta)
             if templates:
-                event['similarity'][tmp_sta] = \
+                event['similarity'][sta] = \
                     templates_max_similarity(stream, event['time'], templates)
         # skip if both coincidence sum and similarity thresholds are not met
         if event['coincidence_sum'] < thr_coincidence_sum:
@@ -736,19 +703,545 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
         # (determined by a shared off-time, this is a bit sloppy)
         if off <= last_off_time:
             continue
-        event['duration'] = off - on
-        if details:
-            weights = np.array([trace_ids[i] for i in event['trace_ids']])
-            weighted_values = np.array(event['cft_peaks']) * weights
-            event['cft_peak_wmean'] = weighted_values.sum() / weights.sum()
-            weighted_values = np.array(event['cft_stds']) * weights
-            event['cft_std_wmean'] = \
-                (np.array(event['cft_stds']) * weights).sum() / weights.sum()
+        _finish_coincidence_event(event, on, off, trace_ids, details)
         coincidence_triggers.append(event)
         last_off_time = off
     return coincidence_triggers
 
 
+def _coincidence_sum(triggers, trace_ids, trigger_off_extension, details):
+    """
+    Compile the coincidence trigger starting with the first one of the given
+    chronologically sorted single station triggers.
+
+    Returns the event dictionary and the off time of the coincidence trigger.
+    """
+    on, off, tr_id, cft_peak, cft_std = triggers[0]
+    event = {}
+    event['time'] = UTCDateTime(on)
+    event['stations'] = [tr_id.split(".")[1]]
+    event['trace_ids'] = [tr_id]
+    event['coincidence_sum'] = float(trace_ids[tr_id])
+    event['similarity'] = {}
+    if details:
+        event['cft_peaks'] = [cft_peak]
+        event['cft_stds'] = [cft_std]
+    # compile the list of stations that overlap with the current trigger
+    for trigger in islice(triggers, 1, None):
+        tmp_on, tmp_off, tmp_tr_id, tmp_cft_peak, tmp_cft_std = trigger
+        tmp_sta = tmp_tr_id.split(".")[1]
+        # skip retriggering of already present station in current
+        # coincidence trigger
+        if tmp_tr_id in event['trace_ids']:
+            continue
+        # check for overlapping trigger,
+        # break if there is a gap in between the two triggers
+        if tmp_on > off + trigger_off_extension:
+            break
+        event['stations'].append(tmp_sta)
+        event['trace_ids'].append(tmp_tr_id)
+        event['coincidence_sum'] += trace_ids[tmp_tr_id]
+        if details:
+            event['cft_peaks'].append(tmp_cft_peak)
+            event['cft_stds'].append(tmp_cft_std)
+        # allow sets of triggers that overlap only on subsets of all
+        # stations (e.g. A overlaps with B and B overlaps w/ C => ABC)
+        off = max(off, tmp_off)
+    return event, off
+
+
+def _finish_coincidence_event(event, on, off, trace_ids, details):
+    """
+    Add duration and, if requested, the weighted means of the single station
+    characteristic function peaks and standard deviations to an event.
+    """
+    event['duration'] = off - on
+    if details:
+        weights = np.array([trace_ids[i] for i in event['trace_ids']])
+        weighted_values = np.array(event['cft_peaks']) * weights
+        event['cft_peak_wmean'] = weighted_values.sum() / weights.sum()
+        weighted_values = np.array(event['cft_stds']) * weights
+        event['cft_std_wmean'] = \
+            (np.array(event['cft_stds']) * weights).sum() / weights.sum()
+
+
+class StreamingStaLta(object):
+    """
+    STA/LTA characteristic function of a continuous time series that is
+    handed in block by block.
+
+    The averages (recursive STA/LTA) or the last ``nlta - 1`` samples
+    (classic STA/LTA) are carried over from one block to the next, so that
+    the concatenated output equals the characteristic function of the
+    concatenated data, without any warm-up of the LTA at block boundaries.
+    The recursive variant is identical to
+    :func:`~obspy.signal.trigger.recursive_sta_lta` of the whole time series,
+    the classic variant equals :func:`~obspy.signal.trigger.classic_sta_lta`
+    up to rounding.
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+    :type method: str
+    :param method: ``'recursive'`` or ``'classic'`` STA/LTA.
+
+    >>> import numpy as np
+    >>> data = np.random.randn(3000)
+    >>> sta_lta = StreamingStaLta(50, 500)
+    >>> cft = np.concatenate([sta_lta.process(data[i:i + 1000])
+    ...                       for i in range(0, 3000, 1000)])
+    >>> np.array_equal(cft, recursive_sta_lta(data, 50, 500))
+    True
+    """
+    def __init__(self, nsta, nlta, method='recursive'):
+        if method not in ('recursive', 'classic'):
+            msg = "Unknown STA/LTA method '%s'." % method
+            raise ValueError(msg)
+        self.nsta = nsta
+        self.nlta = nlta
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all data seen so far, e.g. to start over after a data gap.
+        """
+        self.npts = 0
+        self._state = np.zeros(2, dtype=np.float64)
+        self._tail = np.empty(0, dtype=np.float64)
+
+    def process(self, data):
+        """
+        Compute the characteristic function of the next block of data.
+
+        :type data: :class:`numpy.ndarray`
+        :param data: Next samples of the time series.
+        :rtype: :class:`numpy.ndarray`, dtype=float64
+        :return: Characteristic function for the given samples.
+        """
+        data = np.ascontiguousarray(data, np.float64)
+        ndat = len(data)
+        if self.method == 'recursive':
+            charfct = np.empty(ndat, dtype=np.float64)
+            start = 0
+            if self.npts == 0 and ndat:
+                # as in recursive_sta_lta() the very first sample does not
+                # enter the averages
+                charfct[0] = 0.0
+                start = 1
+            clibsignal.recstalta_state(data[start:], charfct[start:],
+                                       ndat - start, self.nsta, self.nlta,
+                                       self._state)
+            charfct[:max(self.nlta - self.npts, 0)] = 0.0
+        else:
+            buf = np.concatenate((self._tail, data))
+            if len(buf) < self.nlta:
+                charfct = np.zeros(ndat, dtype=np.float64)
+            else:
+                charfct = classic_sta_lta(buf, self.nsta, self.nlta)
+                charfct = charfct[len(self._tail):]
+            self._tail = buf[max(len(buf) - self.nlta + 1, 0):].copy()
+        self.npts += ndat
+        return charfct
+
+
+class StreamingTriggerOnset(object):
+    """
+    Trigger on and off times of a characteristic function that is handed in
+    block by block.
+
+    Works like :func:`~obspy.signal.trigger.trigger_onset` but keeps the
+    trigger state between blocks. Triggers are returned as soon as they are
+    switched off (or released after ``max_len`` samples), sample indices
+    count from the first sample of the first block.
+
+    :type thres1: float
+    :param thres1: Value above which trigger (of characteristic function)
+        is activated (higher threshold)
+    :type thres2: float
+    :param thres2: Value below which trigger (of characteristic function)
+        is deactivated (lower threshold)
+    :type max_len: int
+    :param max_len: Maximum length of triggered event in samples. A new
+        event will be triggered as soon as the signal reaches again above
+        thres1.
+    :type max_len_delete: bool
+    :param max_len_delete: Drop events longer than max_len.
+    """
+    def __init__(self, thres1, thres2, max_len=9e99, max_len_delete=False):
+        self.thres1 = thres1
+        self.thres2 = thres2
+        self.max_len = max_len
+        self.max_len_delete = max_len_delete
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all data seen so far, e.g. to start over after a data gap.
+        """
+        self.npts = 0
+        # start index of the trigger that is currently on
+        self.pending_on = None
+        # start index of a trigger that is dropped as soon as it is off
+        self._dropped_on = None
+        self._last_off = -1
+        self._above1 = False
+        self._above2 = False
+
+    def process(self, charfct):
+        """
+        Evaluate the next block of the characteristic function.
+
+        :type charfct: :class:`numpy.ndarray`
+        :param charfct: Next samples of the characteristic function.
+        :rtype: :class:`numpy.ndarray`
+        :return: Array of shape ``(n, 2)`` with on and off sample indices of
+            all triggers that were completed in this block.
+        """
+        charfct = np.asarray(charfct)
+        offset = self.npts
+        above1 = np.concatenate(([self._above1], charfct > self.thres1))
+        above2 = np.concatenate(([self._above2], charfct > self.thres2))
+        # first samples of runs above the on threshold and last samples of
+        # runs above the off threshold, a run that reaches the end of the
+        # block is completed by a later block
+        starts = np.flatnonzero(above1[1:] & ~above1[:-1]) + offset
+        ends = np.flatnonzero(above2[:-1] & ~above2[1:]) + offset - 1
+        self._above1 = above1[-1]
+        self._above2 = above2[-1]
+        self.npts += len(charfct)
+        last = self.npts - 1
+        picks = []
+        while True:
+            if self._dropped_on is not None:
+                i = np.searchsorted(ends, self._dropped_on)
+                if i == len(ends):
+                    break
+                self._last_off = ends[i]
+                self._dropped_on = None
+            if self.pending_on is None:
+                i = np.searchsorted(starts, self._last_off, side='right')
+                if i == len(starts):
+                    break
+                self.pending_on = starts[i]
+            on = self.pending_on
+            i = np.searchsorted(ends, on)
+            if i < len(ends):
+                off = ends[i]
+            elif last - on > self.max_len:
+                # still on but already too long, the exact off time does
+                # not matter any more
+                off = None
+            else:
+                break
+            self.pending_on = None
+            if off is not None and off - on <= self.max_len:
+                picks.append([on, off])
+                self._last_off = off
+            elif self.max_len_delete:
+                if off is None:
+                    self._dropped_on = on
+                else:
+                    self._last_off = off
+            else:
+                picks.append([on, on + self.max_len])
+                self._last_off = on + self.max_len
+        return np.array(picks, dtype=np.int64).reshape(-1, 2)
+
+    def flush(self):
+        """
+        Switch off a trigger that is still on at the end of the data and
+        reset the state.
+
+        :rtype: :class:`numpy.ndarray`
+        :return: Array of shape ``(n, 2)`` with on and off sample indices of
+            the last trigger, if any.
+        """
+        picks = []
+        on = self.pending_on
+        # longer triggers were released or dropped already
+        if on is not None:
+            picks.append([on, self.npts - 1])
+        self.reset()
+        return np.array(picks, dtype=np.int64).reshape(-1, 2)
+
+
+class _StreamingTraceTrigger(object):
+    """
+    Single station trigger state of one continuous segment of a trace ID.
+    """
+    def __init__(self, trace, sta_lta, onset, details):
+        self.starttime = trace.stats.starttime
+        self.sampling_rate = trace.stats.sampling_rate
+        self.sta_lta = sta_lta
+        self.onset = onset
+        self.details = details
+        # characteristic function from the earliest sample still needed
+        self._cft = np.empty(0)
+        self._cft_offset = 0
+
+    def continues(self, trace):
+        """
+        Check if the trace continues this segment without gap or overlap.
+        """
+        if trace.stats.sampling_rate != self.sampling_rate:
+            return False
+        delta = trace.stats.starttime - self.endtime
+        return abs(delta) * self.sampling_rate < 0.5
+
+    @property
+    def endtime(self):
+        """
+        Time of the next expected sample.
+        """
+        return self.starttime + float(self.onset.npts) / self.sampling_rate
+
+    @property
+    def watermark(self):
+        """
+        Earliest time at which an unknown trigger of this segment can start.
+        """
+        if self.onset.pending_on is not None:
+            return (self.starttime + float(self.onset.pending_on) /
+                    self.sampling_rate).timestamp
+        return self.endtime.timestamp
+
+    def process(self, data, tr_id):
+        if self.sta_lta is None:
+            cft = np.asarray(data)
+        else:
+            cft = self.sta_lta.process(data)
+        picks = self.onset.process(cft)
+        if self.details:
+            self._cft = np.concatenate((self._cft, cft))
+        triggers = self._triggers(picks, tr_id)
+        if self.details:
+            keep = self.onset.pending_on
+            if keep is None:
+                keep = self.onset.npts
+            self._cft = self._cft[keep - self._cft_offset:]
+            self._cft_offset = keep
+        return triggers
+
+    def flush(self, tr_id):
+        return self._triggers(self.onset.flush(), tr_id)
+
+    def _triggers(self, picks, tr_id):
+        triggers = []
+        for on, off in picks:
+            cft_peak = cft_std = None
+            if self.details:
+                cft = self._cft[on - self._cft_offset:off - self._cft_offset]
+                try:
+                    cft_peak = cft.max()
+                    cft_std = cft.std()
+                except ValueError:
+                    cft_peak = self._cft[on - self._cft_offset]
+                    cft_std = 0
+            on = self.starttime + float(on) / self.sampling_rate
+            off = self.starttime + float(off) / self.sampling_rate
+            triggers.append((on.timestamp, off.timestamp, tr_id, cft_peak,
+                             cft_std))
+        return triggers
+
+
+class StreamingCoincidenceTrigger(object):
+    """
+    Network coincidence trigger on data that is handed in chunk by chunk.
+
+    Works like :func:`~obspy.signal.trigger.coincidence_trigger` on
+    unbounded data, e.g. a long SDS archive read hour by hour or traces
+    coming in from a SeedLink server. Only the trigger state and the
+    single station triggers that can still be part of a coincidence trigger
+    are kept between chunks, so memory usage does not grow with the amount
+    of data. Coincidence triggers are returned as soon as no single station
+    trigger can be added anymore, i.e. as soon as all stations have
+    delivered data up to the off time of the coincidence trigger (plus
+    ``trigger_off_extension``).
+
+    Every trace ID is processed as a continuous time series. Gaps or
+    overlaps between consecutive chunks of the same trace ID end the
+    current segment (switching off a trigger that is still on) and start a
+    new one, including a new warm-up of the LTA.
+
+    For ``trigger_type`` only the STA/LTA triggers that can carry their
+    state across chunks are supported (``'recstalta'`` and
+    ``'classicstalta'``), or ``None`` for precomputed characteristic
+    functions. For ``'recstalta'`` the result is identical to
+    :func:`~obspy.signal.trigger.coincidence_trigger` on the merged data,
+    independent of how the data is split into chunks. Similarity checks
+    against event templates are not supported.
+
+    See :func:`~obspy.signal.trigger.coincidence_trigger` for a description
+    of the parameters. If ``trace_ids`` is given, coincidence triggers are
+    held back until data for all of these trace IDs has been processed up to
+    their off time, otherwise only trace IDs already seen are waited for.
+    Any prefiltering of the data has to be done in a way that is continuous
+    across chunks, too (e.g. using ``zi`` of :func:`scipy.signal.sosfilt`).
+
+    Running over an SDS archive in chunks of one hour:
+
+    >>> from obspy.clients.filesystem.sds import Client
+    >>> client = Client("/path/to/SDS_root")  # doctest: +SKIP
+    >>> trigger = StreamingCoincidenceTrigger(
+    ...     "recstalta", 3.5, 1, 3, sta=0.5, lta=10)
+    >>> t = UTCDateTime(2010, 5, 27)
+    >>> while t < UTCDateTime(2010, 5, 28):  # doctest: +SKIP
+    ...     st = client.get_waveforms("BW", "UH*", "", "SHZ", t, t + 3600)
+    ...     # the SDS client returns data including the end time
+    ...     st.trim(endtime=t + 3600, nearest_sample=False)
+    ...     for event in trigger.process(st):
+    ...         print(event['time'], event['stations'])
+    ...     t += 3600
+    >>> for event in trigger.flush():  # doctest: +SKIP
+    ...     print(event['time'], event['stations'])
+
+    Triggering on a SeedLink feed:
+
+    >>> from obspy import Stream
+    >>> from obspy.clients.seedlink.easyseedlink import EasySeedLinkClient
+    >>> class TriggerClient(EasySeedLinkClient):
+    ...     def on_data(self, trace):
+    ...         for event in trigger.process(Stream([trace])):
+    ...             print(event['time'], event['stations'])
+    """
+    def __init__(self, trigger_type, thr_on, thr_off, thr_coincidence_sum,
+                 trace_ids=None, max_trigger_length=1e6,
+                 delete_long_trigger=False, trigger_off_extension=0,
+                 details=False, **options):
+        if trigger_type is not None:
+            trigger_type = trigger_type.lower()
+            if trigger_type not in _STREAMING_STA_LTA_METHODS:
+                msg = ("Trigger type '%s' can not be evaluated chunk by "
+                       "chunk. Supported are: %s.") % (
+                    trigger_type,
+                    ", ".join(sorted(_STREAMING_STA_LTA_METHODS)))
+                raise ValueError(msg)
+        self.trigger_type = trigger_type
+        self.thr_on = thr_on
+        self.thr_off = thr_off
+        self.thr_coincidence_sum = thr_coincidence_sum
+        # we always work with a dictionary with trace ids and their weights
+        self._wait_for_all = trace_ids is not None
+        if isinstance(trace_ids, list) or isinstance(trace_ids, tuple):
+            trace_ids = dict.fromkeys(trace_ids, 1)
+        self.trace_ids = trace_ids
+        self.max_trigger_length = max_trigger_length
+        self.delete_long_trigger = delete_long_trigger
+        self.trigger_off_extension = trigger_off_extension
+        self.details = details
+        self.options = options
+        self._segments = {}
+        self._triggers = []
+        self._last_off_time = 0.0
+
+    def _new_segment(self, trace):
+        spr = trace.stats.sampling_rate
+        sta_lta = None
+        if self.trigger_type is not None:
+            options = dict(self.options)
+            # convert sta and lta from seconds to samples, see Trace.trigger
+            for key in ['sta', 'lta']:
+                if key in options:
+                    options['n%s' % (key)] = int(options.pop(key) * spr)
+            sta_lta = StreamingStaLta(
+                method=_STREAMING_STA_LTA_METHODS[self.trigger_type],
+                **options)
+        onset = StreamingTriggerOnset(
+            self.thr_on, self.thr_off,
+            max_len=int(self.max_trigger_length * spr + 0.5),
+            max_len_delete=self.delete_long_trigger)
+        return _StreamingTraceTrigger(trace, sta_lta, onset, self.details)
+
+    def process(self, stream):
+        """
+        Process the next chunk of waveform data.
+
+        :type stream: :class:`~obspy.core.stream.Stream`
+        :param stream: Next chunk of waveform data. Traces have to be
+            chronologically ordered per trace ID. The data is not changed.
+        :rtype: list
+        :returns: List of coincidence triggers completed with this chunk,
+            sorted chronologically.
+        """
+        for tr in stream:
+            if self.trace_ids is not None and tr.id not in self.trace_ids:
+                msg = "At least one trace's ID was not found in the " + \
+                      "trace ID list and was disregarded (%s)" % tr.id
+                warnings.warn(msg, UserWarning)
+                continue
+            segment = self._segments.get(tr.id)
+            if segment is not None and not segment.continues(tr):
+                self._triggers.extend(segment.flush(tr.id))
+                segment = None
+            if segment is None:
+                segment = self._new_segment(tr)
+                self._segments[tr.id] = segment
+            self._triggers.extend(segment.process(tr.data, tr.id))
+        return self._coincidence(final=False)
+
+    def flush(self):
+        """
+        Switch off all single station triggers that are still on and return
+        all remaining coincidence triggers, e.g. at the end of the data.
+
+        :rtype: list
+        :returns: List of remaining coincidence triggers, sorted
+            chronologically.
+        """
+        for tr_id, segment in self._segments.items():
+            self._triggers.extend(segment.flush(tr_id))
+        self._segments = {}
+        return self._coincidence(final=True)
+
+    def _watermark(self):
+        """
+        Earliest time at which a single station trigger not known yet can
+        start.
+        """
+        watermarks = [segment.watermark
+                      for segment in self._segments.values()]
+        if self._wait_for_all and \
+                len(self._segments) < len(self.trace_ids):
+            return -np.inf
+        return min(watermarks) if watermarks else np.inf
+
+    def _coincidence(self, final):
+        if self.trace_ids is None:
+            weights = dict.fromkeys(self._segments, 1)
+            weights.update((t[2], 1) for t in self._triggers)
+        else:
+            weights = self.trace_ids
+        watermark = np.inf if final else self._watermark()
+        triggers = self._triggers
+        triggers.sort()
+        coincidence_triggers = []
+        while triggers != []:
+            event, off = _coincidence_sum(triggers, weights,
+                                          self.trigger_off_extension,
+                                          self.details)
+            # a trigger starting later could still overlap
+            if off + self.trigger_off_extension >= watermark:
+                break
+            on = triggers.pop(0)[0]
+            if event['coincidence_sum'] < self.thr_coincidence_sum:
+                continue
+            # skip coincidence trigger if it is just a subset of the previous
+            if off <= self._last_off_time:
+                continue
+            _finish_coincidence_event(event, on, off, weights, self.details)
+            coincidence_triggers.append(event)
+            self._last_off_time = off
+        return coincidence_triggers
+
+
+_STREAMING_STA_LTA_METHODS = {
+    'recstalta': 'recursive',
+    'classicstalta': 'classic',
+}
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
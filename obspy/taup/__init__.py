@@ -108,6 +108,34 @@ object which can be queried for various attributes.
 >>> arr.ray_param, arr.time, arr.incident_angle  # doctest: +ELLIPSIS
 (453.7535..., 485.2100..., 24.3988...)
 
+Travel times for many distances (and source depths) are calculated much
+faster in one go with
+:meth:`~obspy.taup.tau.TauPyModel.get_travel_times_many`, which returns a
+NumPy structured array with one row per arrival instead of
+:class:`~obspy.taup.helper_classes.Arrival` objects.
+
+>>> tt = model.get_travel_times_many(source_depth_in_km=100,
+...                                  distance_in_degree=[30, 45, 60],
+...                                  phase_list=["P"])
+>>> print(tt["time"].round(3))
+[ 359.064  485.21   595.958]
+
+If travel times are needed over and over again, e.g. to associate picks or
+locate events, a :class:`~obspy.taup.travel_time_table.TravelTimeTable` of
+first arrivals on a grid of source depths and distances can be built once,
+stored as ``.npz`` file and interpolated in very fast. It also estimates the
+interpolation errors by comparing with exact travel times.
+
+Short-lived processes, e.g. command line scripts or the workers of a travel
+time service, spend most of their time loading the model and preparing it for
+the source depth. A :class:`~obspy.taup.model_cache.TauModelCache` keeps all
+of this on disk in a memory mappable format, shared by all processes that use
+the same (private) cache directory:
+
+>>> from obspy.taup import TauModelCache
+>>> cache = TauModelCache("/path/to/taup_cache")  # doctest: +SKIP
+>>> model = TauPyModel(model="iasp91", cache=cache)  # doctest: +SKIP
+
 Ray Paths
 ^^^^^^^^^
 
@@ -135,6 +163,15 @@ results in pierce points being stored as a record array on the arrival object.
 >>> arrivals[0].pierce.dtype
 dtype([('p', '<f8'), ('time', '<f8'), ('dist', '<f8'), ('depth', '<f8')])
 
+Pierce points and ray paths for many source depth - distance pairs, e.g. for
+the ray coverage of a tomography, are calculated much faster with
+:meth:`~obspy.taup.tau.TauPyModel.get_pierce_points_many` and
+:meth:`~obspy.taup.tau.TauPyModel.get_ray_paths_many`, optionally using
+several worker processes. They return the arrivals like
+:meth:`~obspy.taup.tau.TauPyModel.get_travel_times_many` and the points of all
+arrivals in one array, whose field ``arrival`` refers to the row of the
+arrival.
+
 
 Plotting
 --------
@@ -383,6 +420,8 @@ _DEFAULT_VALUES = {
 
 # Convenience imports.
 from .tau import TauPyModel  # NOQA
+from .model_cache import TauModelCache  # NOQA
+from .travel_time_table import TravelTimeTable  # NOQA
 
 
 if __name__ == '__main__':
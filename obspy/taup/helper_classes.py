@@ -67,6 +67,34 @@ CriticalDepth = np.dtype([
 ])
 
 
+"""
+Holds the arrivals of one phase at many distances. The index refers to the
+distance an arrival belongs to.
+"""
+PhaseArrivals = np.dtype([
+    (native_str('index'), np.int_),
+    (native_str('time'), np.float_),
+    (native_str('purist_dist'), np.float_),
+    (native_str('ray_param'), np.float_),
+    (native_str('ray_param_index'), np.int_),
+    (native_str('takeoff_angle'), np.float_),
+    (native_str('incident_angle'), np.float_),
+])
+
+
+"""
+Holds the pierce points or path points of many arrivals. The arrival field is
+the index of the arrival a point belongs to.
+"""
+ArrivalTimeDist = np.dtype([
+    (native_str('arrival'), np.int_),
+    (native_str('p'), np.float_),
+    (native_str('time'), np.float_),
+    (native_str('dist'), np.float_),
+    (native_str('depth'), np.float_),
+])
+
+
 class DepthRange:
     """
     Convenience class for storing a depth range. It has a top and a bottom and
@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Persistent cache for depth corrected models and seismic phases.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import native_str
+
+from collections import OrderedDict
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+
+import numpy as np
+
+from obspy import __version__
+from .seismic_phase import SeismicPhase
+from .tau_model import TauModel, _file_cache_key
+
+
+# Offsets of the arrays in cache files are multiples of this.
+_ALIGNMENT = 64
+
+
+class TauModelCache(object):
+    """
+    Persistent on-disk cache of models, their depth corrected versions and
+    the seismic phases built for them.
+
+    Calculating travel times for a source depth requires loading the model,
+    splitting it at that depth and setting up the requested seismic phases.
+    All of them are stored in a directory with one file per model, source
+    depth (and phase list) so that they are reused across runs and by all
+    processes using the same directory, e.g. the workers of a travel time
+    service. The arrays of the models are memory mapped, so processes share
+    the pages of the cache files instead of holding their own copies, and
+    loading a model from the cache takes a few milliseconds only. Entries do
+    not depend on the location of the model files, so a cache directory
+    filled in advance can be shipped along with short-lived workers.
+
+    The cache is passed to :class:`~obspy.taup.tau.TauPyModel`:
+
+    >>> from obspy.taup import TauPyModel, TauModelCache
+    >>> cache = TauModelCache("/path/to/taup_cache")  # doctest: +SKIP
+    >>> model = TauPyModel("iasp91", cache=cache)  # doctest: +SKIP
+
+    If the files in the cache take up more than ``max_size`` bytes, the least
+    recently used entries are removed. The size is estimated from the
+    entries written by this object between checks of the directory, so the
+    cache can temporarily exceed ``max_size`` if several processes share it.
+    Entries written by another ObsPy version are ignored.
+
+    .. note::
+
+        Cache files only contain JSON and raw arrays, but anyone who can
+        write to the cache directory can still change the models and thus
+        the calculated travel times. Use a private directory, not a shared
+        one like ``/tmp``.
+
+    :type path: str
+    :param path: Directory of the cache. Created if it does not exist.
+    :type max_size: int
+    :param max_size: Maximum size of the cache in bytes. ``None`` for no
+        limit.
+    :type mmap: bool
+    :param mmap: Memory map the arrays of cached models instead of reading
+        them into memory.
+    """
+    SUFFIX = ".taup"
+
+    def __init__(self, path, max_size=2 ** 30, mmap=True):
+        self.path = path
+        self.max_size = max_size
+        self.mmap = mmap
+        # Estimated size of the cache in bytes, see _evict().
+        self._size = None
+        # Phases are looked up once per calculation, keep the recently used
+        # ones in memory.
+        self._phases = OrderedDict()
+        try:
+            os.makedirs(path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+
+    def __deepcopy__(self, memo):  # @UnusedVariable
+        # Models referring to the cache are copied when split, the copies
+        # share the cache.
+        return self
+
+    def _filename(self, key):
+        return os.path.join(
+            self.path,
+            hashlib.sha1(key.encode("utf-8")).hexdigest() + self.SUFFIX)
+
+    def _read(self, filename):
+        """
+        Returns the header and the arrays of a cache file or ``None`` if
+        there is no valid file.
+        """
+        try:
+            header, arrays = _load_arrays(filename, use_mmap=self.mmap)
+        except Exception:
+            # Missing or broken entry.
+            return None
+        if header.get("version") != __version__:
+            return None
+        # The modification time marks the last use for the eviction.
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+        return header, arrays
+
+    def _write(self, filename, header, arrays):
+        header = dict(header, version=__version__)
+        dirname, basename = os.path.split(filename)
+        # Write to a temporary file first and rename it, so that other
+        # processes never see an incompletely written entry.
+        tmp_filename = os.path.join(dirname, ".tmp_%d_%d_%s" % (
+            os.getpid(), threading.current_thread().ident, basename))
+        _save_arrays(tmp_filename, header, arrays)
+        added = _replaced_size(tmp_filename, filename)
+        try:
+            os.replace(tmp_filename, filename)
+        except AttributeError:
+            # Python 2
+            os.rename(tmp_filename, filename)
+        self._evict(added)
+
+    def load_model(self, filename):
+        """
+        Loads a model from a file written by
+        :meth:`~obspy.taup.tau_model.TauModel.serialize`.
+
+        The first time a model is loaded it is converted and stored in the
+        cache. Afterwards it is loaded from the cache, which only requires
+        mapping the arrays of the model into memory and is much faster than
+        reading the (compressed) file.
+
+        :type filename: str
+        :param filename: Filename of the model.
+        :rtype: :class:`~obspy.taup.tau_model.TauModel`
+        """
+        file_key = _file_cache_key(filename)
+        cache_filename = self._filename("file|" + file_key)
+        entry = self._read(cache_filename)
+        if entry is None:
+            model = TauModel.deserialize(filename, cache=self)
+            self._write(cache_filename, {}, model._to_arrays())
+            return model
+        model = TauModel._from_arrays(entry[1], cache=self)
+        model._cache_key = file_key
+        return model
+
+    @staticmethod
+    def _model_key(model, depth):
+        return "model|%s|%r" % (model._cache_key, float(depth))
+
+    @staticmethod
+    def _phases_key(tau_model, receiver_depth, phase_names):
+        return "phases|%s|%r|%s" % (tau_model._cache_key,
+                                    float(receiver_depth),
+                                    "|".join(sorted(phase_names)))
+
+    def get_model(self, model, depth):
+        """
+        Returns the cached model corrected for a source depth or ``None``.
+
+        :type model: :class:`~obspy.taup.tau_model.TauModel`
+        :param model: Model for a surface source.
+        :type depth: float
+        :param depth: Source depth in km.
+        """
+        key = self._model_key(model, depth)
+        entry = self._read(self._filename(key))
+        if entry is None:
+            return None
+        depth_corrected = TauModel._from_arrays(entry[1], cache=False)
+        depth_corrected._cache_key = key
+        return depth_corrected
+
+    def put_model(self, model, depth, depth_corrected):
+        """
+        Stores a model corrected for a source depth.
+
+        :type model: :class:`~obspy.taup.tau_model.TauModel`
+        :param model: Model for a surface source.
+        :type depth: float
+        :param depth: Source depth in km.
+        :type depth_corrected: :class:`~obspy.taup.tau_model.TauModel`
+        :param depth_corrected: Model corrected for the source depth.
+        """
+        key = self._model_key(model, depth)
+        self._write(self._filename(key), {}, depth_corrected._to_arrays())
+        depth_corrected._cache_key = key
+
+    def get_phases(self, tau_model, receiver_depth, phase_names):
+        """
+        Returns the cached seismic phases for a depth corrected model or
+        ``None``.
+
+        :type tau_model: :class:`~obspy.taup.tau_model.TauModel`
+        :param tau_model: Depth corrected model as returned by
+            :meth:`get_model`.
+        :type receiver_depth: float
+        :param receiver_depth: Receiver depth in km.
+        :type phase_names: list of str
+        :param phase_names: Names of the phases.
+        :returns: List of :class:`~obspy.taup.seismic_phase.SeismicPhase`
+            objects. Phases that do not exist in the model are left out.
+        """
+        if tau_model._cache_key is None:
+            return None
+        key = self._phases_key(tau_model, receiver_depth, phase_names)
+        try:
+            states, arrays = self._phases.pop(key)
+        except KeyError:
+            entry = self._read(self._filename(key))
+            if entry is None:
+                return None
+            states, arrays = entry[0]["phases"], entry[1]
+        self._phases[key] = (states, arrays)
+        while len(self._phases) > 128:
+            self._phases.popitem(last=False)
+        phases = []
+        for i, state in enumerate(states):
+            phase = object.__new__(SeismicPhase)
+            phase.__dict__.update(state["attributes"])
+            for name in state["arrays"]:
+                phase.__dict__[name] = arrays["%d/%s" % (i, name)]
+            for name in state["scalars"]:
+                phase.__dict__[name] = arrays["%d/%s" % (i, name)][()]
+            phase.tau_model = tau_model
+            phases.append(phase)
+        return phases
+
+    def put_phases(self, tau_model, receiver_depth, phase_names, phases):
+        """
+        Stores the seismic phases for a depth corrected model.
+
+        See :meth:`get_phases` for the parameters.
+        """
+        if tau_model._cache_key is None:
+            return
+        key = self._phases_key(tau_model, receiver_depth, phase_names)
+        # The arrays (and NumPy scalars) of the phases are stored like the
+        # arrays of the models, everything else in the JSON header.
+        states = []
+        arrays = {}
+        for i, phase in enumerate(phases):
+            state = {"attributes": {}, "arrays": [], "scalars": []}
+            for name, value in phase.__dict__.items():
+                if name == "tau_model":
+                    continue
+                if isinstance(value, np.ndarray):
+                    state["arrays"].append(name)
+                elif isinstance(value, np.generic):
+                    state["scalars"].append(name)
+                else:
+                    state["attributes"][name] = value
+                    continue
+                arrays["%d/%s" % (i, name)] = value
+            states.append(state)
+        self._write(self._filename(key), {"phases": states}, arrays)
+        self._phases[key] = (states, arrays)
+
+    def _entries(self):
+        """
+        Returns (last use, size, filename) of all entries.
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith(self.SUFFIX) or name.startswith(".tmp_"):
+                continue
+            filename = os.path.join(self.path, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                # Removed by another process in the meantime.
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+        return entries
+
+    def _evict(self, added=None):
+        """
+        Removes the least recently used entries if the cache is larger than
+        max_size.
+
+        The directory is only scanned if the size of the cache is unknown or
+        if the estimate, updated with the ``added`` bytes of each new entry,
+        exceeds max_size. Entries are then removed until the cache takes up
+        at most 90 % of max_size, so that the next scans are due only after
+        many more entries.
+        """
+        if self.max_size is None:
+            return
+        if self._size is not None and added is not None:
+            self._size += added
+            if self._size <= self.max_size:
+                return
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+        if size > self.max_size:
+            for _, entry_size, filename in sorted(entries):
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+                size -= entry_size
+                if size <= 0.9 * self.max_size:
+                    break
+        self._size = size
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        self._phases.clear()
+        self._size = None
+        for _, _, filename in self._entries():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def _replaced_size(new_filename, filename):
+    """
+    Returns the change of the cache size in bytes if ``filename`` is
+    replaced by ``new_filename``.
+    """
+    try:
+        old_size = os.path.getsize(filename)
+    except OSError:
+        old_size = 0
+    return os.path.getsize(new_filename) - old_size
+
+
+def _align(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _descr_to_dtype(descr):
+    """
+    Inverse of :func:`numpy.lib.format.dtype_to_descr` for descriptions
+    that went through JSON, i.e. with lists instead of tuples.
+    """
+    if not isinstance(descr, list):
+        return np.dtype(native_str(descr))
+    fields = []
+    for field in descr:
+        field_ = (native_str(field[0]), _descr_to_dtype(field[1]))
+        if len(field) > 2:
+            field_ += (tuple(field[2]),)
+        fields.append(field_)
+    return np.dtype(fields)
+
+
+def _save_arrays(filename, header, arrays):
+    """
+    Writes a header and a dictionary of arrays to a file whose arrays can be
+    memory mapped by :func:`_load_arrays`.
+
+    The file starts with the length of the header followed by the header as
+    UTF-8 encoded JSON and the raw data of all arrays at aligned offsets.
+    """
+    arrays = dict((key, np.asarray(value)) for key, value in arrays.items())
+    layout = []
+    offset = 0
+    for key in sorted(arrays):
+        arr = arrays[key]
+        if arr.dtype.hasobject:
+            msg = "Arrays of Python objects can not be stored: %s" % key
+            raise ValueError(msg)
+        offset = _align(offset)
+        layout.append((key, np.lib.format.dtype_to_descr(arr.dtype),
+                       arr.shape, offset))
+        offset += arr.nbytes
+    header = json.dumps(dict(header, arrays=layout)).encode("utf-8")
+    start = _align(8 + len(header))
+    with open(filename, "wb") as fh:
+        fh.write(struct.pack(native_str("<Q"), len(header)))
+        fh.write(header)
+        for key, _, _, offset in layout:
+            fh.seek(start + offset)
+            fh.write(arrays[key].tobytes())
+
+
+def _load_arrays(filename, use_mmap=True):
+    """
+    Reads a file written by :func:`_save_arrays`.
+
+    With ``use_mmap`` the arrays are copy-on-write memory maps of the file,
+    i.e. they can be changed without changing the file and the memory is
+    shared with other processes mapping the file as long as it is not
+    changed.
+    """
+    with open(filename, "rb") as fh:
+        length = struct.unpack(native_str("<Q"), fh.read(8))[0]
+        header = json.loads(fh.read(length).decode("utf-8"))
+        if use_mmap and header["arrays"]:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            fh.seek(0)
+            buf = bytearray(fh.read())
+    start = _align(8 + length)
+    arrays = {}
+    for key, descr, shape, offset in header.pop("arrays"):
+        dtype = _descr_to_dtype(descr)
+        shape = tuple(shape)
+        count = int(np.prod(shape))
+        if count:
+            arr = np.frombuffer(buf, dtype=dtype, count=count,
+                                offset=start + offset)
+        else:
+            arr = np.empty(0, dtype=dtype)
+        arrays[key] = arr.reshape(shape)
+    return header, arrays
@@ -16,13 +16,15 @@ import numpy as np
 
 from obspy.core.util.obspy_types import Enum
 
-from .helper_classes import (Arrival, SlownessModelError, TauModelError,
-                             TimeDist)
+from .helper_classes import (Arrival, PhaseArrivals, SlownessModelError,
+                             TauModelError, TimeDist)
 
 from .c_wrappers import clibtau
 
 
 REFINE_DIST_RADIAN_TOL = 0.0049 * math.pi / 180
+# Number of distances handled at once by SeismicPhase.calc_time_many.
+CALC_TIME_MANY_CHUNK_SIZE = 4096
 
 
 _ACTIONS = Enum([
@@ -1034,6 +1036,104 @@ class SeismicPhase(object):
                 self._settings["max_recursion"]))
         return arrivals
 
+    def calc_time_many(self, degrees):
+        """
+        Calculate arrival times for this phase at many distances at once.
+
+        Gives the same arrivals as calling :meth:`calc_time` for every
+        distance, but searches the ray parameter intervals and refines the
+        arrivals for all distances together with NumPy instead of creating an
+        :class:`~obspy.taup.helper_classes.Arrival` for every step.
+
+        :param degrees: Epicentral distances in degrees.
+        :type degrees: :class:`~numpy.ndarray`
+        :returns: Arrivals sorted by distance (in the order of ``degrees``)
+            and, for each distance, in the order of :meth:`calc_time`.
+        :rtype: :class:`~numpy.ndarray`
+            (dtype = :const:`~obspy.taup.helper_classes.PhaseArrivals`)
+        """
+        degrees = np.atleast_1d(np.asarray(degrees, dtype=np.float64))
+        results = []
+        for i in range(0, len(degrees), CALC_TIME_MANY_CHUNK_SIZE):
+            arrivals = self._calc_time_many(
+                degrees[i:i + CALC_TIME_MANY_CHUNK_SIZE])
+            arrivals['index'] += i
+            results.append(arrivals)
+        if not results:
+            return np.empty(0, dtype=PhaseArrivals)
+        return np.concatenate(results)
+
+    def _calc_time_many(self, degrees):
+        count = len(self.dist)
+        if count < 2:
+            return np.empty(0, dtype=PhaseArrivals)
+
+        # Search distances in radians, in the same order as in
+        # seismic_phase_calc_time_inner_loop() for every distance.
+        temp_deg = np.abs(degrees)
+        over = temp_deg > 360.0
+        temp_deg[over] -= 360.0 * (np.ceil(temp_deg[over] / 360.0) - 1)
+        temp_deg = np.where(temp_deg > 180.0, 360.0 - temp_deg, temp_deg)
+        rad_dist = temp_deg * np.pi / 180.0
+        index = []
+        order = []
+        search_dist = []
+        n = 0
+        active = np.flatnonzero(rad_dist <= self.max_distance)
+        while len(active):
+            index.append(active)
+            order.append(np.full(len(active), 2 * n))
+            search_dist.append(n * 2 * np.pi + rad_dist[active])
+            back = active[temp_deg[active] != 180.0]
+            index.append(back)
+            order.append(np.full(len(back), 2 * n + 1))
+            search_dist.append((n + 1) * 2.0 * np.pi - rad_dist[back])
+            n += 1
+            active = active[n * 2.0 * np.pi + rad_dist[active] <=
+                            self.max_distance]
+        if not index:
+            return np.empty(0, dtype=PhaseArrivals)
+        index = np.concatenate(index)
+        order = np.concatenate(order)
+        search_dist = np.concatenate(search_dist)
+        sort = np.lexsort((order, index))
+        index = index[sort]
+        search_dist = search_dist[sort]
+
+        # Find all ray parameter intervals that contain a search distance.
+        ray_num = np.arange(count - 1)
+        dist = self.dist
+        skip = (search_dist[:, np.newaxis] == dist[1:]) & \
+            (ray_num + 1 != count - 1)
+        hit = (dist[:-1] - search_dist[:, np.newaxis]) * \
+            (search_dist[:, np.newaxis] - dist[1:]) >= 0
+        if count > 2:
+            hit &= self.ray_param[:-1] != self.ray_param[1:]
+        candidate, ray_num = np.nonzero(hit & ~skip)
+        index = index[candidate]
+        search_dist = search_dist[candidate]
+
+        time, ray_param, ray_param_index, degenerate = self._refine_arrivals(
+            ray_num, search_dist, REFINE_DIST_RADIAN_TOL,
+            self._settings["max_recursion"])
+
+        arrivals = np.empty(len(index), dtype=PhaseArrivals)
+        arrivals['index'] = index
+        arrivals['time'] = time
+        arrivals['purist_dist'] = search_dist
+        arrivals['ray_param'] = ray_param
+        arrivals['ray_param_index'] = ray_param_index
+        if self.name.endswith('kmps') or not len(arrivals):
+            arrivals['takeoff_angle'] = 0
+            arrivals['incident_angle'] = 0
+        else:
+            arrivals['takeoff_angle'] = self.calc_takeoff_angle(ray_param)
+            arrivals['incident_angle'] = self.calc_incident_angle(ray_param)
+            # See linear_interp_arrival().
+            arrivals['takeoff_angle'][degenerate] = 0
+            arrivals['incident_angle'][degenerate] = 0
+        return arrivals
+
     def calc_pierce(self, degrees):
         """
         Calculate pierce points for this phase.
@@ -1058,12 +1158,9 @@ class SeismicPhase(object):
         # parameter in the TauModel, ie it is between ray_num and ray_num+1,
         # We know that it must be <model.ray_param.length-1 since the last
         # ray parameter sample is 0 in a spherical model.
-        ray_num = 0
-        for i, rp in enumerate(self.tau_model.ray_params[:-1]):
-            if rp >= curr_arrival.ray_param:
-                ray_num = i
-            else:
-                break
+        smaller = self.tau_model.ray_params[:-1] < curr_arrival.ray_param
+        ray_num = smaller.argmax() - 1 if smaller.any() else len(smaller) - 1
+        ray_num = max(ray_num, 0)
 
         # Here we use ray parameter and dist info stored within the
         # SeismicPhase so we can use curr_arrival.ray_param_index, which
@@ -1230,6 +1327,49 @@ class SeismicPhase(object):
 
         return curr_arrival
 
+    def calc_pierce_many(self, arrivals, degrees):
+        """
+        Calculate the pierce points for arrivals at many distances.
+
+        :param arrivals: Arrivals as returned by :meth:`calc_time_many`.
+        :type arrivals: :class:`~numpy.ndarray`
+            (dtype = :const:`~obspy.taup.helper_classes.PhaseArrivals`)
+        :param degrees: Epicentral distances in degrees that were passed to
+            :meth:`calc_time_many`.
+        :type degrees: :class:`~numpy.ndarray`
+        :returns: List with the pierce points of every arrival.
+        :rtype: list of :class:`~numpy.ndarray`
+            (dtype = :const:`~obspy.taup.helper_classes.TimeDist`)
+        """
+        return [self.calc_pierce_from_arrival(arrival).pierce
+                for arrival in self._arrivals_from_array(arrivals, degrees)]
+
+    def calc_path_many(self, arrivals, degrees):
+        """
+        Calculate the paths for arrivals at many distances.
+
+        See :meth:`calc_pierce_many` for the parameters.
+
+        :returns: List with the path of every arrival.
+        :rtype: list of :class:`~numpy.ndarray`
+            (dtype = :const:`~obspy.taup.helper_classes.TimeDist`)
+        """
+        return [self.calc_path_from_arrival(arrival).path
+                for arrival in self._arrivals_from_array(arrivals, degrees)]
+
+    def _arrivals_from_array(self, arrivals, degrees):
+        """
+        Create :class:`~obspy.taup.helper_classes.Arrival` objects for the
+        arrivals returned by :meth:`calc_time_many`.
+        """
+        for arrival in arrivals:
+            yield Arrival(self, degrees[arrival['index']], arrival['time'],
+                          arrival['purist_dist'], arrival['ray_param'],
+                          arrival['ray_param_index'], self.name,
+                          self.purist_name, self.source_depth,
+                          self.receiver_depth, arrival['takeoff_angle'],
+                          arrival['incident_angle'])
+
     def handle_special_waves(self, curr_arrival, pierce, index):
         """
         Handle head or diffracted waves.
@@ -1326,30 +1466,137 @@ class SeismicPhase(object):
             raise_from(RuntimeError('Please contact the developers. This '
                                     'error should not occur.'), e)
 
+    def _refine_arrivals(self, ray_index, search_dist, tolerance,
+                         recursion_limit):
+        """
+        Vectorized version of :meth:`refine_arrival` for many arrivals.
+
+        Returns the times, the ray parameters, the ray parameter indices and
+        whether the degenerate case of :meth:`linear_interp_arrival` was hit
+        for each arrival.
+        """
+        left = (self.time[ray_index], self.dist[ray_index],
+                self.ray_param[ray_index], ray_index)
+        # Use ray_index since dist is between ray_index and (ray_index + 1).
+        right = (self.time[ray_index + 1], self.dist[ray_index + 1],
+                 self.ray_param[ray_index + 1], ray_index)
+        body_wave = not (self.name.endswith('kmps') or any(
+            phase in self.name for phase in ['Pdiff', 'Sdiff', 'Pn', 'Sn']))
+
+        time = np.empty(len(search_dist))
+        ray_param = np.empty(len(search_dist))
+        ray_param_index = np.empty(len(search_dist), dtype=np.int_)
+        degenerate = np.empty(len(search_dist), dtype=np.bool_)
+        pending = np.arange(len(search_dist))
+        done = np.zeros(len(search_dist), dtype=np.bool_)
+        while len(pending):
+            new_time, new_ray_param, new_index, new_degenerate = \
+                self._linear_interp_arrivals(search_dist, left, right)
+            if recursion_limit <= 0 or not body_wave:
+                done[:] = True
+            time[pending[done]] = new_time[done]
+            ray_param[pending[done]] = new_ray_param[done]
+            ray_param_index[pending[done]] = new_index[done]
+            degenerate[pending[done]] = new_degenerate[done]
+            keep = ~done
+            pending = pending[keep]
+            search_dist = search_dist[keep]
+            left = tuple(x[keep] for x in left)
+            right = tuple(x[keep] for x in right)
+            if not len(pending):
+                break
+
+            try:
+                shoot = self._shoot_rays(new_ray_param[keep])
+            except (IndexError, LookupError, SlownessModelError) as e:
+                raise_from(RuntimeError('Please contact the developers. This '
+                                        'error should not occur.'), e)
+            # search between left and shoot or between shoot and right
+            use_left = ((left[1] - search_dist) *
+                        (search_dist - shoot[1])) > 0
+            left = tuple(np.where(use_left, a, b)
+                         for a, b in zip(left, shoot))
+            right = tuple(np.where(use_left, a, b)
+                          for a, b in zip(shoot, right))
+            done = np.abs(shoot[1] - search_dist) < tolerance
+            recursion_limit -= 1
+        return time, ray_param, ray_param_index, degenerate
+
+    def _linear_interp_arrivals(self, search_dist, left, right):
+        """
+        Vectorized version of :meth:`linear_interp_arrival`.
+
+        The left and right estimates are tuples of arrays of the times,
+        distances, ray parameters and ray parameter indices. Returns the
+        times, the ray parameters, the ray parameter indices and whether the
+        degenerate case was hit.
+        """
+        left_time, left_dist, left_ray_param, left_index = left
+        right_time, right_dist, right_ray_param, _ = right
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time = ((search_dist - left_dist) / (right_dist - left_dist) *
+                    (right_time - left_time)) + left_time
+            ray_param = ((search_dist - right_dist) /
+                         (left_dist - right_dist) *
+                         (left_ray_param - right_ray_param)) + right_ray_param
+        at_left = left_dist == search_dist
+        time[at_left] = left_time[at_left]
+        ray_param[at_left] = left_ray_param[at_left]
+        degenerate = (left_index == 0) & (search_dist == self.dist[0])
+        time[degenerate] = self.time[0]
+        ray_param[degenerate] = self.ray_param[0]
+        ray_param_index = np.where(degenerate, 0, left_index)
+        if np.isnan(time).any():
+            i = np.flatnonzero(np.isnan(time))[0]
+            msg = ('Time is NaN, search=%f leftDist=%f leftTime=%f '
+                   'rightDist=%f rightTime=%f')
+            raise RuntimeError(msg % (search_dist[i], left_dist[i],
+                                      left_time[i], right_dist[i],
+                                      right_time[i]))
+        return time, ray_param, ray_param_index, degenerate
+
     def shoot_ray(self, degrees, ray_param):
+        time, dist, ray_param_, ray_param_index = self._shoot_rays(
+            np.array([ray_param]))
+        return Arrival(self, degrees, time[0], dist[0], ray_param_[0],
+                       ray_param_index[0], self.name, self.purist_name,
+                       self.source_depth, self.receiver_depth)
+
+    def _shoot_rays(self, ray_param):
+        """
+        Shoot rays with an array of ray parameters.
+
+        Returns arrays of the times, distances, ray parameters and ray
+        parameter indices, in the same order as the left and right estimates
+        in :meth:`_refine_arrivals`.
+        """
         if (any(phase in self.name
                 for phase in ['Pdiff', 'Sdiff', 'Pn', 'Sn']) or
                 self.name.endswith('kmps')):
             raise SlownessModelError('Unable to shoot ray in non-body waves')
 
-        if ray_param < self.min_ray_param or self.max_ray_param < ray_param:
+        outside = (ray_param < self.min_ray_param) | \
+            (self.max_ray_param < ray_param)
+        if outside.any():
             msg = 'Ray param %f is outside range for this phase: min=%f max=%f'
-            raise SlownessModelError(msg % (ray_param, self.min_ray_param,
+            raise SlownessModelError(msg % (ray_param[outside][0],
+                                            self.min_ray_param,
                                             self.max_ray_param))
 
-        # looks like a body wave and ray param can propagate
-        for ray_param_index in range(len(self.ray_param) - 1):
-            if self.ray_param[ray_param_index + 1] < ray_param:
-                break
+        # looks like a body wave and ray param can propagate, use the first
+        # index after which the ray parameter is smaller or the last one
+        smaller = self.ray_param[1:] < ray_param[:, np.newaxis]
+        ray_param_index = np.where(smaller.any(axis=1),
+                                   smaller.argmax(axis=1),
+                                   len(self.ray_param) - 2)
 
         tau_model = self.tau_model
         s_mod = tau_model.s_mod
 
         # counter for passes through each branch. 0 is P and 1 is S.
         times_branches = self.calc_branch_mult(tau_model)
-        time = np.zeros(1)
-        dist = np.zeros(1)
-        ray_param = np.array([ray_param])
+        time = np.zeros(len(ray_param))
+        dist = np.zeros(len(ray_param))
 
         # Sum the branches with the appropriate multiplier.
         for j in range(tau_model.tau_branches.shape[1]):
@@ -1377,9 +1624,7 @@ class SeismicPhase(object):
                 time += times_branches[1, j] * td['time']
                 dist += times_branches[1, j] * td['dist']
 
-        return Arrival(self, degrees, time[0], dist[0], ray_param[0],
-                       ray_param_index, self.name, self.purist_name,
-                       self.source_depth, self.receiver_depth)
+        return time, dist, ray_param, ray_param_index
 
     def linear_interp_arrival(self, degrees, search_dist, left, right):
         if left.ray_param_index == 0 and search_dist == self.dist[0]:
@@ -1439,7 +1684,9 @@ class SeismicPhase(object):
             raise_from(RuntimeError('Please contact the developers. This '
                                     'error should not occur.'), e)
 
-        takeoff_angle = np.degrees(math.asin(np.clip(
+        # arrays of ray parameters are used by calc_time_many()
+        asin = np.arcsin if np.ndim(ray_param) else math.asin
+        takeoff_angle = np.degrees(asin(np.clip(
             takeoff_velocity * ray_param /
             (self.tau_model.radius_of_planet - self.source_depth), -1.0, 1.0)))
         if not self.down_going[0]:
@@ -1466,7 +1713,8 @@ class SeismicPhase(object):
             raise_from(RuntimeError('Please contact the developers. This '
                                     'error should not occur.'), e)
 
-        incident_angle = np.degrees(math.asin(np.clip(
+        asin = np.arcsin if np.ndim(ray_param) else math.asin
+        incident_angle = np.degrees(asin(np.clip(
             incident_velocity * ray_param /
             (self.tau_model.radius_of_planet - self.receiver_depth),
             -1.0, 1.0)))
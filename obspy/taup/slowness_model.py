@@ -534,12 +534,37 @@ class SlownessModel(object):
         if top_critical_layer > bot_critical_layer:
             raise SlownessModelError(
                 "findDepth: no layers to search (wrong layer num?)")
-        for layer_num in range(top_critical_layer, bot_critical_layer + 1):
-            vel_layer = self.v_mod.layers[layer_num]
-            top_velocity = evaluate_velocity_at_top(vel_layer, wave_type)
-            bot_velocity = evaluate_velocity_at_bottom(vel_layer, wave_type)
-            top_p = self.to_slowness(top_velocity, vel_layer['top_depth'])
-            bot_p = self.to_slowness(bot_velocity, vel_layer['bot_depth'])
+        # Evaluate the slownesses of all layers to search (and of the top of
+        # the layer below them) at once, the search itself is done on floats.
+        layers = self.v_mod.layers[top_critical_layer:bot_critical_layer + 2]
+        top_velocities = evaluate_velocity_at_top(layers, wave_type)
+        bot_velocities = evaluate_velocity_at_bottom(layers, wave_type)
+        next_top_velocities = top_velocities.copy()
+        if is_p_wave is False:
+            # Special case for S waves above a fluid. If top next layer is in
+            # a fluid then we should set top_velocity to be the P velocity at
+            # the top of the layer.
+            fluid = self.depth_in_fluid(layers['top_depth'])
+            next_top_velocities[fluid] = \
+                evaluate_velocity_at_top(layers[fluid], 'P')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            top_ps = ((self.radius_of_planet - layers['top_depth']) /
+                      top_velocities).tolist()
+            bot_ps = ((self.radius_of_planet - layers['bot_depth']) /
+                      bot_velocities).tolist()
+            next_top_ps = ((self.radius_of_planet - layers['top_depth']) /
+                           next_top_velocities).tolist()
+        for i in range(bot_critical_layer - top_critical_layer + 1):
+            layer_num = top_critical_layer + i
+            vel_layer = layers[i]
+            top_velocity = top_velocities[i]
+            bot_velocity = bot_velocities[i]
+            if top_velocity == 0 or bot_velocity == 0:
+                # Raises the error for zero velocities.
+                self.to_slowness(top_velocity, vel_layer['top_depth'])
+                self.to_slowness(bot_velocity, vel_layer['bot_depth'])
+            top_p = top_ps[i]
+            bot_p = bot_ps[i]
             # Check to see if we are within 'chatter level' (numerical
             # error) of the top or bottom and if so then return that depth.
             if abs(top_p - p) < self.slowness_tolerance:
@@ -567,16 +592,11 @@ class SlownessModel(object):
             # of the last velocity layer from the previous loop, set top_p
             # to be the slowness at the top of the next layer.
             if layer_num < len(self.v_mod) - 1:
-                vel_layer = self.v_mod.layers[layer_num + 1]
-                top_velocity = evaluate_velocity_at_top(vel_layer, wave_type)
-                if (is_p_wave is False and
-                        np.any(self.depth_in_fluid(vel_layer['top_depth']))):
-                    # Special case for S waves above a fluid. If top next
-                    # layer is in a fluid then we should set top_velocity to
-                    # be the P velocity at the top of the layer.
-                    top_velocity = evaluate_velocity_at_top(vel_layer, 'P')
-
-                top_p = self.to_slowness(top_velocity, vel_layer['top_depth'])
+                vel_layer = layers[i + 1]
+                if next_top_velocities[i + 1] == 0:
+                    self.to_slowness(next_top_velocities[i + 1],
+                                     vel_layer['top_depth'])
+                top_p = next_top_ps[i + 1]
                 if bot_p >= p >= top_p:
                     return vel_layer['top_depth']
 
@@ -7,7 +7,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+from collections import OrderedDict
 import copy
+import multiprocessing
 import warnings
 
 import matplotlib.cbook
@@ -16,6 +18,7 @@ import matplotlib.text
 import numpy as np
 
 from .helper_classes import Arrival
+from .seismic_phase import CALC_TIME_MANY_CHUNK_SIZE
 from .tau_model import TauModel
 from .taup_create import TauPCreate
 from .taup_path import TauPPath
@@ -359,6 +362,48 @@ class Arrivals(list):
         return ax
 
 
+def _calc_many(model, kind, depth, distances, phase_list, receiver_depth):
+    """
+    Calculate the arrivals, and for ``kind`` ``"pierce"`` or ``"path"`` their
+    pierce points or paths, at many distances for one source depth.
+    """
+    if kind == "time":
+        tt = TauPTime(model, phase_list, depth, None, receiver_depth)
+    elif kind == "pierce":
+        tt = TauPPierce(model, phase_list, depth, None, receiver_depth)
+    else:
+        tt = TauPPath(model, phase_list, depth, None, receiver_depth)
+    tt.depth_correct(tt.source_depth, tt.receiver_depth)
+    tt.recalc_phases()
+    if kind == "time":
+        return tt.calc_time_many(distances), None
+    elif kind == "pierce":
+        return tt.calc_pierce_many(distances)
+    return tt.calc_path_many(distances)
+
+
+# TauModel used in worker processes of TauPyModel._calc_many()
+_worker_model = None
+
+
+def _init_taup_worker(model):
+    """
+    Set up a worker process for parallel processing in
+    :meth:`TauPyModel.get_pierce_points_many` and
+    :meth:`TauPyModel.get_ray_paths_many`.
+    """
+    global _worker_model
+    _worker_model = model
+
+
+def _process_taup_chunk(args):
+    """
+    Process one chunk of distances in a worker process, see
+    :meth:`TauPyModel.get_pierce_points_many`.
+    """
+    return _calc_many(_worker_model, *args)
+
+
 class TauPyModel(object):
     """
     Representation of a seismic model and methods for ray paths through it.
@@ -385,8 +430,13 @@ class TauPyModel(object):
             multiple results are requested for the same source depth. The
             dictionary must be ordered, otherwise the LRU cache will not
             behave correctly. If ``False`` is specified, then no cache will be
-            used.
-        :type cache: :class:`collections.OrderedDict` or bool
+            used. A :class:`~obspy.taup.model_cache.TauModelCache` stores
+            the model, the split models and the seismic phases on disk so
+            they are shared by all processes using the same cache directory
+            and reused in later runs, which also makes loading the model
+            much faster.
+        :type cache: :class:`collections.OrderedDict`,
+            :class:`~obspy.taup.model_cache.TauModelCache` or bool
 
         Usage:
 
@@ -432,6 +482,129 @@ class TauPyModel(object):
         return Arrivals(sorted(tt.arrivals, key=lambda x: x.time),
                         model=self.model)
 
+    def get_travel_times_many(self, source_depth_in_km, distance_in_degree,
+                              phase_list=("ttall",),
+                              receiver_depth_in_km=0.0):
+        """
+        Return travel times of every given phase for many distances and
+        optionally source depths at once.
+
+        Much faster than calling :meth:`get_travel_times` for every distance
+        as the phases are only set up once per source depth and the arrivals
+        are calculated for all distances together with NumPy instead of
+        creating an :class:`~obspy.taup.helper_classes.Arrival` object for
+        each of them.
+
+        :param source_depth_in_km: Source depth(s) in km. Either a single
+            depth for all distances or one depth per distance.
+        :type source_depth_in_km: float or :class:`~numpy.ndarray`
+        :param distance_in_degree: Epicentral distances in degrees.
+        :type distance_in_degree: :class:`~numpy.ndarray`
+        :param phase_list: List of phases for which travel times should be
+            calculated. If this is empty, all phases will be used.
+        :type phase_list: list of str
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+
+        :return: Structured array with one row per arrival. The field
+            ``index`` is the index of the distance (and source depth) in the
+            input, the other fields ``source_depth``, ``distance``, ``name``,
+            ``time``, ``ray_param``, ``takeoff_angle`` and ``incident_angle``
+            are the same as the attributes of
+            :class:`~obspy.taup.helper_classes.Arrival`. The arrivals are
+            sorted by index and time.
+        :rtype: :class:`~numpy.ndarray`
+
+        >>> import numpy as np
+        >>> from obspy.taup import TauPyModel
+        >>> model = TauPyModel("iasp91")
+        >>> tt = model.get_travel_times_many(
+        ...     np.array([10.0, 10.0, 300.0]), np.array([40.0, 60.0, 40.0]),
+        ...     phase_list=["P", "S"])
+        >>> print(tt["index"])
+        [0 0 1 1 2 2]
+        >>> print(tt["name"])
+        ['P' 'S' 'P' 'S' 'P' 'S']
+        >>> print(tt["time"].round(2))  # doctest: +NORMALIZE_WHITESPACE
+        [  454.74   821.13   606.67  1099.99   426.05   769.24]
+        """
+        return self._calc_many("time", source_depth_in_km, distance_in_degree,
+                               phase_list, receiver_depth_in_km)[0]
+
+    def _calc_many(self, kind, source_depth_in_km, distance_in_degree,
+                   phase_list, receiver_depth_in_km, workers=None):
+        """
+        Implementation of :meth:`get_travel_times_many`,
+        :meth:`get_pierce_points_many` and :meth:`get_ray_paths_many`.
+
+        The distances are processed per source depth, in chunks if worker
+        processes are used.
+        """
+        source_depth_in_km, distance_in_degree = np.broadcast_arrays(
+            np.asarray(source_depth_in_km, dtype=np.float64),
+            np.atleast_1d(np.asarray(distance_in_degree, dtype=np.float64)))
+        source_depth_in_km = source_depth_in_km.ravel()
+        distance_in_degree = distance_in_degree.ravel()
+        if workers and workers > 1:
+            # Enough chunks to keep all workers busy.
+            chunk_size = max(1, min(CALC_TIME_MANY_CHUNK_SIZE, -(
+                -len(distance_in_degree) // (4 * workers))))
+        else:
+            chunk_size = max(len(distance_in_degree), 1)
+        indices = []
+        chunks = []
+        for depth in np.unique(source_depth_in_km):
+            index = np.flatnonzero(source_depth_in_km == depth)
+            for i in range(0, len(index), chunk_size):
+                indices.append(index[i:i + chunk_size])
+                chunks.append((kind, float(depth),
+                               distance_in_degree[indices[-1]], phase_list,
+                               receiver_depth_in_km))
+        if not chunks:
+            return _calc_many(self.model, kind, 0.0, distance_in_degree, [],
+                              receiver_depth_in_km)
+
+        if workers and workers > 1 and len(chunks) > 1:
+            # The worker processes do not need the depth corrected models
+            # cached so far.
+            model = copy.copy(self.model)
+            if model._depth_cache is not None:
+                model._depth_cache = OrderedDict()
+            pool = multiprocessing.Pool(min(workers, len(chunks)),
+                                        initializer=_init_taup_worker,
+                                        initargs=(model,))
+            try:
+                results = pool.map(_process_taup_chunk, chunks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_calc_many(self.model, *chunk) for chunk in chunks]
+
+        arrivals = [result[0] for result in results]
+        # The phase names might have different lengths.
+        dtype = max((arrivals_.dtype for arrivals_ in arrivals),
+                    key=lambda dtype: dtype['name'].itemsize)
+        offset = 0
+        for index, (arrivals_, points) in zip(indices, results):
+            arrivals_['index'] = index[arrivals_['index']]
+            if points is not None:
+                points['arrival'] += offset
+            offset += len(arrivals_)
+        arrivals = np.concatenate([arrivals_.astype(dtype)
+                                   for arrivals_ in arrivals])
+        order = np.argsort(arrivals['index'], kind='mergesort')
+        arrivals = arrivals[order]
+        if kind == "time":
+            return arrivals, None
+        points = np.concatenate([result[1] for result in results])
+        # Renumber the points for the sorted arrivals, keeping their order.
+        new_index = np.empty_like(order)
+        new_index[order] = np.arange(len(order))
+        points['arrival'] = new_index[points['arrival']]
+        points = points[np.argsort(points['arrival'], kind='mergesort')]
+        return arrivals, points
+
     def get_pierce_points(self, source_depth_in_km, distance_in_degree,
                           phase_list=("ttall",), receiver_depth_in_km=0.0):
         """
@@ -484,6 +657,73 @@ class TauPyModel(object):
         return Arrivals(sorted(rp.arrivals, key=lambda x: x.time),
                         model=self.model)
 
+    def get_pierce_points_many(self, source_depth_in_km, distance_in_degree,
+                               phase_list=("ttall",),
+                               receiver_depth_in_km=0.0, workers=None):
+        """
+        Return pierce points of every given phase for many distances and
+        optionally source depths at once.
+
+        Much faster than calling :meth:`get_pierce_points` for every distance,
+        see :meth:`get_travel_times_many`. The pierce points of all arrivals
+        are returned in one array.
+
+        :param source_depth_in_km: Source depth(s) in km. Either a single
+            depth for all distances or one depth per distance.
+        :type source_depth_in_km: float or :class:`~numpy.ndarray`
+        :param distance_in_degree: Epicentral distances in degrees.
+        :type distance_in_degree: :class:`~numpy.ndarray`
+        :param phase_list: List of phases for which travel times should be
+            calculated. If this is empty, all phases will be used.
+        :type phase_list: list of str
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+        :type workers: int, optional
+        :param workers: Number of worker processes used to compute the
+            pierce points. By default everything is computed in the current
+            process.
+
+        :return: The arrivals as returned by :meth:`get_travel_times_many`
+            and a structured array with the pierce points of all arrivals.
+            Its field ``arrival`` is the index of the arrival a point belongs
+            to, the fields ``p``, ``time``, ``dist`` and ``depth`` are the
+            same as in :attr:`Arrival.pierce
+            <obspy.taup.helper_classes.Arrival.pierce>`. The points are
+            sorted by arrival.
+        :rtype: tuple of :class:`~numpy.ndarray`
+
+        >>> import numpy as np
+        >>> from obspy.taup import TauPyModel
+        >>> model = TauPyModel("iasp91")
+        >>> arrivals, points = model.get_pierce_points_many(
+        ...     10.0, np.array([40.0, 60.0]), phase_list=["P"])
+        >>> print(arrivals["index"])
+        [0 1]
+        >>> pierce = points[points["arrival"] == 1]
+        >>> print(pierce["depth"].round(1))  # doctest: +NORMALIZE_WHITESPACE
+        [   10.     20.     35.    210.    410.    660.   1547.6   660.    410.
+           210.     35.     20.     10.      0. ]
+        """
+        return self._calc_many("pierce", source_depth_in_km,
+                               distance_in_degree, phase_list,
+                               receiver_depth_in_km, workers=workers)
+
+    def get_ray_paths_many(self, source_depth_in_km, distance_in_degree,
+                           phase_list=("ttall",), receiver_depth_in_km=0.0,
+                           workers=None):
+        """
+        Return ray paths of every given phase for many distances and
+        optionally source depths at once.
+
+        Like :meth:`get_pierce_points_many` but returns the points of the ray
+        paths, i.e. the fields ``p``, ``time``, ``dist`` and ``depth`` of the
+        points are the same as in :attr:`Arrival.path
+        <obspy.taup.helper_classes.Arrival.path>`.
+        """
+        return self._calc_many("path", source_depth_in_km, distance_in_degree,
+                               phase_list, receiver_depth_in_km,
+                               workers=workers)
+
     def get_travel_times_geo(self, source_depth_in_km, source_latitude_in_deg,
                              source_longitude_in_deg, receiver_latitude_in_deg,
                              receiver_longitude_in_deg, phase_list=("ttall",)):
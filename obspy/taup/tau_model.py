@@ -9,6 +9,7 @@ from future.builtins import *  # NOQA
 from future.utils import native_str
 
 from collections import OrderedDict
+import hashlib
 import os
 from copy import deepcopy
 from itertools import count
@@ -58,12 +59,19 @@ class TauModel(object):
         # happens to fall on a real discontinuity then it is not included.
         self.no_discon_depths = []
 
+        # Persistent cache shared with other processes and the key
+        # identifying this model in it, see obspy.taup.model_cache.
+        self._persistent_cache = None
+        self._cache_key = None
         if cache is None:
             self._depth_cache = OrderedDict()
-        elif cache is not False:
-            self._depth_cache = cache
-        else:
+        elif cache is False:
             self._depth_cache = None
+        elif hasattr(cache, "get_model"):
+            self._depth_cache = OrderedDict()
+            self._persistent_cache = cache
+        else:
+            self._depth_cache = cache
 
         if not skip_calc:
             self.calc_tau_inc_from()
@@ -235,13 +243,21 @@ class TauModel(object):
                 self._depth_cache.popitem(last=False)
             return value
         else:
-            return self._load_from_depth_cache()
+            return self._load_from_depth_cache(depth)
 
     def _load_from_depth_cache(self, depth):
+        use_persistent_cache = (self._persistent_cache is not None and
+                                self._cache_key is not None)
+        if use_persistent_cache:
+            depth_corrected = self._persistent_cache.get_model(self, depth)
+            if depth_corrected is not None:
+                return depth_corrected
         depth_corrected = self.split_branch(depth)
         depth_corrected.source_depth = depth
         depth_corrected.source_branch = depth_corrected.find_branch(depth)
         depth_corrected.validate()
+        if use_persistent_cache:
+            self._persistent_cache.put_model(self, depth, depth_corrected)
         return depth_corrected
 
     def split_branch(self, depth):
@@ -369,6 +385,10 @@ class TauModel(object):
         tau_model.ray_params = out_ray_params
         tau_model.tau_branches = new_tau_branches
         tau_model.no_discon_depths = self.no_discon_depths + [depth]
+        if self._cache_key is not None:
+            # The split model is fully determined by this one and the depth.
+            tau_model._cache_key = "%s|split|%r" % (self._cache_key,
+                                                    float(depth))
         tau_model.validate()
         return tau_model
 
@@ -473,6 +493,14 @@ class TauModel(object):
             moho_depth <type 'float'>
             radius_of_planet <type 'float'>
         """
+        # finally save the collection of (structured) arrays to a binary file
+        np.savez_compressed(filename, **self._to_arrays())
+
+    def _to_arrays(self):
+        """
+        Returns a dictionary of (structured) arrays with the contents of the
+        model, see :meth:`serialize`.
+        """
         # a) handle simple contents
         keys = ['cmb_branch', 'cmb_depth', 'debug', 'iocb_branch',
                 'iocb_depth', 'moho_branch', 'moho_depth', 'no_discon_depths',
@@ -536,9 +564,7 @@ class TauModel(object):
             velocity_model[key] = getattr(self.s_mod.v_mod, key)
         arrays['v_mod'] = velocity_model
         arrays['v_mod.layers'] = self.s_mod.v_mod.layers
-
-        # finally save the collection of (structured) arrays to a binary file
-        np.savez_compressed(filename, **arrays)
+        return arrays
 
     @staticmethod
     def deserialize(filename, cache=None):
@@ -548,86 +574,97 @@ class TauModel(object):
         # XXX: Make this a with statement when old NumPy support is dropped.
         npz = np.load(filename)
         try:
-            model = TauModel(s_mod=None,
-                             radius_of_planet=float(npz["radius_of_planet"]),
-                             cache=cache, skip_calc=True)
-            complex_contents = [
-                'tau_branches', 's_mod', 'v_mod',
-                's_mod.p_layers', 's_mod.s_layers', 's_mod.critical_depths',
-                's_mod.fluid_layer_depths',
-                's_mod.high_slowness_layer_depths_p',
-                's_mod.high_slowness_layer_depths_s', 'v_mod.layers']
-
-            # a) handle simple contents
-            for key in npz.keys():
-                # we have multiple, dynamic key names for individual tau
-                # branches now, skip them all
-                if key in complex_contents or key.startswith('tau_branches'):
-                    continue
-                arr = npz[key]
-                if arr.ndim == 0:
-                    arr = arr[()]
-                setattr(model, key, arr)
-
-            # b) handle .tau_branches
-            tau_branch_keys = [key for key in npz.keys()
-                               if key.startswith('tau_branches_')]
-            j, i = tau_branch_keys[0].split("__")[1:]
-            i = int(i.split("/")[1])
-            j = int(j.split("/")[1])
-            branches = np.empty(shape=(i, j), dtype=np.object_)
-            for key in tau_branch_keys:
-                j_, i_ = key.split("__")[1:]
-                i_ = int(i_.split("/")[0])
-                j_ = int(j_.split("/")[0])
-                branches[i_][j_] = TauBranch._from_array(npz[key])
-            # no idea how numpy lays out empty arrays of object type,
-            # make a copy just in case..
-            branches = np.copy(branches)
-            setattr(model, "tau_branches", branches)
-
-            # c) handle simple contents of .s_mod
-            slowness_model = SlownessModel(v_mod=None,
-                                           skip_model_creation=True)
-            setattr(model, "s_mod", slowness_model)
-            for key in npz['s_mod'].dtype.names:
-                # restore scalar types from 0d array
-                arr = npz['s_mod'][key]
-                if arr.ndim == 0:
-                    arr = arr.flatten()[0]
-                setattr(slowness_model, key, arr)
-
-            # d) handle complex contents of .s_mod
-            for key in ['p_layers', 's_layers', 'critical_depths']:
-                setattr(slowness_model, key, npz['s_mod.' + key])
-            for key in ['fluid_layer_depths', 'high_slowness_layer_depths_p',
-                        'high_slowness_layer_depths_s']:
-                arr_ = npz['s_mod.' + key]
-                if len(arr_) == 0:
-                    data = []
-                else:
-                    data = [DepthRange._from_array(x) for x in arr_]
-                setattr(slowness_model, key, data)
-
-            # e) handle .s_mod.v_mod
-            velocity_model = VelocityModel(
-                model_name=native_str(npz["v_mod"]["model_name"]),
-                radius_of_planet=float(npz["v_mod"]["radius_of_planet"]),
-                min_radius=float(npz["v_mod"]["min_radius"]),
-                max_radius=float(npz["v_mod"]["max_radius"]),
-                moho_depth=float(npz["v_mod"]["moho_depth"]),
-                cmb_depth=float(npz["v_mod"]["cmb_depth"]),
-                iocb_depth=float(npz["v_mod"]["iocb_depth"]),
-                is_spherical=bool(npz["v_mod"]["is_spherical"]),
-                layers=None
-            )
-            setattr(slowness_model, "v_mod", velocity_model)
-            setattr(velocity_model, 'layers', npz['v_mod.layers'])
+            model = TauModel._from_arrays(npz, cache=cache)
         finally:
             if hasattr(npz, 'close'):
                 npz.close()
             else:
                 del npz
+        if model._persistent_cache is not None:
+            model._cache_key = _file_cache_key(filename)
+        return model
+
+    @staticmethod
+    def _from_arrays(npz, cache=None):
+        """
+        Creates a model from a mapping of (structured) arrays as returned by
+        :meth:`_to_arrays`.
+        """
+        model = TauModel(s_mod=None,
+                         radius_of_planet=float(npz["radius_of_planet"]),
+                         cache=cache, skip_calc=True)
+        complex_contents = [
+            'tau_branches', 's_mod', 'v_mod',
+            's_mod.p_layers', 's_mod.s_layers', 's_mod.critical_depths',
+            's_mod.fluid_layer_depths',
+            's_mod.high_slowness_layer_depths_p',
+            's_mod.high_slowness_layer_depths_s', 'v_mod.layers']
+
+        # a) handle simple contents
+        for key in npz.keys():
+            # we have multiple, dynamic key names for individual tau
+            # branches now, skip them all
+            if key in complex_contents or key.startswith('tau_branches'):
+                continue
+            arr = npz[key]
+            if arr.ndim == 0:
+                arr = arr[()]
+            setattr(model, key, arr)
+
+        # b) handle .tau_branches
+        tau_branch_keys = [key for key in npz.keys()
+                           if key.startswith('tau_branches_')]
+        j, i = tau_branch_keys[0].split("__")[1:]
+        i = int(i.split("/")[1])
+        j = int(j.split("/")[1])
+        branches = np.empty(shape=(i, j), dtype=np.object_)
+        for key in tau_branch_keys:
+            j_, i_ = key.split("__")[1:]
+            i_ = int(i_.split("/")[0])
+            j_ = int(j_.split("/")[0])
+            branches[i_][j_] = TauBranch._from_array(npz[key])
+        # no idea how numpy lays out empty arrays of object type,
+        # make a copy just in case..
+        branches = np.copy(branches)
+        setattr(model, "tau_branches", branches)
+
+        # c) handle simple contents of .s_mod
+        slowness_model = SlownessModel(v_mod=None,
+                                       skip_model_creation=True)
+        setattr(model, "s_mod", slowness_model)
+        for key in npz['s_mod'].dtype.names:
+            # restore scalar types from 0d array
+            arr = npz['s_mod'][key]
+            if arr.ndim == 0:
+                arr = arr.flatten()[0]
+            setattr(slowness_model, key, arr)
+
+        # d) handle complex contents of .s_mod
+        for key in ['p_layers', 's_layers', 'critical_depths']:
+            setattr(slowness_model, key, npz['s_mod.' + key])
+        for key in ['fluid_layer_depths', 'high_slowness_layer_depths_p',
+                    'high_slowness_layer_depths_s']:
+            arr_ = npz['s_mod.' + key]
+            if len(arr_) == 0:
+                data = []
+            else:
+                data = [DepthRange._from_array(x) for x in arr_]
+            setattr(slowness_model, key, data)
+
+        # e) handle .s_mod.v_mod
+        velocity_model = VelocityModel(
+            model_name=native_str(npz["v_mod"]["model_name"]),
+            radius_of_planet=float(npz["v_mod"]["radius_of_planet"]),
+            min_radius=float(npz["v_mod"]["min_radius"]),
+            max_radius=float(npz["v_mod"]["max_radius"]),
+            moho_depth=float(npz["v_mod"]["moho_depth"]),
+            cmb_depth=float(npz["v_mod"]["cmb_depth"]),
+            iocb_depth=float(npz["v_mod"]["iocb_depth"]),
+            is_spherical=bool(npz["v_mod"]["is_spherical"]),
+            layers=None
+        )
+        setattr(slowness_model, "v_mod", velocity_model)
+        setattr(velocity_model, 'layers', npz['v_mod.layers'])
         return model
 
     @staticmethod
@@ -637,4 +674,17 @@ class TauModel(object):
         else:
             filename = os.path.join(os.path.dirname(__file__), "data",
                                     model_name.lower() + ".npz")
+        if hasattr(cache, "load_model"):
+            return cache.load_model(filename)
         return TauModel.deserialize(filename, cache=cache)
+
+
+def _file_cache_key(filename):
+    """
+    Returns a key identifying the model stored in a file in persistent caches.
+
+    The key depends on the contents of the file only, so caches stay valid if
+    the file is moved or installed again.
+    """
+    with open(filename, "rb") as fh:
+        return "sha1:" + hashlib.sha1(fh.read()).hexdigest()
@@ -32,3 +32,15 @@ class TauPPath(TauPPierce):
         self.degrees = degrees
         for phase in self.phases:
             self.arrivals += phase.calc_path(degrees)
+
+    def calc_path_many(self, degrees):
+        """
+        Calculates the arrivals and their ray paths for many distances at
+        once.
+
+        Like :meth:`~obspy.taup.taup_pierce.TauPPierce.calc_pierce_many` but
+        returns the ray paths instead of the pierce points.
+        """
+        return self._calc_points_many(
+            degrees, lambda phase, arrivals, degrees:
+            phase.calc_path_many(arrivals, degrees))
@@ -7,6 +7,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import numpy as np
+
+from .helper_classes import ArrivalTimeDist
 from .taup_time import TauPTime
 
 
@@ -80,3 +83,32 @@ class TauPPierce(TauPTime):
         """
         for phase in self.phases:
             self.arrivals += phase.calc_pierce(degrees)
+
+    def calc_pierce_many(self, degrees):
+        """
+        Calculates the arrivals and their pierce points for many distances at
+        once.
+
+        :param degrees: Epicentral distances in degrees.
+        :type degrees: :class:`~numpy.ndarray`
+        :returns: The arrivals as returned by
+            :meth:`~obspy.taup.taup_time.TauPTime.calc_time_many` and the
+            pierce points of all arrivals in one array, sorted by arrival.
+        :rtype: tuple of :class:`~numpy.ndarray`, the second with dtype
+            :const:`~obspy.taup.helper_classes.ArrivalTimeDist`
+        """
+        return self._calc_points_many(
+            degrees, lambda phase, arrivals, degrees:
+            phase.calc_pierce_many(arrivals, degrees))
+
+    def _calc_points_many(self, degrees, calc_points):
+        arrivals, points = self._calc_many(degrees, calc_points)
+        # Copy the points of all arrivals into one preallocated array.
+        lengths = [len(points_) for points_ in points]
+        result = np.empty(sum(lengths), dtype=ArrivalTimeDist)
+        result['arrival'] = np.repeat(np.arange(len(arrivals)), lengths)
+        if len(result):
+            points = np.concatenate(points)
+            for key in points.dtype.names:
+                result[key] = points[key]
+        return arrivals, result
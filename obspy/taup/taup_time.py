@@ -6,6 +6,9 @@ Travel time calculations.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
+
+import numpy as np
 
 from .helper_classes import TauModelError
 from .seismic_phase import SeismicPhase
@@ -62,6 +65,15 @@ class TauPTime(object):
         Recalculates the given phases using a possibly new or changed tau
         model.
         """
+        # Phases for depth corrected models from a persistent cache, see
+        # obspy.taup.model_cache, are cached as well.
+        cache = getattr(self.model, "_persistent_cache", None)
+        if cache is not None:
+            phases = cache.get_phases(self.depth_corrected_model,
+                                      self.receiver_depth, self.phase_names)
+            if phases is not None:
+                self.phases = phases
+                return
         new_phases = []
         for temp_phase_name in self.phase_names:
             for phase_num, seismic_phase in enumerate(self.phases):
@@ -86,6 +98,9 @@ class TauPTime(object):
                     print("Error with this phase, skipping it: " +
                           str(temp_phase_name))
             self.phases = new_phases
+        if cache is not None:
+            cache.put_phases(self.depth_corrected_model, self.receiver_depth,
+                             self.phase_names, self.phases)
 
     def calculate(self, degrees):
         """
@@ -108,3 +123,63 @@ class TauPTime(object):
         # Sort them.
         self.arrivals = sorted(self.arrivals,
                                key=lambda arrivals: arrivals.time)
+
+    def calc_time_many(self, degrees):
+        """
+        Calculates the arrival times of all phases at many distances at once
+        with :meth:`~obspy.taup.seismic_phase.SeismicPhase.calc_time_many`.
+
+        :param degrees: Epicentral distances in degrees.
+        :type degrees: :class:`~numpy.ndarray`
+        :returns: Structured array with the fields ``index`` (of the
+            distance in ``degrees``), ``source_depth``, ``distance``,
+            ``name``, ``time``, ``ray_param``, ``takeoff_angle`` and
+            ``incident_angle``, sorted by index and time.
+        :rtype: :class:`~numpy.ndarray`
+        """
+        return self._calc_many(degrees)[0]
+
+    def _calc_many(self, degrees, calc_points=None):
+        """
+        Implementation of :meth:`calc_time_many`.
+
+        If ``calc_points`` is given, it is called with every phase, its
+        arrivals and the distances and must return a list with the points
+        (e.g. pierce points) of every arrival. The points are returned as
+        second value, in the order of the arrivals.
+        """
+        degrees = np.atleast_1d(np.asarray(degrees, dtype=np.float64))
+        name_length = max([len(phase.name) for phase in self.phases] + [1])
+        dtype = np.dtype([
+            (native_str('index'), np.int_),
+            (native_str('source_depth'), np.float_),
+            (native_str('distance'), np.float_),
+            (native_str('name'), native_str('U%d' % name_length)),
+            (native_str('time'), np.float_),
+            (native_str('ray_param'), np.float_),
+            (native_str('takeoff_angle'), np.float_),
+            (native_str('incident_angle'), np.float_),
+        ])
+        results = []
+        points = []
+        for phase in self.phases:
+            arrivals = phase.calc_time_many(degrees)
+            result = np.empty(len(arrivals), dtype=dtype)
+            for key in ('index', 'time', 'ray_param', 'takeoff_angle',
+                        'incident_angle'):
+                result[key] = arrivals[key]
+            result['name'] = phase.name
+            results.append(result)
+            if calc_points is not None:
+                points.extend(calc_points(phase, arrivals, degrees))
+        if not results:
+            return np.empty(0, dtype=dtype), []
+        result = np.concatenate(results)
+        # Stable sort like calc_time(), so equal times keep the phase order.
+        order = np.lexsort((result['time'], result['index']))
+        result = result[order]
+        result['source_depth'] = self.source_depth
+        result['distance'] = degrees[result['index']]
+        if calc_points is not None:
+            points = [points[i] for i in order]
+        return result, points
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests the persistent TauModelCache.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import native_str
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from obspy.core.util.base import NamedTemporaryFile
+from obspy.taup.model_cache import (TauModelCache, _load_arrays,
+                                    _save_arrays)
+from obspy.taup.seismic_phase import SeismicPhase
+from obspy.taup.tau import TauPyModel
+
+
+class TauModelCacheTestCase(unittest.TestCase):
+    """
+    Test suite for the TauModelCache class.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.model = TauPyModel("iasp91", cache=False)
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _compare(self, model, *args, **kwargs):
+        expected = self.model.get_travel_times(*args, **kwargs)
+        arrivals = model.get_travel_times(*args, **kwargs)
+        self.assertEqual([(arr.name, arr.time, arr.ray_param)
+                          for arr in arrivals],
+                         [(arr.name, arr.time, arr.ray_param)
+                          for arr in expected])
+
+    def test_cached_results(self):
+        """
+        Results with a cold and warm cache are the same as without cache, also
+        for buried receivers and ray paths.
+        """
+        for _ in range(2):
+            model = TauPyModel("iasp91", cache=TauModelCache(self.path))
+            for depth in (0.0, 33.3, 300.0):
+                self._compare(model, depth, 50.0)
+                self._compare(model, depth, 30.0, phase_list=["P", "S"],
+                              receiver_depth_in_km=10.0)
+            paths = model.get_ray_paths(100.0, 60.0, phase_list=["P", "PcP"])
+            expected = self.model.get_ray_paths(100.0, 60.0,
+                                                phase_list=["P", "PcP"])
+            for path, path_ in zip(paths, expected):
+                np.testing.assert_array_equal(path.path, path_.path)
+        # one entry for the model, per model split at a source depth (the
+        # model itself is used for surface sources) and per phase list and
+        # receiver depth
+        self.assertEqual(len(os.listdir(self.path)), 1 + 3 + 7)
+
+    def test_load_model(self):
+        """
+        Models are loaded from the cache after the first time, independent of
+        the location of the model file.
+        """
+        cache = TauModelCache(self.path)
+        model = TauPyModel("iasp91", cache=cache)
+        self.assertEqual(len(cache._entries()), 1)
+        self._compare(model, 10.0, 50.0)
+        self.assertEqual(len(cache._entries()), 3)
+        filename = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                "data", "iasp91.npz")
+        with NamedTemporaryFile(suffix=".npz") as tf:
+            shutil.copy(filename, tf.name)
+            model_ = TauPyModel(tf.name, cache=cache)
+            self.assertEqual(model_.model._cache_key, model.model._cache_key)
+            self._compare(model_, 10.0, 50.0)
+        self.assertEqual(len(cache._entries()), 3)
+
+    def test_phases(self):
+        """
+        Cached phases are restored with the arrays of the cache file.
+        """
+        cache = TauModelCache(self.path)
+        model = TauPyModel("iasp91", cache=cache)
+        self._compare(model, 10.0, 50.0, phase_list=["P", "PcP"])
+        tau_model = cache.get_model(model.model, 10.0)
+        # the phases as calculated, kept in memory
+        expected = cache.get_phases(tau_model, 0.0, ["P", "PcP"])
+        # a new cache object reads the phases from the file
+        cache = TauModelCache(self.path)
+        phases = cache.get_phases(tau_model, 0.0, ["P", "PcP"])
+        self.assertEqual([phase.name for phase in phases],
+                         [phase.name for phase in expected])
+        for phase, expected_phase in zip(phases, expected):
+            self.assertIs(type(phase), SeismicPhase)
+            self.assertIs(phase.tau_model, tau_model)
+            # memory mapped
+            base = phase.dist
+            while isinstance(base, np.ndarray):
+                base = base.base
+            self.assertIsInstance(base, mmap.mmap)
+            self.assertEqual(sorted(phase.__dict__),
+                             sorted(expected_phase.__dict__))
+            for key, value in expected_phase.__dict__.items():
+                self.assertIs(type(phase.__dict__[key]), type(value))
+                np.testing.assert_array_equal(phase.__dict__[key], value)
+
+    def test_eviction_and_clear(self):
+        """
+        The least recently used entries are removed if the cache gets too
+        large.
+        """
+        cache = TauModelCache(self.path, max_size=None)
+        model = TauPyModel("iasp91", cache=cache)
+        model.get_travel_times(10.0, 50.0, phase_list=["P"])
+        size = sum(entry[1] for entry in cache._entries())
+        cache.max_size = size + 1
+        model.get_travel_times(20.0, 50.0, phase_list=["P"])
+        self.assertLess(len(cache._entries()), 4)
+        self.assertLessEqual(sum(entry[1] for entry in cache._entries()),
+                             cache.max_size)
+        cache.clear()
+        self.assertEqual(cache._entries(), [])
+        self._compare(model, 30.0, 50.0, phase_list=["P"])
+
+    def test_save_and_load_arrays(self):
+        """
+        Arrays are restored with their shapes and dtypes, memory mapped or
+        not.
+        """
+        arrays = {"a": np.arange(5.0), "b": np.array(3),
+                  "c": np.zeros(0, dtype=np.int32),
+                  "d": np.ones((2, 3), dtype=[(native_str("x"), np.int16),
+                                              (native_str("y"), np.float64)])}
+        with NamedTemporaryFile() as tf:
+            _save_arrays(tf.name, {"meta": "data"}, arrays)
+            # the header is JSON
+            with open(tf.name, "rb") as fh:
+                length = struct.unpack(native_str("<Q"), fh.read(8))[0]
+                header = json.loads(fh.read(length).decode("utf-8"))
+            self.assertEqual(header["meta"], "data")
+            for use_mmap in (True, False):
+                header, loaded = _load_arrays(tf.name, use_mmap=use_mmap)
+                self.assertEqual(header, {"meta": "data"})
+                self.assertEqual(sorted(loaded), sorted(arrays))
+                for key, arr in arrays.items():
+                    self.assertEqual(loaded[key].dtype, arr.dtype)
+                    self.assertEqual(loaded[key].shape, arr.shape)
+                    np.testing.assert_array_equal(loaded[key], arr)
+                # changing the arrays does not change the file
+                loaded["a"][0] = 10.0
+            self.assertEqual(_load_arrays(tf.name)[1]["a"][0], 0.0)
+        with self.assertRaises(ValueError):
+            _save_arrays(tf.name, {}, {"a": np.array([None])})
+
+
+def suite():
+    return unittest.makeSuite(TauModelCacheTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -17,6 +17,7 @@ import warnings
 import numpy as np
 
 from obspy.core.util.misc import TemporaryWorkingDirectory
+from obspy.taup.helper_classes import ArrivalTimeDist, TimeDist
 from obspy.taup import TauPyModel
 from obspy.taup.tau import Arrivals
 from obspy.taup.taup_create import build_taup_model
@@ -1001,6 +1002,74 @@ class TauPyModelTestCase(unittest.TestCase):
             self.assertEqual(a.name, d[0])
             self.assertAlmostEqual(a.time, d[1], 3)
 
+    def test_get_travel_times_many(self):
+        """
+        Test that calculating travel times for many distances and depths at
+        once gives the same arrivals as single calls.
+        """
+        m = TauPyModel(model="iasp91")
+        phase_list = ["ttall", "3.5kmps", "Pn", "Sn"]
+        depths = np.array([10.0, 10.0, 10.0, 300.0, 300.0, 10.0, 10.0])
+        distances = np.array([0.0, 1.0, 25.0, 50.0, 150.0, 190.0, 400.0])
+        result = m.get_travel_times_many(depths, distances,
+                                         phase_list=phase_list)
+        self.assertTrue(np.all(np.diff(result['index']) >= 0))
+        for i, (depth, distance) in enumerate(zip(depths, distances)):
+            rows = result[result['index'] == i]
+            arrivals = m.get_travel_times(depth, distance,
+                                          phase_list=phase_list)
+            self.assertEqual(len(rows), len(arrivals))
+            np.testing.assert_array_equal(rows['source_depth'], depth)
+            np.testing.assert_array_equal(rows['distance'], distance)
+            self.assertEqual(list(rows['name']),
+                             [arr.name for arr in arrivals])
+            for key in ('time', 'ray_param', 'takeoff_angle',
+                        'incident_angle'):
+                np.testing.assert_allclose(
+                    rows[key], [getattr(arr, key) for arr in arrivals],
+                    rtol=1e-12, atol=1e-10)
+        # a single depth for all distances
+        result2 = m.get_travel_times_many(10.0, distances[:3],
+                                          phase_list=phase_list)
+        np.testing.assert_array_equal(result2,
+                                      result[result['index'] < 3])
+
+    def test_get_pierce_points_and_ray_paths_many(self):
+        """
+        Pierce points and ray paths for many distances are the same as the
+        ones calculated distance by distance, also with worker processes.
+        """
+        m = TauPyModel(model="iasp91")
+        depths = np.array([10.0, 10.0, 300.0, 10.0])
+        distances = np.array([35.0, 110.0, 60.0, 0.0])
+        phase_list = ["P", "Pdiff", "PcP", "SKS", "sP"]
+        for many, single, key in (
+                (m.get_pierce_points_many, m.get_pierce_points, 'pierce'),
+                (m.get_ray_paths_many, m.get_ray_paths, 'path')):
+            arrivals, points = many(depths, distances, phase_list=phase_list,
+                                    receiver_depth_in_km=1.0)
+            self.assertEqual(points.dtype, ArrivalTimeDist)
+            np.testing.assert_array_equal(
+                arrivals, m.get_travel_times_many(depths, distances,
+                                                  phase_list=phase_list,
+                                                  receiver_depth_in_km=1.0))
+            for i, (depth, distance) in enumerate(zip(depths, distances)):
+                expected = single(depth, distance, phase_list=phase_list,
+                                  receiver_depth_in_km=1.0)
+                rows = np.flatnonzero(arrivals['index'] == i)
+                self.assertEqual(len(rows), len(expected))
+                for row, arr in zip(rows, expected):
+                    self.assertEqual(arrivals['name'][row], arr.name)
+                    points_ = points[points['arrival'] == row]
+                    for name in TimeDist.names:
+                        np.testing.assert_array_equal(
+                            points_[name], getattr(arr, key)[name])
+            arrivals2, points2 = many(depths, distances,
+                                      phase_list=phase_list,
+                                      receiver_depth_in_km=1.0, workers=2)
+            np.testing.assert_array_equal(arrivals2, arrivals)
+            np.testing.assert_array_equal(points2, points)
+
 
 def suite():
     return unittest.makeSuite(TauPyModelTestCase, 'test')
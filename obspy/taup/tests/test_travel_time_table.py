@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests the TravelTimeTable class.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import unittest
+
+import numpy as np
+
+from obspy.core.util.base import NamedTemporaryFile
+from obspy.taup.tau import TauPyModel
+from obspy.taup.travel_time_table import TravelTimeTable
+
+
+class TravelTimeTableTestCase(unittest.TestCase):
+    """
+    Test suite for the TravelTimeTable class.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.model = TauPyModel('iasp91')
+        cls.depths = np.array([0.0, 20.0, 50.0, 100.0])
+        cls.distances = np.arange(0.0, 100.1, 2.0)
+        cls.table = TravelTimeTable.from_model(
+            cls.model, ["P", "S", "PKP"], distances=cls.distances,
+            depths=cls.depths)
+
+    def test_grid_nodes(self):
+        """
+        Travel times at the grid nodes are the exact first arrivals.
+        """
+        for depth in self.depths[::2]:
+            for distance in self.distances[::7]:
+                for phase in self.table.phases:
+                    arrivals = self.model.get_travel_times(
+                        depth, distance, phase_list=[phase])
+                    time = self.table.get_travel_times(phase, depth,
+                                                       distance)
+                    ray_param = self.table.get_ray_params(phase, depth,
+                                                          distance)
+                    if not arrivals:
+                        self.assertTrue(np.isnan(time))
+                        continue
+                    self.assertAlmostEqual(time, arrivals[0].time, 9)
+                    self.assertAlmostEqual(ray_param, arrivals[0].ray_param,
+                                           9)
+
+    def test_interpolation_and_error_bounds(self):
+        """
+        Interpolated travel times between the grid nodes are within the
+        estimated errors (with some margin as they are estimated in the
+        cell centers only).
+        """
+        rs = np.random.RandomState(42)
+        depths = rs.uniform(0, 100, 20)
+        distances = rs.uniform(25, 95, 20)
+        times = self.table.get_travel_times("P", depths, distances)
+        errors = self.table.get_error_bounds("P", depths, distances)
+        self.assertEqual(times.shape, (20, ))
+        for depth, distance, time, error in zip(depths, distances, times,
+                                                errors):
+            exact = self.model.get_travel_times(depth, distance,
+                                                phase_list=["P"])[0].time
+            self.assertLess(abs(time - exact), 2 * error + 1e-3)
+            self.assertLess(abs(time - exact), 0.5)
+        # outside of the table
+        self.assertTrue(np.all(np.isnan(self.table.get_travel_times(
+            "P", [10.0, 150.0, -1.0], [101.0, 50.0, 50.0]))))
+        self.assertTrue(np.isnan(self.table.get_error_bounds("P", 150, 50)))
+        # phase without arrivals at these distances
+        self.assertTrue(np.isnan(self.table.get_travel_times("PKP", 10, 30)))
+        with self.assertRaises(ValueError):
+            self.table.get_travel_times("SKS", 10, 30)
+
+    def test_save_and_load_npz(self):
+        """
+        Tables can be saved and loaded again.
+        """
+        with NamedTemporaryFile(suffix=".npz") as tf:
+            self.table.save_npz(tf.name)
+            table = TravelTimeTable.load_npz(tf.name)
+        self.assertEqual(table.phases, self.table.phases)
+        for key in ("depths", "distances", "times", "ray_params", "errors"):
+            np.testing.assert_array_equal(getattr(table, key),
+                                          getattr(self.table, key))
+        self.assertEqual(table.receiver_depth, 0.0)
+        self.assertEqual(str(table), str(self.table))
+        # without error estimates
+        table = TravelTimeTable.from_model(
+            self.model, ["P"], distances=[10.0, 20.0], depths=[0.0, 10.0],
+            estimate_errors=False)
+        with NamedTemporaryFile(suffix=".npz") as tf:
+            table.save_npz(tf.name)
+            table = TravelTimeTable.load_npz(tf.name)
+        self.assertIsNone(table.errors)
+        with self.assertRaises(ValueError):
+            table.get_error_bounds("P", 5.0, 15.0)
+
+    def test_invalid_grid(self):
+        """
+        Grids have to be strictly increasing.
+        """
+        times = np.zeros((1, 2, 2))
+        with self.assertRaises(ValueError):
+            TravelTimeTable(["P"], [0, 0], [1, 2], times, times)
+        with self.assertRaises(ValueError):
+            TravelTimeTable(["P"], [0, 1], [1], times, times)
+        with self.assertRaises(ValueError):
+            TravelTimeTable(["P"], [0, 1, 2], [1, 2], times, times)
+
+
+def suite():
+    return unittest.makeSuite(TravelTimeTableTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
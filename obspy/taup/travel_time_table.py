@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Precomputed travel time tables with interpolation.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import numpy as np
+
+from .utils import get_phase_names
+
+
+class TravelTimeTable(object):
+    """
+    Grid of first arrival travel times of some phases over source depth and
+    epicentral distance.
+
+    Looking up travel times in a table is orders of magnitude faster than
+    calculating them with :class:`~obspy.taup.tau.TauPyModel`, which makes
+    it suitable for e.g. associators and locators that need travel times for
+    very many source - receiver pairs. Tables are built with
+    :meth:`from_model`, can be stored with :meth:`save_npz` and restored
+    with :meth:`load_npz`. Travel times between the grid nodes are linearly
+    interpolated in depth and distance (bilinear interpolation).
+
+    For every phase only the first arrival at a grid node is stored. If the
+    table is built with ``estimate_errors=True``, the interpolated times at
+    the centers of all grid cells are compared to the exact travel times.
+    The deviations are a good estimate of the interpolation error in the
+    cells and can be queried with :meth:`get_error_bounds`.
+
+    >>> import numpy as np
+    >>> from obspy.taup import TauPyModel
+    >>> from obspy.taup.travel_time_table import TravelTimeTable
+    >>> model = TauPyModel("iasp91")
+    >>> table = TravelTimeTable.from_model(
+    ...     model, ["P", "S"], distances=np.arange(30, 61, 5.0),
+    ...     depths=np.array([0.0, 50.0, 100.0]))
+    >>> print(table)  # doctest: +ELLIPSIS
+    TravelTimeTable with 2 phases, 3 depths (0 - 100 km) and 7 distances \
+(30 - 60 deg)
+      P: max. error ... s
+      S: max. error ... s
+    >>> print(table.get_travel_times("P", 33.0, 47.5).round(2))
+    511.98
+    >>> print(round(model.get_travel_times(33.0, 47.5, ["P"])[0].time, 2))
+    511.72
+    >>> print(table.get_error_bounds("P", 33.0, 47.5).round(2))
+    0.24
+
+    :type phases: list of str
+    :param phases: Names of the phases.
+    :type depths: :class:`~numpy.ndarray`
+    :param depths: Increasing source depths of the grid in km.
+    :type distances: :class:`~numpy.ndarray`
+    :param distances: Increasing epicentral distances of the grid in
+        degrees.
+    :type times: :class:`~numpy.ndarray`
+    :param times: Travel times in seconds, shape ``(len(phases),
+        len(depths), len(distances))``. NaN where a phase has no arrival.
+    :type ray_params: :class:`~numpy.ndarray`
+    :param ray_params: Ray parameters in seconds per radian, same shape as
+        ``times``.
+    :type receiver_depth: float
+    :param receiver_depth: Receiver depth in km.
+    :type errors: :class:`~numpy.ndarray`
+    :param errors: Estimated interpolation errors in seconds for each grid
+        cell, shape ``(len(phases), len(depths) - 1, len(distances) - 1)``.
+    """
+    NPZ_STORE_KEYS = ["phases", "depths", "distances", "times", "ray_params",
+                      "receiver_depth", "errors"]
+
+    def __init__(self, phases, depths, distances, times, ray_params,
+                 receiver_depth=0.0, errors=None):
+        self.phases = list(phases)
+        self.depths = np.asarray(depths, dtype=np.float64)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.times = np.asarray(times, dtype=np.float64)
+        self.ray_params = np.asarray(ray_params, dtype=np.float64)
+        self.receiver_depth = float(receiver_depth)
+        self.errors = errors
+        for name, grid in (("depths", self.depths),
+                           ("distances", self.distances)):
+            if grid.ndim != 1 or len(grid) < 2 or np.any(np.diff(grid) <= 0):
+                msg = ("The %s of a travel time table must be strictly "
+                       "increasing with at least two values.") % name
+                raise ValueError(msg)
+        shape = (len(self.phases), len(self.depths), len(self.distances))
+        if self.times.shape != shape or self.ray_params.shape != shape:
+            msg = "Travel times and ray parameters must have shape %s." % (
+                str(shape), )
+            raise ValueError(msg)
+
+    def __str__(self):
+        ret = ("TravelTimeTable with %d phases, %d depths (%g - %g km) and %d "
+               "distances (%g - %g deg)") % (
+            len(self.phases), len(self.depths), self.depths[0],
+            self.depths[-1], len(self.distances), self.distances[0],
+            self.distances[-1])
+        if self.errors is not None:
+            for phase, errors in zip(self.phases, self.errors):
+                errors = errors[~np.isnan(errors)]
+                if len(errors):
+                    ret += "\n  %s: max. error %.3f s" % (phase, errors.max())
+                else:
+                    ret += "\n  %s: no arrivals" % phase
+        return ret
+
+    def _repr_pretty_(self, p, cycle):  # @UnusedVariable
+        p.text(str(self))
+
+    @classmethod
+    def from_model(cls, model, phase_list, distances, depths,
+                   receiver_depth_in_km=0.0, estimate_errors=True):
+        """
+        Build a travel time table from a model.
+
+        :type model: :class:`~obspy.taup.tau.TauPyModel`
+        :param model: Model to calculate the travel times with.
+        :type phase_list: list of str
+        :param phase_list: Phases to put into the table. Lists of phases like
+            ``"ttbasic"`` are expanded.
+        :type distances: :class:`~numpy.ndarray`
+        :param distances: Increasing epicentral distances of the grid in
+            degrees.
+        :type depths: :class:`~numpy.ndarray`
+        :param depths: Increasing source depths of the grid in km.
+        :type receiver_depth_in_km: float
+        :param receiver_depth_in_km: Receiver depth in km.
+        :type estimate_errors: bool
+        :param estimate_errors: Compare the interpolated with the exact
+            travel times at the centers of all grid cells to estimate the
+            interpolation errors. Roughly doubles the time to build the table.
+        """
+        phases = []
+        for phase_name in phase_list:
+            for name in get_phase_names(phase_name):
+                if name not in phases:
+                    phases.append(name)
+        distances = np.asarray(distances, dtype=np.float64)
+        depths = np.asarray(depths, dtype=np.float64)
+        times, ray_params = _first_arrivals(
+            model, phases, depths, distances, receiver_depth_in_km)
+        table = cls(phases, depths, distances, times, ray_params,
+                    receiver_depth=receiver_depth_in_km)
+        if estimate_errors:
+            table.errors = table._estimate_errors(model)
+        return table
+
+    def _estimate_errors(self, model):
+        """
+        Compare the interpolated with the exact travel times at the centers
+        of all grid cells.
+
+        Cells in which a phase disappears get an infinite error.
+        """
+        depths = (self.depths[:-1] + self.depths[1:]) / 2.0
+        distances = (self.distances[:-1] + self.distances[1:]) / 2.0
+        exact, _ = _first_arrivals(model, self.phases, depths, distances,
+                                   self.receiver_depth)
+        depth_grid, distance_grid = np.meshgrid(depths, distances,
+                                                indexing="ij")
+        errors = np.empty_like(exact)
+        for i, phase in enumerate(self.phases):
+            interpolated = self.get_travel_times(phase, depth_grid,
+                                                 distance_grid)
+            errors[i] = np.abs(interpolated - exact[i])
+            errors[i][np.isnan(exact[i]) & ~np.isnan(interpolated)] = np.inf
+        return errors
+
+    def save_npz(self, filename):
+        """
+        Saves the table as a compressed numpy binary (npz format).
+
+        The table can be restored with :meth:`load_npz`.
+
+        :type filename: str
+        :param filename: Name of numpy .npz output file
+        """
+        out = dict([(key, getattr(self, key)) for key in self.NPZ_STORE_KEYS])
+        out["phases"] = np.array(self.phases, dtype=np.unicode_)
+        if self.errors is None:
+            out["errors"] = np.empty(0)
+        np.savez_compressed(filename, **out)
+
+    @staticmethod
+    def load_npz(filename):
+        """
+        Loads a table saved with :meth:`save_npz`.
+
+        :type filename: str
+        :param filename: Name of numpy .npz file with a stored table
+        """
+        data = np.load(filename)
+        kwargs = dict([(key, data[key]) for key in
+                       TravelTimeTable.NPZ_STORE_KEYS])
+        kwargs["phases"] = [str(phase) for phase in kwargs["phases"]]
+        kwargs["receiver_depth"] = float(kwargs["receiver_depth"])
+        if not kwargs["errors"].size:
+            kwargs["errors"] = None
+        return TravelTimeTable(**kwargs)
+
+    def _get_phase_index(self, phase):
+        try:
+            return self.phases.index(phase)
+        except ValueError:
+            msg = "Phase '%s' is not in the travel time table." % phase
+            raise ValueError(msg)
+
+    def _locate(self, source_depth_in_km, distance_in_degree):
+        """
+        Find the grid cells and relative positions within the cells for
+        source depths and distances.
+        """
+        depth, distance = np.broadcast_arrays(
+            np.asarray(source_depth_in_km, dtype=np.float64),
+            np.asarray(distance_in_degree, dtype=np.float64))
+        cells = []
+        for values, grid in ((depth, self.depths),
+                             (distance, self.distances)):
+            i = np.clip(np.searchsorted(grid, values, side="right") - 1,
+                        0, len(grid) - 2)
+            weight = np.where((values < grid[0]) | (values > grid[-1]),
+                              np.nan,
+                              (values - grid[i]) / (grid[i + 1] - grid[i]))
+            cells.append((i, weight))
+        return cells
+
+    def _interpolate(self, grid, source_depth_in_km, distance_in_degree):
+        (i, wi), (j, wj) = self._locate(source_depth_in_km,
+                                        distance_in_degree)
+        return _lerp(_lerp(grid[i, j], grid[i, j + 1], wj),
+                     _lerp(grid[i + 1, j], grid[i + 1, j + 1], wj), wi)
+
+    def get_travel_times(self, phase, source_depth_in_km,
+                         distance_in_degree):
+        """
+        Interpolated first arrival travel times of a phase.
+
+        :type phase: str
+        :param phase: Name of the phase.
+        :type source_depth_in_km: float or :class:`~numpy.ndarray`
+        :param source_depth_in_km: Source depth(s) in km.
+        :type distance_in_degree: float or :class:`~numpy.ndarray`
+        :param distance_in_degree: Epicentral distance(s) in degrees.
+        :returns: Travel times in seconds. NaN outside of the table or if the
+            phase does not exist at one of the surrounding grid nodes.
+        :rtype: :class:`~numpy.ndarray`
+        """
+        return self._interpolate(self.times[self._get_phase_index(phase)],
+                                 source_depth_in_km, distance_in_degree)
+
+    def get_ray_params(self, phase, source_depth_in_km, distance_in_degree):
+        """
+        Interpolated ray parameters of the first arrivals of a phase.
+
+        See :meth:`get_travel_times` for the parameters.
+
+        :returns: Ray parameters in seconds per radian.
+        :rtype: :class:`~numpy.ndarray`
+        """
+        return self._interpolate(
+            self.ray_params[self._get_phase_index(phase)],
+            source_depth_in_km, distance_in_degree)
+
+    def get_error_bounds(self, phase, source_depth_in_km, distance_in_degree):
+        """
+        Estimated interpolation errors of the travel times of a phase.
+
+        See :meth:`get_travel_times` for the parameters.
+
+        :returns: Estimated errors in seconds of the grid cells the source
+            depths and distances fall into. NaN outside of the table or where
+            the phase does not exist.
+        :rtype: :class:`~numpy.ndarray`
+        """
+        if self.errors is None:
+            msg = ("The travel time table has no error estimates. Build it "
+                   "with estimate_errors=True.")
+            raise ValueError(msg)
+        errors = self.errors[self._get_phase_index(phase)]
+        (i, wi), (j, wj) = self._locate(source_depth_in_km,
+                                        distance_in_degree)
+        return np.where(np.isnan(wi) | np.isnan(wj), np.nan, errors[i, j])
+
+
+def _lerp(a, b, weight):
+    """
+    Linear interpolation between a and b that gives exactly a or b on the
+    grid nodes, even if the other value is NaN.
+    """
+    return np.where(weight == 0, a, np.where(
+        weight == 1, b, (1.0 - weight) * a + weight * b))
+
+
+def _first_arrivals(model, phases, depths, distances, receiver_depth_in_km):
+    """
+    Calculate the times and ray parameters of the first arrivals of all
+    phases on a grid of source depths and distances.
+    """
+    depth_grid, distance_grid = np.meshgrid(depths, distances, indexing="ij")
+    result = model.get_travel_times_many(
+        depth_grid.ravel(), distance_grid.ravel(), phase_list=phases,
+        receiver_depth_in_km=receiver_depth_in_km)
+    count = depth_grid.size
+    times = np.full((len(phases), count), np.nan)
+    ray_params = np.full((len(phases), count), np.nan)
+    names, name_index = np.unique(result["name"], return_inverse=True)
+    phase_index = np.array([phases.index(name) for name in names],
+                           dtype=np.int_)[name_index]
+    # The arrivals are sorted by time, so the first occurrence is the first
+    # arrival.
+    _, first = np.unique(phase_index * count + result["index"],
+                         return_index=True)
+    times[phase_index[first], result["index"][first]] = result["time"][first]
+    ray_params[phase_index[first], result["index"][first]] = \
+        result["ray_param"][first]
+    shape = (len(phases), len(depths), len(distances))
+    return times.reshape(shape), ray_params.reshape(shape)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)